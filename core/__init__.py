@@ -5,21 +5,31 @@ Re-exports key components for easy importing.
 """
 
 from core.config import RaptorConfig
+from core.inventory import end_run, get_inventory, inventory_run, run_env, start_run
 from core.logging import get_logger
 from core.sarif.parser import (
     deduplicate_findings,
+    iter_sarif_findings,
     parse_sarif_findings,
     validate_sarif,
     generate_scan_metrics,
     sanitize_finding_for_display,
 )
+from core.tree_hash import sha256_tree
 
 __all__ = [
     "RaptorConfig",
+    "end_run",
+    "get_inventory",
+    "inventory_run",
+    "run_env",
+    "start_run",
     "get_logger",
     "deduplicate_findings",
+    "iter_sarif_findings",
     "parse_sarif_findings",
     "validate_sarif",
     "generate_scan_metrics",
     "sanitize_finding_for_display",
+    "sha256_tree",
 ]
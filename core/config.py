@@ -39,6 +39,7 @@ class RaptorConfig:
     CODEQL_TIMEOUT = 1800            # 30 minutes (database creation)
     CODEQL_ANALYZE_TIMEOUT = 2400    # 40 minutes (query execution)
     GIT_CLONE_TIMEOUT = 600          # 10 minutes
+    GIT_STATUS_TIMEOUT = 120         # 2 minutes (git status on large checkouts)
     LLM_TIMEOUT = 120                # 2 minutes per LLM call
     SUBPROCESS_POLL_INTERVAL = 1     # 1 second
 
@@ -47,10 +48,15 @@ class RaptorConfig:
     MAX_TAIL_BYTES = 2000                    # bytes of stdout/stderr in results
     HASH_CHUNK_SIZE = 1024 * 1024            # 1 MiB chunks for file hashing
     MAX_FILE_SIZE_FOR_HASH = 100 * 1024 * 1024  # 100 MiB max file size for hashing
+    TREE_HASH_WORKERS = 8                    # Threads hashing files in sha256_tree
+    TREE_HASH_CACHE_DIR = BASE_OUT_DIR / "tree_hash_cache"
+    INVENTORY_WORKERS = 4                    # Threads walking top-level subtrees for the inventory
 
     # Parallel Processing
     MAX_SEMGREP_WORKERS = 4          # Parallel Semgrep scans
     MAX_CODEQL_WORKERS = 2           # Parallel CodeQL scans
+    SEMGREP_SHARDS = 0               # Shards per config in sharded mode (0 = MAX_SEMGREP_WORKERS)
+    SEMGREP_SHARD_MAX_SPLITS = 3     # Times a timed-out shard is halved and retried
 
     # CodeQL Resource Configuration
     CODEQL_RAM_MB = 8192             # RAM for CodeQL analysis (8GB)
@@ -59,6 +65,12 @@ class RaptorConfig:
     CODEQL_DB_CACHE_DAYS = 7         # Keep databases for 7 days
     CODEQL_DB_AUTO_CLEANUP = True    # Automatically cleanup old databases
 
+    # Incremental Semgrep Configuration
+    SEMGREP_CACHE_DIR = BASE_OUT_DIR / "semgrep_cache"
+    SEMGREP_INCREMENTAL_MAX_CHANGED_FILES = 1000     # More changes than this -> cold scan
+    SEMGREP_INCREMENTAL_MAX_CHANGED_FRACTION = 0.5   # Or more than this share of the repo
+    SEMGREP_REGISTRY_CACHE_TTL = 24 * 3600           # Registry packs change upstream; rescan daily
+
     # Baseline Semgrep Packs (always included)
     BASELINE_SEMGREP_PACKS: List[Tuple[str, str]] = [
         ("semgrep_security_audit", "p/security-audit"),
@@ -89,6 +101,7 @@ class RaptorConfig:
     # Environment Variables
     ENV_OUT_DIR = "RAPTOR_OUT_DIR"
     ENV_JOB_ID = "RAPTOR_JOB_ID"
+    ENV_INVENTORY = "RAPTOR_INVENTORY"  # Run's repository inventory snapshot (core.inventory)
     ENV_LLM_CMD = "RAPTOR_LLM_CMD"
 
     # LLM Provider Configuration
@@ -110,6 +123,11 @@ class RaptorConfig:
     MCP_VERSION = "0.6.0"
     MCP_JOB_DIR = BASE_OUT_DIR / "jobs"
 
+    # SARIF Index Configuration
+    SARIF_INDEX_DIR = BASE_OUT_DIR / "sarif_index"
+    SARIF_INDEX_MAX_BYTES = 1024 * 1024 * 1024   # Evict least recently used above this (0 = unbounded)
+    SARIF_INDEX_MAX_AGE = 7 * 24 * 3600          # Drop indexes unused this long (0 = never)
+
     # Logging Configuration
     LOG_DIR = BASE_OUT_DIR / "logs"
     LOG_FORMAT_CONSOLE = "[%(levelname)s] %(module)s: %(message)s"
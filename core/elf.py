@@ -0,0 +1,746 @@
+#!/usr/bin/env python3
+"""
+RAPTOR ELF Reader
+
+In-process ELF parsing shared by the exploit feasibility analyzer, binary
+context collection and crash analysis, replacing readelf/nm/objdump/strings
+subprocesses and the regexes over their text output.
+
+The file is memory-mapped once and every table (sections, segments, dynamic
+entries, symbols, relocations, PLT stubs) is decoded on first access.
+open_elf() memoises readers on file identity, so all callers in a process
+share one mapping per binary.
+
+Usage:
+    elf = open_elf("/path/to/binary")
+    elf.arch, elf.elf_type                 # "x86_64", "DYN"
+    elf.checksec()["full_relro"]
+    elf.find_symbol("system").value        # nm -D
+    elf.got_entries()["printf"]            # readelf -r
+    elf.plt_entries()["printf"]            # objdump -d <printf@plt>
+    elf.find_string("/bin/sh")             # strings -t x
+"""
+
+import mmap
+import os
+import re
+import struct
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+ELF_MAGIC = b"\x7fELF"
+
+# Program header types and flags
+PT_LOAD = 1
+PT_DYNAMIC = 2
+PT_INTERP = 3
+PT_NOTE = 4
+PT_GNU_STACK = 0x6474E551
+PT_GNU_RELRO = 0x6474E552
+PF_X = 0x1
+PF_W = 0x2
+PF_R = 0x4
+
+# Section header types and flags
+SHT_SYMTAB = 2
+SHT_RELA = 4
+SHT_DYNAMIC = 6
+SHT_NOTE = 7
+SHT_NOBITS = 8
+SHT_REL = 9
+SHT_DYNSYM = 11
+SHT_GNU_VERSYM = 0x6FFFFFFF
+SHF_WRITE = 0x1
+SHF_ALLOC = 0x2
+SHF_EXECINSTR = 0x4
+SHN_LORESERVE = 0xFF00
+
+# Dynamic tags and flags
+DT_NEEDED = 1
+DT_STRTAB = 5
+DT_STRSZ = 10
+DT_RPATH = 15
+DT_BIND_NOW = 24
+DT_RUNPATH = 29
+DT_FLAGS = 30
+DT_FLAGS_1 = 0x6FFFFFFB
+DF_BIND_NOW = 0x8
+DF_1_NOW = 0x1
+DF_1_PIE = 0x08000000
+
+# Note types
+NT_GNU_BUILD_ID = 3
+
+ELF_TYPES = {0: "NONE", 1: "REL", 2: "EXEC", 3: "DYN", 4: "CORE"}
+SYMBOL_TYPES = {0: "NOTYPE", 1: "OBJECT", 2: "FUNC", 3: "SECTION", 4: "FILE",
+                5: "COMMON", 6: "TLS", 10: "IFUNC"}
+SYMBOL_BINDS = {0: "LOCAL", 1: "GLOBAL", 2: "WEAK", 10: "UNIQUE"}
+
+EM_386 = 3
+EM_X86_64 = 62
+
+# e_machine -> architecture name (matching pwntools / exploit_feasibility names)
+MACHINES = {
+    EM_386: "i386",
+    EM_X86_64: "x86_64",
+    40: "arm",
+    183: "aarch64",
+    8: "mips",
+    20: "powerpc",
+    21: "powerpc64",
+    243: "riscv",
+    2: "sparc",
+    43: "sparc64",
+}
+
+# Relocation types that fill a GOT slot for a symbol: e_machine -> (GLOB_DAT, JUMP_SLOT)
+GOT_RELOCATIONS = {
+    EM_386: (6, 7),
+    EM_X86_64: (6, 7),
+    40: (21, 22),
+    183: (1025, 1026),
+    20: (20, 21),
+    21: (20, 21),
+    8: (51, 127),
+    243: (None, 5),
+}
+
+# Runs of printable characters, as `strings` counts them
+_PRINTABLE = rb"[\x20-\x7e\t]"
+
+
+class ELFError(ValueError):
+    """File is not an ELF file, or its headers are malformed."""
+
+
+@dataclass(frozen=True)
+class Section:
+    """One section header."""
+    index: int
+    name: str
+    type: int
+    flags: int
+    addr: int
+    offset: int
+    size: int
+    link: int
+    info: int
+    entsize: int
+
+    @property
+    def is_writable(self) -> bool:
+        return bool(self.flags & SHF_WRITE)
+
+    @property
+    def is_executable(self) -> bool:
+        return bool(self.flags & SHF_EXECINSTR)
+
+
+@dataclass(frozen=True)
+class Segment:
+    """One program header."""
+    type: int
+    flags: int
+    offset: int
+    vaddr: int
+    filesz: int
+    memsz: int
+
+    @property
+    def permissions(self) -> str:
+        """readelf-style flags, e.g. "RW" or "RWE"."""
+        return "".join(c for c, bit in (("R", PF_R), ("W", PF_W), ("E", PF_X)) if self.flags & bit)
+
+
+@dataclass(frozen=True)
+class Symbol:
+    """One symbol table entry. Names carry no @VERSION suffix."""
+    name: str
+    value: int
+    size: int
+    type: str
+    bind: str
+    shndx: int
+    hidden: bool = False  # Non-default symbol version (name@VER rather than name@@VER)
+
+    @property
+    def defined(self) -> bool:
+        return self.shndx != 0
+
+
+@dataclass(frozen=True)
+class Relocation:
+    """One REL/RELA entry, with its symbol name resolved."""
+    offset: int
+    type: int
+    symbol: str
+    addend: int
+    section: str
+
+
+class ELFFile:
+    """
+    Memory-mapped ELF file with lazily decoded tables.
+
+    Raises ELFError from the constructor if the file is not a valid ELF;
+    tables that are malformed further in are decoded as far as possible.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._symbol_tables: Dict[int, List[Symbol]] = {}
+        with open(self.path, "rb") as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty file
+                raise ELFError(f"Not an ELF file: {self.path}") from None
+        try:
+            self._parse_header()
+        except BaseException:
+            self._data.close()
+            raise
+
+    def __enter__(self) -> "ELFFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._data.close()
+
+    def __repr__(self) -> str:
+        return f"ELFFile({self.path!r}, arch={self.arch}, type={self.elf_type})"
+
+    # ── Header ───────────────────────────────────────────────────────────────
+
+    def _parse_header(self) -> None:
+        data = self._data
+        if len(data) < 52 or data[:4] != ELF_MAGIC:
+            raise ELFError(f"Not an ELF file: {self.path}")
+        ei_class, ei_data = data[4], data[5]
+        if ei_class not in (1, 2) or ei_data not in (1, 2):
+            raise ELFError(f"Unsupported ELF class/encoding: {self.path}")
+
+        self.bits = 64 if ei_class == 2 else 32
+        self.little_endian = ei_data == 1
+        e = "<" if self.little_endian else ">"
+        w = "Q" if self.bits == 64 else "I"
+        self._e = e
+        self._w = w
+
+        fmt = struct.Struct(f"{e}HHI{w}{w}{w}IHHHHHH")
+        if len(data) < 16 + fmt.size:
+            raise ELFError(f"Truncated ELF header: {self.path}")
+        (e_type, self.machine, _, self.entry, self._phoff, self._shoff, self.flags,
+         _, self._phentsize, self._phnum, self._shentsize, self._shnum,
+         self._shstrndx) = fmt.unpack_from(data, 16)
+        self.elf_type = ELF_TYPES.get(e_type, f"0x{e_type:x}")
+
+    @property
+    def arch(self) -> str:
+        """Architecture name (x86_64, i386, aarch64, arm, mips64, ...)."""
+        name = MACHINES.get(self.machine, f"em_{self.machine}")
+        if name in ("mips", "riscv") and self.bits == 64:
+            return f"{name}64"
+        if name == "riscv":
+            return "riscv32"
+        return name
+
+    def header_summary(self) -> str:
+        """Short readelf -h style description."""
+        return "\n".join([
+            f"Class: ELF{self.bits}",
+            f"Data: {'little' if self.little_endian else 'big'} endian",
+            f"Type: {self.elf_type}",
+            f"Machine: {self.arch}",
+            f"Entry point address: 0x{self.entry:x}",
+            f"Number of program headers: {len(self.segments)}",
+            f"Number of section headers: {len(self.sections)}",
+        ])
+
+    # ── Raw access ───────────────────────────────────────────────────────────
+
+    def read(self, offset: int, size: int) -> bytes:
+        """File bytes at offset (short if the file ends first)."""
+        if offset < 0 or size < 0:
+            return b""
+        return self._data[offset:offset + size]
+
+    def _cstring(self, offset: int, limit: Optional[int] = None) -> str:
+        data = self._data
+        if offset < 0 or offset >= len(data):
+            return ""
+        end = data.find(b"\0", offset, limit if limit is not None else len(data))
+        if end < 0:
+            end = limit if limit is not None else len(data)
+        return data[offset:end].decode("utf-8", "replace")
+
+    def vaddr_to_offset(self, vaddr: int) -> Optional[int]:
+        """File offset backing a virtual address, if it is in a loaded segment."""
+        for seg in self.segments:
+            if seg.type == PT_LOAD and seg.vaddr <= vaddr < seg.vaddr + seg.filesz:
+                return seg.offset + (vaddr - seg.vaddr)
+        return None
+
+    def offset_to_vaddr(self, offset: int) -> Optional[int]:
+        """Virtual address a file offset is loaded at, if any."""
+        for seg in self.segments:
+            if seg.type == PT_LOAD and seg.offset <= offset < seg.offset + seg.filesz:
+                return seg.vaddr + (offset - seg.offset)
+        return None
+
+    # ── Segments and sections ────────────────────────────────────────────────
+
+    @cached_property
+    def segments(self) -> List[Segment]:
+        e, w = self._e, self._w
+        if self.bits == 64:
+            fmt = struct.Struct(f"{e}II{w}{w}{w}{w}{w}{w}")
+        else:
+            fmt = struct.Struct(f"{e}IIIIIIII")
+
+        segments = []
+        if not self._phoff or self._phentsize < fmt.size:
+            return segments
+        for i in range(self._phnum):
+            offset = self._phoff + i * self._phentsize
+            if offset + fmt.size > len(self._data):
+                break
+            fields = fmt.unpack_from(self._data, offset)
+            if self.bits == 64:
+                p_type, p_flags, p_offset, p_vaddr, _, p_filesz, p_memsz, _ = fields
+            else:
+                p_type, p_offset, p_vaddr, _, p_filesz, p_memsz, p_flags, _ = fields
+            segments.append(Segment(p_type, p_flags, p_offset, p_vaddr, p_filesz, p_memsz))
+        return segments
+
+    def segment(self, seg_type: int) -> Optional[Segment]:
+        """First program header of a type (PT_GNU_STACK, ...)."""
+        for seg in self.segments:
+            if seg.type == seg_type:
+                return seg
+        return None
+
+    @cached_property
+    def sections(self) -> List[Section]:
+        e, w = self._e, self._w
+        fmt = struct.Struct(f"{e}II{w}{w}{w}{w}II{w}{w}")
+        data = self._data
+        if not self._shoff or self._shentsize < fmt.size or self._shoff + fmt.size > len(data):
+            return []
+
+        # Extended numbering: real counts live in section 0
+        shnum, shstrndx = self._shnum, self._shstrndx
+        first = fmt.unpack_from(data, self._shoff)
+        if shnum == 0:
+            shnum = first[5]
+        if shstrndx == 0xFFFF:
+            shstrndx = first[6]
+
+        raw = []
+        for i in range(shnum):
+            offset = self._shoff + i * self._shentsize
+            if offset + fmt.size > len(data):
+                break
+            raw.append(fmt.unpack_from(data, offset))
+
+        names_offset = raw[shstrndx][4] if shstrndx < len(raw) else None
+        sections = []
+        for i, (name, s_type, flags, addr, offset, size, link, info, _, entsize) in enumerate(raw):
+            section_name = self._cstring(names_offset + name) if names_offset is not None else ""
+            sections.append(Section(i, section_name, s_type, flags, addr, offset, size, link, info, entsize))
+        return sections
+
+    @cached_property
+    def _sections_by_name(self) -> Dict[str, Section]:
+        by_name: Dict[str, Section] = {}
+        for section in self.sections:
+            by_name.setdefault(section.name, section)
+        return by_name
+
+    def section(self, name: str) -> Optional[Section]:
+        """First section with this name, or None."""
+        return self._sections_by_name.get(name)
+
+    def section_data(self, section: Section) -> bytes:
+        """Contents of a section (empty for NOBITS sections like .bss)."""
+        if section.type == SHT_NOBITS:
+            return b""
+        return self.read(section.offset, section.size)
+
+    # ── Dynamic section ──────────────────────────────────────────────────────
+
+    @cached_property
+    def dynamic(self) -> List[Tuple[int, int]]:
+        """(tag, value) entries of the dynamic section, up to DT_NULL."""
+        seg = self.segment(PT_DYNAMIC)
+        if seg is not None:
+            offset, size = seg.offset, seg.filesz
+        else:
+            sections = [s for s in self.sections if s.type == SHT_DYNAMIC]
+            if not sections:
+                return []
+            offset, size = sections[0].offset, sections[0].size
+
+        fmt = struct.Struct(f"{self._e}{'q' if self.bits == 64 else 'i'}{self._w}")
+        entries = []
+        end = min(offset + size, len(self._data))
+        for pos in range(offset, end - fmt.size + 1, fmt.size):
+            tag, value = fmt.unpack_from(self._data, pos)
+            if tag == 0:
+                break
+            entries.append((tag, value))
+        return entries
+
+    def dynamic_value(self, tag: int) -> Optional[int]:
+        for entry_tag, value in self.dynamic:
+            if entry_tag == tag:
+                return value
+        return None
+
+    def _dynamic_string(self, value: int) -> str:
+        strtab = self.dynamic_value(DT_STRTAB)
+        if strtab is None:
+            return ""
+        offset = self.vaddr_to_offset(strtab)
+        return self._cstring(offset + value) if offset is not None else ""
+
+    @property
+    def needed(self) -> List[str]:
+        """Shared libraries from DT_NEEDED."""
+        return [self._dynamic_string(v) for tag, v in self.dynamic if tag == DT_NEEDED]
+
+    @property
+    def runpath(self) -> List[str]:
+        """DT_RUNPATH and DT_RPATH entries."""
+        return [self._dynamic_string(v) for tag, v in self.dynamic if tag in (DT_RUNPATH, DT_RPATH)]
+
+    @property
+    def bind_now(self) -> bool:
+        """Immediate binding (the Full RELRO half of BIND_NOW / FLAGS NOW / FLAGS_1 NOW)."""
+        for tag, value in self.dynamic:
+            if tag == DT_BIND_NOW:
+                return True
+            if tag == DT_FLAGS and value & DF_BIND_NOW:
+                return True
+            if tag == DT_FLAGS_1 and value & DF_1_NOW:
+                return True
+        return False
+
+    # ── Symbols ──────────────────────────────────────────────────────────────
+
+    def _read_symbols(self, section: Section) -> List[Symbol]:
+        e, w = self._e, self._w
+        if self.bits == 64:
+            fmt = struct.Struct(f"{e}IBBH{w}{w}")
+        else:
+            fmt = struct.Struct(f"{e}IIIBBH")
+        entsize = section.entsize or fmt.size
+        if entsize < fmt.size or section.link >= len(self.sections):
+            return []
+        strtab = self.sections[section.link]
+        str_end = strtab.offset + strtab.size
+
+        versym = None
+        if section.type == SHT_DYNSYM:
+            versions = [s for s in self.sections if s.type == SHT_GNU_VERSYM and s.link == section.index]
+            if versions:
+                versym = self.read(versions[0].offset, versions[0].size)
+
+        symbols = []
+        data = self._data
+        count = section.size // entsize
+        for i in range(count):
+            pos = section.offset + i * entsize
+            if pos + fmt.size > len(data):
+                break
+            if self.bits == 64:
+                name, info, _, shndx, value, size = fmt.unpack_from(data, pos)
+            else:
+                name, value, size, info, _, shndx = fmt.unpack_from(data, pos)
+            hidden = False
+            if versym is not None and 2 * i + 2 <= len(versym):
+                hidden = bool(struct.unpack_from(f"{e}H", versym, 2 * i)[0] & 0x8000)
+            symbols.append(Symbol(
+                name=self._cstring(strtab.offset + name, str_end) if name else "",
+                value=value,
+                size=size,
+                type=SYMBOL_TYPES.get(info & 0xF, str(info & 0xF)),
+                bind=SYMBOL_BINDS.get(info >> 4, str(info >> 4)),
+                shndx=shndx,
+                hidden=hidden,
+            ))
+        return symbols
+
+    def _symbol_table(self, index: int) -> List[Symbol]:
+        if index not in self._symbol_tables:
+            self._symbol_tables[index] = self._read_symbols(self.sections[index])
+        return self._symbol_tables[index]
+
+    @cached_property
+    def symbols(self) -> List[Symbol]:
+        """Static symbol table (.symtab); empty for stripped binaries."""
+        return [sym for s in self.sections if s.type == SHT_SYMTAB for sym in self._symbol_table(s.index)]
+
+    @cached_property
+    def dynamic_symbols(self) -> List[Symbol]:
+        """Dynamic symbol table (.dynsym), imports and exports."""
+        return [sym for s in self.sections if s.type == SHT_DYNSYM for sym in self._symbol_table(s.index)]
+
+    @cached_property
+    def symbol_names(self) -> FrozenSet[str]:
+        """Names from both symbol tables."""
+        return frozenset(sym.name for sym in self.symbols + self.dynamic_symbols if sym.name)
+
+    @cached_property
+    def defined_symbols(self) -> Dict[str, Symbol]:
+        """Name -> defined, non-hidden symbol, dynamic table first (see find_symbol)."""
+        found: Dict[str, Symbol] = {}
+        for sym in self.dynamic_symbols + self.symbols:
+            if sym.defined and sym.name and not sym.hidden:
+                found.setdefault(sym.name, sym)
+        return found
+
+    def find_symbol(self, name: str) -> Optional[Symbol]:
+        """
+        Defined symbol by name, dynamic table first, or None.
+
+        Hidden symbol versions (compat-only symbols such as __malloc_hook in
+        glibc 2.34+) are skipped, since nothing new can link against them.
+        """
+        return self.defined_symbols.get(name)
+
+    @property
+    def imports(self) -> FrozenSet[str]:
+        """Undefined dynamic symbols (functions and data the binary imports)."""
+        return frozenset(s.name for s in self.dynamic_symbols if s.name and not s.defined)
+
+    def function_symbols(self) -> Dict[int, str]:
+        """Address -> name of symbols in executable sections (nm T/t), for address lookup."""
+        sections = self.sections
+        functions: Dict[int, str] = {}
+        for sym in self.symbols or self.dynamic_symbols:
+            if not sym.name or not sym.defined or sym.shndx >= SHN_LORESERVE:
+                continue
+            if sym.type in ("SECTION", "FILE") or sym.shndx >= len(sections):
+                continue
+            if sections[sym.shndx].is_executable:
+                functions[sym.value] = sym.name
+        return functions
+
+    # ── Relocations, GOT and PLT ─────────────────────────────────────────────
+
+    @cached_property
+    def relocations(self) -> List[Relocation]:
+        """Entries of every REL/RELA section, in section order."""
+        e, w = self._e, self._w
+        relocations = []
+        for section in self.sections:
+            if section.type not in (SHT_REL, SHT_RELA):
+                continue
+            rela = section.type == SHT_RELA
+            if self.bits == 64:
+                fmt = struct.Struct(f"{e}{w}{w}q" if rela else f"{e}{w}{w}")
+            else:
+                fmt = struct.Struct(f"{e}IIi" if rela else f"{e}II")
+            entsize = section.entsize or fmt.size
+            if entsize < fmt.size:
+                continue
+            symbols = []
+            if section.link and section.link < len(self.sections):
+                symbols = self._symbol_table(section.link)
+
+            for pos in range(section.offset, section.offset + section.size - fmt.size + 1, entsize):
+                if pos + fmt.size > len(self._data):
+                    break
+                fields = fmt.unpack_from(self._data, pos)
+                offset, info = fields[0], fields[1]
+                addend = fields[2] if rela else 0
+                if self.bits == 64:
+                    sym_index, r_type = info >> 32, info & 0xFFFFFFFF
+                else:
+                    sym_index, r_type = info >> 8, info & 0xFF
+                name = symbols[sym_index].name if 0 < sym_index < len(symbols) else ""
+                relocations.append(Relocation(offset, r_type, name, addend, section.name))
+        return relocations
+
+    def got_entries(self) -> Dict[str, int]:
+        """Symbol -> relocated address for every named relocation (as listed by readelf -r)."""
+        return {r.symbol: r.offset for r in self.relocations if r.symbol and r.offset}
+
+    def got_slots(self) -> Dict[str, int]:
+        """Symbol -> GOT slot address, from GLOB_DAT / JUMP_SLOT relocations only."""
+        kinds = GOT_RELOCATIONS.get(self.machine)
+        if kinds is None:
+            return {}
+        return {r.symbol: r.offset for r in self.relocations if r.symbol and r.type in kinds}
+
+    @cached_property
+    def _plt(self) -> Dict[int, str]:
+        """PLT stub address -> symbol (x86 / x86-64), decoded from each stub's indirect jmp."""
+        if self.machine not in (EM_386, EM_X86_64):
+            return {}
+        slots = {addr: name for name, addr in self.got_slots().items()}
+        got_plt = self.section(".got.plt") or self.section(".got")
+        got_base = got_plt.addr if got_plt else 0
+
+        stubs: Dict[int, str] = {}
+        seen = set()
+        for name in (".plt.sec", ".plt", ".plt.got"):
+            section = self.section(name)
+            if section is None or section.type == SHT_NOBITS:
+                continue
+            data = self.section_data(section)
+            stride = section.entsize if section.entsize >= 8 else 16
+            for start in range(0, len(data) - 5, stride):
+                entry = data[start:start + stride]
+                target = None
+                pos = entry.find(b"\xff\x25")  # jmp *disp32(%rip) / jmp *abs32
+                if pos >= 0 and pos + 6 <= len(entry):
+                    disp = struct.unpack_from("<i" if self.machine == EM_X86_64 else "<I", entry, pos + 2)[0]
+                    target = section.addr + start + pos + 6 + disp if self.machine == EM_X86_64 else disp
+                elif self.machine == EM_386:
+                    pos = entry.find(b"\xff\xa3")  # jmp *disp32(%ebx), PIC
+                    if pos >= 0 and pos + 6 <= len(entry):
+                        target = got_base + struct.unpack_from("<i", entry, pos + 2)[0]
+                name_at = slots.get(target)
+                if name_at and name_at not in seen:
+                    stubs[section.addr + start] = name_at
+                    seen.add(name_at)
+        return stubs
+
+    def plt_entries(self) -> Dict[str, int]:
+        """Symbol -> PLT stub address, as objdump labels <name@plt> (x86 only)."""
+        return {name: addr for addr, name in self._plt.items()}
+
+    def plt_calls(self) -> Dict[str, int]:
+        """Number of direct `call <name@plt>` instructions per symbol (x86 only)."""
+        stubs = self._plt
+        if not stubs:
+            return {}
+        counts: Dict[str, int] = {}
+        mask = 0xFFFFFFFFFFFFFFFF if self.bits == 64 else 0xFFFFFFFF
+        for section in self.sections:
+            if not section.is_executable or section.type == SHT_NOBITS or section.name.startswith(".plt"):
+                continue
+            data = self.section_data(section)
+            find = data.find
+            pos = find(b"\xe8")
+            while 0 <= pos <= len(data) - 5:
+                rel = struct.unpack_from("<i", data, pos + 1)[0]
+                name = stubs.get((section.addr + pos + 5 + rel) & mask)
+                if name is not None:
+                    counts[name] = counts.get(name, 0) + 1
+                pos = find(b"\xe8", pos + 1)
+        return counts
+
+    # ── Notes ────────────────────────────────────────────────────────────────
+
+    def _notes(self) -> Iterator[Tuple[str, int, bytes]]:
+        """(name, type, descriptor) of every note, from sections or else segments."""
+        regions = [(s.offset, s.size) for s in self.sections if s.type == SHT_NOTE]
+        if not regions:
+            regions = [(p.offset, p.filesz) for p in self.segments if p.type == PT_NOTE]
+        for offset, size in regions:
+            pos, end = offset, min(offset + size, len(self._data))
+            while pos + 12 <= end:
+                namesz, descsz, note_type = struct.unpack_from(f"{self._e}III", self._data, pos)
+                pos += 12
+                name = self._data[pos:pos + namesz].rstrip(b"\0").decode("ascii", "replace")
+                pos += (namesz + 3) & ~3
+                desc = self._data[pos:pos + descsz]
+                pos += (descsz + 3) & ~3
+                yield name, note_type, desc
+
+    @cached_property
+    def build_id(self) -> Optional[str]:
+        """GNU build ID as hex (`readelf -n`), or None."""
+        for name, note_type, desc in self._notes():
+            if name == "GNU" and note_type == NT_GNU_BUILD_ID:
+                return desc.hex()
+        return None
+
+    # ── Strings ──────────────────────────────────────────────────────────────
+
+    def strings(self, min_length: int = 4) -> Iterator[Tuple[int, str]]:
+        """(file offset, text) of printable runs, like `strings -a -t d`."""
+        pattern = re.compile(_PRINTABLE + b"{%d,}" % min_length)
+        for match in pattern.finditer(self._data):
+            yield match.start(), match.group().decode("ascii")
+
+    def find_string(self, text: str) -> Optional[int]:
+        """File offset of the first printable run equal to text, or None."""
+        literal = re.escape(text.encode())
+        match = re.search(b"(?<!" + _PRINTABLE + b")" + literal + b"(?!" + _PRINTABLE + b")", self._data)
+        return match.start() if match else None
+
+    # ── Protections ──────────────────────────────────────────────────────────
+
+    def checksec(self) -> Dict[str, bool]:
+        """
+        Protections from headers and symbols, as pwntools reports them.
+
+        NX is assumed when there is no PT_GNU_STACK header.
+        """
+        names = self.symbol_names
+        stack = self.segment(PT_GNU_STACK)
+        relro = self.segment(PT_GNU_RELRO) is not None
+        return {
+            "relro": relro,
+            "full_relro": relro and self.bind_now,
+            "partial_relro": relro and not self.bind_now,
+            "pie": self.elf_type == "DYN",
+            "nx": not (stack is not None and stack.flags & PF_X),
+            "canary": "__stack_chk_fail" in names,
+            "fortify": any("__chk" in n or n.endswith("_chk") or "__fortify" in n for n in names),
+        }
+
+
+# Readers shared across callers, keyed on file identity so a rebuilt binary
+# is re-read; bounded so long runs over many binaries don't hold every mapping
+_MAX_OPEN = 32
+_open_files: "OrderedDict[Tuple[str, int, int, int], ELFFile]" = OrderedDict()
+_open_lock = threading.Lock()
+
+
+def is_elf(path: str) -> bool:
+    """True if the file starts with the ELF magic."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(4) == ELF_MAGIC
+    except OSError:
+        return False
+
+
+def open_elf(path: str) -> ELFFile:
+    """
+    Shared ELFFile for a path, re-opened only when the file changes.
+
+    Raises:
+        OSError: File is missing or unreadable
+        ELFError: File is not a valid ELF
+    """
+    real = os.path.realpath(str(path))
+    st = os.stat(real)
+    key = (real, st.st_size, st.st_mtime_ns, st.st_ino)
+    with _open_lock:
+        elf = _open_files.get(key)
+        if elf is not None:
+            _open_files.move_to_end(key)
+            return elf
+
+    elf = ELFFile(real)
+    with _open_lock:
+        existing = _open_files.get(key)
+        if existing is not None:
+            elf.close()
+            return existing
+        _open_files[key] = elf
+        while len(_open_files) > _MAX_OPEN:
+            # Evicted readers may still be in use; their mapping closes on GC
+            _open_files.popitem(last=False)
+        return elf
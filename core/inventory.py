@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+RAPTOR Repository Inventory
+
+One walk of a target tree shared by every pre-scan stage: tree hashing,
+language and build-system detection, the exploitability checklist, recon,
+SCA and CodeQL cache keys. The walk is iter_tree_files() (os.scandir,
+pruning excluded directories before descending), run on parallel threads
+over the top-level subtrees, and the result is kept as a compact columnar
+table: relative path, size, mtime, inode, extension, language and a
+build/dependency-file flag per regular file.
+
+Walks prune PRUNED_DIRS (version control metadata, installed dependencies,
+tool caches) without entering them. A stage that needs those directories
+asks get_inventory() for the full tree and gets its own unpruned walk.
+
+An inventory is shared for the duration of a run. start_run() walks the
+target once and registers the result in-process until end_run() (or use
+the inventory_run() context manager); given a snapshot path it also saves
+the table to SQLite, and run_env() hands it to stage subprocesses
+(scanner.py, codeql/agent.py) through RAPTOR_INVENTORY so they load it
+instead of walking again. Outside a run, get_inventory() walks fresh on
+every call, so standalone tools never see a stale listing.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from core.config import RaptorConfig
+from core.logging import get_logger
+from core.tree_hash import StatKey, iter_tree_files
+
+logger = get_logger()
+
+# Language by lowercase extension (CodeQL language names)
+EXTENSION_LANGUAGES = {
+    ".java": "java",
+    ".py": "python",
+    ".js": "javascript", ".jsx": "javascript", ".mjs": "javascript", ".cjs": "javascript",
+    ".ts": "typescript", ".tsx": "typescript",
+    ".go": "go",
+    ".c": "cpp", ".cc": "cpp", ".cpp": "cpp", ".cxx": "cpp",
+    ".h": "cpp", ".hpp": "cpp", ".hxx": "cpp",
+    ".cs": "csharp",
+    ".rb": "ruby",
+    ".swift": "swift",
+    ".kt": "kotlin", ".kts": "kotlin",
+}
+
+# Build and dependency manifests looked for by language/build detection and SCA
+BUILD_FILE_NAMES = {
+    # Java / Kotlin
+    "pom.xml", "build.xml", "build.gradle", "build.gradle.kts", "settings.gradle", "settings.gradle.kts",
+    "gradlew",
+    # Python
+    "setup.py", "pyproject.toml", "requirements.txt", "Pipfile", "poetry.lock", "setup.cfg",
+    # JavaScript / TypeScript
+    "package.json", "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "webpack.config.js", ".npmrc",
+    "tsconfig.json",
+    # Go
+    "go.mod", "go.sum", "go.work",
+    # C / C++
+    "CMakeLists.txt", "Makefile", "makefile", "configure", "configure.ac", "meson.build",
+    # C#
+    "packages.config", "nuget.config",
+    # Ruby
+    "Gemfile", "Gemfile.lock", "Rakefile",
+    # Swift
+    "Package.swift", "Podfile",
+}
+BUILD_FILE_SUFFIXES = (".csproj", ".sln", ".gemspec")
+
+# Pruned from every walk: the directories all stages ignore that never hold
+# the target's own sources. Names that can (build/, bin/, vendor/,
+# packages/, ...) stay in the table; stages ignoring them filter with files().
+PRUNED_DIRS = frozenset({
+    ".git", ".svn", ".hg", ".bzr",
+    "node_modules", "bower_components", "venv", ".venv",
+    "__pycache__", ".pytest_cache", ".mypy_cache", ".tox", ".gradle",
+})
+
+_FLAG_BUILD_FILE = 0x1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    ext TEXT NOT NULL,
+    language TEXT NOT NULL,
+    flags INTEGER NOT NULL
+);
+"""
+
+
+class InventoryFile(NamedTuple):
+    """One regular file of an inventory."""
+    path: str          # Relative to the inventory root, "/"-separated
+    size: int
+    mtime_ns: int
+    inode: int
+    ext: str           # Path suffix as found (case preserved), "" if none
+    language: str      # From EXTENSION_LANGUAGES, "" if unknown
+    build_file: bool   # Name in BUILD_FILE_NAMES or suffix in BUILD_FILE_SUFFIXES
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def stat_key(self) -> StatKey:
+        return (self.size, self.mtime_ns, self.inode)
+
+
+def _walk_subtrees(root: Path, excluded: Set[str], workers: int) -> Iterator[Tuple[str, os.stat_result]]:
+    """iter_tree_files() with each top-level directory walked on its own thread."""
+    subdirs = []
+    try:
+        with os.scandir(root) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in excluded:
+                    subdirs.append(entry.name)
+            elif entry.is_file():
+                yield entry.name, entry.stat()
+        except OSError:
+            continue
+
+    def walk(name: str) -> List[Tuple[str, os.stat_result]]:
+        return [(f"{name}/{rel}", st) for rel, st in iter_tree_files(root / name, excluded)]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for files in executor.map(walk, subdirs):
+            yield from files
+
+
+def _is_build_file(name: str) -> bool:
+    return name in BUILD_FILE_NAMES or name.endswith(BUILD_FILE_SUFFIXES)
+
+
+class RepoInventory:
+    """Columnar listing of the regular files under one root."""
+
+    def __init__(self, root: Path, exclude_dirs: Iterable[str] = ()):
+        self.root = Path(root).resolve()
+        self.created = time.time()
+        self.exclude_dirs: FrozenSet[str] = frozenset(exclude_dirs)  # Pruned by the walk
+        self._paths: List[str] = []
+        self._sizes = array("q")
+        self._mtimes = array("q")
+        self._inodes = array("Q")
+        self._exts: List[str] = []       # Interned; few distinct values
+        self._languages: List[str] = []  # Interned
+        self._flags = bytearray()
+
+    @classmethod
+    def scan(cls, root: Path, exclude_dirs: Iterable[str] = (),
+             workers: Optional[int] = None) -> "RepoInventory":
+        """
+        Walk root once and record every regular file.
+
+        Args:
+            root: Directory to walk
+            exclude_dirs: Directory names to prune anywhere in the tree
+            workers: Threads walking the top-level subtrees in parallel
+                     (default: RaptorConfig.INVENTORY_WORKERS; 1 = sequential)
+        """
+        inventory = cls(root, exclude_dirs)
+        workers = RaptorConfig.INVENTORY_WORKERS if workers is None else workers
+        start = time.time()
+        if workers > 1:
+            walked = _walk_subtrees(inventory.root, set(inventory.exclude_dirs), workers)
+        else:
+            walked = iter_tree_files(inventory.root, inventory.exclude_dirs)
+        for rel, st in walked:
+            inventory._append(rel, st.st_size, st.st_mtime_ns, st.st_ino)
+        logger.debug(f"Inventory of {inventory.root}: {len(inventory)} files "
+                     f"in {time.time() - start:.2f}s")
+        return inventory
+
+    def _append(self, rel: str, size: int, mtime_ns: int, inode: int,
+                ext: Optional[str] = None, language: Optional[str] = None,
+                flags: Optional[int] = None) -> None:
+        name = rel.rsplit("/", 1)[-1]
+        if ext is None:
+            # Same rule as Path.suffix
+            dot = name.rfind(".")
+            ext = name[dot:] if 0 < dot < len(name) - 1 else ""
+        if language is None:
+            language = EXTENSION_LANGUAGES.get(ext.lower(), "")
+        if flags is None:
+            flags = _FLAG_BUILD_FILE if _is_build_file(name) else 0
+        self._paths.append(rel)
+        self._sizes.append(size)
+        self._mtimes.append(mtime_ns)
+        self._inodes.append(inode)
+        self._exts.append(sys.intern(ext))
+        self._languages.append(sys.intern(language))
+        self._flags.append(flags)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def _row(self, i: int) -> InventoryFile:
+        return InventoryFile(self._paths[i], self._sizes[i], self._mtimes[i], self._inodes[i],
+                             self._exts[i], self._languages[i],
+                             bool(self._flags[i] & _FLAG_BUILD_FILE))
+
+    def __iter__(self) -> Iterator[InventoryFile]:
+        return (self._row(i) for i in range(len(self._paths)))
+
+    def files(self, exclude_dirs: Iterable[str] = (), skip_hidden_dirs: bool = False) -> Iterator[InventoryFile]:
+        """
+        Files not under an excluded directory, as if those had been pruned.
+
+        Args:
+            exclude_dirs: Directory names to skip anywhere in the tree
+            skip_hidden_dirs: Also skip directories whose name starts with "."
+        """
+        # Directories the walk pruned have no entries to skip
+        excluded = set(exclude_dirs) - self.exclude_dirs
+        if not excluded and not skip_hidden_dirs:
+            yield from self
+            return
+        # Decide once per directory rather than once per file
+        skipped: Dict[str, bool] = {}
+        for i, rel in enumerate(self._paths):
+            rel_dir = rel.rpartition("/")[0]
+            if rel_dir:
+                skip = skipped.get(rel_dir)
+                if skip is None:
+                    dirs = rel_dir.split("/")
+                    skip = skipped[rel_dir] = bool(excluded.intersection(dirs)) or (
+                        skip_hidden_dirs and any(d.startswith(".") for d in dirs))
+                if skip:
+                    continue
+            yield self._row(i)
+
+    def named(self, names: Set[str]) -> List[InventoryFile]:
+        """Files whose name is in names, in path order."""
+        return sorted((f for f in self if f.name in names), key=lambda f: f.path.split("/"))
+
+    def stat_keys(self, max_size: Optional[int] = None) -> List[Tuple[str, StatKey]]:
+        """(relpath, stat key) pairs for hash_tree_files(), optionally size-capped."""
+        return [(self._paths[i], (size, self._mtimes[i], self._inodes[i]))
+                for i, size in enumerate(self._sizes)
+                if max_size is None or size <= max_size]
+
+    def build_files(self) -> Iterator[InventoryFile]:
+        """Files flagged as build or dependency manifests."""
+        return (self._row(i) for i, flags in enumerate(self._flags) if flags & _FLAG_BUILD_FILE)
+
+    def subtree(self, rel_dir: str) -> "RepoInventory":
+        """Inventory of a subdirectory, with paths relative to it."""
+        rel_dir = rel_dir.strip("/")
+        if not rel_dir or rel_dir == ".":
+            return self
+        sub = RepoInventory(self.root / rel_dir, self.exclude_dirs)
+        sub.created = self.created
+        prefix = rel_dir + "/"
+        for i, rel in enumerate(self._paths):
+            if rel.startswith(prefix):
+                sub._append(rel[len(prefix):], self._sizes[i], self._mtimes[i], self._inodes[i],
+                            self._exts[i], self._languages[i], self._flags[i])
+        return sub
+
+    # ── Snapshots ────────────────────────────────────────────────────────────
+
+    def save(self, path: Path) -> Path:
+        """Write the table to a SQLite snapshot (replacing any existing file)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+        conn = sqlite3.connect(str(tmp))
+        try:
+            conn.executescript(_SCHEMA)
+            with conn:
+                conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                                 [("root", str(self.root)), ("created", repr(self.created)),
+                                  ("exclude_dirs", "/".join(sorted(self.exclude_dirs)))])
+                conn.executemany(
+                    "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    zip(self._paths, self._sizes, self._mtimes, self._inodes,
+                        self._exts, self._languages, self._flags),
+                )
+        finally:
+            conn.close()
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "RepoInventory":
+        """
+        Read a snapshot written by save().
+
+        Raises:
+            sqlite3.Error: Not a valid snapshot
+        """
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            inventory = cls(Path(meta["root"]), filter(None, meta.get("exclude_dirs", "").split("/")))
+            inventory.created = float(meta["created"])
+            for row in conn.execute("SELECT * FROM files"):
+                inventory._append(*row)
+        except KeyError as e:
+            raise sqlite3.DatabaseError(f"Inventory snapshot missing {e}") from e
+        finally:
+            conn.close()
+        return inventory
+
+
+# Inventories of the current run, by resolved root
+_run_inventories: Dict[Path, RepoInventory] = {}
+_loaded_snapshots: Set[str] = set()
+_run_snapshot: Optional[str] = None
+_lock = threading.Lock()
+
+
+def _load_run_snapshot() -> None:
+    """Adopt the snapshot handed down by a parent process (once per snapshot)."""
+    snapshot = os.environ.get(RaptorConfig.ENV_INVENTORY)
+    if not snapshot or snapshot in _loaded_snapshots:
+        return
+    _loaded_snapshots.add(snapshot)
+    try:
+        inventory = RepoInventory.load(Path(snapshot))
+    except (OSError, sqlite3.Error) as e:
+        logger.debug(f"Ignoring inventory snapshot {snapshot}: {e}")
+        return
+    _run_inventories.setdefault(inventory.root, inventory)
+
+
+def _run_inventory(root: Path, full: bool = False) -> Optional[RepoInventory]:
+    """The current run's inventory of root (or of an ancestor, as a subtree)."""
+    with _lock:
+        _load_run_snapshot()
+        for run_root, inventory in _run_inventories.items():
+            if full and inventory.exclude_dirs:
+                continue
+            if root == run_root:
+                return inventory
+            if run_root in root.parents:
+                return inventory.subtree(root.relative_to(run_root).as_posix())
+    return None
+
+
+def start_run(root: Path, snapshot: Optional[Path] = None) -> RepoInventory:
+    """
+    Share one inventory of root with every later get_inventory() call,
+    until end_run().
+
+    Reuses the run inventory already covering root (e.g. the snapshot of a
+    parent process), otherwise walks root, pruning PRUNED_DIRS.
+
+    Args:
+        root: Target tree of the run
+        snapshot: If given, also save the table there for stage subprocesses
+                  (see run_env())
+
+    Returns:
+        The run's inventory
+    """
+    global _run_snapshot
+    root = Path(root).resolve()
+    inventory = _run_inventory(root)
+    if inventory is None:
+        inventory = RepoInventory.scan(root, exclude_dirs=PRUNED_DIRS)
+        with _lock:
+            _run_inventories[inventory.root] = inventory
+        logger.info(f"Inventory: {len(inventory)} files under {inventory.root}")
+    if snapshot is not None:
+        try:
+            path = str(inventory.save(snapshot))
+            with _lock:
+                _loaded_snapshots.add(path)
+                _run_snapshot = path
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not save inventory snapshot: {e}")
+    return inventory
+
+
+def end_run() -> None:
+    """Forget the run's inventories; later calls walk the tree again."""
+    global _run_snapshot
+    with _lock:
+        _run_inventories.clear()
+        _loaded_snapshots.clear()
+        _run_snapshot = None
+        # A stage subprocess must not re-adopt its parent's snapshot either
+        os.environ.pop(RaptorConfig.ENV_INVENTORY, None)
+
+
+@contextmanager
+def inventory_run(root: Path, snapshot: Optional[Path] = None) -> Iterator[RepoInventory]:
+    """start_run() for the duration of a with block, then end_run()."""
+    try:
+        yield start_run(root, snapshot)
+    finally:
+        end_run()
+
+
+def run_env(env: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Environment for a stage subprocess of the current run.
+
+    A copy of env (default: os.environ) with RAPTOR_INVENTORY pointing at the
+    run's snapshot, if start_run() saved one. The variable is never set in
+    this process, so nothing started after the run inherits it.
+    """
+    env = dict(os.environ if env is None else env)
+    with _lock:
+        if _run_snapshot is not None:
+            env[RaptorConfig.ENV_INVENTORY] = _run_snapshot
+    return env
+
+
+def get_inventory(root: Path, workers: Optional[int] = None,
+                  exclude_dirs: Iterable[str] = (), full: bool = False) -> RepoInventory:
+    """
+    Inventory of root: the current run's (or a subtree of it) if one covers
+    root, otherwise a fresh walk with the given number of walker threads.
+
+    Args:
+        root: Directory to list
+        workers: Walker threads for a fresh walk
+        exclude_dirs: Further directory names to prune in a fresh walk. A run
+                      inventory is returned as is, so callers still filter
+                      with files(exclude_dirs); that costs nothing here.
+        full: The caller needs PRUNED_DIRS too; only an unpruned inventory
+              is returned, walking again if the run's was pruned
+    """
+    root = Path(root).resolve()
+    inventory = _run_inventory(root, full)
+    if inventory is not None:
+        return inventory
+    pruned = set(exclude_dirs) if full else PRUNED_DIRS.union(exclude_dirs)
+    return RepoInventory.scan(root, exclude_dirs=pruned, workers=workers)
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+RAPTOR SARIF Index
+
+A compact on-disk index of a SARIF file, built in a single streaming pass
+and shared by every consumer (finding parsing, counting, summaries, metrics
+and dataflow extraction) so a full run touches each SARIF byte once.
+
+Each index is a small SQLite database named after the SHA-256 of the SARIF
+content and holds:
+  - runs:     per-run metadata (tool, artifact count, everything but results)
+  - rules:    the rule table of every run
+  - findings: one normalized row per result, plus the byte span of the raw
+              result so codeFlows can be decoded on demand with a single seek
+
+A catalog maps (path, size, mtime_ns) to the content hash, so reopening an
+unchanged SARIF file costs a stat() instead of a rehash.
+
+Opening an index marks it used (its mtime). Whenever a new index is built,
+indexes unused for SARIF_INDEX_MAX_AGE are dropped, then the least recently
+used ones until the directory fits in SARIF_INDEX_MAX_BYTES.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.config import RaptorConfig
+from core.sarif.stream import (
+    DEFAULT_CHUNK_SIZE,
+    RESULT,
+    RUN_END,
+    iter_sarif_events_with_spans,
+    read_sarif_result,
+)
+
+INDEX_FORMAT_VERSION = "2"
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE runs (
+    run_index INTEGER PRIMARY KEY,
+    tool_name TEXT,
+    artifact_count INTEGER,
+    meta_json TEXT
+);
+CREATE TABLE rules (
+    run_index INTEGER,
+    rule_index INTEGER,
+    rule_id TEXT,
+    rule_json TEXT,
+    PRIMARY KEY (run_index, rule_index)
+);
+CREATE TABLE findings (
+    row INTEGER PRIMARY KEY,
+    run_index INTEGER,
+    result_index INTEGER,
+    finding_id TEXT,
+    rule_id TEXT,
+    rule_index INTEGER,
+    level TEXT,
+    message TEXT,
+    file TEXT,
+    start_line INTEGER,
+    end_line INTEGER,
+    snippet TEXT,
+    codeflow_count INTEGER,
+    dataflow_steps INTEGER,
+    dataflow_json TEXT,
+    offset INTEGER,
+    length INTEGER
+);
+CREATE INDEX idx_findings_rule ON findings (rule_id);
+CREATE INDEX idx_findings_dataflow ON findings (codeflow_count);
+"""
+
+_CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog (
+    path TEXT,
+    size INTEGER,
+    mtime_ns INTEGER,
+    sha256 TEXT,
+    PRIMARY KEY (path, size, mtime_ns)
+);
+"""
+
+# Process-wide memo so consumers within one run share a single open index
+_open_indexes: Dict[Tuple[str, str, int, int], "SarifIndex"] = {}
+_open_lock = threading.Lock()
+
+
+class _HashingReader(io.RawIOBase):
+    """Raw reader that feeds every byte it returns into a SHA-256."""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.hasher = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = self._raw.readinto(b)
+        if n:
+            self.hasher.update(memoryview(b)[:n])
+        return n
+
+
+def _count_dataflow_steps(code_flows: List[Dict[str, Any]]) -> int:
+    steps = 0
+    for flow in code_flows:
+        for thread_flow in flow.get("threadFlows", []):
+            steps += len(thread_flow.get("locations", []))
+    return steps
+
+
+class SarifIndex:
+    """
+    Read-only query interface over an indexed SARIF file.
+
+    Use get_sarif_index() rather than constructing directly; it builds the
+    index on first use and reuses it afterwards.
+    """
+
+    def __init__(self, sarif_path: Path, index_path: Path, sha256: str):
+        self.sarif_path = sarif_path
+        self.index_path = index_path
+        self.sha256 = sha256
+        self._conn = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Counting and summaries
+    # ------------------------------------------------------------------
+
+    def count(self) -> int:
+        """Total number of results across all runs."""
+        return self._query("SELECT COUNT(*) FROM findings")[0][0]
+
+    def queries_executed(self) -> int:
+        """Total number of rules across all runs."""
+        return self._query("SELECT COUNT(*) FROM rules")[0][0]
+
+    def summary(self) -> Dict[str, Any]:
+        """Summary statistics in the shape returned by QueryRunner.get_sarif_summary()."""
+        summary: Dict[str, Any] = {
+            "total_findings": self.count(),
+            "by_severity": {"error": 0, "warning": 0, "note": 0},
+            "by_rule": {},
+            "queries_executed": self.queries_executed(),
+            "dataflow_paths": 0,
+            "total_dataflow_steps": 0,
+        }
+        summary["by_severity"].update(self.count_by_level())
+        summary["by_rule"] = self.count_by_rule()
+        paths, steps = self._query(
+            "SELECT COUNT(*), COALESCE(SUM(dataflow_steps), 0) FROM findings WHERE codeflow_count > 0"
+        )[0]
+        summary["dataflow_paths"] = paths
+        summary["total_dataflow_steps"] = steps
+        return summary
+
+    def count_by_level(self) -> Dict[str, int]:
+        """Result counts per SARIF level, in order of first appearance."""
+        return dict(self._query(
+            "SELECT level, COUNT(*) FROM findings GROUP BY level ORDER BY MIN(row)"
+        ))
+
+    def count_by_rule(self) -> Dict[str, int]:
+        """Result counts per rule id ("unknown" when absent), in order of first appearance."""
+        return dict(self._query(
+            "SELECT COALESCE(rule_id, 'unknown') AS rid, COUNT(*) FROM findings GROUP BY rid ORDER BY MIN(row)"
+        ))
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """Per-run tool name, artifact count and result count, in document order."""
+        return [
+            {
+                "run_index": run_index,
+                "tool_name": tool_name,
+                "artifact_count": artifact_count,
+                "result_count": result_count,
+            }
+            for run_index, tool_name, artifact_count, result_count in self._query(
+                "SELECT r.run_index, r.tool_name, r.artifact_count, COUNT(f.row) "
+                "FROM runs r LEFT JOIN findings f ON f.run_index = r.run_index "
+                "GROUP BY r.run_index ORDER BY r.run_index"
+            )
+        ]
+
+    # ------------------------------------------------------------------
+    # Findings
+    # ------------------------------------------------------------------
+
+    def iter_findings(self) -> Iterator[Dict[str, Any]]:
+        """Normalized findings, identical to core.sarif.parser.parse_sarif_findings()."""
+        rows = self._query(
+            "SELECT finding_id, rule_id, message, file, start_line, end_line, snippet, level, dataflow_json "
+            "FROM findings ORDER BY row"
+        )
+        for finding_id, rule_id, message, file, start, end, snippet, level, dataflow_json in rows:
+            dataflow_path = json.loads(dataflow_json) if dataflow_json else None
+            yield {
+                "finding_id": finding_id,
+                "rule_id": rule_id,
+                "message": message,
+                "file": file,
+                "startLine": start,
+                "endLine": end,
+                "snippet": snippet,
+                "level": level,
+                "has_dataflow": dataflow_path is not None,
+                "dataflow_path": dataflow_path,
+            }
+
+    def dataflow_findings(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Findings whose first code flow has a usable source-to-sink path."""
+        sql = "SELECT rule_id, message, dataflow_json FROM findings WHERE dataflow_json IS NOT NULL ORDER BY row"
+        params: Tuple = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (limit,)
+        return [
+            {"rule_id": rule_id, "message": message, "dataflow_path": json.loads(dataflow_json)}
+            for rule_id, message, dataflow_json in self._query(sql, params)
+        ]
+
+    # ------------------------------------------------------------------
+    # Raw SARIF access
+    # ------------------------------------------------------------------
+
+    def raw_result(self, row: int) -> Dict[str, Any]:
+        """Decode the raw SARIF result for a finding row (0-based, document order)."""
+        found = self._query("SELECT offset, length FROM findings WHERE row = ?", (row,))
+        if not found:
+            raise IndexError(f"No finding at row {row} in {self.sarif_path}")
+        offset, length = found[0]
+        return read_sarif_result(self.sarif_path, offset, length)
+
+    def run(self, run_index: int) -> Dict[str, Any]:
+        """Reassemble a run object (without results) including its rule table."""
+        found = self._query("SELECT meta_json FROM runs WHERE run_index = ?", (run_index,))
+        if not found:
+            raise IndexError(f"No run {run_index} in {self.sarif_path}")
+        run = json.loads(found[0][0])
+        rules = [
+            json.loads(rule_json)
+            for (rule_json,) in self._query(
+                "SELECT rule_json FROM rules WHERE run_index = ? ORDER BY rule_index", (run_index,)
+            )
+        ]
+        if rules:
+            run.setdefault("tool", {}).setdefault("driver", {})["rules"] = rules
+        return run
+
+    def iter_raw_results(
+        self,
+        dataflow_only: bool = False,
+        limit: Optional[int] = None,
+    ) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Yield ``(result, run)`` pairs, decoding only the requested results.
+
+        Args:
+            dataflow_only: Only yield results that carry codeFlows
+            limit: Maximum number of results to yield
+        """
+        sql = "SELECT run_index, offset, length FROM findings"
+        if dataflow_only:
+            sql += " WHERE codeflow_count > 0"
+        sql += " ORDER BY row"
+        params: Tuple = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (limit,)
+
+        runs: Dict[int, Dict[str, Any]] = {}
+        with open(self.sarif_path, "rb") as f:
+            for run_index, offset, length in self._query(sql, params):
+                if run_index not in runs:
+                    runs[run_index] = self.run(run_index)
+                f.seek(offset)
+                yield json.loads(f.read(length)), runs[run_index]
+
+
+def _build_index(sarif_path: Path, db_path: Path, chunk_size: int) -> str:
+    """Stream the SARIF file into a new index database; returns the content hash."""
+    # Imported here to avoid a cycle: the parser module builds on this one
+    from core.sarif.parser import _normalize_result
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(_SCHEMA)
+        result_index = 0
+        row = 0
+        batch: List[Tuple] = []
+
+        with open(sarif_path, "rb") as raw:
+            hashing = _HashingReader(raw)
+            text = io.TextIOWrapper(io.BufferedReader(hashing), encoding="utf-8", newline="")
+
+            for kind, run_index, payload, span in iter_sarif_events_with_spans(text, chunk_size):
+                if kind == RESULT:
+                    finding = _normalize_result(payload)
+                    code_flows = payload.get("codeFlows") or []
+                    dataflow = finding["dataflow_path"]
+                    batch.append((
+                        row, run_index, result_index, finding["finding_id"], finding["rule_id"],
+                        payload.get("ruleIndex"), finding["level"], finding["message"], finding["file"],
+                        finding["startLine"], finding["endLine"], finding["snippet"],
+                        len(code_flows), _count_dataflow_steps(code_flows),
+                        json.dumps(dataflow) if dataflow else None,
+                        span[0], span[1],
+                    ))
+                    row += 1
+                    result_index += 1
+                    if len(batch) >= 1000:
+                        conn.executemany(f"INSERT INTO findings VALUES ({','.join('?' * 17)})", batch)
+                        batch.clear()
+
+                elif kind == RUN_END:
+                    result_index = 0
+                    driver = payload.get("tool", {}).get("driver", {})
+                    rules = driver.pop("rules", None) or []
+                    conn.executemany(
+                        "INSERT INTO rules VALUES (?, ?, ?, ?)",
+                        [
+                            (run_index, i, rule.get("id") if isinstance(rule, dict) else None, json.dumps(rule))
+                            for i, rule in enumerate(rules)
+                        ],
+                    )
+                    conn.execute(
+                        "INSERT INTO runs VALUES (?, ?, ?, ?)",
+                        (run_index, driver.get("name", "unknown"),
+                         len(payload.get("artifacts", [])), json.dumps(payload)),
+                    )
+
+            if batch:
+                conn.executemany(f"INSERT INTO findings VALUES ({','.join('?' * 17)})", batch)
+
+            # Drain anything the parser did not need so the hash covers the whole file
+            while text.read(chunk_size):
+                pass
+
+        sha256 = hashing.hasher.hexdigest()
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [("sha256", sha256), ("version", INDEX_FORMAT_VERSION), ("source", str(sarif_path))],
+        )
+        conn.commit()
+        return sha256
+    finally:
+        conn.close()
+
+
+def _index_path(index_dir: Path, sha256: str) -> Path:
+    # The format version is part of the name, so older indexes are never reused
+    return index_dir / f"{sha256}.v{INDEX_FORMAT_VERSION}.sqlite"
+
+
+def _catalog(index_dir: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(index_dir / "catalog.sqlite", timeout=30)
+    conn.executescript(_CATALOG_SCHEMA)
+    return conn
+
+
+def _evict(index_dir: Path, catalog: sqlite3.Connection, keep: Path) -> None:
+    """Drop expired, then least recently used, indexes other than keep and those open here."""
+    in_use = {index.index_path for index in _open_indexes.values()} | {keep}
+    entries = []
+    total = 0
+    for path in index_dir.glob("*.sqlite"):
+        if path.name == "catalog.sqlite":
+            continue
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        total += st.st_size
+        if path not in in_use:
+            entries.append((st.st_mtime, st.st_size, path))
+
+    max_age = RaptorConfig.SARIF_INDEX_MAX_AGE
+    max_bytes = RaptorConfig.SARIF_INDEX_MAX_BYTES
+    now = time.time()
+    for mtime, size, path in sorted(entries):
+        expired = max_age and now - mtime > max_age
+        # A dot file may be another process's build in progress; only age removes it
+        oversize = max_bytes and total > max_bytes and not path.name.startswith(".")
+        if expired or oversize:
+            path.unlink(missing_ok=True)
+            total -= size
+
+    # Catalog rows for evicted (or older format) indexes would only force a rebuild
+    live = {path.name.split(".")[0] for path in index_dir.glob(f"*.v{INDEX_FORMAT_VERSION}.sqlite")}
+    stale = [(sha256,) for (sha256,) in catalog.execute("SELECT DISTINCT sha256 FROM catalog")
+             if sha256 not in live]
+    if stale:
+        catalog.executemany("DELETE FROM catalog WHERE sha256 = ?", stale)
+        catalog.commit()
+
+
+def get_sarif_index(
+    sarif_path: Path,
+    index_dir: Optional[Path] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> SarifIndex:
+    """
+    Open the index for a SARIF file, building it on first use.
+
+    Args:
+        sarif_path: Path to SARIF file
+        index_dir: Directory holding index databases (default RaptorConfig.SARIF_INDEX_DIR)
+        chunk_size: Read size used while building
+
+    Returns:
+        SarifIndex for the file's current content
+
+    Raises:
+        json.JSONDecodeError: If the SARIF file is malformed
+        OSError, sqlite3.Error: If the index cannot be read or written
+    """
+    sarif_path = Path(sarif_path).resolve()
+    index_dir = Path(index_dir or RaptorConfig.SARIF_INDEX_DIR)
+    st = sarif_path.stat()
+    stat_key = (str(sarif_path), st.st_size, st.st_mtime_ns)
+    memo_key = (str(index_dir),) + stat_key
+
+    with _open_lock:
+        cached = _open_indexes.get(memo_key)
+        if cached is not None:
+            return cached
+
+        index_dir.mkdir(parents=True, exist_ok=True)
+        catalog = _catalog(index_dir)
+        try:
+            row = catalog.execute(
+                "SELECT sha256 FROM catalog WHERE path = ? AND size = ? AND mtime_ns = ?", stat_key
+            ).fetchone()
+            sha256 = row[0] if row else None
+
+            if sha256 is None or not _index_path(index_dir, sha256).exists():
+                fd, tmp_name = tempfile.mkstemp(dir=index_dir, prefix=".build-", suffix=".sqlite")
+                os.close(fd)
+                tmp_path = Path(tmp_name)
+                try:
+                    sha256 = _build_index(sarif_path, tmp_path, chunk_size)
+                    # Same content under another path may already be indexed
+                    target = _index_path(index_dir, sha256)
+                    if target.exists():
+                        tmp_path.unlink()
+                    else:
+                        os.replace(tmp_path, target)
+                finally:
+                    if tmp_path.exists():
+                        tmp_path.unlink()
+
+                catalog.execute("INSERT OR REPLACE INTO catalog VALUES (?, ?, ?, ?)", stat_key + (sha256,))
+                catalog.commit()
+                _evict(index_dir, catalog, keep=_index_path(index_dir, sha256))
+        finally:
+            catalog.close()
+
+        index_path = _index_path(index_dir, sha256)
+        try:
+            # Mark as recently used for eviction
+            os.utime(index_path)
+        except OSError:
+            pass
+        index = SarifIndex(sarif_path, index_path, sha256)
+        _open_indexes[memo_key] = index
+        return index
@@ -6,11 +6,15 @@ Utilities for working with SARIF (Static Analysis Results Interchange Format) fi
 including validation, deduplication, and merging.
 """
 
+import hashlib
 import json
+import sqlite3
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from core.config import RaptorConfig
+from core.sarif.index import get_sarif_index
+from core.sarif.stream import RESULT, RUN_END, RUN_START, iter_sarif_events
 
 
 def extract_dataflow_path(code_flows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
@@ -107,6 +111,65 @@ def deduplicate_findings(findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     return unique
 
 
+def _normalize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a raw SARIF result into RAPTOR's normalized finding structure."""
+    finding_id = (
+        result.get("fingerprints", {}).get("matchBasedId/v1")
+        or result.get("ruleId")
+        # Stable across processes (unlike hash()), since indexes persist it
+        or hashlib.sha256(json.dumps(result, sort_keys=True).encode()).hexdigest()
+    )
+
+    loc = (result.get("locations") or [{}])[0].get("physicalLocation", {})
+    artifact = loc.get("artifactLocation", {})
+    region = loc.get("region", {})
+    snippet = region.get("snippet", {}).get("text", "")
+
+    # Extract dataflow path if present
+    code_flows = result.get("codeFlows", [])
+    dataflow_path = extract_dataflow_path(code_flows) if code_flows else None
+
+    return {
+        "finding_id": finding_id,
+        "rule_id": result.get("ruleId"),
+        "message": result.get("message", {}).get("text"),
+        "file": artifact.get("uri"),
+        "startLine": region.get("startLine"),
+        "endLine": region.get("endLine"),
+        "snippet": snippet,
+        "level": result.get("level", "warning"),
+        # NEW: Dataflow information
+        "has_dataflow": dataflow_path is not None,
+        "dataflow_path": dataflow_path,
+    }
+
+
+def iter_sarif_findings(sarif_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream normalized findings from a SARIF file.
+
+    Only one raw result is held in memory at a time, so this is safe on
+    multi-hundred-MB CodeQL output.
+
+    Raises:
+        json.JSONDecodeError: If the SARIF file is malformed.
+    """
+    results_in_run = 0
+    runs_seen = 0
+
+    for kind, run_idx, payload in iter_sarif_events(sarif_path):
+        if kind == RUN_START:
+            results_in_run = 0
+        elif kind == RESULT:
+            results_in_run += 1
+            yield _normalize_result(payload)
+        elif kind == RUN_END:
+            runs_seen += 1
+            print(f"[SARIF Parser] Run {run_idx + 1}: {results_in_run} result(s)")
+
+    print(f"[SARIF Parser] Found {runs_seen} run(s) in SARIF file")
+
+
 def parse_sarif_findings(sarif_path: Path) -> List[Dict[str, Any]]:
     """
     Parse findings from a SARIF file.
@@ -122,51 +185,23 @@ def parse_sarif_findings(sarif_path: Path) -> List[Dict[str, Any]]:
         return []
 
     try:
-        data = json.loads(sarif_path.read_text() or "{}")
+        index = get_sarif_index(sarif_path)
+        runs = index.runs()
+        print(f"[SARIF Parser] Found {len(runs)} run(s) in SARIF file")
+        for run in runs:
+            print(f"[SARIF Parser] Run {run['run_index'] + 1}: {run['result_count']} result(s)")
+        findings = list(index.iter_findings())
     except json.JSONDecodeError as e:
         print(f"[SARIF Parser] ERROR: Invalid JSON in {sarif_path}: {e}")
         return []
-
-    findings: List[Dict[str, Any]] = []
-
-    runs = data.get("runs", [])
-    print(f"[SARIF Parser] Found {len(runs)} run(s) in SARIF file")
-    
-    for run_idx, run in enumerate(runs):
-        results = run.get("results", [])
-        print(f"[SARIF Parser] Run {run_idx + 1}: {len(results)} result(s)")
-        
-        for result in results:
-            finding_id = (
-                result.get("fingerprints", {}).get("matchBasedId/v1")
-                or result.get("ruleId")
-                or str(hash(json.dumps(result)))
-            )
-
-            loc = (result.get("locations") or [{}])[0].get("physicalLocation", {})
-            artifact = loc.get("artifactLocation", {})
-            region = loc.get("region", {})
-            snippet = region.get("snippet", {}).get("text", "")
-
-            # Extract dataflow path if present
-            code_flows = result.get("codeFlows", [])
-            dataflow_path = extract_dataflow_path(code_flows) if code_flows else None
-
-            findings.append(
-                {
-                    "finding_id": finding_id,
-                    "rule_id": result.get("ruleId"),
-                    "message": result.get("message", {}).get("text"),
-                    "file": artifact.get("uri"),
-                    "startLine": region.get("startLine"),
-                    "endLine": region.get("endLine"),
-                    "snippet": snippet,
-                    "level": result.get("level", "warning"),
-                    # NEW: Dataflow information
-                    "has_dataflow": dataflow_path is not None,
-                    "dataflow_path": dataflow_path,
-                }
-            )
+    except (OSError, sqlite3.Error) as e:
+        # Index unavailable (e.g. read-only output dir): stream the file directly
+        print(f"[SARIF Parser] Warning: SARIF index unavailable ({e}), streaming instead")
+        try:
+            findings = list(iter_sarif_findings(sarif_path))
+        except json.JSONDecodeError as e:
+            print(f"[SARIF Parser] ERROR: Invalid JSON in {sarif_path}: {e}")
+            return []
 
     print(f"[SARIF Parser] Parsed {len(findings)} total findings")
     return findings
@@ -258,35 +293,31 @@ def generate_scan_metrics(sarif_paths: List[str]) -> Dict[str, Any]:
             continue
 
         try:
-            sarif_data = json.loads(path.read_text())
-        except json.JSONDecodeError:
+            index = get_sarif_index(path)
+        except (json.JSONDecodeError, OSError, sqlite3.Error):
             continue
 
-        for run in sarif_data.get("runs", []):
+        for run in index.runs():
             # Track tool
-            tool_name = run.get("tool", {}).get("driver", {}).get("name", "unknown")
-            if tool_name not in metrics["tools_used"]:
-                metrics["tools_used"].append(tool_name)
+            if run["tool_name"] not in metrics["tools_used"]:
+                metrics["tools_used"].append(run["tool_name"])
 
             # Count artifacts (files)
-            artifacts = run.get("artifacts", [])
-            metrics["total_files_scanned"] += len(artifacts)
-
-            # Count findings
-            results = run.get("results", [])
-            metrics["total_findings"] += len(results)
-
-            for result in results:
-                # Count by severity
-                level = result.get("level", "warning")
-                if level in metrics["findings_by_severity"]:
-                    metrics["findings_by_severity"][level] += 1
-
-                # Count by rule
-                rule_id = result.get("ruleId", "unknown")
-                metrics["findings_by_rule"][rule_id] = (
-                    metrics["findings_by_rule"].get(rule_id, 0) + 1
-                )
+            metrics["total_files_scanned"] += run["artifact_count"]
+
+        # Count findings
+        metrics["total_findings"] += index.count()
+
+        # Count by severity
+        for level, count in index.count_by_level().items():
+            if level in metrics["findings_by_severity"]:
+                metrics["findings_by_severity"][level] += count
+
+        # Count by rule
+        for rule_id, count in index.count_by_rule().items():
+            metrics["findings_by_rule"][rule_id] = (
+                metrics["findings_by_rule"].get(rule_id, 0) + count
+            )
 
     return metrics
 
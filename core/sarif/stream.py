@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+RAPTOR Streaming SARIF Reader
+
+Incremental reader for large SARIF files. CodeQL output with codeFlows
+regularly runs to hundreds of megabytes, so instead of materialising the
+whole document this module walks ``runs[].results[]`` one result at a time.
+Memory use is bounded by the largest single result (plus run metadata such
+as the rule table), not by the size of the file.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
+
+# Event kinds produced by iter_sarif_events()
+RUN_START = "run_start"
+RESULT = "result"
+RUN_END = "run_end"
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+_WHITESPACE = " \t\n\r"
+
+
+class _JsonTokenStream:
+    """
+    Minimal pull tokenizer over a text file.
+
+    Structural characters are consumed one at a time; complete values are
+    decoded with ``json.JSONDecoder.raw_decode`` on a sliding buffer that is
+    only grown while the current value is incomplete.
+    """
+
+    def __init__(self, fh: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE, track_offsets: bool = False):
+        self._fh = fh
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+        # Byte offset bookkeeping: _mark_bytes is the UTF-8 offset of _buf[_mark_char]
+        self._track_offsets = track_offsets
+        self._mark_char = 0
+        self._mark_bytes = 0
+
+    def _advance_mark(self) -> None:
+        if self._mark_char < self._pos:
+            self._mark_bytes += len(self._buf[self._mark_char:self._pos].encode("utf-8"))
+            self._mark_char = self._pos
+
+    def tell(self) -> int:
+        """Byte offset of the next unconsumed character (requires track_offsets)."""
+        self._advance_mark()
+        return self._mark_bytes
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """Drop consumed input and append the next chunk. False at EOF."""
+        if self._eof:
+            return False
+        if self._pos:
+            if self._track_offsets:
+                self._advance_mark()
+                self._mark_char = 0
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        chunk = self._fh.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def _error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self._buf, self._pos)
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            buf = self._buf
+            pos = self._pos
+            end = len(buf)
+            while pos < end and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < end:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def next_char(self) -> str:
+        """Consume and return the next non-whitespace character."""
+        ch = self.peek()
+        if ch:
+            self._pos += 1
+        return ch
+
+    def expect(self, expected: str) -> None:
+        ch = self.next_char()
+        if ch != expected:
+            raise self._error(f"Expecting {expected!r}, got {ch or 'EOF'!r}")
+
+    def read_value(self) -> Any:
+        """Decode and consume one complete JSON value."""
+        if not self.peek():
+            raise self._error("Unexpected end of input")
+
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Most likely the value spans past the buffer; grow geometrically
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+
+            # A scalar ending exactly at the buffer edge may be truncated ("12" of "123")
+            if end >= len(self._buf) and self._fill(size):
+                continue
+
+            self._pos = end
+            return value
+
+    def iter_object_keys(self) -> Iterator[str]:
+        """
+        Iterate the keys of an object whose '{' has already been consumed.
+
+        The caller must consume each key's value before advancing.
+        """
+        if self.peek() == "}":
+            self.next_char()
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise self._error("Expecting property name")
+            self.expect(":")
+            yield key
+            ch = self.next_char()
+            if ch == "}":
+                return
+            if ch != ",":
+                raise self._error("Expecting ',' or '}'")
+
+    def iter_array_items(self) -> Iterator[int]:
+        """
+        Iterate the positions of an array whose '[' has already been consumed.
+
+        The caller must consume each element before advancing.
+        """
+        if self.peek() == "]":
+            self.next_char()
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            ch = self.next_char()
+            if ch == "]":
+                return
+            if ch != ",":
+                raise self._error("Expecting ',' or ']'")
+
+
+def _iter_runs(stream: _JsonTokenStream) -> Iterator[Tuple[str, int, Any, Optional[Tuple[int, int]]]]:
+    for run_index in stream.iter_array_items():
+        if stream.peek() != "{":
+            # Not a run object; skip it rather than fail the whole file
+            stream.read_value()
+            continue
+
+        stream.expect("{")
+        yield RUN_START, run_index, None, None
+
+        run_meta: Dict[str, Any] = {}
+        for key in stream.iter_object_keys():
+            if key == "results" and stream.peek() == "[":
+                stream.expect("[")
+                for _ in stream.iter_array_items():
+                    if stream._track_offsets:
+                        stream.peek()
+                        start = stream.tell()
+                        result = stream.read_value()
+                        yield RESULT, run_index, result, (start, stream.tell() - start)
+                    else:
+                        yield RESULT, run_index, stream.read_value(), None
+            else:
+                run_meta[key] = stream.read_value()
+
+        yield RUN_END, run_index, run_meta, None
+
+
+def _iter_document(stream: _JsonTokenStream) -> Iterator[Tuple[str, int, Any, Optional[Tuple[int, int]]]]:
+    if not stream.peek():
+        return
+
+    stream.expect("{")
+    for key in stream.iter_object_keys():
+        if key == "runs" and stream.peek() == "[":
+            stream.expect("[")
+            yield from _iter_runs(stream)
+        else:
+            stream.read_value()
+
+    if stream.peek():
+        raise stream._error("Extra data after SARIF document")
+
+
+def iter_sarif_events(
+    sarif_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[str, int, Any]]:
+    """
+    Stream a SARIF file as a sequence of events.
+
+    Yields ``(kind, run_index, payload)`` tuples:
+      - ``(RUN_START, i, None)`` when run ``i`` begins
+      - ``(RESULT, i, result)`` for every entry of ``runs[i].results``
+      - ``(RUN_END, i, run)`` once run ``i`` is complete, where ``run`` holds
+        every property of the run except ``results``
+
+    An empty file yields nothing.
+
+    Raises:
+        json.JSONDecodeError: If the document is malformed. Events already
+            yielded before the error remain valid.
+    """
+    with open(sarif_path, encoding="utf-8") as fh:
+        for kind, run_index, payload, _ in _iter_document(_JsonTokenStream(fh, chunk_size)):
+            yield kind, run_index, payload
+
+
+def iter_sarif_events_with_spans(
+    fh: TextIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[str, int, Any, Optional[Tuple[int, int]]]]:
+    """
+    Like iter_sarif_events(), but over an open handle and with byte spans.
+
+    Each event carries a fourth element: ``(offset, length)`` of the raw
+    result in the file for RESULT events, None otherwise. The handle must
+    be opened as UTF-8 text with ``newline=""`` so offsets match the bytes
+    on disk; the span can later be read back with read_sarif_result().
+    """
+    yield from _iter_document(_JsonTokenStream(fh, chunk_size, track_offsets=True))
+
+
+def read_sarif_result(sarif_path: Path, offset: int, length: int) -> Dict[str, Any]:
+    """Decode a single result from its byte span without reading the rest of the file."""
+    with open(sarif_path, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.read(length))
+
+
+def iter_sarif_results(
+    sarif_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Stream ``(run_index, result)`` pairs from a SARIF file.
+
+    Raises:
+        json.JSONDecodeError: If the document is malformed.
+    """
+    for kind, run_index, payload in iter_sarif_events(sarif_path, chunk_size):
+        if kind == RESULT:
+            yield run_index, payload
@@ -0,0 +1,23 @@
+"""Shared fixtures for core tests."""
+
+import pytest
+
+from core.config import RaptorConfig
+from core.sarif import index as sarif_index
+
+
+@pytest.fixture(autouse=True)
+def index_dir(tmp_path, monkeypatch):
+    """Keep SARIF indexes out of the repository and reset the in-process memo."""
+    directory = tmp_path / "sarif_index"
+    monkeypatch.setattr(RaptorConfig, "SARIF_INDEX_DIR", directory)
+    monkeypatch.setattr(sarif_index, "_open_indexes", {})
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def tree_hash_cache_dir(tmp_path, monkeypatch):
+    """Keep tree hash stat caches out of the repository."""
+    directory = tmp_path / "tree_hash_cache"
+    monkeypatch.setattr(RaptorConfig, "TREE_HASH_CACHE_DIR", directory)
+    return directory
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Tests for the in-process ELF reader."""
+
+import re
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from core.elf import PT_GNU_STACK, ELFError, ELFFile, is_elf, open_elf
+
+needs_gcc = pytest.mark.skipif(not shutil.which("gcc"), reason="needs gcc")
+needs_readelf = pytest.mark.skipif(not shutil.which("readelf"), reason="needs readelf")
+
+SOURCE = r"""
+#include <stdio.h>
+#include <string.h>
+
+int main(int argc, char **argv) {
+    char buf[64];
+    strcpy(buf, argc > 1 ? argv[1] : "x");
+    printf(buf);
+    printf("%d %s\n", argc, "/bin/sh");
+    return 0;
+}
+"""
+
+
+@pytest.fixture(scope="module")
+def binary(tmp_path_factory):
+    """A small PIE with full RELRO, a canary and printf/strcpy imports."""
+    if not shutil.which("gcc"):
+        pytest.skip("needs gcc")
+    tmp = tmp_path_factory.mktemp("elf")
+    (tmp / "t.c").write_text(SOURCE)
+    out = tmp / "t"
+    subprocess.run(
+        ["gcc", "-O0", "-fstack-protector-all", "-fPIE", "-pie",
+         "-Wl,-z,relro,-z,now", "-Wno-format-security", "-o", str(out), str(tmp / "t.c")],
+        check=True, capture_output=True,
+    )
+    return str(out)
+
+
+def test_rejects_non_elf(tmp_path):
+    script = tmp_path / "run.sh"
+    script.write_text("#!/bin/sh\n")
+    assert not is_elf(str(script))
+    with pytest.raises(ELFError):
+        ELFFile(str(script))
+
+
+def test_open_elf_memoises_until_file_changes(tmp_path):
+    path = tmp_path / "python"
+    shutil.copy(sys.executable, path)
+    first = open_elf(str(path))
+    assert open_elf(str(path)) is first
+
+    shutil.copy(sys.executable, tmp_path / "copy")
+    (tmp_path / "copy").replace(path)
+    assert open_elf(str(path)) is not first
+
+
+@needs_gcc
+class TestCompiledBinary:
+    """Header, symbol and mitigation queries on a freshly built binary."""
+
+    def test_checksec(self, binary):
+        sec = open_elf(binary).checksec()
+        assert sec["pie"] and sec["nx"] and sec["canary"]
+        assert sec["full_relro"] and not sec["partial_relro"]
+
+    def test_imports_and_plt(self, binary):
+        elf = open_elf(binary)
+        assert {"printf", "__stack_chk_fail"} <= elf.imports
+        assert "printf" in elf.got_slots()
+        calls = elf.plt_calls()
+        if calls:  # x86 only
+            assert calls["printf"] == 2
+
+    def test_find_string(self, binary):
+        elf = open_elf(binary)
+        offset = elf.find_string("/bin/sh")
+        assert offset is not None
+        assert elf.read(offset, 7) == b"/bin/sh"
+        assert elf.find_string("/bin/s") is None
+
+    def test_main_is_a_function_symbol(self, binary):
+        elf = open_elf(binary)
+        main = elf.find_symbol("main")
+        assert main is not None
+        assert elf.function_symbols()[main.value] == "main"
+
+    def test_stack_segment_not_executable(self, binary):
+        stack = open_elf(binary).segment(PT_GNU_STACK)
+        assert stack is not None and "E" not in stack.permissions
+
+
+@needs_readelf
+class TestAgainstReadelf:
+    """Tables match binutils on the running interpreter."""
+
+    def readelf(self, *args):
+        return subprocess.run(["readelf", "-W", *args, sys.executable],
+                              capture_output=True, text=True, check=True).stdout
+
+    def test_sections(self):
+        expected = re.findall(r"^\s*\[\s*\d+\]\s+(\S+)\s+\S+\s+([0-9a-f]+)", self.readelf("-S"), re.M)
+        elf = open_elf(sys.executable)
+        width = 16 if elf.bits == 64 else 8
+        got = [(s.name, f"{s.addr:0{width}x}") for s in elf.sections]
+        # Row 0 is the NULL section, which readelf prints without a name
+        assert got[1:] == expected[1:]
+
+    def test_needed(self):
+        expected = re.findall(r"\(NEEDED\).*\[(.+)\]", self.readelf("-d"))
+        assert open_elf(sys.executable).needed == expected
+
+    def test_dynamic_symbol_names(self):
+        expected = set()
+        for line in self.readelf("--dyn-syms").splitlines():
+            fields = line.split()
+            if len(fields) >= 8 and fields[0][:-1].isdigit():
+                expected.add(fields[7].split("@")[0])
+        names = {s.name for s in open_elf(sys.executable).dynamic_symbols if s.name}
+        assert names == expected - {""}
+
+    def test_build_id(self):
+        expected = re.search(r"Build ID:\s*([0-9a-f]+)", self.readelf("-n"))
+        assert open_elf(sys.executable).build_id == (expected.group(1) if expected else None)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Tests for the shared repository inventory."""
+
+import os
+
+import pytest
+
+from core import inventory as inventory_module
+from core.config import RaptorConfig
+from core.inventory import (
+    PRUNED_DIRS, RepoInventory, end_run, get_inventory, inventory_run, run_env, start_run,
+)
+from core.tree_hash import iter_tree_files, sha256_tree
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    for rel, text in {
+        "setup.py": "",
+        "pkg/__init__.py": "",
+        "pkg/Main.JAVA": "",
+        "pkg/app.csproj": "",
+        ".git/config": "",
+        "node_modules/lib/index.js": "",
+        "docs/.hidden/notes.txt": "",
+        "Makefile": "all:",
+    }.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return root
+
+
+@pytest.fixture(autouse=True)
+def no_run():
+    end_run()
+    yield
+    end_run()
+
+
+def paths(files):
+    return sorted(f.path for f in files)
+
+
+def entered(root, scanned):
+    """Names of the directories under root that were listed."""
+    return {part for path in scanned for part in os.path.relpath(path, root).split(os.sep)}
+
+
+class TestRepoInventory:
+    """Columns and queries of a single walk."""
+
+    def test_lists_same_files_as_walker(self, tree):
+        inventory = RepoInventory.scan(tree)
+        assert paths(inventory) == sorted(rel for rel, _ in iter_tree_files(tree))
+
+    def test_parallel_walk_matches_sequential(self, tree):
+        sequential = RepoInventory.scan(tree, exclude_dirs={".git"}, workers=1)
+        parallel = RepoInventory.scan(tree, exclude_dirs={".git"}, workers=4)
+        assert sorted(parallel) == sorted(sequential)
+        assert ".git/config" not in paths(parallel)
+
+    def test_columns(self, tree):
+        files = {f.path: f for f in RepoInventory.scan(tree)}
+        java = files["pkg/Main.JAVA"]
+        assert (java.ext, java.language, java.build_file) == (".JAVA", "java", False)
+        assert files["Makefile"].ext == "" and files["Makefile"].build_file
+        assert files["pkg/app.csproj"].build_file
+        assert files[".git/config"].ext == ""
+        assert files["Makefile"].size == 4
+
+    def test_files_prunes_like_a_walk(self, tree):
+        inventory = RepoInventory.scan(tree)
+        assert paths(inventory.files(exclude_dirs={".git", "node_modules"})) == [
+            "Makefile", "docs/.hidden/notes.txt", "pkg/Main.JAVA", "pkg/__init__.py",
+            "pkg/app.csproj", "setup.py",
+        ]
+        hidden = paths(inventory.files(skip_hidden_dirs=True))
+        assert ".git/config" not in hidden and "docs/.hidden/notes.txt" not in hidden
+
+    def test_subtree(self, tree):
+        sub = RepoInventory.scan(tree).subtree("pkg")
+        assert sub.root == (tree / "pkg").resolve()
+        assert paths(sub) == paths(RepoInventory.scan(tree / "pkg"))
+
+    def test_snapshot_round_trip(self, tree, tmp_path):
+        inventory = RepoInventory.scan(tree)
+        loaded = RepoInventory.load(inventory.save(tmp_path / "inventory.sqlite"))
+        assert loaded.root == inventory.root
+        assert list(loaded) == list(inventory)
+
+
+class TestRun:
+    """Sharing one walk across consumers and processes."""
+
+    def test_outside_a_run_walks_fresh(self, tree):
+        get_inventory(tree)
+        (tree / "new.py").write_text("")
+        assert "new.py" in paths(get_inventory(tree))
+
+    def test_run_shares_one_walk(self, tree, monkeypatch):
+        run = start_run(tree)
+        monkeypatch.setattr(RepoInventory, "scan", classmethod(lambda cls, root, exclude_dirs=(), workers=None: pytest.fail("walked")))
+        assert get_inventory(tree) is run
+        assert paths(get_inventory(tree / "pkg")) == ["Main.JAVA", "__init__.py", "app.csproj"]
+        sha256_tree(tree)
+
+    def test_hash_unchanged_by_run(self, tree):
+        before = sha256_tree(tree, use_cache=False)
+        start_run(tree)
+        assert sha256_tree(tree, use_cache=False) == before
+
+    def test_child_process_adopts_snapshot(self, tree, tmp_path, monkeypatch):
+        run = start_run(tree, snapshot=tmp_path / "inventory.sqlite")
+        env = run_env()
+        assert env[RaptorConfig.ENV_INVENTORY] == str(tmp_path / "inventory.sqlite")
+        assert RaptorConfig.ENV_INVENTORY not in os.environ
+
+        # A child process starts with only the environment
+        monkeypatch.setattr(inventory_module, "_run_inventories", {})
+        monkeypatch.setattr(inventory_module, "_loaded_snapshots", set())
+        monkeypatch.setenv(RaptorConfig.ENV_INVENTORY, env[RaptorConfig.ENV_INVENTORY])
+        monkeypatch.setattr(RepoInventory, "scan", classmethod(lambda cls, root, exclude_dirs=(), workers=None: pytest.fail("walked")))
+        child = get_inventory(tree)
+        assert list(child) == list(run)
+        assert child.exclude_dirs == PRUNED_DIRS
+
+    def test_bad_snapshot_is_ignored(self, tree, tmp_path, monkeypatch):
+        bad = tmp_path / "bad.sqlite"
+        bad.write_text("not a database")
+        monkeypatch.setenv(RaptorConfig.ENV_INVENTORY, str(bad))
+        assert "setup.py" in paths(get_inventory(tree))
+
+    def test_run_is_scoped(self, tree, tmp_path):
+        with inventory_run(tree, snapshot=tmp_path / "inventory.sqlite") as run:
+            assert get_inventory(tree) is run
+        assert RaptorConfig.ENV_INVENTORY not in run_env()
+        (tree / "new.py").write_text("")
+        assert "new.py" in paths(get_inventory(tree))
+
+    def test_run_ends_on_error(self, tree):
+        with pytest.raises(RuntimeError):
+            with inventory_run(tree) as run:
+                raise RuntimeError("stage failed")
+        assert get_inventory(tree) is not run
+
+
+class TestPruning:
+    """Ignored directories are pruned during the walk, not filtered after it."""
+
+    @pytest.fixture
+    def scanned(self, monkeypatch):
+        seen = []
+        original = os.scandir
+
+        def scandir(path="."):
+            seen.append(os.fspath(path))
+            return original(path)
+
+        monkeypatch.setattr(os, "scandir", scandir)
+        return seen
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_run_never_enters_pruned_dirs(self, tree, scanned, workers, monkeypatch):
+        monkeypatch.setattr(RaptorConfig, "INVENTORY_WORKERS", workers)
+        run = start_run(tree)
+        assert not entered(tree, scanned) & {".git", "node_modules"}
+        assert run.exclude_dirs == PRUNED_DIRS
+        assert "node_modules/lib/index.js" not in paths(run)
+        assert "pkg/Main.JAVA" in paths(run)
+
+    def test_fresh_walk_prunes_caller_dirs(self, tree, scanned):
+        inventory = get_inventory(tree, exclude_dirs={"docs"})
+        assert not entered(tree, scanned) & {"docs", "node_modules"}
+        assert paths(inventory.files({"docs"})) == paths(inventory)
+
+    def test_full_tree_walked_separately(self, tree):
+        run = start_run(tree)
+        full = get_inventory(tree, full=True)
+        assert full is not run and not full.exclude_dirs
+        assert {".git/config", "node_modules/lib/index.js"} <= set(paths(full))
+
+    def test_snapshot_keeps_pruned_dirs(self, tree, tmp_path):
+        inventory = RepoInventory.scan(tree, exclude_dirs={"docs"})
+        loaded = RepoInventory.load(inventory.save(tmp_path / "inventory.sqlite"))
+        assert loaded.exclude_dirs == {"docs"}
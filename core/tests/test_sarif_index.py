@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Tests for the shared on-disk SARIF index."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import pytest
+
+from core.config import RaptorConfig
+from core.sarif import index as sarif_index
+from core.sarif.index import INDEX_FORMAT_VERSION, get_sarif_index
+from core.sarif.parser import generate_scan_metrics, iter_sarif_findings, parse_sarif_findings
+
+from .test_sarif_stream import _sarif
+
+
+@pytest.fixture
+def sarif_file(tmp_path):
+    path = tmp_path / "scan.sarif"
+    # Non-ASCII content and CRLF line endings must not skew byte offsets
+    path.write_bytes(json.dumps(_sarif(), indent=2, ensure_ascii=False).replace("\n", "\r\n").encode())
+    return path
+
+
+class TestSarifIndex:
+    """Tests for SarifIndex queries."""
+
+    def test_keyed_by_content_hash(self, sarif_file, index_dir):
+        """The index file is named after the SARIF content hash and format version."""
+        index = get_sarif_index(sarif_file)
+        assert index.sha256 == hashlib.sha256(sarif_file.read_bytes()).hexdigest()
+        assert index.index_path == index_dir / f"{index.sha256}.v{INDEX_FORMAT_VERSION}.sqlite"
+        assert index.index_path.exists()
+
+    def test_reused_across_paths(self, sarif_file, index_dir, tmp_path):
+        """Identical content at another path shares one index database."""
+        copy = tmp_path / "copy.sarif"
+        copy.write_bytes(sarif_file.read_bytes())
+        first = get_sarif_index(sarif_file)
+        second = get_sarif_index(copy)
+        assert first.index_path == second.index_path
+        assert len(list(index_dir.glob("*.sqlite"))) == 2  # index + catalog
+
+    def test_findings_match_streaming(self, sarif_file, index_dir):
+        """Indexed findings equal the streamed ones."""
+        indexed = list(get_sarif_index(sarif_file).iter_findings())
+        streamed = list(iter_sarif_findings(sarif_file))
+        assert indexed == streamed
+        assert len(parse_sarif_findings(sarif_file)) == 3
+
+    def test_summary(self, sarif_file, index_dir):
+        """Summary counts severities, rules, queries and dataflow steps."""
+        summary = get_sarif_index(sarif_file).summary()
+        assert summary["total_findings"] == 3
+        assert summary["by_severity"] == {"error": 1, "warning": 1, "note": 1}
+        assert summary["by_rule"] == {"r1": 1, "r2": 1, "r3": 1}
+        assert summary["queries_executed"] == 2
+        assert summary["dataflow_paths"] == 1
+        assert summary["total_dataflow_steps"] == 3
+
+    def test_raw_results_by_offset(self, sarif_file, index_dir):
+        """Raw results are decoded from their byte spans."""
+        index = get_sarif_index(sarif_file)
+        expected = [r for run in _sarif()["runs"] for r in run.get("results", [])]
+        assert [index.raw_result(i) for i in range(3)] == expected
+
+        pairs = list(index.iter_raw_results(dataflow_only=True))
+        assert len(pairs) == 1
+        result, run = pairs[0]
+        assert result["codeFlows"] == expected[0]["codeFlows"]
+        assert run["tool"]["driver"]["rules"] == [{"id": "r1"}, {"id": "r2"}]
+
+    def test_metrics_use_index(self, sarif_file, index_dir):
+        """Scan metrics are derived from the index."""
+        metrics = generate_scan_metrics([str(sarif_file)])
+        assert metrics["total_findings"] == 3
+        assert metrics["tools_used"] == ["CodeQL", "Semgrep", "Empty"]
+
+    def test_malformed_leaves_no_index(self, tmp_path, index_dir):
+        """A malformed file raises and leaves no partial index behind."""
+        bad = tmp_path / "bad.sarif"
+        bad.write_text('{"runs": [{"results": [{"ruleId": "x"},')
+        with pytest.raises(json.JSONDecodeError):
+            get_sarif_index(bad)
+        assert not [p for p in index_dir.glob("*.sqlite") if p.name != "catalog.sqlite"]
+
+    def test_finding_id_stable_digest(self, tmp_path, index_dir):
+        """Results without a fingerprint or rule id get a digest that is the same in every process."""
+        result = {"message": {"text": "m"}, "level": "note"}
+        path = tmp_path / "anonymous.sarif"
+        path.write_text(json.dumps({"version": "2.1.0", "runs": [{"results": [result]}]}))
+        expected = hashlib.sha256(json.dumps(result, sort_keys=True).encode()).hexdigest()
+        assert [f["finding_id"] for f in get_sarif_index(path).iter_findings()] == [expected]
+        assert [f["finding_id"] for f in iter_sarif_findings(path)] == [expected]
+
+
+class TestSarifIndexEviction:
+    """Tests for bounding the index directory."""
+
+    def _index(self, tmp_path, name, monkeypatch):
+        path = tmp_path / f"{name}.sarif"
+        path.write_text(json.dumps({"version": "2.1.0", "runs": [{"results": [{"ruleId": name}]}]}))
+        # A new run: nothing stays open from the previous one
+        monkeypatch.setattr(sarif_index, "_open_indexes", {})
+        return get_sarif_index(path).index_path
+
+    def _catalog(self, index_dir):
+        conn = sqlite3.connect(index_dir / "catalog.sqlite")
+        try:
+            return {sha256 for (sha256,) in conn.execute("SELECT sha256 FROM catalog")}
+        finally:
+            conn.close()
+
+    def test_least_recently_used_evicted_over_size(self, tmp_path, index_dir, monkeypatch):
+        first = self._index(tmp_path, "first", monkeypatch)
+        second = self._index(tmp_path, "second", monkeypatch)
+        os.utime(first, (time.time() - 60, time.time() - 60))
+        os.utime(second, (time.time() - 120, time.time() - 120))
+        # Reopening first marks it used again
+        self._index(tmp_path, "first", monkeypatch)
+
+        monkeypatch.setattr(RaptorConfig, "SARIF_INDEX_MAX_BYTES", 2 * first.stat().st_size + 1)
+        third = self._index(tmp_path, "third", monkeypatch)
+
+        assert first.exists() and third.exists()
+        assert not second.exists()
+        assert self._catalog(index_dir) == {first.name.split(".")[0], third.name.split(".")[0]}
+
+    def test_expired_and_stale_files_dropped(self, tmp_path, index_dir, monkeypatch):
+        index_dir.mkdir(parents=True)
+        old_format = index_dir / ("0" * 64 + ".sqlite")
+        abandoned_build = index_dir / ".build-abc.sqlite"
+        recent_build = index_dir / ".build-def.sqlite"
+        for path in (old_format, abandoned_build, recent_build):
+            path.write_bytes(b"x")
+        month_ago = time.time() - 30 * 24 * 3600
+        os.utime(old_format, (month_ago, month_ago))
+        os.utime(abandoned_build, (month_ago, month_ago))
+        # Even over the size cap, a build that may be in progress is left alone
+        monkeypatch.setattr(RaptorConfig, "SARIF_INDEX_MAX_BYTES", 1)
+
+        index_path = self._index(tmp_path, "new", monkeypatch)
+
+        assert index_path.exists()
+        assert not old_format.exists()
+        assert not abandoned_build.exists()
+        assert recent_build.exists()
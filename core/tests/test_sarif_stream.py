@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Tests for streaming SARIF reader and its consumers."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from core.sarif.parser import generate_scan_metrics, parse_sarif_findings
+from core.sarif.stream import (
+    RESULT,
+    RUN_END,
+    RUN_START,
+    iter_sarif_events,
+    iter_sarif_results,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "engine" / "semgrep" / "tools"))
+from sarif_merge import merge_sarif_files  # noqa: E402
+
+
+def _result(rule_id, line, level="warning", flow=False):
+    result = {
+        "ruleId": rule_id,
+        "level": level,
+        "message": {"text": f"issue é {rule_id} [x]{{y}}"},
+        "locations": [{
+            "physicalLocation": {
+                "artifactLocation": {"uri": "src/app.py"},
+                "region": {"startLine": line, "endLine": line + 1, "snippet": {"text": "x = 1"}},
+            }
+        }],
+    }
+    if flow:
+        result["codeFlows"] = [{
+            "threadFlows": [{
+                "locations": [
+                    {"location": {"physicalLocation": {"artifactLocation": {"uri": "a.py"},
+                                                       "region": {"startLine": i}},
+                                  "message": {"text": f"step {i}"}}}
+                    for i in range(3)
+                ]
+            }]
+        }]
+    return result
+
+
+def _sarif():
+    return {
+        "version": "2.1.0",
+        "runs": [
+            {
+                "tool": {"driver": {"name": "CodeQL", "rules": [{"id": "r1"}, {"id": "r2"}]}},
+                "results": [_result("r1", 10, "error", flow=True), _result("r2", 20)],
+                "artifacts": [{"location": {"uri": "src/app.py"}}],
+            },
+            {
+                # results before tool: metadata must still be collected
+                "results": [_result("r3", 30, "note")],
+                "tool": {"driver": {"name": "Semgrep"}},
+                "properties": {"n": 123456789},
+            },
+            {"tool": {"driver": {"name": "Empty"}}},
+        ],
+    }
+
+
+@pytest.fixture
+def sarif_file(tmp_path):
+    path = tmp_path / "scan.sarif"
+    path.write_text(json.dumps(_sarif(), indent=2))
+    return path
+
+
+class TestIterSarifEvents:
+    """Tests for the incremental reader."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+    def test_matches_full_parse(self, sarif_file, chunk_size):
+        """Results and run metadata match json.load at any chunk size."""
+        expected = _sarif()
+        results = [[] for _ in expected["runs"]]
+        metas = {}
+        for kind, idx, payload in iter_sarif_events(sarif_file, chunk_size=chunk_size):
+            if kind == RESULT:
+                results[idx].append(payload)
+            elif kind == RUN_END:
+                metas[idx] = payload
+
+        for idx, run in enumerate(expected["runs"]):
+            assert results[idx] == run.get("results", [])
+            assert metas[idx] == {k: v for k, v in run.items() if k != "results"}
+
+    def test_event_order(self, sarif_file):
+        """Each run is bracketed by start and end events."""
+        kinds = [(kind, idx) for kind, idx, _ in iter_sarif_events(sarif_file)]
+        assert kinds[0] == (RUN_START, 0)
+        assert kinds[-1] == (RUN_END, 2)
+        assert kinds.count((RESULT, 0)) == 2
+
+    def test_empty_file(self, tmp_path):
+        """An empty file yields nothing."""
+        path = tmp_path / "empty.sarif"
+        path.write_text("")
+        assert list(iter_sarif_results(path)) == []
+
+    def test_malformed_raises(self, tmp_path):
+        """Truncated documents raise JSONDecodeError."""
+        path = tmp_path / "bad.sarif"
+        path.write_text(json.dumps(_sarif())[:-40])
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_sarif_results(path, chunk_size=16))
+
+
+class TestStreamingConsumers:
+    """Tests for parser functions built on the stream."""
+
+    def test_parse_sarif_findings(self, sarif_file):
+        """Findings are normalized from every run."""
+        findings = parse_sarif_findings(sarif_file)
+        assert [f["rule_id"] for f in findings] == ["r1", "r2", "r3"]
+        assert findings[0]["has_dataflow"]
+        assert findings[0]["dataflow_path"]["total_steps"] == 3
+        assert findings[2]["level"] == "note"
+
+    def test_parse_invalid_json(self, tmp_path):
+        """Malformed files produce no findings."""
+        path = tmp_path / "bad.sarif"
+        path.write_text("{\"runs\": [")
+        assert parse_sarif_findings(path) == []
+
+    def test_generate_scan_metrics(self, sarif_file, tmp_path):
+        """Metrics count results, tools and artifacts; bad files are skipped."""
+        bad = tmp_path / "bad.sarif"
+        bad.write_text(json.dumps(_sarif())[:-10])
+        metrics = generate_scan_metrics([str(sarif_file), str(bad)])
+        assert metrics["total_findings"] == 3
+        assert metrics["total_files_scanned"] == 1
+        assert metrics["findings_by_severity"]["error"] == 1
+        assert metrics["tools_used"] == ["CodeQL", "Semgrep", "Empty"]
+
+    def test_merge_sarif_files(self, sarif_file, tmp_path):
+        """Merged output contains every run of every valid input."""
+        bad = tmp_path / "bad.sarif"
+        bad.write_text("{\"runs\": [{\"results\": [")
+        out = tmp_path / "merged.sarif"
+        merge_sarif_files(str(out), [str(sarif_file), str(bad), str(sarif_file)])
+
+        merged = json.loads(out.read_text())
+        assert merged["version"] == "2.1.0"
+        expected = _sarif()["runs"] * 2
+        assert len(merged["runs"]) == len(expected)
+        for got, want in zip(merged["runs"], expected):
+            assert got["results"] == want.get("results", [])
+            assert {k: v for k, v in got.items() if k != "results"} == \
+                {k: v for k, v in want.items() if k != "results"}
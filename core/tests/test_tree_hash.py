@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Tests for incremental tree hashing."""
+
+import os
+
+import pytest
+
+from core import tree_hash
+from core.config import RaptorConfig
+from core.tree_hash import iter_tree_files, sha256_tree
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "a.txt").write_text("top")
+    (root / "a" / "b" / "c.py").write_text("print(1)")
+    (root / "a" / "z.py").write_text("z")
+    (root / "empty").mkdir()
+    os.symlink(root / "a.txt", root / "link.txt")
+    os.symlink(root / "a", root / "linkdir")
+    # Old enough to be cached (outside the racy mtime window)
+    for path in root.rglob("*"):
+        os.utime(path, (1_600_000_000, 1_600_000_000), follow_symlinks=False)
+    return root
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Record which files are actually read."""
+    seen = []
+    original = tree_hash.sha256_file
+
+    def counting(path):
+        seen.append(path.name)
+        return original(path)
+
+    monkeypatch.setattr(tree_hash, "sha256_file", counting)
+    return seen
+
+
+class TestTreeHash:
+    """Tests for sha256_tree."""
+
+    def test_same_files_and_order_as_rglob(self, tree):
+        """File selection and order match sorted(root.rglob("*"))."""
+        expected = [p.relative_to(tree).as_posix() for p in sorted(tree.rglob("*")) if p.is_file()]
+        listed = sorted((rel for rel, _ in iter_tree_files(tree)), key=lambda rel: rel.split("/"))
+        assert listed == expected
+
+    def test_unchanged_files_not_reread(self, tree, reads):
+        """A second run hashes from the stat cache alone."""
+        first = sha256_tree(tree)
+        assert len(reads) == 4
+        reads.clear()
+        assert sha256_tree(tree) == first
+        assert reads == []
+
+    def test_detects_content_change(self, tree, reads):
+        """Modified files are re-read and change the digest."""
+        first = sha256_tree(tree)
+        reads.clear()
+        (tree / "a" / "z.py").write_text("changed")
+        assert sha256_tree(tree) != first
+        assert reads == ["z.py"]
+
+    def test_cache_matches_cold(self, tree, tmp_path):
+        """Cached and uncached digests agree, and the cache is per-root."""
+        cached = sha256_tree(tree)
+        assert sha256_tree(tree, use_cache=False) == cached
+        assert sha256_tree(tree, cache_dir=tmp_path / "other") == cached
+
+    def test_skips_large_files(self, tree, monkeypatch):
+        """Files over MAX_FILE_SIZE_FOR_HASH do not affect the digest."""
+        before = sha256_tree(tree)
+        monkeypatch.setattr(RaptorConfig, "MAX_FILE_SIZE_FOR_HASH", 10)
+        (tree / "big.bin").write_bytes(b"x" * 100)
+        assert sha256_tree(tree) == before
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+RAPTOR Tree Hashing
+
+Content hash of a directory tree for scan manifests and cache keys. The
+tree is walked once with os.scandir, files are hashed in a thread pool
+(hashlib releases the GIL on large buffers), and a per-root stat cache maps
+(path, size, mtime_ns, inode) to each file's SHA-256 so unchanged files
+are never re-read.
+
+The tree digest is SHA-256 over "<relpath>\\0<file sha256>\\n" for every
+regular file, in pathlib sort order. File selection matches the previous
+rglob-based hasher, except that core.inventory.PRUNED_DIRS (.git,
+node_modules, ...) are not part of the tree: symlinked files are followed,
+symlinked directories are not, and files over MAX_FILE_SIZE_FOR_HASH are
+skipped.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.config import RaptorConfig
+from core.logging import get_logger
+
+logger = get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER,
+    inode INTEGER,
+    sha256 TEXT
+);
+"""
+
+# Files modified this recently may change again within the same mtime tick;
+# hash them but don't cache them (git's "racily clean" problem)
+_RACY_WINDOW_NS = 2 * 1_000_000_000
+
+StatKey = Tuple[int, int, int]  # (size, mtime_ns, inode)
+
+
+def stat_key(st: os.stat_result) -> StatKey:
+    """Cache identity of a file's content."""
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def iter_tree_files(root: Path, exclude_dirs: Iterable[str] = ()) -> Iterable[Tuple[str, os.stat_result]]:
+    """
+    Yield (relpath, stat) for every regular file under root, unordered.
+
+    Symlinks to files are followed (stat describes the target); symlinked
+    directories and unreadable directories are skipped.
+
+    Args:
+        root: Directory to walk
+        exclude_dirs: Directory names to prune anywhere in the tree
+    """
+    excluded = set(exclude_dirs)
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, rel_dir) if rel_dir else root) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in excluded:
+                        stack.append(rel)
+                elif entry.is_file():
+                    yield rel, entry.stat()
+            except OSError:
+                continue
+
+
+def sha256_file(path: Path) -> str:
+    """SHA-256 of a file's content."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(RaptorConfig.HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class TreeHashCache:
+    """Persistent (path, size, mtime_ns, inode) -> sha256 table for one tree root."""
+
+    def __init__(self, root: Path, cache_dir: Optional[Path] = None):
+        cache_dir = Path(cache_dir or RaptorConfig.TREE_HASH_CACHE_DIR)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        root_key = hashlib.sha256(str(Path(root).resolve()).encode()).hexdigest()[:32]
+        self.path = cache_dir / f"{root_key}.sqlite"
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.executescript(_SCHEMA)
+
+    def load(self) -> Dict[str, Tuple[StatKey, str]]:
+        rows = self._conn.execute("SELECT path, size, mtime_ns, inode, sha256 FROM files").fetchall()
+        return {path: ((size, mtime_ns, inode), digest) for path, size, mtime_ns, inode, digest in rows}
+
+    def save(self, changed: Dict[str, Tuple[StatKey, str]], removed: Iterable[str]) -> None:
+        with self._conn:
+            self._conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                [(p, key[0], key[1], key[2], digest) for p, (key, digest) in changed.items()],
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def hash_tree_files(
+    root: Path,
+    files: List[Tuple[str, StatKey]],
+    cache_dir: Optional[Path] = None,
+    use_cache: bool = True,
+    max_workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """
+    SHA-256 of each listed file, reusing cached digests for unchanged files.
+
+    Args:
+        root: Tree root the relative paths are under (also the cache identity)
+        files: (relpath, stat key) pairs, e.g. from RepoInventory.stat_keys()
+        cache_dir: Stat cache directory (default: TREE_HASH_CACHE_DIR)
+        use_cache: Set False to read every file and leave the cache untouched
+        max_workers: Hashing threads (default: TREE_HASH_WORKERS)
+
+    Returns:
+        Dict of relpath -> hex digest; unreadable files are omitted
+    """
+    cache = None
+    cached: Dict[str, Tuple[StatKey, str]] = {}
+    if use_cache:
+        try:
+            cache = TreeHashCache(root, cache_dir)
+            cached = cache.load()
+        except (OSError, sqlite3.Error) as e:
+            logger.debug(f"Tree hash cache unavailable, hashing without it: {e}")
+            cache = None
+
+    digests: Dict[str, str] = {}
+    keys: Dict[str, StatKey] = {}
+    to_hash: List[str] = []
+    for rel, key in files:
+        keys[rel] = key
+        hit = cached.get(rel)
+        if hit and hit[0] == key:
+            digests[rel] = hit[1]
+        else:
+            to_hash.append(rel)
+
+    def _hash(rel: str) -> Optional[str]:
+        try:
+            return sha256_file(Path(root) / rel)
+        except OSError:
+            return None
+
+    if to_hash:
+        # Largest first so one big file doesn't finish last on an idle pool
+        to_hash.sort(key=lambda rel: -keys[rel][0])
+        workers = max_workers or RaptorConfig.TREE_HASH_WORKERS
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for rel, digest in zip(to_hash, executor.map(_hash, to_hash)):
+                if digest is not None:
+                    digests[rel] = digest
+
+    if cache:
+        racy_after = time.time_ns() - _RACY_WINDOW_NS
+        changed = {
+            rel: (keys[rel], digests[rel])
+            for rel in to_hash
+            if rel in digests and keys[rel][1] < racy_after
+        }
+        removed = [rel for rel in cached if rel not in keys]
+        try:
+            if changed or removed:
+                cache.save(changed, removed)
+        except sqlite3.Error as e:
+            logger.debug(f"Could not update tree hash cache: {e}")
+        finally:
+            cache.close()
+
+    logger.debug(f"Tree hash of {root}: {len(files)} files, {len(to_hash)} read")
+    return digests
+
+
+def sha256_tree(
+    root: Path,
+    cache_dir: Optional[Path] = None,
+    use_cache: bool = True,
+    max_workers: Optional[int] = None,
+    exclude_dirs: Iterable[str] = (),
+) -> str:
+    """
+    Hash a directory tree incrementally and in parallel.
+
+    The file list comes from the run's shared inventory (core.inventory)
+    when one covers root, so the tree is not walked again. Either way
+    core.inventory.PRUNED_DIRS are left out.
+
+    Args:
+        root: Directory to hash
+        cache_dir: Stat cache directory (default: TREE_HASH_CACHE_DIR)
+        use_cache: Set False to read every file and leave the cache untouched
+        max_workers: Hashing threads (default: TREE_HASH_WORKERS)
+        exclude_dirs: Directory names to prune anywhere in the tree
+
+    Returns:
+        Hex SHA-256 digest of the tree
+    """
+    # Late import: core.inventory builds on iter_tree_files() above
+    from core.inventory import get_inventory
+
+    files = []
+    skipped = 0
+    for f in get_inventory(root).files(exclude_dirs):
+        if f.size > RaptorConfig.MAX_FILE_SIZE_FOR_HASH:
+            skipped += 1
+            continue
+        files.append((f.path, f.stat_key))
+    if skipped:
+        logger.debug(f"Skipped {skipped} large files during hashing")
+
+    digests = hash_tree_files(root, files, cache_dir, use_cache, max_workers)
+
+    h = hashlib.sha256()
+    # Same order as sorted(root.rglob("*")): component-wise path comparison
+    for rel in sorted(digests, key=lambda rel: rel.split("/")):
+        h.update(f"{rel}\0{digests[rel]}\n".encode())
+    return h.hexdigest()
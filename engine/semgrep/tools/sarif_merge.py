@@ -1,39 +1,84 @@
 #!/usr/bin/env python3
 """
 Simple SARIF merger - combines multiple SARIF files into one.
+
+Inputs are streamed run by run and result by result, so merging stays
+within bounded memory even for multi-hundred-MB CodeQL output.
 """
 import json
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 
+# Add repository root to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from core.sarif.stream import RESULT, RUN_END, RUN_START, iter_sarif_events
+
+SARIF_SCHEMA = "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json"
+
+
+def _write_runs(input_path: str, out) -> int:
+    """
+    Stream every run of one SARIF file into ``out`` as comma-prefixed JSON.
+
+    Results are written first and the remaining run properties once the run
+    is complete, since those may follow ``results`` in the source document.
+
+    Returns:
+        Number of runs written
+    """
+    runs = 0
+    for kind, _, payload in iter_sarif_events(Path(input_path)):
+        if kind == RUN_START:
+            out.write(',\n' if runs else '\n')
+            out.write('{"results": [')
+            first_result = True
+        elif kind == RESULT:
+            if not first_result:
+                out.write(',')
+            out.write('\n')
+            out.write(json.dumps(payload))
+            first_result = False
+        elif kind == RUN_END:
+            out.write(']')
+            for key, value in payload.items():
+                out.write(f', {json.dumps(key)}: {json.dumps(value)}')
+            out.write('}')
+            runs += 1
+    return runs
+
 
 def merge_sarif_files(output_path: str, input_paths: list) -> None:
     """Merge multiple SARIF files into one."""
-    merged = {
-        "version": "2.1.0",
-        "$schema": "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json",
-        "runs": []
-    }
-
-    for input_path in input_paths:
-        try:
-            with open(input_path) as f:
-                sarif = json.load(f)
-
-            # Add all runs from this SARIF
-            if "runs" in sarif:
-                merged["runs"].extend(sarif["runs"])
-
-        except Exception as e:
-            print(f"Warning: Failed to merge {input_path}: {e}", file=sys.stderr)
-            continue
-
-    # Write merged output
+    total_runs = 0
+
     with open(output_path, 'w') as f:
-        json.dump(merged, f, indent=2)
+        f.write('{"version": "2.1.0", ')
+        f.write(f'"$schema": {json.dumps(SARIF_SCHEMA)}, ')
+        f.write('"runs": [')
+
+        for input_path in input_paths:
+            # Spool each input so a malformed file can be skipped as a whole
+            with tempfile.TemporaryFile('w+') as spool:
+                try:
+                    runs = _write_runs(input_path, spool)
+                except Exception as e:
+                    print(f"Warning: Failed to merge {input_path}: {e}", file=sys.stderr)
+                    continue
+
+                if runs:
+                    if total_runs:
+                        f.write(',')
+                    spool.seek(0)
+                    shutil.copyfileobj(spool, f)
+                    total_runs += runs
+
+        f.write('\n]}\n')
 
     print(f"Merged {len(input_paths)} SARIF files into {output_path}")
-    print(f"Total runs: {len(merged['runs'])}")
+    print(f"Total runs: {total_runs}")
 
 
 if __name__ == "__main__":
@@ -9,12 +9,14 @@ Instead of hardcoded seeds, this module:
 - Learns which seed patterns lead to coverage/crashes
 """
 
+import hashlib
 import json
 import subprocess
 from pathlib import Path
 from typing import List, Dict, Optional, Set
 
 from core.logging import get_logger
+from packages.fuzzing.corpus_manager import CorpusManager, SeedCoverage, minimal_cover
 
 logger = get_logger()
 
@@ -395,43 +397,80 @@ class CorpusGenerator:
 
         return seeds
 
-    def optimize_corpus(self, corpus_dir: Path, coverage_data: Optional[Dict] = None) -> int:
+    def optimize_corpus(self, corpus_dir: Path, coverage_data: Optional[Dict] = None,
+                        input_mode: str = "stdin", qemu: bool = False,
+                        workers: Optional[int] = None) -> int:
         """
         Optimize corpus by removing redundant seeds.
 
+        Duplicate seeds are removed first. The rest are then minimised by edge
+        coverage: a greedy set cover keeps a small subset of seeds, favouring
+        small and fast ones, that hits every edge the whole corpus hits. Seeds
+        without a coverage measurement are kept.
+
         Args:
             corpus_dir: Corpus directory
-            coverage_data: Coverage info for each seed (optional)
+            coverage_data: Coverage info for each seed: seed file name -> iterable
+                           of edge IDs (optional; measured with afl-showmap on
+                           self.binary_path if not given)
+            input_mode: How the binary reads input when measuring ("stdin" or "file")
+            qemu: Measure in QEMU mode (uninstrumented binary)
+            workers: Concurrent afl-showmap runs (default: CPU count)
 
         Returns:
             Number of seeds removed
         """
         logger.info("Optimizing corpus (removing redundant seeds)...")
 
-        seeds = list(corpus_dir.glob("seed_*"))
-        initial_count = len(seeds)
-
-        if not coverage_data:
-            # Simple deduplication by content
-            seen_hashes = set()
-            removed = 0
-
-            for seed_file in seeds:
-                content = seed_file.read_bytes()
-                content_hash = hash(content)
-
-                if content_hash in seen_hashes:
-                    seed_file.unlink()
-                    removed += 1
-                else:
-                    seen_hashes.add(content_hash)
-
-            logger.info(f"Removed {removed} duplicate seeds")
-            return removed
-
-        # With coverage data, remove seeds that don't add new coverage
-        # TODO: Implement coverage-guided minimization
-        return 0
+        seeds = sorted(corpus_dir.glob("seed_*"))
+
+        # Simple deduplication by content
+        seen_hashes = set()
+        unique = []
+        for seed_file in seeds:
+            content_hash = hashlib.sha256(seed_file.read_bytes()).digest()
+            if content_hash in seen_hashes:
+                seed_file.unlink()
+            else:
+                seen_hashes.add(content_hash)
+                unique.append(seed_file)
+        duplicates = len(seeds) - len(unique)
+        logger.info(f"Removed {duplicates} duplicate seeds")
+
+        if coverage_data is not None:
+            coverages = []
+            for seed_file in unique:
+                edges = coverage_data.get(seed_file.name)
+                if edges is not None:
+                    bits = 0
+                    for edge in edges:
+                        bits |= 1 << edge
+                    # No timing given: unit exec time, so ties go to the smallest seed
+                    coverages.append(SeedCoverage(seed_file, bits, seed_file.stat().st_size, 1.0))
+        else:
+            try:
+                coverages = CorpusManager(corpus_dir).collect_coverage(
+                    self.binary_path, unique, input_mode=input_mode, qemu=qemu, workers=workers)
+            except FileNotFoundError:
+                logger.warning("afl-showmap not found - skipping coverage-guided minimisation")
+                return duplicates
+
+        if not any(coverage.edges for coverage in coverages):
+            logger.warning("No edge coverage recorded - skipping coverage-guided minimisation")
+            return duplicates
+
+        # Seeds adding no edges beyond the cover are redundant
+        kept = {coverage.path for coverage in minimal_cover(coverages)}
+        redundant = [coverage.path for coverage in coverages if coverage.path not in kept]
+        for seed_file in redundant:
+            seed_file.unlink()
+
+        covered = 0
+        for coverage in coverages:
+            covered |= coverage.edges
+        logger.info(f"Coverage minimisation: {len(coverages)} -> {len(kept)} seeds "
+                    f"covering all {bin(covered).count('1')} edges")
+        return duplicates + len(redundant)
 
     def learn_from_crash(self, crash_input: Path, crash_type: str):
         """
@@ -7,11 +7,14 @@ improve over time through persistent knowledge storage.
 """
 
 import json
+import sqlite3
+import threading
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 
 from core.logging import get_logger
 
@@ -68,6 +71,51 @@ class FuzzingKnowledge:
         return self.success_count / total
 
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS knowledge (
+    knowledge_type TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    success_count INTEGER NOT NULL,
+    failure_count INTEGER NOT NULL,
+    last_updated REAL NOT NULL,
+    binary_hash TEXT,
+    campaign_id TEXT,
+    PRIMARY KEY (knowledge_type, key)
+);
+CREATE INDEX IF NOT EXISTS idx_knowledge_confidence ON knowledge (knowledge_type, confidence);
+CREATE INDEX IF NOT EXISTS idx_knowledge_binary ON knowledge (binary_hash, knowledge_type);
+CREATE TABLE IF NOT EXISTS campaigns (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+_COLUMNS = ("knowledge_type, key, value, confidence, success_count, failure_count, "
+            "last_updated, binary_hash, campaign_id")
+
+
+def _row_to_knowledge(row) -> FuzzingKnowledge:
+    return FuzzingKnowledge(
+        knowledge_type=row[0],
+        key=row[1],
+        value=json.loads(row[2]),
+        confidence=row[3],
+        success_count=row[4],
+        failure_count=row[5],
+        last_updated=row[6],
+        binary_hash=row[7],
+        campaign_id=row[8],
+    )
+
+
+def _knowledge_to_row(k: FuzzingKnowledge) -> tuple:
+    return (k.knowledge_type, k.key, json.dumps(k.value), k.confidence, k.success_count,
+            k.failure_count, k.last_updated, k.binary_hash, k.campaign_id)
+
+
 class FuzzingMemory:
     """
     Persistent memory system for fuzzing knowledge.
@@ -77,46 +125,105 @@ class FuzzingMemory:
     - Learn from successes and failures
     - Improve strategies over time
     - Share knowledge between fuzzing sessions
+
+    Knowledge lives in a SQLite database indexed by knowledge type, key and
+    binary hash. Every update is its own transaction, so concurrent fuzzing
+    runs (threads or processes) sharing one database never lose updates;
+    wrap bursts of updates in batch() to commit them together.
     """
 
     def __init__(self, memory_file: Optional[Path] = None):
         """
         Initialise fuzzing memory.
-        Right now we use json and ideally we should be using sqlite or similar for scalability.
+
+        A JSON memory file from earlier versions (the given path if it ends in
+        .json, otherwise the same path with a .json suffix) is imported into
+        the database once and renamed to *.json.migrated.
 
         Args:
-            memory_file: Path to JSON file for persistent storage
+            memory_file: Path to the SQLite database
+                         (default: ~/.raptor/fuzzing_memory.sqlite)
         """
         if memory_file is None:
-            memory_file = Path.home() / ".raptor" / "fuzzing_memory.json"
+            memory_file = Path.home() / ".raptor" / "fuzzing_memory.sqlite"
+
+        memory_file = Path(memory_file)
+        legacy_file = memory_file.with_suffix(".json")
+        if memory_file.suffix == ".json":
+            memory_file = memory_file.with_suffix(".sqlite")
 
-        self.memory_file = Path(memory_file)
+        self.memory_file = memory_file
         self.memory_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # In-memory knowledge store
-        self.knowledge: Dict[str, FuzzingKnowledge] = {}
+        # One connection in autocommit mode; transactions are explicit so that
+        # read-modify-write updates take the write lock up front
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._conn = sqlite3.connect(str(self.memory_file), timeout=30,
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
 
-        # Campaign history
-        self.campaigns: List[Dict] = []
+        if legacy_file.exists():
+            self._import_legacy_json(legacy_file)
 
-        # Load existing memory
-        self.load()
+        logger.info(f"Fuzzing memory initialised: {len(self)} knowledge entries loaded")
 
-        logger.info(f"Fuzzing memory initialised: {len(self.knowledge)} knowledge entries loaded")
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM knowledge").fetchone()[0]
+
+    @property
+    def knowledge(self) -> Dict[str, FuzzingKnowledge]:
+        """
+        Snapshot of all knowledge keyed by "knowledge_type:key".
+
+        Changes to the returned entries are not stored; use remember() or
+        the record_*() methods.
+        """
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {_COLUMNS} FROM knowledge").fetchall()
+        return {f"{row[0]}:{row[1]}": _row_to_knowledge(row) for row in rows}
 
     def load(self):
-        """Load memory from persistent storage."""
-        if not self.memory_file.exists():
-            logger.info(f"No existing memory file at {self.memory_file}")
-            return
+        """Kept for compatibility: the database is always current, nothing to load."""
+
+    def save(self):
+        """Kept for compatibility: every update is already committed (see batch())."""
 
+    @contextmanager
+    def batch(self) -> Iterator["FuzzingMemory"]:
+        """
+        Commit every update made inside the block as one transaction.
+
+        Other threads wait for the block to finish; other processes wait for
+        the database write lock. Nested blocks join the outermost one.
+        """
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.execute("COMMIT")
+
+    def _import_legacy_json(self, legacy_file: Path):
+        """Import a JSON memory file once, then rename it out of the way."""
         try:
-            with open(self.memory_file, 'r') as f:
+            with open(legacy_file, 'r') as f:
                 data = json.load(f)
 
-            # Load knowledge entries
-            for key, k_dict in data.get("knowledge", {}).items():
-                self.knowledge[key] = FuzzingKnowledge(
+            rows = []
+            for k_dict in data.get("knowledge", {}).values():
+                rows.append(_knowledge_to_row(FuzzingKnowledge(
                     knowledge_type=k_dict["knowledge_type"],
                     key=k_dict["key"],
                     value=k_dict["value"],
@@ -126,67 +233,58 @@ class FuzzingMemory:
                     last_updated=k_dict.get("last_updated", time.time()),
                     binary_hash=k_dict.get("binary_hash"),
                     campaign_id=k_dict.get("campaign_id"),
-                )
+                )))
+            campaigns = [(c.get("timestamp", time.time()), json.dumps(c))
+                         for c in data.get("campaigns", [])]
 
-            # Load campaign history
-            self.campaigns = data.get("campaigns", [])
+            with self.batch():
+                self._conn.executemany(
+                    f"INSERT OR IGNORE INTO knowledge ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self._conn.executemany(
+                    "INSERT INTO campaigns (timestamp, data) VALUES (?, ?)", campaigns)
+            legacy_file.rename(legacy_file.with_name(legacy_file.name + ".migrated"))
 
-            logger.info(f"Loaded {len(self.knowledge)} knowledge entries, {len(self.campaigns)} past campaigns")
+            logger.info(f"Imported {len(rows)} knowledge entries and {len(campaigns)} campaigns "
+                        f"from {legacy_file}")
 
         except Exception as e:
-            logger.error(f"Failed to load memory: {e}")
+            logger.error(f"Failed to import memory from {legacy_file}: {e}")
 
-    def save(self):
-        """Save memory to persistent storage."""
-        try:
-            data = {
-                "knowledge": {
-                    key: {
-                        "knowledge_type": k.knowledge_type,
-                        "key": k.key,
-                        "value": k.value,
-                        "confidence": k.confidence,
-                        "success_count": k.success_count,
-                        "failure_count": k.failure_count,
-                        "last_updated": k.last_updated,
-                        "binary_hash": k.binary_hash,
-                        "campaign_id": k.campaign_id,
-                    }
-                    for key, k in self.knowledge.items()
-                },
-                "campaigns": self.campaigns,
-                "last_saved": time.time(),
-            }
+    def _load(self, knowledge_type: str, key: str) -> Optional[FuzzingKnowledge]:
+        row = self._conn.execute(
+            f"SELECT {_COLUMNS} FROM knowledge WHERE knowledge_type = ? AND key = ?",
+            (knowledge_type, key),
+        ).fetchone()
+        return _row_to_knowledge(row) if row else None
 
-            with open(self.memory_file, 'w') as f:
-                json.dump(data, f, indent=2)
-
-            logger.debug(f"Memory saved to {self.memory_file}")
-
-        except Exception as e:
-            logger.error(f"Failed to save memory: {e}")
+    def _store(self, knowledge: FuzzingKnowledge):
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO knowledge ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            _knowledge_to_row(knowledge),
+        )
 
     def remember(self, knowledge: FuzzingKnowledge):
         """
         Store a piece of knowledge.
 
+        If the entry already exists only its value is replaced; its counts and
+        confidence are kept.
+
         Args:
             knowledge: Knowledge to remember
         """
-        key = f"{knowledge.knowledge_type}:{knowledge.key}"
-
-        if key in self.knowledge:
-            # Update existing knowledge
-            existing = self.knowledge[key]
-            existing.value = knowledge.value
-            existing.last_updated = time.time()
-            logger.debug(f"Updated knowledge: {key}")
-        else:
-            # Store new knowledge
-            self.knowledge[key] = knowledge
-            logger.info(f"Learned new knowledge: {key}")
-
-        self.save()
+        with self.batch():
+            existing = self._load(knowledge.knowledge_type, knowledge.key)
+            if existing is not None:
+                # Update existing knowledge
+                existing.value = knowledge.value
+                existing.last_updated = time.time()
+                self._store(existing)
+                logger.debug(f"Updated knowledge: {knowledge.knowledge_type}:{knowledge.key}")
+            else:
+                # Store new knowledge
+                self._store(knowledge)
+                logger.info(f"Learned new knowledge: {knowledge.knowledge_type}:{knowledge.key}")
 
     def recall(self, knowledge_type: str, key: str) -> Optional[FuzzingKnowledge]:
         """
@@ -199,8 +297,8 @@ class FuzzingMemory:
         Returns:
             Knowledge if found, None otherwise
         """
-        lookup_key = f"{knowledge_type}:{key}"
-        return self.knowledge.get(lookup_key)
+        with self._lock:
+            return self._load(knowledge_type, key)
 
     def find_similar(self, knowledge_type: str,
                      min_confidence: float = 0.5) -> List[FuzzingKnowledge]:
@@ -212,16 +310,15 @@ class FuzzingMemory:
             min_confidence: Minimum confidence threshold
 
         Returns:
-            List of matching knowledge entries
+            List of matching knowledge entries, highest confidence first
         """
-        results = []
-        for k in self.knowledge.values():
-            if k.knowledge_type == knowledge_type and k.confidence >= min_confidence:
-                results.append(k)
-
-        # Sort by confidence (highest first)
-        results.sort(key=lambda x: x.confidence, reverse=True)
-        return results
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM knowledge WHERE knowledge_type = ? AND confidence >= ? "
+                "ORDER BY confidence DESC",
+                (knowledge_type, min_confidence),
+            ).fetchall()
+        return [_row_to_knowledge(row) for row in rows]
 
     def record_strategy_success(self, strategy_name: str, binary_hash: str,
                                 crashes_found: int, exploitable_crashes: int):
@@ -236,33 +333,34 @@ class FuzzingMemory:
         """
         key = f"strategy_{strategy_name}_{binary_hash}"
 
-        knowledge = self.recall("strategy", key)
-        if knowledge is None:
-            knowledge = FuzzingKnowledge(
-                knowledge_type="strategy",
-                key=key,
-                value={
-                    "name": strategy_name,
-                    "crashes_found": crashes_found,
-                    "exploitable_crashes": exploitable_crashes,
-                },
-                binary_hash=binary_hash,
-            )
-
-        # Update with success
-        if crashes_found > 0:
-            knowledge.update_success()
-        else:
-            knowledge.update_failure()
-
-        # Update value
-        knowledge.value = {
-            "name": strategy_name,
-            "crashes_found": crashes_found,
-            "exploitable_crashes": exploitable_crashes,
-        }
+        with self.batch():
+            knowledge = self.recall("strategy", key)
+            if knowledge is None:
+                knowledge = FuzzingKnowledge(
+                    knowledge_type="strategy",
+                    key=key,
+                    value={
+                        "name": strategy_name,
+                        "crashes_found": crashes_found,
+                        "exploitable_crashes": exploitable_crashes,
+                    },
+                    binary_hash=binary_hash,
+                )
 
-        self.remember(knowledge)
+            # Update with success
+            if crashes_found > 0:
+                knowledge.update_success()
+            else:
+                knowledge.update_failure()
+
+            # Update value
+            knowledge.value = {
+                "name": strategy_name,
+                "crashes_found": crashes_found,
+                "exploitable_crashes": exploitable_crashes,
+            }
+
+            self._store(knowledge)
         logger.info(f"Recorded strategy result: {strategy_name} - {crashes_found} crashes")
 
     def record_crash_pattern(self, signal: str, function: str,
@@ -278,31 +376,32 @@ class FuzzingMemory:
         """
         key = f"{signal}_{function}"
 
-        knowledge = self.recall("crash_pattern", key)
-        if knowledge is None:
-            knowledge = FuzzingKnowledge(
-                knowledge_type="crash_pattern",
-                key=key,
-                value={
-                    "signal": signal,
-                    "function": function,
-                    "exploitable_count": 0,
-                    "total_count": 0,
-                },
-                binary_hash=binary_hash,
-            )
-
-        # Update counts
-        value = knowledge.value
-        value["total_count"] += 1
-        if exploitable:
-            value["exploitable_count"] += 1
-            knowledge.update_success()
-        else:
-            knowledge.update_failure()
+        with self.batch():
+            knowledge = self.recall("crash_pattern", key)
+            if knowledge is None:
+                knowledge = FuzzingKnowledge(
+                    knowledge_type="crash_pattern",
+                    key=key,
+                    value={
+                        "signal": signal,
+                        "function": function,
+                        "exploitable_count": 0,
+                        "total_count": 0,
+                    },
+                    binary_hash=binary_hash,
+                )
+
+            # Update counts
+            value = knowledge.value
+            value["total_count"] += 1
+            if exploitable:
+                value["exploitable_count"] += 1
+                knowledge.update_success()
+            else:
+                knowledge.update_failure()
 
-        knowledge.value = value
-        self.remember(knowledge)
+            knowledge.value = value
+            self._store(knowledge)
 
     def record_exploit_technique(self, technique: str, crash_type: str,
                                 binary_characteristics: Dict, success: bool):
@@ -317,24 +416,25 @@ class FuzzingMemory:
         """
         key = f"{technique}_{crash_type}"
 
-        knowledge = self.recall("exploit_technique", key)
-        if knowledge is None:
-            knowledge = FuzzingKnowledge(
-                knowledge_type="exploit_technique",
-                key=key,
-                value={
-                    "technique": technique,
-                    "crash_type": crash_type,
-                    "binary_characteristics": binary_characteristics,
-                },
-            )
-
-        if success:
-            knowledge.update_success()
-        else:
-            knowledge.update_failure()
-
-        self.remember(knowledge)
+        with self.batch():
+            knowledge = self.recall("exploit_technique", key)
+            if knowledge is None:
+                knowledge = FuzzingKnowledge(
+                    knowledge_type="exploit_technique",
+                    key=key,
+                    value={
+                        "technique": technique,
+                        "crash_type": crash_type,
+                        "binary_characteristics": binary_characteristics,
+                    },
+                )
+
+            if success:
+                knowledge.update_success()
+            else:
+                knowledge.update_failure()
+
+            self._store(knowledge)
         logger.info(f"Recorded exploit technique: {technique} - {'success' if success else 'failure'}")
 
     def get_best_strategy(self, binary_hash: str) -> Optional[str]:
@@ -347,19 +447,19 @@ class FuzzingMemory:
         Returns:
             Strategy name if found, None otherwise
         """
-        # Find all strategies for this binary
-        strategies = [
-            k for k in self.knowledge.values()
-            if k.knowledge_type == "strategy" and k.binary_hash == binary_hash
-        ]
-
-        if not strategies:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM knowledge WHERE binary_hash = ? AND knowledge_type = 'strategy' "
+                "ORDER BY confidence DESC, "
+                "CAST(success_count AS REAL) / MAX(success_count + failure_count, 1) DESC "
+                "LIMIT 1",
+                (binary_hash,),
+            ).fetchone()
+
+        if row is None:
             return None
 
-        # Sort by confidence and success rate
-        strategies.sort(key=lambda k: (k.confidence, k.success_rate()), reverse=True)
-
-        best = strategies[0]
+        best = _row_to_knowledge(row)
         logger.info(f"Best strategy for binary: {best.value['name']} "
                    f"(confidence: {best.confidence:.2f}, success rate: {best.success_rate():.2f})")
 
@@ -409,35 +509,35 @@ class FuzzingMemory:
         campaign_data["timestamp"] = time.time()
         campaign_data["date"] = datetime.now().isoformat()
 
-        self.campaigns.append(campaign_data)
-        self.save()
+        with self.batch():
+            self._conn.execute("INSERT INTO campaigns (timestamp, data) VALUES (?, ?)",
+                               (campaign_data["timestamp"], json.dumps(campaign_data)))
 
         logger.info(f"Recorded campaign: {campaign_data.get('binary_name', 'unknown')}")
 
+    @property
+    def campaigns(self) -> List[Dict]:
+        """Recorded campaigns, oldest first."""
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM campaigns ORDER BY id").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
     def get_statistics(self) -> Dict:
         """Get memory statistics."""
-        stats = {
-            "total_knowledge": len(self.knowledge),
-            "total_campaigns": len(self.campaigns),
-            "knowledge_by_type": {},
-            "average_confidence": 0.0,
+        with self._lock:
+            total, average = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(AVG(confidence), 0.0) FROM knowledge").fetchone()
+            by_type = dict(self._conn.execute(
+                "SELECT knowledge_type, COUNT(*) FROM knowledge GROUP BY knowledge_type"))
+            campaigns = self._conn.execute("SELECT COUNT(*) FROM campaigns").fetchone()[0]
+
+        return {
+            "total_knowledge": total,
+            "total_campaigns": campaigns,
+            "knowledge_by_type": by_type,
+            "average_confidence": average,
         }
 
-        # Count by type
-        for k in self.knowledge.values():
-            k_type = k.knowledge_type
-            if k_type not in stats["knowledge_by_type"]:
-                stats["knowledge_by_type"][k_type] = 0
-            stats["knowledge_by_type"][k_type] += 1
-
-        # Average confidence
-        if self.knowledge:
-            stats["average_confidence"] = sum(
-                k.confidence for k in self.knowledge.values()
-            ) / len(self.knowledge)
-
-        return stats
-
     def prune_low_confidence(self, threshold: float = 0.2):
         """
         Remove knowledge with very low confidence.
@@ -445,14 +545,14 @@ class FuzzingMemory:
         Args:
             threshold: Minimum confidence to keep
         """
-        before_count = len(self.knowledge)
+        with self.batch():
+            pruned = self._conn.execute(
+                "DELETE FROM knowledge WHERE confidence < ?", (threshold,)).rowcount
 
-        self.knowledge = {
-            key: k for key, k in self.knowledge.items()
-            if k.confidence >= threshold
-        }
-
-        pruned = before_count - len(self.knowledge)
         if pruned > 0:
             logger.info(f"Pruned {pruned} low-confidence knowledge entries")
-            self.save()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1 @@
+"""Tests for autonomous module."""
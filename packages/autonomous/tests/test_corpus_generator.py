@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Tests for corpus optimisation."""
+
+import pytest
+
+from ..corpus_generator import CorpusGenerator
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    corpus_dir = tmp_path / "corpus"
+    corpus_dir.mkdir()
+    for name, data in {
+        "seed_a": b"AAAA",
+        "seed_b": b"BBBBBBBB",
+        "seed_b_copy": b"BBBBBBBB",
+        "seed_c": b"C",
+        "seed_d": b"DDDDDDDDDDDD",
+        "seed_unmeasured": b"??",
+        "notes.txt": b"AAAA",
+    }.items():
+        (corpus_dir / name).write_bytes(data)
+    return corpus_dir
+
+
+def remaining(corpus_dir):
+    return sorted(path.name for path in corpus_dir.iterdir())
+
+
+class TestOptimizeCorpus:
+    """Deduplication and coverage minimisation with given coverage."""
+
+    def test_minimises_by_coverage(self, corpus, tmp_path):
+        coverage = {
+            "seed_a": [1, 2],
+            "seed_b": [1, 2],      # Same edges as seed_a but larger
+            "seed_c": [3],
+            "seed_d": [1, 2, 3],   # Covers everything, but the largest
+        }
+        removed = CorpusGenerator(tmp_path / "target").optimize_corpus(corpus, coverage_data=coverage)
+
+        # seed_d alone covers every edge, so it is picked first by gain
+        assert remaining(corpus) == ["notes.txt", "seed_d", "seed_unmeasured"]
+        assert removed == 4  # seed_b_copy (duplicate), seed_a, seed_b, seed_c
+
+    def test_tie_goes_to_smaller_seed(self, corpus, tmp_path):
+        # The smaller seed of each pair sorts last, so file order cannot decide
+        coverage = {"seed_a": [9], "seed_b": [1, 2], "seed_c": [9], "seed_d": [1, 2]}
+        removed = CorpusGenerator(tmp_path / "target").optimize_corpus(corpus, coverage_data=coverage)
+        assert remaining(corpus) == ["notes.txt", "seed_b", "seed_c", "seed_unmeasured"]
+        assert removed == 3
+
+    def test_duplicates_only_without_coverage(self, corpus, tmp_path):
+        removed = CorpusGenerator(tmp_path / "target").optimize_corpus(corpus, coverage_data={})
+        assert "seed_b_copy" not in remaining(corpus)
+        assert len(remaining(corpus)) == 6
+        assert removed == 1
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Tests for the SQLite-backed fuzzing memory."""
+
+import json
+
+import pytest
+
+from ..memory import FuzzingKnowledge, FuzzingMemory
+
+
+@pytest.fixture
+def memory(tmp_path):
+    memory = FuzzingMemory(tmp_path / "memory.sqlite")
+    yield memory
+    memory.close()
+
+
+def knowledge(key, confidence, knowledge_type="strategy", **kwargs):
+    return FuzzingKnowledge(knowledge_type=knowledge_type, key=key,
+                            value={"name": key}, confidence=confidence, **kwargs)
+
+
+class TestLegacyImport:
+    """JSON memory files from earlier versions."""
+
+    def test_imports_and_renames(self, tmp_path):
+        legacy = tmp_path / "memory.json"
+        legacy.write_text(json.dumps({
+            "knowledge": {
+                "strategy:fast": {
+                    "knowledge_type": "strategy", "key": "fast", "value": {"name": "fast"},
+                    "confidence": 0.8, "success_count": 3, "binary_hash": "abc",
+                },
+            },
+            "campaigns": [{"binary_name": "target", "timestamp": 1.0}],
+        }))
+
+        memory = FuzzingMemory(legacy)
+        try:
+            assert memory.memory_file == tmp_path / "memory.sqlite"
+            assert not legacy.exists()
+            assert (tmp_path / "memory.json.migrated").exists()
+
+            imported = memory.recall("strategy", "fast")
+            assert (imported.confidence, imported.success_count, imported.failure_count) == (0.8, 3, 0)
+            assert memory.campaigns == [{"binary_name": "target", "timestamp": 1.0}]
+        finally:
+            memory.close()
+
+        # Imported once: reopening does not duplicate anything
+        reopened = FuzzingMemory(legacy)
+        assert len(reopened) == 1 and len(reopened.campaigns) == 1
+        reopened.close()
+
+    def test_json_next_to_database(self, tmp_path):
+        (tmp_path / "memory.json").write_text(json.dumps({"knowledge": {}, "campaigns": [{}]}))
+        memory = FuzzingMemory(tmp_path / "memory.sqlite")
+        assert len(memory.campaigns) == 1
+        assert (tmp_path / "memory.json.migrated").exists()
+        memory.close()
+
+
+class TestRecording:
+    """record_*() counters and confidence."""
+
+    def test_strategy(self, memory):
+        memory.record_strategy_success("havoc", "abc", crashes_found=2, exploitable_crashes=1)
+        memory.record_strategy_success("havoc", "abc", crashes_found=0, exploitable_crashes=0)
+        entry = memory.recall("strategy", "strategy_havoc_abc")
+        assert (entry.success_count, entry.failure_count) == (1, 1)
+        assert entry.confidence == pytest.approx(0.55)
+        assert entry.value["crashes_found"] == 0
+        assert entry.binary_hash == "abc"
+
+    def test_crash_pattern(self, memory):
+        for exploitable in (True, True, False):
+            memory.record_crash_pattern("SIGSEGV", "parse", "abc", exploitable)
+        entry = memory.recall("crash_pattern", "SIGSEGV_parse")
+        assert entry.value["total_count"] == 3
+        assert entry.value["exploitable_count"] == 2
+        assert memory.is_crash_likely_exploitable("SIGSEGV", "parse") == pytest.approx(2 / 3 * 0.65)
+        assert memory.is_crash_likely_exploitable("SIGFPE", "other") == 0.2
+
+    def test_exploit_technique(self, memory):
+        memory.record_exploit_technique("ROP", "stack_overflow", {"nx": True}, success=False)
+        entry = memory.recall("exploit_technique", "ROP_stack_overflow")
+        assert (entry.success_count, entry.failure_count) == (0, 1)
+        assert entry.confidence == pytest.approx(0.45)
+
+    def test_remember_keeps_counts(self, memory):
+        memory.remember(knowledge("fast", 0.9, success_count=4))
+        memory.remember(FuzzingKnowledge("strategy", "fast", {"name": "renamed"}))
+        entry = memory.recall("strategy", "fast")
+        assert entry.value == {"name": "renamed"}
+        assert (entry.confidence, entry.success_count) == (0.9, 4)
+
+
+class TestQueries:
+    """Lookups over stored knowledge."""
+
+    def test_find_similar_by_confidence(self, memory):
+        for key, confidence in (("low", 0.3), ("high", 0.9), ("mid", 0.6)):
+            memory.remember(knowledge(key, confidence))
+        memory.remember(knowledge("other", 1.0, knowledge_type="crash_pattern"))
+
+        assert [k.key for k in memory.find_similar("strategy")] == ["high", "mid"]
+        assert [k.key for k in memory.find_similar("strategy", min_confidence=0.0)] == ["high", "mid", "low"]
+
+    def test_best_strategy(self, memory):
+        assert memory.get_best_strategy("abc") is None
+        memory.remember(knowledge("a", 0.7, binary_hash="abc", success_count=1, failure_count=3))
+        memory.remember(knowledge("b", 0.7, binary_hash="abc", success_count=3, failure_count=1))
+        memory.remember(knowledge("c", 0.9, binary_hash="other"))
+        # Equal confidence: the higher success rate wins; other binaries are ignored
+        assert memory.get_best_strategy("abc") == "b"
+
+    def test_prune_low_confidence(self, memory):
+        memory.remember(knowledge("keep", 0.5))
+        memory.remember(knowledge("drop", 0.1))
+        memory.prune_low_confidence(threshold=0.2)
+        assert list(memory.knowledge) == ["strategy:keep"]
+        assert memory.get_statistics()["total_knowledge"] == 1
+
+
+class TestBatch:
+    """Transactions."""
+
+    def test_rollback_on_error(self, memory):
+        memory.remember(knowledge("kept", 0.5))
+        with pytest.raises(RuntimeError):
+            with memory.batch():
+                memory.record_strategy_success("havoc", "abc", 1, 0)
+                with memory.batch():
+                    memory.record_campaign({"binary_name": "target"})
+                raise RuntimeError("abort")
+
+        assert len(memory) == 1
+        assert memory.campaigns == []
+        # The connection is usable again afterwards
+        memory.record_campaign({"binary_name": "target"})
+        assert len(memory.campaigns) == 1
+
+    def test_visible_to_other_connections(self, memory):
+        with memory.batch():
+            memory.remember(knowledge("fast", 0.5))
+        other = FuzzingMemory(memory.memory_file)
+        assert other.recall("strategy", "fast") is not None
+        other.close()
+
+    def test_compatibility_api(self, memory):
+        memory.remember(knowledge("fast", 0.5))
+        memory.save()
+        memory.load()
+        assert set(memory.knowledge) == {"strategy:fast"}
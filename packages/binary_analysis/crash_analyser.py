@@ -15,6 +15,7 @@ from pathlib import Path
 from typing import Dict, Optional
 import platform
 
+from core.elf import PF_X, PT_GNU_STACK, ELFError, open_elf
 from core.logging import get_logger
 
 logger = get_logger()
@@ -34,6 +35,7 @@ class CrashContext:
     crash_instruction: str = ""
     crash_address: str = ""
     stack_hash: str = ""  # Hash of stack trace for deduplication
+    duplicate_count: int = 0  # Other crashing inputs with the same stack hash
 
     # From disassembly
     disassembly: str = ""
@@ -113,12 +115,10 @@ class CrashAnalyser:
     def _check_tool_availability(self) -> Dict[str, bool]:
         """Check which reverse engineering tools are available on the system. There are many more but this is a start."""
         tools = {
-            "nm": "symbol table extraction",
+            "nm": "symbol table extraction (non-ELF binaries)",
             "addr2line": "address to source resolution", 
             "objdump": "disassembly",
-            "readelf": "ELF header analysis",
             "file": "file type identification",
-            "strings": "string extraction",
         }
         
         available = {}
@@ -145,10 +145,45 @@ class CrashAnalyser:
             
         return available
 
+    def _open_elf(self):
+        """Shared in-process ELF reader for the binary, or None for non-ELF (e.g. Mach-O)."""
+        try:
+            return open_elf(str(self.binary))
+        except (ELFError, OSError):
+            return None
+
+    def _demangle(self, names: list) -> list:
+        """Demangle C++ names with a single c++filt run (names returned as-is on failure)."""
+        if not any(name.startswith("_Z") for name in names):
+            return names
+        try:
+            result = subprocess.run(
+                ["c++filt"],
+                input="\n".join(names),
+                capture_output=True,
+                text=True,
+                timeout=10,
+            )
+            demangled = result.stdout.split("\n")[:len(names)]
+            if result.returncode == 0 and len(demangled) == len(names):
+                return demangled
+        except Exception as e:
+            logger.debug(f"c++filt failed: {e}")
+        return names
+
     def _load_symbol_table(self) -> Dict[str, str]:
         """Load symbol table from binary for address-to-function mapping."""
         symbols = {}
-        
+
+        elf = self._open_elf()
+        if elf is not None:
+            functions = elf.function_symbols()
+            addresses = list(functions)
+            names = self._demangle([functions[addr] for addr in addresses])
+            symbols = dict(zip(addresses, names))
+            logger.info(f"Loaded {len(symbols)} symbols from binary")
+            return symbols
+
         if not self._available_tools.get("nm", False):
             logger.warning("nm not available - symbol table resolution will be limited")
             return symbols
@@ -387,6 +422,35 @@ class CrashAnalyser:
 
         return context
 
+    def stack_signature(self, input_file: Path) -> str:
+        """
+        Stack hash of a crash without the full analysis, for triaging many inputs.
+
+        Replays the input under the debugger and collects only the backtrace
+        (no registers, disassembly, ASan rerun or addr2line). The result is
+        computed exactly as CrashContext.stack_hash is in analyse_crash, so
+        inputs with equal signatures would be reported as duplicates there.
+
+        Args:
+            input_file: Input that triggered the crash
+
+        Returns:
+            Stack hash, or empty string if no backtrace was obtained
+        """
+        try:
+            if self._debugger == "lldb":
+                context = CrashContext(crash_id="", binary_path=self.binary,
+                                       input_file=input_file, signal="")
+                self._parse_lldb_output(context, self._run_lldb_analysis(input_file))
+                stack_trace = context.stack_trace
+            else:
+                stack_trace = self._extract_gdb_backtrace(
+                    self._run_gdb_backtrace(input_file).split("\n"))
+        except Exception as e:
+            logger.debug(f"Stack signature failed for {input_file}: {e}")
+            return ""
+        return self._compute_stack_hash(stack_trace)
+
     def classify_crash_type(self, context: CrashContext) -> str:
         """
         Classify the type of crash based on available information.
@@ -516,6 +580,23 @@ class CrashAnalyser:
 
         return result.stdout
 
+    def _run_gdb_backtrace(self, input_file: Path) -> str:
+        """Run GDB to the crash and print only the top of the backtrace."""
+        # Frames beyond the 10 used by _compute_stack_hash are not needed
+        gdb_commands = [
+            "-ex", "set pagination off",
+            "-ex", "set confirm off",
+            "-ex", f"run < '{input_file}'",
+            "-ex", "backtrace 10",
+        ]
+        result = subprocess.run(
+            ["gdb", "-batch", *gdb_commands, str(self.binary)],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        return result.stdout
+
     def _run_lldb_analysis(self, input_file: Path) -> str:
         """Run LLDB to analyze crash (macOS)."""
         # Create temp files for LLDB stdout/stderr
@@ -735,6 +816,20 @@ class CrashAnalyser:
                     context.function_name = func_part.split()[0].split("(")[0].strip()
                     break
 
+    def _extract_gdb_backtrace(self, lines: list) -> str:
+        """Frame lines ("#N ...") of the backtrace in GDB output."""
+        in_backtrace = False
+        backtrace_lines = []
+        for line in lines:
+            if "backtrace" in line.lower() or "#0" in line:
+                in_backtrace = True
+            if in_backtrace:
+                if line.strip().startswith("#"):
+                    backtrace_lines.append(line.strip())
+                elif "quit" in line.lower():
+                    break
+        return "\n".join(backtrace_lines)
+
     def _parse_gdb_output(self, context: CrashContext, gdb_output: str) -> None:
         """Parse GDB output to extract crash information."""
         lines = gdb_output.split("\n")
@@ -782,18 +877,7 @@ class CrashAnalyser:
                     in_registers = False
 
         # Extract stack trace
-        in_backtrace = False
-        backtrace_lines = []
-        for line in lines:
-            if "backtrace" in line.lower() or "#0" in line:
-                in_backtrace = True
-            if in_backtrace:
-                if line.strip().startswith("#"):
-                    backtrace_lines.append(line.strip())
-                elif "quit" in line.lower():
-                    break
-
-        context.stack_trace = "\n".join(backtrace_lines)
+        context.stack_trace = self._extract_gdb_backtrace(lines)
 
         # Extract crash instruction and address
         crash_instruction_found = False
@@ -851,6 +935,7 @@ class CrashAnalyser:
             context.disassembly = "\n".join(disassembly_lines)
 
         # Try to extract function name from backtrace
+        backtrace_lines = context.stack_trace.splitlines()
         if backtrace_lines:
             first_frame = backtrace_lines[0]
             if "in " in first_frame:
@@ -925,22 +1010,12 @@ class CrashAnalyser:
         else:
             logger.debug("file tool not available - skipping binary type detection")
         
-        if self._available_tools.get("readelf", False):
-            try:
-                # Get ELF header info (will work for ELF binaries, may fail for Mach-O)
-                result = subprocess.run(
-                    ["readelf", "-h", str(self.binary)],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                )
-                if result.returncode == 0:
-                    info["elf_header"] = result.stdout.strip()
-                    
-            except Exception as e:
-                logger.debug(f"readelf failed: {e}")
+        # ELF header info (not available for Mach-O)
+        elf = self._open_elf()
+        if elf is not None:
+            info["elf_header"] = elf.header_summary()
         else:
-            logger.debug("readelf tool not available - skipping ELF header analysis")
+            logger.debug("Not an ELF binary - skipping ELF header analysis")
             
         return info
 
@@ -974,42 +1049,44 @@ class CrashAnalyser:
             info["aslr_enabled"] = "unknown"
             
         # Check if binary has stack canaries
-        try:
-            result = subprocess.run(
-                ["objdump", "-d", str(self.binary)],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            if "__stack_chk_fail" in result.stdout or "__chk_fail" in result.stdout:
+        elf = self._open_elf()
+        if elf is not None:
+            names = elf.symbol_names
+            if "__stack_chk_fail" in names or "__chk_fail" in names:
                 info["stack_canaries"] = "enabled"
             else:
                 info["stack_canaries"] = "not_detected"
-        except:
-            info["stack_canaries"] = "unknown"
+        else:
+            try:
+                result = subprocess.run(
+                    ["objdump", "-d", str(self.binary)],
+                    capture_output=True,
+                    text=True,
+                    timeout=10,
+                )
+                if "__stack_chk_fail" in result.stdout or "__chk_fail" in result.stdout:
+                    info["stack_canaries"] = "enabled"
+                else:
+                    info["stack_canaries"] = "not_detected"
+            except:
+                info["stack_canaries"] = "unknown"
             
         # Check for NX/DEP
-        try:
-            result = subprocess.run(
-                ["otool", "-hv", str(self.binary)],  # macOS
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if "NOUNDEFS" in result.stdout or "NO_HEAP_EXECUTION" in result.stdout:
+        if elf is not None:
+            stack = elf.segment(PT_GNU_STACK)
+            if stack is not None and not stack.flags & PF_X:
                 info["nx_enabled"] = "enabled"
             else:
                 info["nx_enabled"] = "not_detected"
-        except:
+        else:
             try:
-                # Try Linux way
                 result = subprocess.run(
-                    ["readelf", "-l", str(self.binary)],
+                    ["otool", "-hv", str(self.binary)],  # macOS
                     capture_output=True,
                     text=True,
                     timeout=5,
                 )
-                if "GNU_STACK" in result.stdout and "RWE" not in result.stdout:
+                if "NOUNDEFS" in result.stdout or "NO_HEAP_EXECUTION" in result.stdout:
                     info["nx_enabled"] = "enabled"
                 else:
                     info["nx_enabled"] = "not_detected"
@@ -1145,6 +1222,17 @@ class CrashAnalyser:
 
     def _detect_asan_binary(self) -> bool:
         """Detect if binary was compiled with AddressSanitizer."""
+        asan_symbols = [
+            "__asan_", "__sanitizer", "_ZN6__asan", 
+            "__asan_report", "__asan_handle"
+        ]
+        elf = self._open_elf()
+        if elf is not None:
+            names = elf.symbol_names
+            if any(symbol in name for name in names for symbol in asan_symbols):
+                return True
+            return any("asan" in lib for lib in elf.needed)
+
         try:
             # Check for ASan symbols
             result = subprocess.run(
@@ -1153,10 +1241,6 @@ class CrashAnalyser:
                 text=True,
                 timeout=10,
             )
-            asan_symbols = [
-                "__asan_", "__sanitizer", "_ZN6__asan", 
-                "__asan_report", "__asan_handle"
-            ]
             for symbol in asan_symbols:
                 if symbol in result.stdout:
                     return True
@@ -0,0 +1 @@
+"""Tests for binary_analysis module."""
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Tests for GDB output parsing in the crash analyser."""
+
+from pathlib import Path
+
+import pytest
+
+from ..crash_analyser import CrashAnalyser, CrashContext
+
+
+GDB_OUTPUT = """\
+Program received signal SIGSEGV, Segmentation fault.
+0x0000555555555189 in parse_header (buf=0x0) at vuln.c:12
+(gdb) info registers
+rax            0x0                 0
+rip            0x555555555189      0x555555555189 <parse_header+16>
+(gdb) backtrace
+#0  0x0000555555555189 in parse_header (buf=0x0) at vuln.c:12
+#1  0x00005555555551c2 in main (argc=2, argv=0x7fffffffe4a8) at vuln.c:30
+(gdb) x/10i $pc
+=> 0x555555555189 <parse_header+16>:	mov    eax,DWORD PTR [rax]
+   0x55555555518b <parse_header+18>:	pop    rbp
+(gdb) quit
+"""
+
+
+@pytest.fixture
+def analyser():
+    # Parsing needs no binary or tools; skip the probing done by __init__
+    analyser = object.__new__(CrashAnalyser)
+    analyser.binary = Path("/bin/target")
+    analyser._debugger = "gdb"
+    return analyser
+
+
+def make_context():
+    return CrashContext(crash_id="0", binary_path=Path("/bin/target"),
+                        input_file=Path("crash"), signal="")
+
+
+class TestGdbBacktrace:
+    """Backtrace extraction and the fields derived from it."""
+
+    def test_extract_frames_only(self, analyser):
+        trace = analyser._extract_gdb_backtrace(GDB_OUTPUT.split("\n"))
+        assert trace.splitlines() == [
+            "#0  0x0000555555555189 in parse_header (buf=0x0) at vuln.c:12",
+            "#1  0x00005555555551c2 in main (argc=2, argv=0x7fffffffe4a8) at vuln.c:30",
+        ]
+
+    def test_extract_without_backtrace(self, analyser):
+        assert analyser._extract_gdb_backtrace(["(gdb) run", "exited normally"]) == ""
+
+    def test_parse_output(self, analyser):
+        context = make_context()
+        analyser._parse_gdb_output(context, GDB_OUTPUT)
+        assert context.signal == "11"
+        assert context.stack_trace == analyser._extract_gdb_backtrace(GDB_OUTPUT.split("\n"))
+        assert context.function_name == "parse_header"
+        assert context.crash_address == "0x555555555189"
+
+    def test_parse_output_without_backtrace(self, analyser):
+        context = make_context()
+        analyser._parse_gdb_output(context, "Program received signal SIGABRT, Aborted.\n")
+        assert context.signal == "06"
+        assert context.stack_trace == ""
+        assert context.function_name == "unknown"
+
+    def test_signature_matches_full_analysis(self, analyser, monkeypatch):
+        monkeypatch.setattr(analyser, "_run_gdb_backtrace", lambda input_file: GDB_OUTPUT)
+        context = make_context()
+        analyser._parse_gdb_output(context, GDB_OUTPUT)
+        signature = analyser.stack_signature(Path("crash"))
+        assert signature and signature == analyser._compute_stack_hash(context.stack_trace)
@@ -20,7 +20,9 @@ from typing import Dict, List, Optional
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.config import RaptorConfig
+from core.inventory import end_run, start_run
 from core.logging import get_logger
+from core.sarif.index import get_sarif_index
 from packages.codeql.language_detector import LanguageDetector, LanguageInfo
 from packages.codeql.build_detector import BuildDetector, BuildSystem
 from packages.codeql.database_manager import DatabaseManager, DatabaseResult
@@ -177,6 +179,9 @@ class CodeQLAgent:
         """
         errors = []
 
+        # One walk of the repository for language/build detection and cache
+        # keys (raptor_agentic's snapshot is reused when it passed one down)
+        start_run(self.repo_path)
         try:
             # PHASE 1: Language Detection
             logger.info(f"\n{'=' * 70}")
@@ -366,6 +371,8 @@ class CodeQLAgent:
                 sarif_files=[],
                 errors=[str(e)] + errors,
             )
+        finally:
+            end_run()
 
     def _save_report(self, result: CodeQLWorkflowResult):
         """Save workflow report to JSON."""
@@ -435,49 +442,21 @@ class CodeQLAgent:
         """Extract example dataflow paths from SARIF for visualization."""
         examples = []
         try:
-            with open(sarif_path) as f:
-                sarif_data = json.load(f)
-
-            for run in sarif_data.get("runs", []):
-                for result in run.get("results", []):
-                    if len(examples) >= limit:
-                        break
-
-                    code_flows = result.get("codeFlows", [])
-                    if not code_flows:
-                        continue
-
-                    # Extract path information
-                    rule_id = result.get("ruleId", "unknown")
-                    message = result.get("message", {}).get("text", "")
-
-                    # Get the dataflow path
-                    flow = code_flows[0]
-                    thread_flows = flow.get("threadFlows", [])
-                    if not thread_flows:
-                        continue
-
-                    locations = thread_flows[0].get("locations", [])
-                    if len(locations) < 2:  # Need at least source and sink
-                        continue
-
-                    # Extract source, sink, and intermediate steps
-                    source_loc = locations[0].get("location", {})
-                    sink_loc = locations[-1].get("location", {})
-
-                    source_file = source_loc.get("physicalLocation", {}).get("artifactLocation", {}).get("uri", "")
-                    source_line = source_loc.get("physicalLocation", {}).get("region", {}).get("startLine", 0)
-
-                    sink_file = sink_loc.get("physicalLocation", {}).get("artifactLocation", {}).get("uri", "")
-                    sink_line = sink_loc.get("physicalLocation", {}).get("region", {}).get("startLine", 0)
-
-                    examples.append({
-                        "rule": rule_id.split("/")[-1] if "/" in rule_id else rule_id,
-                        "message": message[:60] + "..." if len(message) > 60 else message,
-                        "source": f"{Path(source_file).name}:{source_line}",
-                        "sink": f"{Path(sink_file).name}:{sink_line}",
-                        "steps": len(locations)
-                    })
+            # Dataflow paths are precomputed in the shared SARIF index
+            for finding in get_sarif_index(sarif_path).dataflow_findings(limit=limit):
+                rule_id = finding["rule_id"] or "unknown"
+                message = finding["message"] or ""
+                path = finding["dataflow_path"]
+                source = path["source"]
+                sink = path["sink"]
+
+                examples.append({
+                    "rule": rule_id.split("/")[-1] if "/" in rule_id else rule_id,
+                    "message": message[:60] + "..." if len(message) > 60 else message,
+                    "source": f"{Path(source['file']).name}:{source['line']}",
+                    "sink": f"{Path(sink['file']).name}:{sink['line']}",
+                    "steps": path["total_steps"]
+                })
 
         except Exception as e:
             logger.debug(f"Failed to extract dataflow examples: {e}")
@@ -20,6 +20,7 @@ from typing import Dict, List, Optional
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.logging import get_logger
+from core.sarif.index import get_sarif_index
 from packages.codeql.dataflow_validator import DataflowValidator, DataflowValidation
 from packages.codeql.dataflow_visualizer import DataflowVisualizer
 
@@ -609,17 +610,15 @@ def main():
     args = parser.parse_args()
 
     print(f"Loading SARIF: {args.sarif}")
-    with open(args.sarif) as f:
-        sarif = json.load(f)
+    index = get_sarif_index(Path(args.sarif))
+    total = index.count()
 
-    run = sarif["runs"][0]
-    results = run["results"]
-
-    print(f"Found {len(results)} findings")
+    print(f"Found {total} findings")
     print(f"Analyzing up to {args.max_findings} findings...")
 
-    for i, result in enumerate(results[:args.max_findings]):
-        print(f"\n[{i+1}/{min(len(results), args.max_findings)}] {result.get('ruleId')}")
+    # Only the analysed results are decoded from the SARIF file
+    for i, (result, run) in enumerate(index.iter_raw_results(limit=args.max_findings)):
+        print(f"\n[{i+1}/{min(total, args.max_findings)}] {result.get('ruleId')}")
         # Would need LLM client and validator for full analysis
         # analyzer = AutonomousCodeQLAnalyzer(llm_client, validator)
         # analysis = analyzer.analyze_finding_autonomous(result, run, Path(args.repo), Path(args.out))
@@ -18,6 +18,7 @@ import xml.etree.ElementTree as ET
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from core.inventory import get_inventory
 from core.logging import get_logger
 
 logger = get_logger()
@@ -259,11 +260,15 @@ class BuildDetector:
 
             # Check for extension match (e.g., *.csproj)
             if build_file.startswith("."):
-                matches = list(self.repo_path.rglob(f"*{build_file}"))
+                matches = sorted(
+                    (f.path for f in get_inventory(self.repo_path).build_files()
+                     if f.name.endswith(build_file)),
+                    key=lambda rel: rel.split("/"),
+                )
                 if matches:
                     detected_files.append(build_file)
                     # Use the directory of the first match
-                    working_dir = matches[0].parent
+                    working_dir = (self.repo_path / matches[0]).parent
 
         if not detected_files:
             return None
@@ -8,7 +8,9 @@ validation, and cleanup.
 
 import hashlib
 import json
+import os
 import shutil
+import stat
 import subprocess
 import sys
 import time
@@ -23,6 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.config import RaptorConfig
 from core.logging import get_logger
+from core.tree_hash import hash_tree_files, sha256_tree, stat_key
 from packages.codeql.build_detector import BuildSystem
 
 logger = get_logger()
@@ -131,9 +134,15 @@ class DatabaseManager:
 
     def compute_repo_hash(self, repo_path: Path) -> str:
         """
-        Compute SHA256 hash of repository for caching.
+        Compute a content-accurate cache key for a repository.
 
-        Uses git commit hash if available, otherwise hashes file contents.
+        For git checkouts this is the tree hash of HEAD at repo_path plus the
+        working-tree state reported by `git status` (modified, staged,
+        deleted and untracked files, with the content of each changed file),
+        so a dirty tree never reuses a database built from clean sources.
+        Other trees use the full incremental content hash from
+        core.tree_hash. Both read only files whose stat changed since the
+        last call.
 
         Args:
             repo_path: Path to repository
@@ -143,43 +152,62 @@ class DatabaseManager:
         """
         repo_path = Path(repo_path).resolve()
 
-        # Try to use git commit hash (fast)
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "HEAD"],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                git_hash = result.stdout.strip()
-                # Combine with repo path to ensure uniqueness
-                combined = f"{repo_path}:{git_hash}"
-                return hashlib.sha256(combined.encode()).hexdigest()[:16]
-        except Exception:
-            pass
+        git_state = self._git_state(repo_path)
+        if git_state is not None:
+            combined = f"git:{repo_path}:{git_state}"
+        else:
+            combined = f"tree:{repo_path}:{sha256_tree(repo_path)}"
+        return hashlib.sha256(combined.encode()).hexdigest()[:16]
 
-        # Fallback: hash directory structure and modification times
-        hasher = hashlib.sha256()
-        hasher.update(str(repo_path).encode())
+    def _git_state(self, repo_path: Path) -> Optional[str]:
+        """
+        Digest of the HEAD tree and working-tree changes under repo_path.
 
-        # Hash a sample of files (for performance)
-        try:
-            files = list(repo_path.rglob("*"))[:1000]  # Sample first 1000 files
-            for file_path in sorted(files):
-                if file_path.is_file():
-                    hasher.update(str(file_path.relative_to(repo_path)).encode())
-                    try:
-                        stat = file_path.stat()
-                        hasher.update(str(stat.st_mtime).encode())
-                        hasher.update(str(stat.st_size).encode())
-                    except OSError:
-                        pass
-        except Exception as e:
-            logger.debug(f"Error hashing repository: {e}")
+        Returns:
+            Hex digest, or None if repo_path is not inside a git checkout
+            with at least one commit
+        """
+        def git(*args: str) -> Optional[bytes]:
+            try:
+                result = subprocess.run(
+                    ["git", "--no-optional-locks", *args],
+                    cwd=repo_path,
+                    capture_output=True,
+                    timeout=RaptorConfig.GIT_STATUS_TIMEOUT,
+                    env=RaptorConfig.get_git_env(),
+                )
+            except (OSError, subprocess.TimeoutExpired):
+                return None
+            return result.stdout if result.returncode == 0 else None
 
-        return hasher.hexdigest()[:16]
+        # "HEAD:./" is the tree of repo_path itself, even in a subdirectory
+        tree = git("rev-parse", "HEAD:./")
+        toplevel = git("rev-parse", "--show-toplevel")
+        status = git("status", "--porcelain=v1", "-z", "--untracked-files=all", "--no-renames", "--", ".")
+        if tree is None or toplevel is None or status is None:
+            return None
+
+        # Porcelain paths are relative to the top level, not to cwd
+        top = Path(os.fsdecode(toplevel.strip()))
+        entries = []
+        for record in status.split(b"\0"):
+            if len(record) > 3:
+                entries.append((record[:2].decode(), os.fsdecode(record[3:])))
+
+        present = []
+        for _, rel in entries:
+            try:
+                st = (top / rel).stat()
+            except OSError:
+                continue  # Deleted: the status code alone records it
+            if stat.S_ISREG(st.st_mode):
+                present.append((rel, stat_key(st)))
+        digests = hash_tree_files(top, present)
+
+        hasher = hashlib.sha256(tree.strip())
+        for code, rel in sorted(entries, key=lambda entry: entry[1]):
+            hasher.update(f"\n{code}\0{rel}\0{digests.get(rel, '')}".encode())
+        return hasher.hexdigest()
 
     def get_database_dir(self, repo_hash: str, language: str) -> Path:
         """Get database directory path."""
@@ -218,7 +246,8 @@ class DatabaseManager:
         self,
         repo_path: Path,
         language: str,
-        max_age_days: int = 7
+        max_age_days: int = 7,
+        repo_hash: Optional[str] = None,
     ) -> Optional[Path]:
         """
         Check if valid cached database exists.
@@ -227,11 +256,12 @@ class DatabaseManager:
             repo_path: Repository path
             language: Programming language
             max_age_days: Maximum age of cached database in days
+            repo_hash: Precomputed compute_repo_hash() result
 
         Returns:
             Path to cached database or None
         """
-        repo_hash = self.compute_repo_hash(repo_path)
+        repo_hash = repo_hash or self.compute_repo_hash(repo_path)
         db_path = self.get_database_dir(repo_hash, language)
         metadata = self.load_metadata(repo_hash, language)
 
@@ -267,7 +297,8 @@ class DatabaseManager:
         repo_path: Path,
         language: str,
         build_system: Optional[BuildSystem] = None,
-        force: bool = False
+        force: bool = False,
+        repo_hash: Optional[str] = None,
     ) -> DatabaseResult:
         """
         Create CodeQL database.
@@ -277,6 +308,7 @@ class DatabaseManager:
             language: Programming language
             build_system: Build system info (None for no-build mode)
             force: Force recreation even if cached DB exists
+            repo_hash: Precomputed compute_repo_hash() result
 
         Returns:
             DatabaseResult with creation status
@@ -289,15 +321,15 @@ class DatabaseManager:
         logger.info(f"Creating CodeQL database for {language}")
         logger.info(f"{'=' * 70}")
 
+        # Key the cache on the sources as they are before the build runs
+        repo_hash = repo_hash or self.compute_repo_hash(repo_path)
+
         # Check for cached database
         if not force:
-            cached_db = self.get_cached_database(repo_path, language)
+            cached_db = self.get_cached_database(repo_path, language, repo_hash=repo_hash)
             if cached_db:
                 duration = time.time() - start_time
-                metadata = self.load_metadata(
-                    self.compute_repo_hash(repo_path),
-                    language
-                )
+                metadata = self.load_metadata(repo_hash, language)
                 return DatabaseResult(
                     success=True,
                     language=language,
@@ -308,8 +340,7 @@ class DatabaseManager:
                     cached=True,
                 )
 
-        # Compute repo hash and database path
-        repo_hash = self.compute_repo_hash(repo_path)
+        # Database path
         db_path = self.get_database_dir(repo_hash, language)
 
         # Ensure parent directory exists
@@ -455,6 +486,9 @@ class DatabaseManager:
 
         logger.info(f"Creating {len(language_build_map)} databases in parallel (max workers: {max_workers})")
 
+        # One cache key for all languages
+        repo_hash = self.compute_repo_hash(repo_path)
+
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit all tasks
             future_to_lang = {
@@ -463,7 +497,8 @@ class DatabaseManager:
                     repo_path,
                     lang,
                     build_system,
-                    force
+                    force,
+                    repo_hash,
                 ): lang
                 for lang, build_system in language_build_map.items()
             }
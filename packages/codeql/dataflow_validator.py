@@ -6,7 +6,6 @@ Validates CodeQL dataflow findings using LLM analysis to determine
 if dataflow paths are truly exploitable beyond theoretical detection.
 """
 
-import json
 import sys
 from dataclasses import dataclass, asdict
 from pathlib import Path
@@ -16,6 +15,7 @@ from typing import Dict, List, Optional
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.logging import get_logger
+from core.sarif.index import get_sarif_index
 
 logger = get_logger()
 
@@ -329,17 +329,15 @@ def main():
     parser.add_argument("--finding-index", type=int, default=0, help="Finding index to validate")
     args = parser.parse_args()
 
-    # Load SARIF
-    with open(args.sarif) as f:
-        sarif = json.load(f)
-
-    # Get finding
-    results = sarif["runs"][0]["results"]
-    if args.finding_index >= len(results):
-        print(f"Finding index {args.finding_index} out of range (0-{len(results)-1})")
+    # Index SARIF (first run only) and decode just the requested finding
+    index = get_sarif_index(Path(args.sarif))
+    runs = index.runs()
+    result_count = runs[0]["result_count"] if runs else 0
+    if args.finding_index >= result_count:
+        print(f"Finding index {args.finding_index} out of range (0-{result_count-1})")
         return
 
-    finding = results[args.finding_index]
+    finding = index.raw_result(args.finding_index)
 
     # Initialize validator (would need LLM client in real usage)
     # validator = DataflowValidator(llm_client)
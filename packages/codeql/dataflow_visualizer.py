@@ -20,6 +20,7 @@ from html import escape
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.logging import get_logger
+from core.sarif.index import get_sarif_index
 from packages.codeql.dataflow_validator import DataflowPath, DataflowStep
 
 logger = get_logger()
@@ -830,17 +831,15 @@ def main():
 
     args = parser.parse_args()
 
-    # Load SARIF
-    with open(args.sarif) as f:
-        sarif = json.load(f)
-
-    # Get finding
-    results = sarif["runs"][0]["results"]
-    if args.finding_index >= len(results):
-        print(f"Finding index {args.finding_index} out of range (0-{len(results)-1})")
+    # Index SARIF (first run only) and decode just the requested finding
+    index = get_sarif_index(Path(args.sarif))
+    runs = index.runs()
+    result_count = runs[0]["result_count"] if runs else 0
+    if args.finding_index >= result_count:
+        print(f"Finding index {args.finding_index} out of range (0-{result_count-1})")
         return
 
-    finding = results[args.finding_index]
+    finding = index.raw_result(args.finding_index)
 
     # Extract dataflow (using validator's extractor)
     validator = DataflowValidator(llm_client=None)  # Don't need LLM for extraction
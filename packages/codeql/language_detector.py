@@ -6,15 +6,17 @@ Automatically detects programming languages in a repository
 to determine which CodeQL databases need to be created.
 """
 
+import re
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Set
-from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from collections import Counter, defaultdict
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from core.inventory import InventoryFile, RepoInventory, get_inventory
 from core.logging import get_logger
 
 logger = get_logger()
@@ -126,16 +128,22 @@ class LanguageDetector:
         ".lock", ".min.js", ".bundle.js",
     }
 
-    def __init__(self, repo_path: Path, max_files: int = 10000):
+    def __init__(self, repo_path: Path, max_files: Optional[int] = None,
+                 workers: Optional[int] = None):
         """
         Initialize language detector.
 
         Args:
             repo_path: Path to repository
-            max_files: Maximum files to scan (performance limit)
+            max_files: Sample about this many files, evenly across the tree,
+                       for extension counts (None: count every file). Build
+                       files and indicators are always checked on the full tree.
+            workers: Walker threads if no run inventory covers the repository
+                     (default: RaptorConfig.INVENTORY_WORKERS)
         """
         self.repo_path = Path(repo_path)
         self.max_files = max_files
+        self.workers = workers
 
         if not self.repo_path.exists():
             raise ValueError(f"Repository path does not exist: {repo_path}")
@@ -179,7 +187,12 @@ class LanguageDetector:
 
     def _scan_repository(self) -> Dict:
         """
-        Scan repository and collect file statistics.
+        Census of the repository: extension counts, build files and
+        indicators over every file outside ignored directories.
+
+        Extensions are counted per file (or per sampled file, scaled back up,
+        when max_files is set). Build files and indicators are matched once
+        per distinct file name and directory rather than once per file.
 
         Returns:
             Dictionary with extension counts, build files, and indicators
@@ -192,57 +205,80 @@ class LanguageDetector:
             "scanned_files": 0,
         }
 
-        try:
-            for file_path in self._walk_repository():
-                stats["scanned_files"] += 1
-
-                # Check for build files
-                if file_path.name in self._get_all_build_files():
-                    stats["build_files"].add(file_path.name)
+        indicators = self._get_all_indicators()
+        # Indicators with an inner "/" can span a directory and the file name
+        spanning = {ind for ind in indicators if "/" in ind and not ind.endswith("/")}
+        extensions = Counter()
+        names = set()
+        dirs = set()
 
-                # Check for structural indicators
-                relative = str(file_path.relative_to(self.repo_path))
-                for indicator in self._get_all_indicators():
-                    if indicator in relative:
+        try:
+            inventory = get_inventory(self.repo_path, workers=self.workers, exclude_dirs=self.IGNORE_DIRS)
+            step = 1
+            if self.max_files and len(inventory) > self.max_files:
+                step = -(-len(inventory) // self.max_files)
+                logger.info(f"Sampling 1 in {step} files for extension counts")
+
+            for i, file in enumerate(self._walk_repository(inventory)):
+                rel_dir, _, name = file.path.rpartition("/")
+                names.add(name)
+                dirs.add(rel_dir)
+                if i % step == 0:
+                    stats["scanned_files"] += 1
+                    if file.ext:
+                        extensions[file.ext] += step
+                for indicator in spanning:
+                    if indicator in file.path:
                         stats["indicators"].add(indicator)
-
-                # Count extensions
-                if file_path.suffix:
-                    stats["extensions"][file_path.suffix] += 1
-
                 stats["total_files"] += 1
 
-                # Performance limit
-                if stats["scanned_files"] >= self.max_files:
-                    logger.warning(
-                        f"Reached max file scan limit ({self.max_files}), "
-                        f"detection may be incomplete"
-                    )
-                    break
-
         except Exception as e:
             logger.error(f"Error scanning repository: {e}")
 
-        logger.debug(f"Scanned {stats['scanned_files']} files")
+        stats["extensions"].update(extensions)
+        stats["build_files"] = names & self._get_all_build_files()
+        stats["indicators"].update(self._match_indicators(
+            indicators - spanning, [d + "/" for d in dirs if d], names))
+
+        logger.debug(f"Counted {stats['total_files']} files "
+                     f"({len(dirs)} directories, {len(names)} distinct names)")
         return stats
 
-    def _walk_repository(self):
-        """Walk repository while respecting ignore patterns."""
-        try:
-            for path in self.repo_path.rglob("*"):
-                # Skip ignored directories
-                if any(ignored in path.parts for ignored in self.IGNORE_DIRS):
-                    continue
+    @staticmethod
+    def _match_indicators(indicators: Set[str], *candidates: Iterable[str]) -> Set[str]:
+        """
+        Indicators occurring as a substring of any candidate string.
 
-                # Skip ignored files
-                if path.name in self.IGNORE_FILES:
-                    continue
+        One precompiled alternation screens each candidate; it is rebuilt
+        without an indicator once that indicator has been found.
+        """
+        found = set()
+        remaining = set(indicators)
+        pattern = re.compile("|".join(map(re.escape, sorted(remaining))))
+        for strings in candidates:
+            for string in strings:
+                if not remaining:
+                    return found
+                if pattern.search(string):
+                    hits = {ind for ind in remaining if ind in string}
+                    found |= hits
+                    remaining -= hits
+                    if remaining:
+                        pattern = re.compile("|".join(map(re.escape, sorted(remaining))))
+        return found
+
+    def _walk_repository(self, inventory: Optional[RepoInventory] = None) -> Iterator[InventoryFile]:
+        """
+        Files of the repository inventory outside ignored directories.
 
-                # Only process files
-                if path.is_file():
-                    yield path
-        except PermissionError as e:
-            logger.warning(f"Permission denied accessing: {e}")
+        A fresh walk never enters IGNORE_DIRS; a run's shared inventory has
+        only core.inventory.PRUNED_DIRS pruned, so the rest are filtered here.
+        """
+        if inventory is None:
+            inventory = get_inventory(self.repo_path, workers=self.workers, exclude_dirs=self.IGNORE_DIRS)
+        for file in inventory.files(exclude_dirs=self.IGNORE_DIRS):
+            if file.name not in self.IGNORE_FILES:
+                yield file
 
     def _analyze_language(self, lang: str, patterns: Dict, stats: Dict) -> LanguageInfo:
         """
@@ -387,10 +423,11 @@ def main():
     parser = argparse.ArgumentParser(description="Detect languages in repository")
     parser.add_argument("--repo", required=True, help="Repository path")
     parser.add_argument("--min-files", type=int, default=3, help="Minimum files to detect language")
+    parser.add_argument("--max-files", type=int, help="Sample about this many files for extension counts")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     args = parser.parse_args()
 
-    detector = LanguageDetector(Path(args.repo))
+    detector = LanguageDetector(Path(args.repo), max_files=args.max_files)
     detected = detector.detect_languages(min_files=args.min_files)
     supported = detector.filter_codeql_supported(detected)
 
@@ -6,7 +6,6 @@ Executes CodeQL queries and suites against databases,
 producing SARIF output for vulnerability analysis.
 """
 
-import json
 import subprocess
 import sys
 import time
@@ -20,6 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.config import RaptorConfig
 from core.logging import get_logger
+from core.sarif.index import get_sarif_index
 
 logger = get_logger()
 
@@ -254,19 +254,10 @@ class QueryRunner:
 
             if sarif_path.exists():
                 try:
-                    with open(sarif_path) as f:
-                        sarif_data = json.load(f)
-
-                    # Count findings
-                    for run in sarif_data.get("runs", []):
-                        results = run.get("results", [])
-                        findings_count += len(results)
-
-                        # Count queries executed
-                        tool = run.get("tool", {})
-                        driver = tool.get("driver", {})
-                        rules = driver.get("rules", [])
-                        queries_executed += len(rules)
+                    # Build the shared index now; later summaries reuse it
+                    index = get_sarif_index(sarif_path)
+                    findings_count = index.count()
+                    queries_executed = index.queries_executed()
 
                 except Exception as e:
                     logger.warning(f"Failed to parse SARIF: {e}")
@@ -473,14 +464,7 @@ class QueryRunner:
     def _count_sarif_findings(self, sarif_path: Path) -> int:
         """Count findings in SARIF file."""
         try:
-            with open(sarif_path) as f:
-                sarif_data = json.load(f)
-
-            count = 0
-            for run in sarif_data.get("runs", []):
-                count += len(run.get("results", []))
-
-            return count
+            return get_sarif_index(sarif_path).count()
         except Exception as e:
             logger.debug(f"Failed to count SARIF findings: {e}")
             return 0
@@ -493,48 +477,7 @@ class QueryRunner:
             Dict with summary statistics
         """
         try:
-            with open(sarif_path) as f:
-                sarif_data = json.load(f)
-
-            summary = {
-                "total_findings": 0,
-                "by_severity": {"error": 0, "warning": 0, "note": 0},
-                "by_rule": {},
-                "queries_executed": 0,
-                "dataflow_paths": 0,
-                "total_dataflow_steps": 0,
-            }
-
-            for run in sarif_data.get("runs", []):
-                # Count findings by severity
-                for result in run.get("results", []):
-                    summary["total_findings"] += 1
-
-                    level = result.get("level", "warning")
-                    summary["by_severity"][level] = summary["by_severity"].get(level, 0) + 1
-
-                    # Count by rule
-                    rule_id = result.get("ruleId", "unknown")
-                    summary["by_rule"][rule_id] = summary["by_rule"].get(rule_id, 0) + 1
-
-                    # Count dataflow paths
-                    code_flows = result.get("codeFlows", [])
-                    if code_flows:
-                        summary["dataflow_paths"] += 1
-                        # Count total steps in all dataflow paths for this finding
-                        for flow in code_flows:
-                            for thread_flow in flow.get("threadFlows", []):
-                                locations = thread_flow.get("locations", [])
-                                summary["total_dataflow_steps"] += len(locations)
-
-                # Count queries
-                tool = run.get("tool", {})
-                driver = tool.get("driver", {})
-                rules = driver.get("rules", [])
-                summary["queries_executed"] += len(rules)
-
-            return summary
-
+            return get_sarif_index(sarif_path).summary()
         except Exception as e:
             logger.warning(f"Failed to generate SARIF summary: {e}")
             return {}
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Tests for the language detector's repository census."""
+
+import os
+
+import pytest
+
+from core.inventory import end_run, start_run
+from ..language_detector import LanguageDetector
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    for rel in (
+        "setup.py", "app/main.py", "app/util.py", "app/models.py",
+        "node_modules/lib/index.js", "node_modules/lib/other.js", "node_modules/x/y.js",
+        "build/gen/a.js", "build/gen/b.js", "build/gen/c.js",
+        ".git/hooks/pre-commit.py",
+    ):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    return root
+
+
+@pytest.fixture
+def scanned(monkeypatch):
+    """Directory names listed with os.scandir, relative to the repo."""
+    seen = []
+    original = os.scandir
+
+    def scandir(path="."):
+        seen.append(os.fspath(path))
+        return original(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    return seen
+
+
+def entered(root, scanned):
+    return {part for path in scanned for part in os.path.relpath(path, root).split(os.sep)}
+
+
+@pytest.fixture(autouse=True)
+def no_run():
+    end_run()
+    yield
+    end_run()
+
+
+class TestCensus:
+    """Ignored directories are neither entered nor counted."""
+
+    def test_ignored_dirs_never_entered(self, repo, scanned):
+        detected = LanguageDetector(repo).detect_languages(min_files=1)
+        assert not entered(repo, scanned) & {"node_modules", "build", ".git"}
+        assert "python" in detected
+        assert "javascript" not in detected
+
+    def test_run_inventory_filters_the_rest(self, repo, scanned):
+        start_run(repo)
+        stats = LanguageDetector(repo)._scan_repository()
+        # The shared walk prunes node_modules and .git; build/ is filtered
+        assert not entered(repo, scanned) & {"node_modules", ".git"}
+        assert dict(stats["extensions"]) == {".py": 4}
+        assert stats["build_files"] == {"setup.py"}
@@ -28,8 +28,13 @@ Modular Structure:
     - constraints.py: Input handler, bad byte, and libc fingerprinting analysis
     - graph.py: Primitive dependency graph for path finding
     - cache.py: LRU caching for expensive operations
+    - gadgets.py: Persistent ROP gadget store shared by all call sites
+    - gadget_index.py: Indexed gadget queries (by register/effect, bad bytes, charset)
+    - libc_db.py: Persistent libc fingerprint database (offsets, one_gadget, leak lookup)
     - errors.py: Structured error handling
     - context.py: Binary reconnaissance data
+    - stages.py: Concurrent, order-preserving analysis stage scheduler
+    - batch.py: Batch analysis of many binaries with shared host facts
     - analyzer.py: Main analysis orchestration
     - api.py: Public API functions
 """
@@ -41,11 +41,20 @@ import subprocess
 from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 from enum import Enum
 
+from core.elf import PT_GNU_STACK, open_elf
 from core.logging import get_logger
+from .aslr import sample_address_space
+from .config import get_config
 from .exploit_context import ExploitContext
+from .gadgets import GadgetToolError, get_gadgets
+from .libc_db import get_libc_db
+from .stages import Stage, run_stages
+
+if TYPE_CHECKING:
+    from .batch import HostFacts
 
 # Import from modular files - these are the canonical definitions
 from .context import (
@@ -128,6 +137,7 @@ logger = get_logger()
 #                 AddressSpaceInfo, SeccompInfo, PayloadConstraints, ExploitPrimitive
 #   - techniques.py: TechniqueRequirements, get_technique_requirements()
 #   - cache.py: CachedROPGadgets, CachedOneGadget, CachedLibcInfo (lightweight)
+#   - gadgets.py: GadgetDB, get_gadgets() (shared persistent ROPgadget output)
 # =============================================================================
 
 
@@ -296,6 +306,25 @@ def _check_bad_bytes(address: int, bad_bytes: List[int]) -> Tuple[bool, List[int
     return bool(positions), positions
 
 
+def find_libc_path(binary_path) -> Optional[str]:
+    """Path of the libc a binary loads, from ldd (None if not dynamically linked to libc)."""
+    try:
+        result = subprocess.run(
+            ['ldd', str(binary_path)],
+            capture_output=True, text=True, timeout=10
+        )
+    except (subprocess.SubprocessError, OSError) as e:
+        logger.debug(f"ldd failed: {e}")
+        return None
+
+    if result.returncode == 0:
+        # Parse libc path: libc.so.6 => /lib/x86_64-linux-gnu/libc.so.6 (0x...)
+        match = re.search(r'libc\.so\.\d+\s+=>\s+(\S+)', result.stdout)
+        if match:
+            return match.group(1)
+    return None
+
+
 # Note: analyze_gadget_quality and assess_technique_viability are imported from targets.py
 
 
@@ -415,6 +444,9 @@ class FeasibilityReport:
     # Context-specific notes (web guidance, kernel warnings, etc.)
     context_notes: List[str] = field(default_factory=list)
 
+    # Wall-clock seconds per analysis stage (see stages.py)
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+
     def add_finding(self, key: str, value: Any, confidence_level: str) -> None:
         """
         Add a finding with confidence tracking.
@@ -452,6 +484,8 @@ class FeasibilityReport:
                 "allowed_charset": self.payload_constraints.allowed_charset,
                 "encoding_suggestions": self.payload_constraints.encoding_suggestions,
             }
+        if self.stage_timings:
+            result["stage_timings"] = {name: round(secs, 3) for name, secs in self.stage_timings.items()}
         return result
 
     def summary(self) -> str:
@@ -691,21 +725,21 @@ class FeasibilityReport:
         if self.libc_info:
             recon.set('libc.path', self.libc_info.path, source='ldd')
             if self.libc_info.system_offset:
-                recon.set('libc.system_offset', self.libc_info.system_offset, source='nm -D libc')
+                recon.set('libc.system_offset', self.libc_info.system_offset, source='libc dynsym')
             if self.libc_info.execve_offset:
-                recon.set('libc.execve_offset', self.libc_info.execve_offset, source='nm -D libc')
+                recon.set('libc.execve_offset', self.libc_info.execve_offset, source='libc dynsym')
             if self.libc_info.bin_sh_offset:
-                recon.set('libc.bin_sh_offset', self.libc_info.bin_sh_offset, source='strings -t x libc')
+                recon.set('libc.bin_sh_offset', self.libc_info.bin_sh_offset, source='libc strings')
             if self.libc_info.malloc_hook_offset:
-                recon.set('libc.malloc_hook_offset', self.libc_info.malloc_hook_offset, source='nm -D libc')
+                recon.set('libc.malloc_hook_offset', self.libc_info.malloc_hook_offset, source='libc dynsym')
             if self.libc_info.free_hook_offset:
-                recon.set('libc.free_hook_offset', self.libc_info.free_hook_offset, source='nm -D libc')
+                recon.set('libc.free_hook_offset', self.libc_info.free_hook_offset, source='libc dynsym')
             if self.libc_info.one_gadgets:
                 recon.set('libc.one_gadgets', self.libc_info.one_gadgets, source='one_gadget')
 
         # Binary protections
         for prot, enabled in self.binary_protections.items():
-            recon.set(f'binary.protections.{prot}', enabled, source='checksec/readelf')
+            recon.set(f'binary.protections.{prot}', enabled, source='checksec/ELF headers')
 
         # Kernel mitigations
         for mit, value in self.kernel_mitigations.items():
@@ -732,13 +766,13 @@ class FeasibilityReport:
         # ELF structure
         if self.elf_structure:
             if self.elf_structure.got_plt_addr:
-                recon.set('binary.sections.got_plt_addr', self.elf_structure.got_plt_addr, source='readelf -S')
+                recon.set('binary.sections.got_plt_addr', self.elf_structure.got_plt_addr, source='ELF section headers')
             if self.elf_structure.fini_array_addr:
-                recon.set('binary.sections.fini_array_addr', self.elf_structure.fini_array_addr, source='readelf -S')
+                recon.set('binary.sections.fini_array_addr', self.elf_structure.fini_array_addr, source='ELF section headers')
             if self.elf_structure.bss_addr:
-                recon.set('binary.sections.bss_addr', self.elf_structure.bss_addr, source='readelf -S')
+                recon.set('binary.sections.bss_addr', self.elf_structure.bss_addr, source='ELF section headers')
             if self.elf_structure.got_entries:
-                recon.set('binary.got_entries', self.elf_structure.got_entries, source='readelf -r')
+                recon.set('binary.got_entries', self.elf_structure.got_entries, source='ELF relocations')
 
         # Address space
         if self.address_space:
@@ -760,7 +794,7 @@ class FeasibilityReport:
 
         # Input handlers
         if self.detected_input_handlers:
-            recon.set('binary.input_handlers', self.detected_input_handlers, source='nm -D')
+            recon.set('binary.input_handlers', self.detected_input_handlers, source='dynsym')
 
         # Write targets
         if self.write_targets:
@@ -914,7 +948,9 @@ class FeasibilityAnalyzer:
     def __init__(
         self,
         binary_path: Optional[Path] = None,
-        profile: Optional[TargetProfile] = None
+        profile: Optional[TargetProfile] = None,
+        max_workers: Optional[int] = None,
+        host_facts: Optional["HostFacts"] = None,
     ):
         """
         Initialize the mitigation analyzer.
@@ -923,6 +959,11 @@ class FeasibilityAnalyzer:
             binary_path: Path to binary being analyzed (optional for system-only checks)
             profile: Pre-configured target profile (for remote/web/kernel contexts).
                     If provided, takes precedence over binary_path for context.
+            max_workers: Analysis stages run concurrently (default: AnalysisConfig
+                        analysis_workers; 1 = strictly sequential)
+            host_facts: Precomputed glibc/kernel/libc results shared across a
+                       batch of binaries (see batch.py); replayed instead of
+                       re-running those checks
         """
         # Set up profile (provided profile takes precedence)
         if profile:
@@ -946,6 +987,12 @@ class FeasibilityAnalyzer:
         # Select analysis strategy based on profile context
         self.strategy = get_analysis_strategy(self.profile)
 
+        self.max_workers = max_workers or get_config().analysis_workers
+        self.host_facts = host_facts
+
+        # Gadget query index, set by _analyze_rop_gadgets
+        self._gadget_index = None
+
     def full_analysis(self, vuln_type: str = None,
                        input_handler: str = None,
                        extended: bool = False) -> FeasibilityReport:
@@ -994,51 +1041,84 @@ class FeasibilityAnalyzer:
                 report.context_notes.append(f"Relevant checks: {', '.join(checks)}")
             return report
 
+        if not self.binary:
+            logger.info("No binary specified - skipping binary protection checks")
+
+        # Independent probes run concurrently; the report matches the sequential order
+        stages = self._core_stages(vuln_type, input_handler)
+        if extended and self.binary:
+            logger.info("Running extended analysis...")
+            stages += self._extended_stages(vuln_type)
+        run_stages(report, stages, self.max_workers)
+        if extended and self.binary:
+            logger.info("Extended analysis complete")
+
+        # Log summary
+        logger.info(f"Analysis complete. Verdict: {report.verdict.value}")
+        if report.blockers:
+            for blocker in report.blockers:
+                logger.warning(f"BLOCKER: {blocker}")
+
+        return report
+
+    def _core_stages(self, vuln_type: Optional[str], input_handler: Optional[str]) -> List[Stage]:
+        """Mitigation check stages of full_analysis, in sequential order."""
+
         # 1. CRITICAL: Check glibc mitigations first (can block entire exploit classes)
-        logger.info("Checking glibc/runtime mitigations...")
-        self._check_glibc_mitigations(report, vuln_type=vuln_type)
+        def glibc_mitigations(report):
+            logger.info("Checking glibc/runtime mitigations...")
+            if not self._replay_host_fact("glibc_mitigations", report, vuln_type):
+                self._check_glibc_mitigations(report, vuln_type=vuln_type)
 
-        # 2. Check binary protections
-        if self.binary:
+        # 2. Check binary protections (checksec output captured via pwntools)
+        def binary_protections(report):
             logger.info(f"Checking binary protections: {self.binary}")
             self._check_binary_protections(report)
-            # Note: checksec output is now captured via pwntools in _check_binary_protections
-        else:
-            logger.info("No binary specified - skipping binary protection checks")
 
         # 3. Check kernel mitigations
-        logger.info("Checking kernel mitigations...")
-        self._check_kernel_mitigations(report)
+        def kernel_mitigations(report):
+            logger.info("Checking kernel mitigations...")
+            if not self._replay_host_fact("kernel_mitigations", report, vuln_type):
+                self._check_kernel_mitigations(report)
 
         # 4. Check compiler mitigations
-        if self.binary:
+        def compiler_mitigations(report):
             logger.info("Checking compiler mitigations...")
             self._check_compiler_mitigations(report)
 
         # 5. Vulnerability-specific checks
-        if vuln_type:
+        def vuln_specific(report):
             logger.info(f"Checking {vuln_type}-specific mitigations...")
             self._check_vuln_specific(report, vuln_type)
 
         # 6. Infer payload constraints (bad bytes, encoding requirements)
-        if vuln_type or input_handler:
+        def payload_constraints(report):
             logger.info("Inferring payload byte constraints...")
             self._infer_payload_constraints(report, vuln_type or "", input_handler)
 
-        # 7. Determine final verdict
-        self._compute_verdict(report)
-
-        # 8. Extended analysis (optional - libc, ROP, ELF, seccomp, write targets)
-        if extended and self.binary:
-            self.extended_analysis(report, vuln_type)
+        stages = [Stage("glibc_mitigations", glibc_mitigations)]
+        if self.binary:
+            stages.append(Stage("binary_protections", binary_protections))
+        stages.append(Stage("kernel_mitigations", kernel_mitigations))
+        if self.binary:
+            stages.append(Stage("compiler_mitigations", compiler_mitigations,
+                                depends_on=("binary_protections",)))
+        if vuln_type:
+            stages.append(Stage("vuln_specific", vuln_specific, depends_on=(
+                "glibc_mitigations", "binary_protections", "kernel_mitigations", "compiler_mitigations",
+            )))
+        if vuln_type or input_handler:
+            stages.append(Stage("payload_constraints", payload_constraints))
 
-        # Log summary
-        logger.info(f"Analysis complete. Verdict: {report.verdict.value}")
-        if report.blockers:
-            for blocker in report.blockers:
-                logger.warning(f"BLOCKER: {blocker}")
+        # 7. Determine final verdict (reads everything reported so far)
+        stages.append(Stage("verdict", self._compute_verdict,
+                            depends_on=tuple(stage.name for stage in stages)))
+        return stages
 
-        return report
+    def _replay_host_fact(self, name: str, report: FeasibilityReport, vuln_type: Optional[str]) -> bool:
+        """Apply a shared host-level stage result, if one was computed for vuln_type."""
+        facts = self.host_facts
+        return facts is not None and facts.vuln_type == vuln_type and facts.replay(name, report)
 
     def quick_check(self, vuln_type: str) -> Tuple[bool, str]:
         """
@@ -1229,7 +1309,7 @@ int main() {
 
     def _check_binary_protections(self, report: FeasibilityReport):
         """
-        Check binary security features using pwntools ELF (primary) with readelf fallback.
+        Check binary security features using pwntools ELF (primary) with core.elf fallback.
 
         Checks:
         - RELRO (Relocation Read-Only) - Full or Partial
@@ -1239,7 +1319,7 @@ int main() {
         - FORTIFY_SOURCE (bounds checking)
 
         Uses pwntools for fast, reliable detection (same as checksec command).
-        Falls back to readelf/objdump if pwntools unavailable.
+        Falls back to parsing the ELF in-process if pwntools unavailable.
         """
         if not self.binary:
             return
@@ -1326,119 +1406,65 @@ int main() {
             logger.debug(f"pwntools check failed: {e}, falling back to manual checks")
 
         # ─────────────────────────────────────────────────────────────────────
-        # Fallback: Use readelf/objdump if pwntools unavailable or failed
+        # Fallback: Parse the ELF in-process if pwntools unavailable or failed
         # ─────────────────────────────────────────────────────────────────────
         if not pwntools_available:
             try:
+                elf = open_elf(self.binary)
+                checks = elf.checksec()
+
                 # Check RELRO
-                result = subprocess.run(
-                    ["readelf", "-l", str(self.binary)],
-                    capture_output=True, text=True, timeout=5
-                )
-                if result.returncode == 0:
-                    if "GNU_RELRO" in result.stdout:
-                        protections["relro"] = True
-
-                        # Check for Full RELRO (BIND_NOW)
-                        dyn_result = subprocess.run(
-                            ["readelf", "-d", str(self.binary)],
-                            capture_output=True, text=True, timeout=5
-                        )
-                        if "BIND_NOW" in dyn_result.stdout or "(NOW)" in dyn_result.stdout:
-                            protections["full_relro"] = True
-                            report.warnings.append(
-                                "Full RELRO: GOT is read-only after startup - "
-                                "GOT overwrite not possible"
-                            )
-                        else:
-                            protections["partial_relro"] = True
-                            report.warnings.append(
-                                "Partial RELRO: Some GOT entries writable"
-                            )
-                    else:
-                        protections["relro"] = False
+                protections["relro"] = checks["relro"]
+                if checks["full_relro"]:
+                    protections["full_relro"] = True
+                    report.warnings.append(
+                        "Full RELRO: GOT is read-only after startup - "
+                        "GOT overwrite not possible"
+                    )
+                elif checks["relro"]:
+                    protections["partial_relro"] = True
+                    report.warnings.append(
+                        "Partial RELRO: Some GOT entries writable"
+                    )
 
                 # Check PIE
-                result = subprocess.run(
-                    ["readelf", "-h", str(self.binary)],
-                    capture_output=True, text=True, timeout=5
-                )
-                if result.returncode == 0:
-                    if "DYN (Position-Independent Executable" in result.stdout or \
-                       "Type:                              DYN" in result.stdout:
-                        protections["pie"] = True
-                        report.warnings.append(
-                            "PIE enabled: Binary base address is randomized (with ASLR)"
-                        )
-                    else:
-                        protections["pie"] = False
+                protections["pie"] = checks["pie"]
+                if checks["pie"]:
+                    report.warnings.append(
+                        "PIE enabled: Binary base address is randomized (with ASLR)"
+                    )
 
                 # Check NX (No-Execute stack)
-                result = subprocess.run(
-                    ["readelf", "-l", str(self.binary)],
-                    capture_output=True, text=True, timeout=5
-                )
-                if result.returncode == 0:
-                    # Look for GNU_STACK segment
-                    if "GNU_STACK" in result.stdout:
-                        # Check if RWE (read-write-execute) - means NX disabled
-                        lines = result.stdout.split('\n')
-                        for i, line in enumerate(lines):
-                            if "GNU_STACK" in line:
-                                # Check flags in this or next line
-                                stack_line = line + (lines[i+1] if i+1 < len(lines) else "")
-                                if "RWE" in stack_line:
-                                    protections["nx"] = False
-                                    report.warnings.append(
-                                        "NX DISABLED: Stack is executable - shellcode possible"
-                                    )
-                                else:
-                                    protections["nx"] = True
-                                    report.warnings.append(
-                                        "NX enabled: Stack not executable - need ROP/ret2libc"
-                                    )
-                                break
-                    else:
-                        protections["nx"] = True  # Default to NX enabled if no GNU_STACK
-
-                # Check Stack Canary
-                result = subprocess.run(
-                    ["objdump", "-d", str(self.binary)],
-                    capture_output=True, text=True, timeout=15
-                )
-                if result.returncode == 0:
-                    if "__stack_chk_fail" in result.stdout:
-                        protections["canary"] = True
+                protections["nx"] = checks["nx"]  # Default to NX enabled if no GNU_STACK
+                if elf.segment(PT_GNU_STACK) is not None:
+                    if checks["nx"]:
                         report.warnings.append(
-                            "Stack canary enabled: Stack buffer overflow will be detected"
-                        )
-                        report.bypass_suggestions.append(
-                            "Leak canary value via format string or other info disclosure"
+                            "NX enabled: Stack not executable - need ROP/ret2libc"
                         )
                     else:
-                        protections["canary"] = False
-
-                # Check FORTIFY_SOURCE (fallback via symbol check)
-                result = subprocess.run(
-                    ["objdump", "-t", str(self.binary)],
-                    capture_output=True, text=True, timeout=10
-                )
-                if result.returncode == 0:
-                    symbols = result.stdout.lower()
-                    fortify_symbols = ["__chk", "_chk@", "__fortify", "__sprintf_chk",
-                                      "__strcpy_chk", "__memcpy_chk"]
-                    if any(sym in symbols for sym in fortify_symbols):
-                        protections["fortify"] = True
                         report.warnings.append(
-                            "FORTIFY_SOURCE: Bounds checking on string/memory functions"
+                            "NX DISABLED: Stack is executable - shellcode possible"
                         )
-                    else:
-                        protections["fortify"] = False
 
-                logger.info(f"Binary protections (readelf fallback): {protections}")
+                # Check Stack Canary
+                protections["canary"] = checks["canary"]
+                if checks["canary"]:
+                    report.warnings.append(
+                        "Stack canary enabled: Stack buffer overflow will be detected"
+                    )
+                    report.bypass_suggestions.append(
+                        "Leak canary value via format string or other info disclosure"
+                    )
+
+                # Check FORTIFY_SOURCE (fallback via symbol check)
+                protections["fortify"] = checks["fortify"]
+                if checks["fortify"]:
+                    report.warnings.append(
+                        "FORTIFY_SOURCE: Bounds checking on string/memory functions"
+                    )
+
+                logger.info(f"Binary protections (ELF headers): {protections}")
 
-            except subprocess.TimeoutExpired:
-                report.warnings.append("Binary protection check timed out")
             except Exception as e:
                 report.warnings.append(f"Binary protection check failed: {e}")
 
@@ -1662,37 +1688,24 @@ int main() {
         else:
             # Fallback: check symbols manually
             try:
-                result = subprocess.run(
-                    ["objdump", "-t", str(self.binary)],
-                    capture_output=True, text=True, timeout=10
-                )
-                if result.returncode == 0:
-                    symbols = result.stdout.lower()
-                    fortify_symbols = ["__chk", "_chk@", "__fortify", "__sprintf_chk",
-                                      "__strcpy_chk", "__memcpy_chk"]
-                    if any(sym in symbols for sym in fortify_symbols):
-                        compiler["fortify_source"] = True
-                        report.warnings.append(
-                            "FORTIFY_SOURCE: Bounds checking on string/memory functions"
-                        )
-                    else:
-                        compiler["fortify_source"] = False
+                if open_elf(self.binary).checksec()["fortify"]:
+                    compiler["fortify_source"] = True
+                    report.warnings.append(
+                        "FORTIFY_SOURCE: Bounds checking on string/memory functions"
+                    )
+                else:
+                    compiler["fortify_source"] = False
             except Exception as e:
                 logger.debug(f"FORTIFY check failed: {e}")
 
         # Check for CFI (Control Flow Integrity) - always check via symbols
         try:
-            result = subprocess.run(
-                ["objdump", "-t", str(self.binary)],
-                capture_output=True, text=True, timeout=10
-            )
-            if result.returncode == 0:
-                symbols = result.stdout.lower()
-                if "__cfi" in symbols or "cfi_check" in symbols:
-                    compiler["cfi"] = True
-                    report.warnings.append(
-                        "CFI (Control Flow Integrity): Indirect calls validated"
-                    )
+            symbols = " ".join(open_elf(self.binary).symbol_names).lower()
+            if "__cfi" in symbols or "cfi_check" in symbols:
+                compiler["cfi"] = True
+                report.warnings.append(
+                    "CFI (Control Flow Integrity): Indirect calls validated"
+                )
         except Exception as e:
             logger.debug(f"CFI check failed: {e}")
 
@@ -2441,19 +2454,14 @@ int main() {
         }
 
         try:
-            # Use nm to get dynamic symbols
-            result = subprocess.run(
-                ['nm', '-D', str(self.binary)],
-                capture_output=True, text=True, timeout=10
-            )
+            # Dynamic symbols (imports and exports), without version suffixes
+            symbols = {sym.name for sym in open_elf(self.binary).dynamic_symbols}
 
             detected = []
-            if result.returncode == 0:
-                for func, note in dangerous_input_funcs.items():
-                    # Match function name (with possible @ version suffix)
-                    if re.search(rf'\b{func}(@|$|\s)', result.stdout):
-                        detected.append(func)
-                        logger.debug(f"Detected input handler: {func} ({note})")
+            for func, note in dangerous_input_funcs.items():
+                if func in symbols:
+                    detected.append(func)
+                    logger.debug(f"Detected input handler: {func} ({note})")
 
             report.detected_input_handlers = detected
 
@@ -2492,35 +2500,28 @@ int main() {
                        'vfprintf', 'vsprintf', 'vsnprintf', 'dprintf']
 
         try:
-            # Use objdump to find call instructions
-            result = subprocess.run(
-                ['objdump', '-d', str(self.binary)],
-                capture_output=True, text=True, timeout=30
-            )
-
-            if result.returncode == 0:
-                total_calls = 0
-                sink_counts = {}
-
-                for func in format_funcs:
-                    # Match: call <printf@plt> or call *<addr> with printf in relocation
-                    # Pattern: callq ... <printf@plt>
-                    count = len(re.findall(rf'call[q]?\s+[^<]*<{func}@plt>', result.stdout))
-                    if count > 0:
-                        sink_counts[func] = count
-                        total_calls += count
-
-                report.format_string_call_count = total_calls
-                report.format_string_sinks = sink_counts
-                report.single_shot_format_string = (total_calls == 1)
-
-                if total_calls > 0:
-                    logger.info(f"Format string sinks: {sink_counts} (total: {total_calls})")
-                    if report.single_shot_format_string:
-                        logger.warning(
-                            "SINGLE FORMAT STRING CALL: Limited exploitation - "
-                            "cannot chain writes across multiple printf calls"
-                        )
+            # Direct calls to each function's PLT stub (call <printf@plt>)
+            calls = open_elf(self.binary).plt_calls()
+
+            total_calls = 0
+            sink_counts = {}
+            for func in format_funcs:
+                count = calls.get(func, 0)
+                if count > 0:
+                    sink_counts[func] = count
+                    total_calls += count
+
+            report.format_string_call_count = total_calls
+            report.format_string_sinks = sink_counts
+            report.single_shot_format_string = (total_calls == 1)
+
+            if total_calls > 0:
+                logger.info(f"Format string sinks: {sink_counts} (total: {total_calls})")
+                if report.single_shot_format_string:
+                    logger.warning(
+                        "SINGLE FORMAT STRING CALL: Limited exploitation - "
+                        "cannot chain writes across multiple printf calls"
+                    )
 
         except Exception as e:
             logger.debug(f"Format string call counting failed: {e}")
@@ -2529,96 +2530,52 @@ int main() {
         """
         Query the actual libc for offsets (no database needed).
 
-        Uses ldd to find libc path, then nm/strings to get offsets.
+        Uses ldd to find libc path, then reads offsets from the libc's ELF tables.
         """
         if not self.binary:
             return
 
-        libc_info = LibcInfo()
-
-        try:
-            # Get libc path from ldd
-            result = subprocess.run(
-                ['ldd', str(self.binary)],
-                capture_output=True, text=True, timeout=10
-            )
-
-            if result.returncode == 0:
-                # Parse libc path: libc.so.6 => /lib/x86_64-linux-gnu/libc.so.6 (0x...)
-                match = re.search(r'libc\.so\.\d+\s+=>\s+(\S+)', result.stdout)
-                if match:
-                    libc_info.path = match.group(1)
-                    logger.info(f"Libc path: {libc_info.path}")
-
-            if not libc_info.path:
-                return
-
-            # Get libc version
-            try:
-                ver_result = subprocess.run(
-                    [libc_info.path],
-                    capture_output=True, text=True, timeout=5
-                )
-                # First line usually contains version
-                if ver_result.stdout:
-                    first_line = ver_result.stdout.split('\n')[0]
-                    libc_info.version = first_line
-            except (subprocess.SubprocessError, OSError):
-                pass  # Libc version detection failure is non-critical
-
-            # Query offsets using nm -D
-            nm_result = subprocess.run(
-                ['nm', '-D', libc_info.path],
-                capture_output=True, text=True, timeout=30
-            )
-
-            if nm_result.returncode == 0:
-                symbols = nm_result.stdout
-
-                # system() - handle versioned symbols like system@@GLIBC_2.2.5
-                match = re.search(r'^([0-9a-f]+)\s+\w+\s+system(?:@@|\s|$)', symbols, re.MULTILINE)
-                if match:
-                    libc_info.system_offset = int(match.group(1), 16)
-
-                # execve()
-                match = re.search(r'^([0-9a-f]+)\s+\w+\s+execve(?:@@|\s|$)', symbols, re.MULTILINE)
-                if match:
-                    libc_info.execve_offset = int(match.group(1), 16)
-
-                # __malloc_hook
-                match = re.search(r'^([0-9a-f]+)\s+\w+\s+__malloc_hook(?:@@|\s|$)', symbols, re.MULTILINE)
-                if match:
-                    libc_info.malloc_hook_offset = int(match.group(1), 16)
-
-                # __free_hook
-                match = re.search(r'^([0-9a-f]+)\s+\w+\s+__free_hook(?:@@|\s|$)', symbols, re.MULTILINE)
-                if match:
-                    libc_info.free_hook_offset = int(match.group(1), 16)
+        libc_path = find_libc_path(self.binary)
+        if not libc_path:
+            return
+        logger.info(f"Libc path: {libc_path}")
 
-            # Find "/bin/sh" string offset
-            strings_result = subprocess.run(
-                ['strings', '-t', 'x', libc_info.path],
-                capture_output=True, text=True, timeout=30
-            )
+        if self.host_facts is not None and self.host_facts.replay_libc(libc_path, report):
+            return
+        self._query_libc_details(report, libc_path)
 
-            if strings_result.returncode == 0:
-                match = re.search(r'^\s*([0-9a-f]+)\s+/bin/sh$', strings_result.stdout, re.MULTILINE)
-                if match:
-                    libc_info.bin_sh_offset = int(match.group(1), 16)
+    def _query_libc_details(self, report: FeasibilityReport, libc_path: str):
+        """Offsets, one_gadgets and 2-byte gadgets of one libc (independent of the binary)."""
+        libc_info = LibcInfo(path=libc_path)
 
-            # Try one_gadget if available
+        try:
+            # Version, offsets, /bin/sh and one_gadget output come from the
+            # persistent libc database; a libc is only parsed the first time
+            db = get_libc_db()
+            record = db.lookup(libc_info.path)
+            libc_info.version = record.version
+
+            # Offsets from the dynamic symbol table (default symbol versions)
+            for name, attr in (('system', 'system_offset'), ('execve', 'execve_offset'),
+                               ('__malloc_hook', 'malloc_hook_offset'),
+                               ('__free_hook', 'free_hook_offset')):
+                if name in record.symbols:
+                    setattr(libc_info, attr, record.symbols[name])
+
+            # "/bin/sh" string offset
+            if record.bin_sh_offset is not None:
+                libc_info.bin_sh_offset = record.bin_sh_offset
+
+            # Try one_gadget if available (run once per libc, then stored)
             try:
-                og_result = subprocess.run(
-                    ['one_gadget', libc_info.path],
-                    capture_output=True, text=True, timeout=60
-                )
-                if og_result.returncode == 0:
+                og_output = db.one_gadget_output(libc_info.path)
+                if og_output:
                     # Parse one_gadget output with constraints:
                     # 0xf8d09 execve("/bin/sh", rbp-0x50, r15)
                     # constraints:
                     #   address rbp-0x48 is writable
                     #   r14 == NULL || ...
-                    lines = og_result.stdout.split('\n')
+                    lines = og_output.split('\n')
                     current_gadget = None
                     current_constraints = []
 
@@ -2713,26 +2670,15 @@ int main() {
         useful_gadgets = []
 
         try:
-            # Use ROPgadget to find gadgets in low offset range
-            result = subprocess.run(
-                ['ROPgadget', '--binary', libc_path, '--offset', '0x0'],
-                capture_output=True, text=True, timeout=120
-            )
-
-            if result.returncode != 0:
+            # libc is position independent, so gadget addresses are offsets
+            try:
+                gadgets = get_gadgets(libc_path)
+            except GadgetToolError:
                 logger.debug("ROPgadget failed on libc")
                 return
 
-            # Parse gadgets and filter to 2-byte range
-            # Format: 0x00000000000XXXXX : gadget instruction
-            for line in result.stdout.split('\n'):
-                match = re.match(r'^(0x[0-9a-f]+)\s*:\s*(.+)$', line.strip())
-                if not match:
-                    continue
-
-                offset = int(match.group(1), 16)
-                gadget = match.group(2).strip()
-
+            # Filter to 2-byte range
+            for offset, gadget in gadgets:
                 # Only keep gadgets in 2-byte range (0x0000-0xFFFF)
                 # Actually, let's look at 0x20000-0x30000 range too (common "2XXXX" range)
                 # This is where partial overwrites often land
@@ -2806,55 +2752,21 @@ int main() {
         rop_info = ROPGadgetInfo()
 
         try:
-            # Run ROPgadget
-            result = subprocess.run(
-                ['ROPgadget', '--binary', str(self.binary)],
-                capture_output=True, text=True, timeout=120
-            )
-
-            if result.returncode != 0:
+            # Shared with BinaryContext and cache.py, so ROPgadget runs once per binary
+            try:
+                index = get_gadgets(str(self.binary)).index()
+            except GadgetToolError:
                 logger.debug("ROPgadget failed or not installed")
                 return
+            self._gadget_index = index
 
-            # Parse gadgets
-            gadgets = []
-            for line in result.stdout.split('\n'):
-                # Format: 0x0000000000401234 : pop rdi ; ret
-                match = re.match(r'^(0x[0-9a-f]+)\s+:\s+(.+)$', line.strip())
-                if match:
-                    addr = int(match.group(1), 16)
-                    instr = match.group(2).strip()
-                    gadgets.append((addr, instr))
-
-            rop_info.total_gadgets = len(gadgets)
-
-            # Filter by bad bytes
-            def has_bad_byte(addr: int) -> bool:
-                addr_bytes = addr.to_bytes(8, 'little')
-                return any(b in bad_bytes for b in addr_bytes)
-
-            # Charset filtering helpers
-            def is_printable_addr(addr: int) -> bool:
-                """Check if all non-null bytes in address are printable ASCII."""
-                for b in addr.to_bytes(8, 'little'):
-                    if b != 0 and not (0x20 <= b <= 0x7e):
-                        return False
-                return True
-
-            def is_alphanumeric_addr(addr: int) -> bool:
-                """Check if all non-null bytes in address are alphanumeric."""
-                for b in addr.to_bytes(8, 'little'):
-                    if b != 0 and not (0x30 <= b <= 0x39 or 0x41 <= b <= 0x5a or 0x61 <= b <= 0x7a):
-                        return False
-                return True
-
-            usable = [(addr, instr) for addr, instr in gadgets if not has_bad_byte(addr)]
-            rop_info.usable_gadgets = len(usable)
-            rop_info.filtered_by_bad_bytes = len(gadgets) - len(usable)
+            rop_info.total_gadgets = len(index)
+            rop_info.usable_gadgets = index.count(bad_bytes=bad_bytes)
+            rop_info.filtered_by_bad_bytes = rop_info.total_gadgets - rop_info.usable_gadgets
 
             # Count charset-compatible gadgets (for constrained input scenarios)
-            rop_info.printable_gadgets = sum(1 for addr, _ in usable if is_printable_addr(addr))
-            rop_info.alphanumeric_gadgets = sum(1 for addr, _ in usable if is_alphanumeric_addr(addr))
+            rop_info.printable_gadgets = index.count(bad_bytes=bad_bytes, charset='printable')
+            rop_info.alphanumeric_gadgets = index.count(bad_bytes=bad_bytes, charset='alphanumeric')
 
             # If payload constraints require charset filtering, note the impact
             if report.payload_constraints:
@@ -2866,63 +2778,13 @@ int main() {
                     logger.info(f"Charset filter (printable): {rop_info.printable_gadgets} gadgets usable")
 
             # Find essential gadgets (from usable set)
-            for addr, instr in usable:
-                instr_lower = instr.lower()
-
-                # pop rdi ; ret
-                if 'pop rdi' in instr_lower and 'ret' in instr_lower and not rop_info.pop_rdi_ret:
-                    if instr_lower.strip() in ['pop rdi ; ret', 'pop rdi; ret']:
-                        rop_info.pop_rdi_ret = addr
-
-                # pop rsi ; ret (may have pop r15)
-                if 'pop rsi' in instr_lower and 'ret' in instr_lower and not rop_info.pop_rsi_ret:
-                    rop_info.pop_rsi_ret = addr
-
-                # pop rdx ; ret
-                if 'pop rdx' in instr_lower and 'ret' in instr_lower and not rop_info.pop_rdx_ret:
-                    rop_info.pop_rdx_ret = addr
-
-                # pop rax ; ret
-                if 'pop rax' in instr_lower and 'ret' in instr_lower and not rop_info.pop_rax_ret:
-                    rop_info.pop_rax_ret = addr
-
-                # pop rbx ; ret
-                if 'pop rbx' in instr_lower and 'ret' in instr_lower and not rop_info.pop_rbx_ret:
-                    rop_info.pop_rbx_ret = addr
-
-                # pop rcx ; ret
-                if 'pop rcx' in instr_lower and 'ret' in instr_lower and not rop_info.pop_rcx_ret:
-                    rop_info.pop_rcx_ret = addr
-
-                # pop rbp ; ret
-                if 'pop rbp' in instr_lower and 'ret' in instr_lower and not rop_info.pop_rbp_ret:
-                    rop_info.pop_rbp_ret = addr
-
-                # pop rsp ; ret (stack pivot gadget)
-                if 'pop rsp' in instr_lower and 'ret' in instr_lower and not rop_info.pop_rsp_ret:
-                    rop_info.pop_rsp_ret = addr
-
-                # syscall ; ret
-                if 'syscall' in instr_lower and not rop_info.syscall_ret:
-                    rop_info.syscall_ret = addr
-
-                # leave ; ret (stack pivot)
-                if 'leave' in instr_lower and 'ret' in instr_lower and not rop_info.leave_ret:
-                    if instr_lower.strip() in ['leave ; ret', 'leave; ret']:
-                        rop_info.leave_ret = addr
-
-                # call rax (useful for calling function pointers)
-                if 'call rax' in instr_lower and not rop_info.call_rax:
-                    rop_info.call_rax = addr
-
-                # Simple ret
-                if instr_lower.strip() == 'ret' and not rop_info.ret:
-                    rop_info.ret = addr
+            for name, addr in index.key_gadgets(bad_bytes=bad_bytes).items():
+                setattr(rop_info, name, addr)
 
             # Store some gadgets for reference (convert to dict format for all_gadgets)
             rop_info.all_gadgets = [
                 {'address': addr, 'instruction': instr}
-                for addr, instr in usable[:50]
+                for addr, instr in index.query(bad_bytes=bad_bytes, limit=50)
             ]
 
             report.rop_gadgets = rop_info
@@ -2937,7 +2799,7 @@ int main() {
         """
         Analyze ELF structure for write targets.
 
-        Uses readelf to find sections and GOT entries.
+        Reads section headers and relocations to find sections and GOT entries.
         """
         if not self.binary:
             return
@@ -2945,92 +2807,29 @@ int main() {
         elf = ELFStructure()
 
         try:
-            # Get section headers
-            result = subprocess.run(
-                ['readelf', '-S', str(self.binary)],
-                capture_output=True, text=True, timeout=10
-            )
-
-            if result.returncode == 0:
-                # Parse sections - handle both single-line and multi-line formats
-                # Modern readelf uses two lines per section:
-                #   [23] .fini_array       FINI_ARRAY       0000000000003db0  00002db0
-                #        0000000000000008  0000000000000008  WA       0     0     8
-                # Older formats have it on one line
-
-                lines = result.stdout.split('\n')
-                current_section = None
-                current_addr = None
-
-                for i, line in enumerate(lines):
-                    # Try to match section header line: [Nr] Name Type Address Offset
-                    # Name can be truncated with [...] for long names
-                    match = re.search(
-                        r'\[\s*\d+\]\s+(\.[\w.\[\]]+)\s+\w+\s+([0-9a-f]+)\s+[0-9a-f]+',
-                        line
-                    )
-                    if match:
-                        name = match.group(1)
-                        # Handle truncated names like ".note.gnu.pr[...]"
-                        if '[...]' in name:
-                            name = name.split('[...]')[0]
-                        addr = int(match.group(2), 16)
-
-                        # Check if size is on this line (old format) or next line (new format)
-                        # Old: [ 1] .interp PROGBITS 0000000000400200 00000200 0000001c 00 A 0 0 1
-                        size_match = re.search(
-                            r'\[\s*\d+\]\s+\.[\w.\[\]]+\s+\w+\s+[0-9a-f]+\s+[0-9a-f]+\s+([0-9a-f]+)',
-                            line
-                        )
-                        if size_match:
-                            size = int(size_match.group(1), 16)
-                        else:
-                            # Size is on next line (new format)
-                            if i + 1 < len(lines):
-                                size_line = lines[i + 1].strip()
-                                size_match = re.match(r'^([0-9a-f]+)', size_line)
-                                if size_match:
-                                    size = int(size_match.group(1), 16)
-                                else:
-                                    size = 0
-                            else:
-                                size = 0
-
-                        if name == '.got.plt' or name == '.got':
-                            elf.got_plt_addr = addr
-                            elf.got_plt_size = size
-                        elif name == '.fini_array':
-                            elf.fini_array_addr = addr
-                            elf.fini_array_size = size
-                        elif name == '.init_array':
-                            elf.init_array_addr = addr
-                            elf.init_array_size = size
-                        elif name == '.bss':
-                            elf.bss_addr = addr
-                            elf.bss_size = size
-                        elif name == '.data':
-                            elf.data_addr = addr
-                            elf.data_size = size
-
-            # Get GOT entries (relocations)
-            rel_result = subprocess.run(
-                ['readelf', '-r', str(self.binary)],
-                capture_output=True, text=True, timeout=10
-            )
-
-            if rel_result.returncode == 0:
-                # Parse: Offset Info Type Sym.Value Sym.Name + Addend
-                for line in rel_result.stdout.split('\n'):
-                    # Match: 000000601018 000200000007 R_X86_64_JUMP_SLO 0000000000000000 printf@GLIBC_2.2.5
-                    match = re.search(
-                        r'^([0-9a-f]+)\s+[0-9a-f]+\s+\S+\s+[0-9a-f]+\s+(\w+)',
-                        line.strip()
-                    )
-                    if match:
-                        addr = int(match.group(1), 16)
-                        func = match.group(2).split('@')[0]  # Remove version
-                        if func and addr:
-                            elf.got_entries[func] = addr
+            binary = open_elf(self.binary)
+
+            # Section addresses and sizes
+            for section in binary.sections:
+                name, addr, size = section.name, section.addr, section.size
+                if name == '.got.plt' or name == '.got':
+                    elf.got_plt_addr = addr
+                    elf.got_plt_size = size
+                elif name == '.fini_array':
+                    elf.fini_array_addr = addr
+                    elf.fini_array_size = size
+                elif name == '.init_array':
+                    elf.init_array_addr = addr
+                    elf.init_array_size = size
+                elif name == '.bss':
+                    elf.bss_addr = addr
+                    elf.bss_size = size
+                elif name == '.data':
+                    elf.data_addr = addr
+                    elf.data_size = size
+
+            # GOT entries (relocation targets by symbol)
+            elf.got_entries.update(binary.got_entries())
 
             report.elf_structure = elf
             logger.info(f"ELF structure: GOT={len(elf.got_entries)} entries, "
@@ -3208,11 +3007,12 @@ int main() {
         report.write_targets = targets
         logger.info(f"Write targets: {len(targets)} identified")
 
-    def _sample_address_space(self, report: FeasibilityReport, num_samples: int = 5):
+    def _sample_address_space(self, report: FeasibilityReport, num_samples: Optional[int] = None):
         """
         Sample the address space to understand ASLR entropy and null byte issues.
 
-        Runs the binary multiple times to observe address variations.
+        Launches the binary many times (stopped at its entry point, see aslr.py)
+        to observe address variations.
         No database needed - direct runtime observation.
         """
         if not self.binary:
@@ -3221,73 +3021,15 @@ int main() {
 
         addr_info = AddressSpaceInfo()
 
-        # Collect samples by running binary and reading /proc/pid/maps
-        binary_bases = []
-        libc_bases = []
-        ld_bases = []  # Dynamic linker (ld-linux)
-        stack_addrs = []
-        heap_addrs = []
-
-        binary_name = self.binary.name
-
-        for i in range(num_samples):
-            try:
-                # Start process, get its maps, then kill it
-                # Use timeout to avoid hanging on interactive binaries
-                proc = subprocess.Popen(
-                    [str(self.binary)],
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
-
-                try:
-                    # Read /proc/pid/maps
-                    maps_path = f"/proc/{proc.pid}/maps"
-                    with open(maps_path, 'r') as f:
-                        maps_content = f.read()
-
-                    # Parse maps
-                    for line in maps_content.strip().split('\n'):
-                        parts = line.split()
-                        if len(parts) < 6:
-                            continue
-
-                        addr_range = parts[0]
-                        perms = parts[1]
-                        pathname = parts[5] if len(parts) > 5 else ""
-
-                        start_addr = int(addr_range.split('-')[0], 16)
-
-                        # Binary base (executable region of our binary)
-                        if binary_name in pathname and 'x' in perms:
-                            binary_bases.append(start_addr)
-
-                        # Libc base
-                        if 'libc' in pathname and 'x' in perms:
-                            libc_bases.append(start_addr)
-
-                        # Dynamic linker base (ld-linux-x86-64.so, ld-linux.so, ld.so)
-                        # Useful for ret2dlresolve attacks
-                        if ('ld-linux' in pathname or 'ld.so' in pathname) and 'x' in perms:
-                            ld_bases.append(start_addr)
-
-                        # Stack
-                        if '[stack]' in pathname:
-                            stack_addrs.append(start_addr)
-
-                        # Heap
-                        if '[heap]' in pathname:
-                            heap_addrs.append(start_addr)
-
-                finally:
-                    # Clean up
-                    proc.kill()
-                    proc.wait()
+        samples = sample_address_space(str(self.binary), num_samples or get_config().address_samples)
+        addr_info.samples = samples.count
+        addr_info.sample_method = samples.method
 
-            except Exception as e:
-                logger.debug(f"Sample {i} failed: {e}")
-                continue
+        binary_bases = samples.binary
+        libc_bases = samples.libc
+        ld_bases = samples.ld  # Dynamic linker (ld-linux)
+        stack_addrs = samples.stack
+        heap_addrs = samples.heap
 
         # Calculate entropy from observed variations
         def calculate_entropy(samples: List[int]) -> tuple:
@@ -3485,7 +3227,8 @@ int main() {
 
         # Analyze gadget quality if we have ROP info
         if report.rop_gadgets:
-            gadget_quality = analyze_gadget_quality(report.rop_gadgets, bad_bytes)
+            gadget_quality = analyze_gadget_quality(report.rop_gadgets, bad_bytes,
+                                                    index=self._gadget_index)
             binary_analysis.gadgets = gadget_quality
             report.gadget_quality = gadget_quality
 
@@ -3520,52 +3263,66 @@ int main() {
         This is separate from basic mitigation checks to allow incremental use.
         """
         logger.info("Running extended analysis...")
+        run_stages(report, self._extended_stages(vuln_type), self.max_workers)
+        logger.info("Extended analysis complete")
 
-        # 1. Detect input handlers from binary
-        self._detect_input_handlers(report)
+    def _extended_stages(self, vuln_type: Optional[str]) -> List[Stage]:
+        """Extended analysis stages, in sequential order."""
 
         # 2. Infer exploitation constraints from detected input handlers
         #    This populates blocked_techniques and viable_techniques
-        if report.detected_input_handlers and not report.exploitation_constraints:
-            # Use the most constraining detected handler
-            primary_handler = None
-            for h in ['strcpy', 'strcat', 'sprintf', 'gets', 'scanf']:
-                if h in report.detected_input_handlers:
-                    primary_handler = h
-                    break
-            if not primary_handler and report.detected_input_handlers:
-                primary_handler = report.detected_input_handlers[0]
-
-            if primary_handler:
-                logger.info(f"Inferring constraints from detected handler: {primary_handler}")
-                self._infer_payload_constraints(report, vuln_type or "", primary_handler)
-
-        # 3. Query libc for offsets
-        self._query_libc_info(report)
-
-        # 4. Analyze ELF structure
-        self._analyze_elf_structure(report)
-
-        # 5. Check seccomp
-        self._check_seccomp(report)
-
-        # 6. Sample address space (ASLR entropy, null bytes)
-        self._sample_address_space(report)
-
-        # 7. ROP gadget analysis (uses bad bytes from payload_constraints)
-        self._analyze_rop_gadgets(report)
-
-        # 8. Rank write targets
-        self._rank_write_targets(report)
+        def handler_constraints(report):
+            if report.detected_input_handlers and not report.exploitation_constraints:
+                # Use the most constraining detected handler
+                primary_handler = None
+                for h in ['strcpy', 'strcat', 'sprintf', 'gets', 'scanf']:
+                    if h in report.detected_input_handlers:
+                        primary_handler = h
+                        break
+                if not primary_handler and report.detected_input_handlers:
+                    primary_handler = report.detected_input_handlers[0]
+
+                if primary_handler:
+                    logger.info(f"Inferring constraints from detected handler: {primary_handler}")
+                    self._infer_payload_constraints(report, vuln_type or "", primary_handler)
+
+        # Stages reading payload_constraints also depend on both writers of it
+        constraints = ("payload_constraints", "handler_constraints")
+
+        stages = [
+            # 1. Detect input handlers from binary
+            Stage("input_handlers", self._detect_input_handlers),
+            Stage("handler_constraints", handler_constraints,
+                  depends_on=("input_handlers", "payload_constraints")),
+            # 3. Query libc for offsets
+            Stage("libc_info", self._query_libc_info),
+            # 4. Analyze ELF structure
+            Stage("elf_structure", self._analyze_elf_structure),
+            # 5. Check seccomp
+            Stage("seccomp", self._check_seccomp),
+            # 6. Sample address space (ASLR entropy, null bytes)
+            Stage("address_space", self._sample_address_space),
+            # 7. ROP gadget analysis (uses bad bytes from payload_constraints)
+            Stage("rop_gadgets", self._analyze_rop_gadgets, depends_on=constraints),
+            # 8. Rank write targets
+            Stage("write_targets", self._rank_write_targets, depends_on=constraints + (
+                "binary_protections", "glibc_mitigations", "libc_info", "elf_structure",
+            )),
+        ]
 
         # 9. Analyze exploit primitives
         if vuln_type:
-            self._analyze_exploit_primitives(report, vuln_type)
+            stages.append(Stage(
+                "exploit_primitives",
+                lambda report: self._analyze_exploit_primitives(report, vuln_type),
+                depends_on=("binary_protections", "glibc_mitigations", "rop_gadgets"),
+            ))
 
         # 10. Binary-specific analysis (ties mitigations to concrete targets)
-        self._analyze_binary_specific(report)
-
-        logger.info("Extended analysis complete")
+        stages.append(Stage("binary_specific", self._analyze_binary_specific, depends_on=constraints + (
+            "binary_protections", "elf_structure", "rop_gadgets",
+        )))
+        return stages
 
 
 def check_system_exploitability(vuln_type: str = None) -> FeasibilityReport:
@@ -17,12 +17,15 @@ Usage:
 """
 
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Any
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from core.logging import get_logger
 
 logger = get_logger()
 
+if TYPE_CHECKING:
+    from .batch import HostFacts
+
 
 # =============================================================================
 # Auto-Profile Selection
@@ -90,7 +93,8 @@ def _get_profile_for_vuln_type(vuln_type: str = None, binary_path: str = None):
 # =============================================================================
 
 def analyze_binary(binary_path: str, output_dir: str = None,
-                   vuln_type: str = None, extended: bool = True) -> Dict[str, Any]:
+                   vuln_type: str = None, extended: bool = True,
+                   host_facts: Optional["HostFacts"] = None) -> Dict[str, Any]:
     """
     Run mitigation analysis on a binary.
 
@@ -99,6 +103,8 @@ def analyze_binary(binary_path: str, output_dir: str = None,
         output_dir: Directory to save analysis results (optional)
         vuln_type: Vulnerability type for specific checks (optional)
         extended: Run extended analysis (libc offsets, ROP gadgets, etc.)
+        host_facts: Host/libc results shared across many binaries (optional,
+                   see batch.analyze_binaries)
 
     Returns:
         Dictionary with analysis results:
@@ -135,7 +141,7 @@ def analyze_binary(binary_path: str, output_dir: str = None,
     profile = _get_profile_for_vuln_type(vuln_type, str(binary_path) if binary_path else None)
 
     # Run analysis with appropriate profile
-    analyzer = FeasibilityAnalyzer(binary_path=binary_path, profile=profile)
+    analyzer = FeasibilityAnalyzer(binary_path=binary_path, profile=profile, host_facts=host_facts)
     report = analyzer.full_analysis(vuln_type=vuln_type, extended=extended)
 
     # Build clean result dict
@@ -406,6 +412,11 @@ def analyze_binary(binary_path: str, output_dir: str = None,
             'stack_sample': addr.stack_sample,
             'heap_sample': addr.heap_sample,
             'ld_base_sample': addr.ld_base_sample,  # For ret2dlresolve
+            'binary_entropy_bits': addr.binary_entropy_bits,
+            'libc_entropy_bits': addr.libc_entropy_bits,
+            'stack_entropy_bits': addr.stack_entropy_bits,
+            'samples': addr.samples,
+            'sample_method': addr.sample_method,
         }
 
     # Add bad byte impact analysis for each viable target
@@ -2064,6 +2075,210 @@ def what_if_mitigation_blocked(
     return result
 
 
+# Toggled mitigations are enumerated exhaustively; 2^16 scenarios is the limit
+MAX_SWEEP_MITIGATIONS = 16
+
+
+def _sweep_pair(
+    primitives: Dict[str, Any],
+    blocked_masks: List[int],
+    start: str,
+    goal: str,
+) -> List[Tuple[int, Optional[float]]]:
+    """
+    Path count and best reliability from start to goal in every scenario.
+
+    blocked_masks[i] is scenario i's blocked-primitive mask; bit j of i set
+    means toggled mitigation j is enabled. Enabling a mitigation only adds
+    blocks, so a pair unreachable with one toggle fewer stays unreachable
+    and is not searched again.
+    """
+    from .graph import compile_graph
+
+    compiled = compile_graph(primitives)
+    reliability: Dict[Tuple[str, ...], float] = {}
+    results: List[Tuple[int, Optional[float]]] = []
+
+    for scenario, blocked in enumerate(blocked_masks):
+        bits = scenario
+        pruned = False
+        while bits:
+            low = bits & -bits
+            if results[scenario ^ low][0] == 0:
+                pruned = True
+                break
+            bits ^= low
+        if pruned:
+            results.append((0, None))
+            continue
+
+        paths = compiled.paths(start, goal, 10, blocked)
+        for steps in paths:
+            if steps not in reliability:
+                value = 100.0
+                for step in steps:
+                    if step in primitives:
+                        value *= primitives[step].reliability / 100.0
+                reliability[steps] = value
+        best = max((reliability[steps] for steps in paths), default=None)
+        results.append((len(paths), best))
+
+    return results
+
+
+def sweep_mitigations(
+    mitigations: List[str] = None,
+    vulnerabilities: List[str] = None,
+    goals: List[str] = None,
+    binary_path: str = None,
+    binary_protections: Dict[str, Any] = None,
+    glibc_version: str = None,
+    workers: int = 1,
+) -> Dict[str, Any]:
+    """
+    Evaluate every combination of toggled mitigations at once.
+
+    Mitigations detected for the target (from binary_path, or from
+    binary_protections/glibc_version) that are not toggled stay enabled in
+    every scenario. Scenario i enables toggled mitigation j when bit j of i
+    is set; 'current' is the scenario matching the detected mitigations.
+
+    Scenarios that block the same primitives share one search, and a
+    vulnerability/goal pair already unreachable with one toggle fewer is not
+    searched again. Pairs are split across worker processes when workers > 1.
+
+    Args:
+        mitigations: Mitigations to toggle (default: every mitigation that
+                     blocks a primitive). At most MAX_SWEEP_MITIGATIONS.
+        vulnerabilities: Starting vulnerabilities (default: all)
+        goals: Goals to check (default: all goal primitives)
+        binary_path: Path to binary (optional - used to infer mitigations)
+        binary_protections: Dict with relro, pie, nx, canary status
+        glibc_version: glibc version string (e.g., "2.38")
+        workers: Worker processes (1 = evaluate in-process)
+
+    Returns:
+        {
+            'mitigations': ['full_relro', 'glibc_n_disabled', ...],  # Toggled, bit order
+            'fixed_mitigations': ['pie', ...],  # Enabled in every scenario
+            'vulnerabilities': [...],
+            'goals': [...],
+            'current': 2,
+            # Indexed [scenario][vulnerability][goal]; None = goal unreachable
+            'best_reliability': [[[81.0, None, ...], ...], ...],
+            'path_count': [12, 9, ...],  # Paths over all pairs, per scenario
+            # Single toggles from the current scenario, most paths removed first
+            'ranking': [
+                {'mitigation': 'glibc_n_disabled', 'change': 'enable',
+                 'paths_removed': 3, 'goals_removed': {'format_string_vuln': ['arbitrary_write']}},
+            ],
+            'summary': str
+        }
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from .analyzer import FeasibilityAnalyzer, create_dependency_graph
+    from .primitives import PrimitiveType
+
+    if binary_protections is None and binary_path:
+        report = FeasibilityAnalyzer(binary_path).full_analysis(extended=False)
+        binary_protections = dict(report.binary_protections)
+        glibc_version = report.glibc_version
+
+    graph = create_dependency_graph(
+        binary_protections=binary_protections,
+        glibc_version=glibc_version
+    )
+    primitives = graph.primitives
+
+    if mitigations is None:
+        mitigations = sorted({b for prim in primitives.values() for b in prim.blocked_by})
+    mitigations = list(dict.fromkeys(mitigations))
+    if len(mitigations) > MAX_SWEEP_MITIGATIONS:
+        raise ValueError(
+            f"Cannot sweep {len(mitigations)} mitigations (limit {MAX_SWEEP_MITIGATIONS})"
+        )
+    if vulnerabilities is None:
+        vulnerabilities = [n for n, p in primitives.items()
+                           if p.primitive_type == PrimitiveType.VULNERABILITY]
+    if goals is None:
+        goals = [n for n, p in primitives.items() if p.primitive_type == PrimitiveType.GOAL]
+
+    fixed = graph.active_mitigations - set(mitigations)
+    current = sum(1 << j for j, m in enumerate(mitigations) if m in graph.active_mitigations)
+
+    compiled, _ = graph._compiled()
+    scenario_count = 1 << len(mitigations)
+    blocked_masks = [
+        compiled.blocked_mask(frozenset(
+            fixed | {m for j, m in enumerate(mitigations) if scenario >> j & 1}
+        ))
+        for scenario in range(scenario_count)
+    ]
+
+    pairs = [(vuln, goal) for vuln in vulnerabilities for goal in goals]
+    args = ([primitives] * len(pairs), [blocked_masks] * len(pairs),
+            [v for v, _ in pairs], [g for _, g in pairs])
+    if workers > 1 and len(pairs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pairs))) as pool:
+            columns = list(pool.map(_sweep_pair, *args))
+    else:
+        columns = list(map(_sweep_pair, *args))
+    by_pair = dict(zip(pairs, columns))
+
+    best_reliability = [
+        [[by_pair[(vuln, goal)][scenario][1] for goal in goals] for vuln in vulnerabilities]
+        for scenario in range(scenario_count)
+    ]
+    path_count = [
+        sum(column[scenario][0] for column in columns)
+        for scenario in range(scenario_count)
+    ]
+
+    ranking = []
+    for j, mitigation in enumerate(mitigations):
+        other = current ^ (1 << j)
+        goals_removed: Dict[str, List[str]] = {}
+        for v, vuln in enumerate(vulnerabilities):
+            lost = [goal for g, goal in enumerate(goals)
+                    if best_reliability[current][v][g] is not None
+                    and best_reliability[other][v][g] is None]
+            if lost:
+                goals_removed[vuln] = lost
+        ranking.append({
+            'mitigation': mitigation,
+            'change': 'disable' if current >> j & 1 else 'enable',
+            'paths_removed': path_count[current] - path_count[other],
+            'goals_removed': goals_removed,
+        })
+    ranking.sort(key=lambda r: (-r['paths_removed'], r['mitigation']))
+
+    best = ranking[0] if ranking else None
+    if best and best['paths_removed'] > 0:
+        summary = (
+            f"Swept {scenario_count} scenario(s) over {len(mitigations)} mitigation(s). "
+            f"Best single change: {best['change']} '{best['mitigation']}' "
+            f"removes {best['paths_removed']} of {path_count[current]} path(s)."
+        )
+    else:
+        summary = (
+            f"Swept {scenario_count} scenario(s) over {len(mitigations)} mitigation(s). "
+            f"No single change removes any of the {path_count[current]} current path(s)."
+        )
+
+    return {
+        'mitigations': mitigations,
+        'fixed_mitigations': sorted(fixed),
+        'vulnerabilities': vulnerabilities,
+        'goals': goals,
+        'current': current,
+        'best_reliability': best_reliability,
+        'path_count': path_count,
+        'ranking': ranking,
+        'summary': summary,
+    }
+
+
 def get_primitive_requirements(primitive: str) -> Dict[str, Any]:
     """
     Get detailed information about a primitive's requirements.
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+ASLR sampling: where the kernel and loader place a binary's mappings.
+
+The target is started under ptrace (PTRACE_TRACEME), which stops it right
+after execve. A breakpoint is planted on the ELF entry point (AT_ENTRY) and
+the process is continued: the dynamic loader maps libc and the other
+libraries, then the process traps before _start runs. /proc/pid/maps is read
+at that point and the process is killed, so no target code executes and
+there is no race with the loader. Samples are taken in parallel threads
+(each thread traces the child it spawned), so a couple of hundred samples
+per binary take around a second.
+
+The heap is usually not mapped yet at the entry point (no brk before the
+program's first malloc), so ptrace samples normally have no heap addresses.
+Heap samples would need the target to run, which this launcher avoids.
+
+Where ptrace is unavailable (not Linux, ptrace_scope, seccomp, unsupported
+architecture) the binary is simply run and its maps read, as before; that
+is slower and racy, so far fewer samples are taken.
+
+Usage:
+    from packages.exploit_feasibility.aslr import sample_address_space, estimate_entropy
+
+    samples = sample_address_space("/path/to/binary", num_samples=200)
+    base, bits = estimate_entropy(samples.libc)
+"""
+
+import ctypes
+import os
+import signal
+import struct
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.elf import ELFError, open_elf
+from core.logging import get_logger
+
+from .constants import Architecture, Timeout
+
+logger = get_logger()
+
+# ptrace requests (linux/ptrace.h)
+PTRACE_TRACEME = 0
+PTRACE_PEEKDATA = 2
+PTRACE_POKEDATA = 5
+PTRACE_CONT = 7
+
+AT_ENTRY = 9
+
+# Breakpoint instruction and its width in bytes, per architecture
+BREAKPOINTS = {
+    Architecture.X86_64: (b"\xcc", 1),
+    Architecture.I386: (b"\xcc", 1),
+    Architecture.AARCH64: (struct.pack("<I", 0xd4200000), 4),  # brk #0
+}
+
+# Samples taken when the binary has to be run for real
+FALLBACK_SAMPLES = 5
+
+# Seconds one ptrace launch may take to reach its entry point
+SAMPLE_DEADLINE = Timeout.FAST
+
+
+@dataclass
+class AddressSamples:
+    """Per-region base addresses observed over many launches."""
+    binary: List[int] = field(default_factory=list)
+    libc: List[int] = field(default_factory=list)
+    ld: List[int] = field(default_factory=list)  # Dynamic linker (ld-linux)
+    stack: List[int] = field(default_factory=list)
+    heap: List[int] = field(default_factory=list)  # Usually empty with ptrace (unmapped at entry)
+    method: str = ""  # "ptrace" or "run"
+
+    @property
+    def count(self) -> int:
+        return max(len(self.binary), len(self.ld), len(self.stack))
+
+
+def parse_maps(maps: str, binary_name: str) -> Dict[str, int]:
+    """First executable mapping of the binary, libc and ld, plus stack/heap starts."""
+    regions: Dict[str, int] = {}
+    for line in maps.splitlines():
+        parts = line.split()
+        if len(parts) < 6:
+            continue
+
+        perms = parts[1]
+        pathname = parts[5]
+        start_addr = int(parts[0].split('-')[0], 16)
+
+        if 'x' in perms:
+            if binary_name in pathname:
+                regions.setdefault('binary', start_addr)
+            if 'libc' in pathname:
+                regions.setdefault('libc', start_addr)
+            # ld-linux-x86-64.so, ld-linux.so, ld.so; useful for ret2dlresolve
+            if 'ld-linux' in pathname or 'ld.so' in pathname:
+                regions.setdefault('ld', start_addr)
+        if pathname == '[stack]':
+            regions.setdefault('stack', start_addr)
+        elif pathname == '[heap]':
+            regions.setdefault('heap', start_addr)
+    return regions
+
+
+def estimate_entropy(samples: List[int]) -> Tuple[Optional[int], int]:
+    """
+    First sample and the number of address bits that varied across samples.
+
+    A lower bound on the randomised bits; with n samples a bit that is
+    randomised is missed with probability 2^-(n-1).
+    """
+    if not samples:
+        return None, 0
+    base = samples[0]
+    varying = 0
+    for s in samples[1:]:
+        varying |= base ^ s
+    return base, bin(varying).count('1')
+
+
+# =============================================================================
+# ptrace launcher
+# =============================================================================
+
+_libc = None
+_libc_lock = threading.Lock()
+
+
+def _ptrace_libc():
+    global _libc
+    with _libc_lock:
+        if _libc is None:
+            libc = ctypes.CDLL(None, use_errno=True)
+            libc.ptrace.restype = ctypes.c_long
+            libc.ptrace.argtypes = [ctypes.c_long, ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p]
+            _libc = libc
+    return _libc
+
+
+def _ptrace(request: int, pid: int, addr: int = 0, data: int = 0) -> int:
+    libc = _ptrace_libc()
+    ctypes.set_errno(0)
+    result = libc.ptrace(request, pid, ctypes.c_void_p(addr), ctypes.c_void_p(data))
+    err = ctypes.get_errno()
+    if result == -1 and err:
+        raise OSError(err, os.strerror(err))
+    return result
+
+
+def _traceme(ptrace):
+    """preexec_fn for Popen calling the already resolved ptrace function."""
+    def traceme() -> None:
+        # Runs in the forked child before exec: no locks (another sampler
+        # thread may have held one at fork time) and no lazy loading
+        ptrace(PTRACE_TRACEME, 0, None, None)
+    return traceme
+
+
+def _read_entry(pid: int, bits: int) -> Optional[int]:
+    """AT_ENTRY from the stopped process's auxiliary vector."""
+    word = "<QQ" if bits == 64 else "<II"
+    with open(f"/proc/{pid}/auxv", "rb") as f:
+        auxv = f.read()
+    for key, value in struct.iter_unpack(word, auxv[:len(auxv) - len(auxv) % struct.calcsize(word)]):
+        if key == AT_ENTRY:
+            return value
+    return None
+
+
+def _set_breakpoint(pid: int, address: int, breakpoint: bytes) -> None:
+    """Overwrite the start of the instruction at address with breakpoint."""
+    word_size = ctypes.sizeof(ctypes.c_long)
+    mask = (1 << (8 * word_size)) - 1
+    original = _ptrace(PTRACE_PEEKDATA, pid, address) & mask
+    data = bytearray(original.to_bytes(word_size, sys.byteorder))
+    data[:len(breakpoint)] = breakpoint
+    _ptrace(PTRACE_POKEDATA, pid, address, int.from_bytes(data, sys.byteorder))
+
+
+def _wait_stopped(pid: int, deadline: float) -> bool:
+    """
+    Wait for the tracee to stop; False if it exited or was killed instead.
+
+    Raises:
+        TimeoutError: If it neither stopped nor exited by deadline (monotonic)
+    """
+    delay = 0.0005
+    while True:
+        waited, status = os.waitpid(pid, os.WNOHANG)
+        if waited:
+            return os.WIFSTOPPED(status)
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"process {pid} did not stop in time")
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+
+def _sample_at_entry(binary_path: str, bits: int, breakpoint: bytes, ptrace) -> str:
+    """Start the binary, stop it at its entry point and return its maps."""
+    deadline = time.monotonic() + SAMPLE_DEADLINE
+    proc = subprocess.Popen(
+        [binary_path],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        preexec_fn=_traceme(ptrace),
+    )
+    try:
+        if not _wait_stopped(proc.pid, deadline):  # Stopped right after execve
+            raise OSError(f"{binary_path} did not stop after exec")
+
+        entry = _read_entry(proc.pid, bits)
+        if entry is None:
+            raise OSError("AT_ENTRY not found in auxv")
+        _set_breakpoint(proc.pid, entry, breakpoint)
+        _ptrace(PTRACE_CONT, proc.pid)
+        if not _wait_stopped(proc.pid, deadline):  # Loader done, trapped on _start
+            raise OSError(f"{binary_path} exited before reaching its entry point")
+
+        with open(f"/proc/{proc.pid}/maps", "r") as f:
+            return f.read()
+    finally:
+        try:
+            os.kill(proc.pid, signal.SIGKILL)
+            os.waitpid(proc.pid, 0)
+        except (ProcessLookupError, ChildProcessError):
+            pass
+        proc.returncode = -signal.SIGKILL
+
+
+def _sample_running(binary_path: str) -> str:
+    """Start the binary normally and read its maps before killing it."""
+    proc = subprocess.Popen(
+        [binary_path],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    try:
+        with open(f"/proc/{proc.pid}/maps", "r") as f:
+            return f.read()
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def _launcher(binary_path: str):
+    """Sampling function for binary_path: ptrace launcher if usable, else None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        elf = open_elf(binary_path)
+    except (ELFError, OSError):
+        return None
+    if elf.arch not in BREAKPOINTS or elf.little_endian != (sys.byteorder == "little"):
+        return None
+    breakpoint, _ = BREAKPOINTS[elf.arch]
+    # Resolved here, before any sampler thread forks
+    ptrace = _ptrace_libc().ptrace
+
+    def sample() -> str:
+        return _sample_at_entry(binary_path, elf.bits, breakpoint, ptrace)
+
+    # Probe once; ptrace may be denied (ptrace_scope, containers, seccomp)
+    try:
+        sample()
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"ptrace launcher unavailable for {binary_path}: {e}")
+        return None
+    return sample
+
+
+def sample_address_space(
+    binary_path: str,
+    num_samples: int = 200,
+    workers: Optional[int] = None,
+) -> AddressSamples:
+    """
+    Launch binary_path repeatedly and record where each region was mapped.
+
+    Args:
+        binary_path: Binary to sample
+        num_samples: Launches with the ptrace launcher; without it at most
+                     FALLBACK_SAMPLES launches are made
+        workers: Concurrent launches (default: CPU count, at most 16)
+
+    Returns:
+        AddressSamples with one entry per launch for each region found (the
+        heap is rarely found with ptrace, see the module docstring)
+    """
+    binary_path = str(binary_path)
+    samples = AddressSamples()
+    sample = _launcher(binary_path)
+
+    if sample is not None:
+        samples.method = "ptrace"
+        workers = workers or min(16, os.cpu_count() or 1)
+    else:
+        samples.method = "run"
+        num_samples = min(num_samples, FALLBACK_SAMPLES)
+        workers = 1
+
+        def sample() -> str:
+            return _sample_running(binary_path)
+
+    def safe_sample(i: int) -> str:
+        try:
+            return sample()
+        except Exception as e:
+            logger.debug(f"Sample {i} failed: {e}")
+            return ""
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aslr") as pool:
+        results = list(pool.map(safe_sample, range(num_samples), timeout=Timeout.MAX))
+
+    binary_name = Path(binary_path).name
+    for maps in results:
+        regions = parse_maps(maps, binary_name)
+        for region, address in regions.items():
+            getattr(samples, region).append(address)
+
+    logger.debug(f"Sampled {samples.count} launches of {binary_path} via {samples.method}")
+    return samples
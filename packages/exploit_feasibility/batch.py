@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Batch feasibility analysis for many binaries (e.g. an unpacked firmware image).
+
+analyze_binary() re-runs host-level checks for every binary: glibc version and
+mitigations (including the compiled %n test), kernel mitigations, and the
+libc offset / one_gadget / 2-byte gadget queries for the shared libc. For a
+batch these are computed once in the parent process as HostFacts and replayed
+into each binary's report. Identical binaries (same SHA-256) are analysed once
+and the remaining copies reported as duplicates.
+
+Usage:
+    from packages.exploit_feasibility.batch import analyze_binaries
+
+    for record in analyze_binaries("/path/to/rootfs", vuln_type="buffer_overflow"):
+        print(record["binary"], record["result"]["verdict"])
+
+    # CLI: one JSON object per binary, written as results arrive
+    python -m packages.exploit_feasibility.batch /path/to/rootfs -o results.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from core.logging import get_logger
+
+from .analyzer import FeasibilityAnalyzer, FeasibilityReport, find_libc_path
+from .api import _get_profile_for_vuln_type, analyze_binary
+from .gadgets import file_sha256
+from .profiles import TargetContext
+from .stages import Stage, StageEffect, record_stage
+
+logger = get_logger()
+
+ELF_MAGIC = b"\x7fELF"
+
+
+@dataclass
+class HostFacts:
+    """
+    Binary-independent analysis results, computed once per batch.
+
+    Only valid for the vuln_type they were computed with and for local
+    analysis on this host.
+    """
+    vuln_type: Optional[str] = None
+
+    # Recorded effects of host-level stages (glibc_mitigations, kernel_mitigations)
+    stages: Dict[str, StageEffect] = field(default_factory=dict)
+
+    # Recorded libc_info stage effect per libc path
+    libc: Dict[str, StageEffect] = field(default_factory=dict)
+
+    # glibc version the glibc check writes into the report's TargetProfile
+    profile_glibc_version: Optional[str] = None
+
+    def replay(self, name: str, report: FeasibilityReport) -> bool:
+        """Apply a recorded host stage to report. False if it was not recorded."""
+        effect = self.stages.get(name)
+        if effect is None:
+            return False
+        effect.apply(report)
+        if name == "glibc_mitigations" and report.profile and self.profile_glibc_version:
+            report.profile.glibc_version = self.profile_glibc_version
+        return True
+
+    def replay_libc(self, libc_path: str, report: FeasibilityReport) -> bool:
+        """Apply the recorded libc query for libc_path. False if it was not recorded."""
+        effect = self.libc.get(libc_path)
+        if effect is None:
+            return False
+        effect.apply(report)
+        return True
+
+
+def collect_host_facts(vuln_type: Optional[str] = None, libc_paths: Iterable[str] = ()) -> HostFacts:
+    """
+    Run the host-level checks once and record their results.
+
+    Args:
+        vuln_type: Vulnerability type the batch is analysed for
+        libc_paths: Libraries to query offsets/gadgets for (from find_libc_path)
+    """
+    analyzer = FeasibilityAnalyzer(profile=_get_profile_for_vuln_type(vuln_type))
+    facts = HostFacts(vuln_type=vuln_type)
+
+    report = FeasibilityReport(profile=analyzer.profile)
+    facts.stages["glibc_mitigations"] = record_stage(report, Stage(
+        "glibc_mitigations", lambda r: analyzer._check_glibc_mitigations(r, vuln_type=vuln_type)))
+    facts.profile_glibc_version = analyzer.profile.glibc_version
+    facts.stages["kernel_mitigations"] = record_stage(report, Stage(
+        "kernel_mitigations", analyzer._check_kernel_mitigations))
+
+    for libc_path in sorted(set(libc_paths)):
+        logger.info(f"Querying shared libc: {libc_path}")
+        facts.libc[libc_path] = record_stage(FeasibilityReport(), Stage(
+            "libc_info", lambda r, path=libc_path: analyzer._query_libc_details(r, path)))
+    return facts
+
+
+def find_elf_binaries(root: Union[str, Path]) -> List[Path]:
+    """ELF files under root (or root itself), sorted, not following symlinks."""
+    root = Path(root)
+    candidates = [root] if root.is_file() else (
+        Path(dirpath) / name
+        for dirpath, _, filenames in os.walk(root)
+        for name in filenames
+    )
+
+    found = []
+    for path in candidates:
+        if path.is_symlink() or not path.is_file():
+            continue
+        try:
+            with open(path, "rb") as f:
+                if f.read(4) == ELF_MAGIC:
+                    found.append(path)
+        except OSError:
+            continue
+    return sorted(found)
+
+
+# Per-process state for pool workers, set by _init_worker
+_worker_facts: Optional[HostFacts] = None
+
+
+def _init_worker(host_facts: Optional[HostFacts]) -> None:
+    global _worker_facts
+    _worker_facts = host_facts
+
+
+def _analyze_one(binary_path: str, vuln_type: Optional[str], extended: bool) -> Dict[str, Any]:
+    try:
+        return analyze_binary(binary_path, vuln_type=vuln_type, extended=extended,
+                              host_facts=_worker_facts)
+    except Exception as e:
+        logger.debug(f"Analysis of {binary_path} failed: {e}")
+        return {
+            'verdict': 'error',
+            'summary': f'Analysis failed: {e}',
+            'error': str(e),
+        }
+
+
+def _record(binary: Path, sha256: Optional[str], result: Dict[str, Any],
+            duplicate_of: Optional[Path] = None) -> Dict[str, Any]:
+    return {
+        'binary': str(binary),
+        'sha256': sha256,
+        'duplicate_of': str(duplicate_of) if duplicate_of else None,
+        'result': result,
+    }
+
+
+def analyze_binaries(
+    paths: Union[str, Path, Iterable[Union[str, Path]]],
+    vuln_type: Optional[str] = None,
+    extended: bool = True,
+    workers: Optional[int] = None,
+    share_host_facts: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Analyse many binaries in a process pool, yielding results as they finish.
+
+    Args:
+        paths: Directory to scan for ELF files, or an iterable of binary paths
+        vuln_type: Vulnerability type for specific checks (optional)
+        extended: Run extended analysis (libc offsets, ROP gadgets, etc.)
+        workers: Worker processes (default: CPU count; 1 = analyse in-process)
+        share_host_facts: Compute glibc/kernel/libc facts once for the batch
+
+    Yields:
+        One record per binary, in completion order:
+        {
+            'binary': str,
+            'sha256': str,
+            'duplicate_of': str | None,  # First path with the same contents
+            'result': {...},  # analyze_binary() result
+        }
+    """
+    if isinstance(paths, (str, Path)):
+        binaries = find_elf_binaries(paths)
+    else:
+        binaries = [Path(p) for p in paths]
+
+    # Group identical binaries by content hash
+    groups: Dict[str, List[Path]] = defaultdict(list)
+    for binary in binaries:
+        try:
+            groups[file_sha256(str(binary))].append(binary)
+        except OSError as e:
+            yield _record(binary, None, {
+                'verdict': 'error',
+                'summary': f'Binary not readable: {binary}',
+                'error': str(e),
+            })
+
+    unique = {sha256: copies[0] for sha256, copies in groups.items()}
+    logger.info(f"Batch: {len(binaries)} binaries, {len(unique)} unique")
+
+    host_facts = None
+    if share_host_facts and _get_profile_for_vuln_type(vuln_type).context == TargetContext.LOCAL_BINARY:
+        libc_paths = set()
+        if extended and unique:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                libc_paths = {p for p in pool.map(find_libc_path, unique.values()) if p}
+        host_facts = collect_host_facts(vuln_type, libc_paths)
+
+    def emit(sha256: str, result: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        first, *copies = groups[sha256]
+        yield _record(first, sha256, result)
+        for copy in copies:
+            yield _record(copy, sha256, result, duplicate_of=first)
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(unique) <= 1:
+        _init_worker(host_facts)
+        try:
+            for sha256, binary in unique.items():
+                yield from emit(sha256, _analyze_one(str(binary), vuln_type, extended))
+        finally:
+            _init_worker(None)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(unique)),
+                             initializer=_init_worker, initargs=(host_facts,)) as pool:
+        futures = {
+            pool.submit(_analyze_one, str(binary), vuln_type, extended): sha256
+            for sha256, binary in unique.items()
+        }
+        for future in as_completed(futures):
+            yield from emit(futures[future], future.result())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        description='RAPTOR exploit feasibility - batch analysis (JSON Lines output)')
+    ap.add_argument('paths', nargs='+', help='Directories to scan for ELF files, or binaries')
+    ap.add_argument('--vuln-type', help='Vulnerability type (e.g. buffer_overflow, format_string)')
+    ap.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    ap.add_argument('--no-extended', action='store_true', help='Skip extended analysis (libc, ROP, ...)')
+    ap.add_argument('-o', '--output', help='Write JSON Lines here instead of stdout')
+    args = ap.parse_args(argv)
+
+    if len(args.paths) == 1:
+        targets = args.paths[0]
+    else:
+        targets = [b for p in args.paths for b in find_elf_binaries(p)]
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for record in analyze_binaries(targets, vuln_type=args.vuln_type,
+                                       extended=not args.no_extended, workers=args.workers):
+            out.write(json.dumps(record, default=str) + '\n')
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,9 +3,9 @@
 Caching for expensive operations.
 
 Provides LRU caching for:
-- ROP gadget analysis
-- one_gadget execution
-- libc info queries
+- ROP gadget analysis (backed by the persistent store in gadgets.py)
+- one_gadget execution (backed by the persistent libc database in libc_db.py)
+- libc info queries (likewise)
 """
 
 import hashlib
@@ -14,7 +14,11 @@ from dataclasses import dataclass, field
 from functools import lru_cache
 from typing import List, Tuple
 
-from .constants import CacheSettings, Timeout
+from core.elf import ELFError
+
+from .constants import CacheSettings
+from .gadgets import GadgetToolError, clear_gadget_cache, get_gadgets
+from .libc_db import get_libc_db
 
 
 @dataclass
@@ -103,6 +107,9 @@ def cached_rop_analysis(binary_path: str, file_hash: str) -> CachedROPGadgets:
     """
     Cached ROP gadget analysis.
 
+    Gadgets come from the shared gadget store, so ROPgadget only runs if no
+    other call site or process has already extracted this binary.
+
     Args:
         binary_path: Path to binary
         file_hash: Hash of binary for cache invalidation
@@ -118,52 +125,35 @@ def cached_rop_analysis(binary_path: str, file_hash: str) -> CachedROPGadgets:
     info = CachedROPGadgets()
 
     try:
-        result = subprocess.run(
-            ['ROPgadget', '--binary', binary_path],
-            capture_output=True,
-            text=True,
-            timeout=Timeout.VERY_SLOW
-        )
-
-        if result.returncode != 0:
-            info.error = f"ROPgadget failed: {result.stderr}"
-            return info
-
-        for line in result.stdout.split('\n'):
-            if ' : ' in line:
-                parts = line.split(' : ', 1)
-                if len(parts) == 2:
-                    try:
-                        addr = int(parts[0].strip(), 16)
-                        gadget = parts[1].strip()
-                        info.gadgets.append((addr, gadget))
-                        info.total_gadgets += 1
-
-                        # Check for key gadgets
-                        gadget_lower = gadget.lower()
-                        if 'pop rdi' in gadget_lower and 'ret' in gadget_lower:
-                            if not info.pop_rdi_ret:
-                                info.pop_rdi_ret = addr
-                        elif 'pop rsi' in gadget_lower and 'ret' in gadget_lower:
-                            if not info.pop_rsi_ret:
-                                info.pop_rsi_ret = addr
-                        elif 'pop rdx' in gadget_lower and 'ret' in gadget_lower:
-                            if not info.pop_rdx_ret:
-                                info.pop_rdx_ret = addr
-                        elif 'pop rax' in gadget_lower and 'ret' in gadget_lower:
-                            if not info.pop_rax_ret:
-                                info.pop_rax_ret = addr
-                        elif gadget_lower == 'syscall ; ret' or gadget_lower == 'syscall; ret':
-                            if not info.syscall_ret:
-                                info.syscall_ret = addr
-                        elif gadget_lower == 'ret':
-                            if not info.ret:
-                                info.ret = addr
-                    except ValueError:
-                        continue
+        for addr, gadget in get_gadgets(binary_path):
+            info.gadgets.append((addr, gadget))
+            info.total_gadgets += 1
+
+            # Check for key gadgets
+            gadget_lower = gadget.lower()
+            if 'pop rdi' in gadget_lower and 'ret' in gadget_lower:
+                if not info.pop_rdi_ret:
+                    info.pop_rdi_ret = addr
+            elif 'pop rsi' in gadget_lower and 'ret' in gadget_lower:
+                if not info.pop_rsi_ret:
+                    info.pop_rsi_ret = addr
+            elif 'pop rdx' in gadget_lower and 'ret' in gadget_lower:
+                if not info.pop_rdx_ret:
+                    info.pop_rdx_ret = addr
+            elif 'pop rax' in gadget_lower and 'ret' in gadget_lower:
+                if not info.pop_rax_ret:
+                    info.pop_rax_ret = addr
+            elif gadget_lower == 'syscall ; ret' or gadget_lower == 'syscall; ret':
+                if not info.syscall_ret:
+                    info.syscall_ret = addr
+            elif gadget_lower == 'ret':
+                if not info.ret:
+                    info.ret = addr
 
         info.usable_gadgets = info.total_gadgets
 
+    except GadgetToolError as e:
+        info.error = str(e)
     except subprocess.TimeoutExpired:
         info.error = "ROPgadget timed out"
     except FileNotFoundError:
@@ -194,22 +184,14 @@ def cached_one_gadget(libc_path: str, file_hash: str) -> CachedOneGadgetResult:
     info = CachedOneGadgetResult(libc_path=libc_path)
 
     try:
-        result = subprocess.run(
-            ['one_gadget', libc_path],
-            capture_output=True,
-            text=True,
-            timeout=Timeout.SLOW
-        )
-
-        if result.returncode != 0 and not result.stdout:
-            info.error = f"one_gadget failed: {result.stderr}"
-            return info
+        # Raw output is kept in the libc database, so one_gadget runs once per libc
+        output = get_libc_db().one_gadget_output(libc_path)
 
         # Parse output
         current_offset = None
         current_constraints = []
 
-        for line in result.stdout.split('\n'):
+        for line in output.split('\n'):
             line = line.strip()
             if not line:
                 continue
@@ -281,61 +263,22 @@ def cached_libc_info(libc_path: str, file_hash: str) -> CachedLibcInfo:
     info = CachedLibcInfo(path=libc_path)
 
     try:
-        result = subprocess.run(
-            ['nm', '-D', libc_path],
-            capture_output=True,
-            text=True,
-            timeout=Timeout.NORMAL
-        )
-
-        if result.returncode != 0:
-            info.error = f"nm failed: {result.stderr}"
-            return info
-
-        for line in result.stdout.split('\n'):
-            parts = line.split()
-            if len(parts) >= 3:
-                try:
-                    addr = int(parts[0], 16)
-                    symbol = parts[2]
-
-                    if symbol == 'system':
-                        info.system_offset = addr
-                    elif symbol == '__malloc_hook':
-                        info.malloc_hook_offset = addr
-                    elif symbol == '__free_hook':
-                        info.free_hook_offset = addr
-                    elif symbol == '__exit_funcs':
-                        info.exit_funcs_offset = addr
-                    elif symbol == '_IO_list_all':
-                        info.io_list_all_offset = addr
-                except ValueError:
-                    continue
-
-        # Find /bin/sh string
-        try:
-            strings_result = subprocess.run(
-                ['strings', '-a', '-t', 'x', libc_path],
-                capture_output=True,
-                text=True,
-                timeout=Timeout.MEDIUM
-            )
-            for line in strings_result.stdout.split('\n'):
-                if '/bin/sh' in line:
-                    parts = line.strip().split()
-                    if parts:
-                        try:
-                            info.binsh_offset = int(parts[0], 16)
-                            break
-                        except ValueError:
-                            continue
-        except Exception:
-            pass
-
-    except subprocess.TimeoutExpired:
-        info.error = "nm timed out"
-    except Exception as e:
-        info.error = str(e)
+        record = get_libc_db().lookup(libc_path)
+    except (ELFError, OSError) as e:
+        info.error = f"Could not read libc: {e}"
+        return info
+
+    for symbol, attr in (('system', 'system_offset'),
+                         ('__malloc_hook', 'malloc_hook_offset'),
+                         ('__free_hook', 'free_hook_offset'),
+                         ('__exit_funcs', 'exit_funcs_offset'),
+                         ('_IO_list_all', 'io_list_all_offset')):
+        if symbol in record.symbols:
+            setattr(info, attr, record.symbols[symbol])
+
+    # /bin/sh string
+    if record.bin_sh_offset is not None:
+        info.binsh_offset = record.bin_sh_offset
 
     return info
 
@@ -377,7 +320,8 @@ def get_libc_info(libc_path: str) -> CachedLibcInfo:
 
 
 def clear_caches():
-    """Clear all analysis caches."""
+    """Clear all in-process analysis caches (the on-disk gadget and libc stores are kept)."""
     cached_rop_analysis.cache_clear()
+    clear_gadget_cache()
     cached_one_gadget.cache_clear()
     cached_libc_info.cache_clear()
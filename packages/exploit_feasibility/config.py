@@ -47,10 +47,12 @@ class AnalysisConfig:
     libc_cache_size: int = 8
 
     # Analysis settings
+    analysis_workers: int = 4  # Concurrent analysis stages (1 = sequential)
     max_gadgets_to_analyze: int = 10000
     max_write_targets: int = 50
     verify_format_n_empirically: bool = True
     sample_address_space: bool = True
+    address_samples: int = 200  # Launches per binary for ASLR entropy estimates
 
     # Output settings
     verbose: bool = False
@@ -110,6 +112,8 @@ class AnalysisConfig:
             'RAPTOR_ENABLE_CACHING': ('enable_caching', lambda x: x.lower() == 'true'),
             'RAPTOR_CACHE_DIR': ('cache_dir', str),
             'RAPTOR_ROP_CACHE_SIZE': ('rop_cache_size', int),
+            'RAPTOR_ANALYSIS_WORKERS': ('analysis_workers', int),
+            'RAPTOR_ADDRESS_SAMPLES': ('address_samples', int),
             'RAPTOR_MAX_GADGETS': ('max_gadgets_to_analyze', int),
             'RAPTOR_VERIFY_FORMAT_N': ('verify_format_n_empirically', lambda x: x.lower() == 'true'),
             'RAPTOR_VERBOSE': ('verbose', lambda x: x.lower() == 'true'),
@@ -142,10 +146,12 @@ class AnalysisConfig:
             'rop_cache_size': self.rop_cache_size,
             'one_gadget_cache_size': self.one_gadget_cache_size,
             'libc_cache_size': self.libc_cache_size,
+            'analysis_workers': self.analysis_workers,
             'max_gadgets_to_analyze': self.max_gadgets_to_analyze,
             'max_write_targets': self.max_write_targets,
             'verify_format_n_empirically': self.verify_format_n_empirically,
             'sample_address_space': self.sample_address_space,
+            'address_samples': self.address_samples,
             'verbose': self.verbose,
             'include_raw_gadgets': self.include_raw_gadgets,
             'max_raw_gadgets_in_output': self.max_raw_gadgets_in_output,
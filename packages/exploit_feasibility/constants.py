@@ -5,7 +5,7 @@ Constants for exploit feasibility analysis.
 Centralizes magic numbers and thresholds with explanations.
 """
 
-import subprocess
+from core.elf import ELFError, open_elf
 
 
 # =============================================================================
@@ -54,7 +54,7 @@ def detect_architecture(binary_path: str) -> str:
     """
     Detect binary architecture from ELF header.
 
-    Uses pwntools if available, falls back to readelf.
+    Uses pwntools if available, falls back to the ELF header's e_machine.
 
     Args:
         binary_path: Path to ELF binary
@@ -83,47 +83,14 @@ def detect_architecture(binary_path: str) -> str:
     except Exception:
         pass
 
-    # Fallback to readelf
+    # Fallback: read e_machine from the ELF header
     try:
-        result = subprocess.run(
-            ['readelf', '-h', binary_path],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-
-        if result.returncode == 0:
-            for line in result.stdout.split('\n'):
-                if 'Machine:' in line:
-                    machine = line.split(':', 1)[1].strip()
-
-                    # Check our mapping
-                    for key, arch in Architecture.ELF_MACHINE_MAP.items():
-                        if key in machine:
-                            return arch
-
-                    # Handle variations
-                    machine_lower = machine.lower()
-                    if 'x86-64' in machine_lower or 'amd64' in machine_lower:
-                        return Architecture.X86_64
-                    elif '386' in machine_lower or 'i386' in machine_lower:
-                        return Architecture.I386
-                    elif 'aarch64' in machine_lower or 'arm64' in machine_lower:
-                        return Architecture.AARCH64
-                    elif 'arm' in machine_lower:
-                        return Architecture.ARM
-                    elif 'mips' in machine_lower:
-                        if '64' in machine_lower:
-                            return Architecture.MIPS64
-                        return Architecture.MIPS
-                    elif 'powerpc' in machine_lower or 'ppc' in machine_lower:
-                        if '64' in machine_lower:
-                            return Architecture.POWERPC64
-                        return Architecture.POWERPC
-                    elif 'riscv' in machine_lower:
-                        return Architecture.RISCV64
-
-    except (subprocess.SubprocessError, OSError):
+        arch = open_elf(binary_path).arch
+        if arch == "riscv32":
+            arch = Architecture.RISCV64  # Only 64-bit RISC-V is modelled
+        if arch in Architecture.ELF_MACHINE_MAP.values() or arch == Architecture.MIPS64:
+            return arch
+    except (ELFError, OSError):
         pass
 
     # Default to x86_64 if detection fails
@@ -429,6 +429,9 @@ class LibcFingerprintingPotential:
     feasibility: str = ""  # "good", "limited", "poor"
     confidence: str = ""  # "high", "medium", "low"
 
+    # Indexed libcs matching the leaked addresses (only when leaks were given)
+    candidate_libcs: List[str] = field(default_factory=list)
+
     # Guidance
     notes: List[str] = field(default_factory=list)
 
@@ -446,6 +449,8 @@ class LibcFingerprintingPotential:
 
         lines.append(f"  Feasibility: {self.feasibility.title()}")
         lines.append(f"  Confidence: {self.confidence}")
+        for candidate in self.candidate_libcs:
+            lines.append(f"  Candidate libc: {candidate}")
 
         if self.notes:
             for note in self.notes:
@@ -460,6 +465,7 @@ class LibcFingerprintingPotential:
             'symbol_count': self.symbol_count,
             'feasibility': self.feasibility,
             'confidence': self.confidence,
+            'candidate_libcs': self.candidate_libcs,
             'notes': self.notes,
         }
 
@@ -478,6 +484,7 @@ GOOD_FINGERPRINT_SYMBOLS = {
 def assess_libc_fingerprinting(
     plt_symbols: List[str],
     got_symbols: Optional[List[str]] = None,
+    leaks: Optional[Dict[str, int]] = None,
 ) -> LibcFingerprintingPotential:
     """
     Assess whether libc can be reliably identified from available symbols.
@@ -488,6 +495,8 @@ def assess_libc_fingerprinting(
     Args:
         plt_symbols: Symbols in the PLT (callable from binary)
         got_symbols: Symbols in the GOT (if different from PLT)
+        leaks: Leaked runtime addresses (symbol -> address); if given, matching
+               libcs are looked up in the libc database (see libc_db.py)
 
     Returns:
         LibcFingerprintingPotential assessment
@@ -536,4 +545,19 @@ def assess_libc_fingerprinting(
     if 'system' in useful_symbols:
         result.notes.append("system in PLT - may not need full libc base if ret2plt viable")
 
+    if leaks:
+        from .libc_db import get_libc_db
+
+        matches = get_libc_db().identify(leaks)
+        result.candidate_libcs = [
+            f"{m.path} ({m.version or m.build_id or m.sha256[:16]})" for m in matches
+        ]
+        if len(matches) == 1:
+            result.confidence = "high"
+            result.notes.append("Leaks identify a single indexed libc")
+        elif matches:
+            result.notes.append(f"Leaks match {len(matches)} indexed libcs - leak another symbol to narrow")
+        else:
+            result.notes.append("No indexed libc matches the leaks - index more with libc_db scan")
+
     return result
@@ -24,11 +24,12 @@ Usage:
 
 import json
 import subprocess
-import re
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
+from core.elf import open_elf
+
 # Import logging from parent package
 try:
     from ..logging import get_logger
@@ -37,6 +38,11 @@ except ImportError:
     import logging
     logger = logging.getLogger(__name__)
 
+from .aslr import sample_address_space
+from .config import get_config
+from .gadgets import get_gadgets
+from .libc_db import get_libc_db
+
 
 # =============================================================================
 # Data Classes - Shared between mitigation analysis and exploit generation
@@ -277,7 +283,7 @@ class AddressSpaceInfo:
     binary_base_sample: Optional[int] = None
     libc_base_sample: Optional[int] = None
     stack_sample: Optional[int] = None
-    heap_sample: Optional[int] = None
+    heap_sample: Optional[int] = None  # Usually None with ptrace sampling (unmapped at entry)
     ld_base_sample: Optional[int] = None  # Linker base
 
     # Entropy estimates (bits of randomization)
@@ -290,6 +296,10 @@ class AddressSpaceInfo:
     libc_has_nulls: bool = False
     stack_has_nulls: bool = False
 
+    # How the samples were taken: launches observed, "ptrace" or "run" (see aslr.py)
+    samples: int = 0
+    sample_method: str = ""
+
     # Null byte position (which byte position has first null, 0-7)
     # On x86_64 userland, this is typically byte 6 (addresses are 0x00007fff...)
     null_byte_position: int = 6
@@ -819,7 +829,7 @@ class BinaryContext:
         self.infer_exploitation_constraints(arch)
 
     def collect_protections(self):
-        """Collect binary protections using checksec/readelf."""
+        """Collect binary protections from the ELF headers and symbols."""
         if not self.binary_path:
             return
 
@@ -833,39 +843,9 @@ class BinaryContext:
         }
 
         try:
-            # Use readelf to check protections
-            result = subprocess.run(
-                ['readelf', '-d', self.binary_path],
-                capture_output=True, text=True, timeout=10
-            )
-
-            output = result.stdout
-            if 'BIND_NOW' in output:
-                self.protections['full_relro'] = True
-                self.protections['relro'] = True
-            elif 'RELRO' in output or 'GNU_RELRO' in output:
-                self.protections['relro'] = True
-
-            # Check for PIE
-            result = subprocess.run(
-                ['readelf', '-h', self.binary_path],
-                capture_output=True, text=True, timeout=10
-            )
-            if 'DYN' in result.stdout:
-                self.protections['pie'] = True
-
-            # Check for stack canary
-            result = subprocess.run(
-                ['readelf', '-s', self.binary_path],
-                capture_output=True, text=True, timeout=10
-            )
-            if '__stack_chk_fail' in result.stdout:
-                self.protections['canary'] = True
-
-            # Check for FORTIFY
-            if '__fortify_fail' in result.stdout or '_chk@' in result.stdout:
-                self.protections['fortify'] = True
-
+            checks = open_elf(self.binary_path).checksec()
+            for key in self.protections:
+                self.protections[key] = checks[key]
         except Exception as e:
             logger.debug(f"Protection check failed: {e}")
 
@@ -889,16 +869,10 @@ class BinaryContext:
         }
 
         try:
-            result = subprocess.run(
-                ['nm', '-D', self.binary_path],
-                capture_output=True, text=True, timeout=10
-            )
-
-            for line in result.stdout.split('\n'):
-                for func in input_funcs:
-                    if f' {func}@' in line or f' {func}' in line.split()[-1:]:
-                        if func not in self.input_handlers:
-                            self.input_handlers.append(func)
+            symbols = {sym.name for sym in open_elf(self.binary_path).dynamic_symbols}
+            for func in sorted(input_funcs & symbols):
+                if func not in self.input_handlers:
+                    self.input_handlers.append(func)
 
         except Exception as e:
             logger.debug(f"Input handler detection failed: {e}")
@@ -938,60 +912,24 @@ class BinaryContext:
             if not self.libc_info.path:
                 return
 
-            # Get libc version
-            result = subprocess.run(
-                [self.libc_info.path],
-                capture_output=True, text=True, timeout=5
-            )
-            self.libc_info.version = result.stdout.split('\n')[0] if result.stdout else ""
+            # Version, offsets, /bin/sh and one_gadget output from the libc database
+            db = get_libc_db()
+            record = db.lookup(self.libc_info.path)
+            self.libc_info.version = record.version
 
-            # Get symbol offsets using nm
-            result = subprocess.run(
-                ['nm', '-D', self.libc_info.path],
-                capture_output=True, text=True, timeout=30
-            )
+            for name, attr in (('system', 'system_offset'), ('execve', 'execve_offset'),
+                               ('__environ', 'environ_offset'), ('environ', 'environ_offset'),
+                               ('__malloc_hook', 'malloc_hook_offset'),
+                               ('__free_hook', 'free_hook_offset')):
+                if name in record.symbols:
+                    setattr(self.libc_info, attr, record.symbols[name])
 
-            for line in result.stdout.split('\n'):
-                parts = line.split()
-                if len(parts) >= 3:
-                    addr, _, name = parts[0], parts[1], parts[2]
-                    try:
-                        offset = int(addr, 16)
-                        if name == 'system':
-                            self.libc_info.system_offset = offset
-                        elif name == 'execve':
-                            self.libc_info.execve_offset = offset
-                        elif name == '__environ' or name == 'environ':
-                            self.libc_info.environ_offset = offset
-                        elif name == '__malloc_hook':
-                            self.libc_info.malloc_hook_offset = offset
-                        elif name == '__free_hook':
-                            self.libc_info.free_hook_offset = offset
-                    except ValueError:
-                        continue
-
-            # Find /bin/sh string offset
-            result = subprocess.run(
-                ['strings', '-t', 'x', self.libc_info.path],
-                capture_output=True, text=True, timeout=30
-            )
-            for line in result.stdout.split('\n'):
-                if '/bin/sh' in line:
-                    parts = line.strip().split(None, 1)
-                    if parts:
-                        try:
-                            self.libc_info.bin_sh_offset = int(parts[0], 16)
-                            break
-                        except ValueError:
-                            continue
+            if record.bin_sh_offset is not None:
+                self.libc_info.bin_sh_offset = record.bin_sh_offset
 
             # Try one_gadget if available
             try:
-                result = subprocess.run(
-                    ['one_gadget', self.libc_info.path],
-                    capture_output=True, text=True, timeout=60
-                )
-                for line in result.stdout.split('\n'):
+                for line in db.one_gadget_output(self.libc_info.path).split('\n'):
                     if line.startswith('0x'):
                         try:
                             offset = int(line.split()[0], 16)
@@ -1015,64 +953,19 @@ class BinaryContext:
         self.elf_structure = ELFStructure()
 
         try:
-            # Get section headers
-            result = subprocess.run(
-                ['readelf', '-S', self.binary_path],
-                capture_output=True, text=True, timeout=10
-            )
-
-            for line in result.stdout.split('\n'):
-                # Parse section info
-                if '.got.plt' in line:
-                    match = re.search(r'([0-9a-f]+)\s+([0-9a-f]+)\s+', line)
-                    if match:
-                        self.elf_structure.got_plt_addr = int(match.group(1), 16)
-                        self.elf_structure.got_plt_size = int(match.group(2), 16)
-                elif '.fini_array' in line:
-                    match = re.search(r'([0-9a-f]+)\s+([0-9a-f]+)\s+', line)
-                    if match:
-                        self.elf_structure.fini_array_addr = int(match.group(1), 16)
-                        self.elf_structure.fini_array_size = int(match.group(2), 16)
-                elif '.init_array' in line:
-                    match = re.search(r'([0-9a-f]+)\s+', line)
-                    if match:
-                        self.elf_structure.init_array_addr = int(match.group(1), 16)
-                elif '.bss' in line and '.bss' in line.split()[0:2]:
-                    match = re.search(r'([0-9a-f]+)\s+([0-9a-f]+)\s+', line)
-                    if match:
-                        self.elf_structure.bss_addr = int(match.group(1), 16)
-                        self.elf_structure.bss_size = int(match.group(2), 16)
-
-            # Get GOT entries
-            result = subprocess.run(
-                ['readelf', '-r', self.binary_path],
-                capture_output=True, text=True, timeout=10
-            )
-
-            for line in result.stdout.split('\n'):
-                if 'JUMP_SLOT' in line or 'GLOB_DAT' in line:
-                    parts = line.split()
-                    if len(parts) >= 5:
-                        try:
-                            addr = int(parts[0], 16)
-                            name = parts[-1].split('@')[0]
-                            self.elf_structure.got_entries[name] = addr
-                        except (ValueError, IndexError):
-                            continue
+            elf = open_elf(self.binary_path)
 
-            # Get PLT entries
-            result = subprocess.run(
-                ['objdump', '-d', '-j', '.plt', self.binary_path],
-                capture_output=True, text=True, timeout=10
-            )
+            # Section addresses and sizes
+            for name, field_prefix in (('.got.plt', 'got_plt'), ('.fini_array', 'fini_array'),
+                                       ('.init_array', 'init_array'), ('.bss', 'bss')):
+                section = elf.section(name)
+                if section is not None:
+                    setattr(self.elf_structure, f'{field_prefix}_addr', section.addr)
+                    setattr(self.elf_structure, f'{field_prefix}_size', section.size)
 
-            for line in result.stdout.split('\n'):
-                if '@plt>' in line:
-                    match = re.search(r'([0-9a-f]+)\s+<(\w+)@plt>', line)
-                    if match:
-                        addr = int(match.group(1), 16)
-                        name = match.group(2)
-                        self.elf_structure.plt_entries[name] = addr
+            # GOT slots (JUMP_SLOT / GLOB_DAT relocations) and PLT stubs
+            self.elf_structure.got_entries.update(elf.got_slots())
+            self.elf_structure.plt_entries.update(elf.plt_entries())
 
         except Exception as e:
             logger.debug(f"ELF structure analysis failed: {e}")
@@ -1094,59 +987,19 @@ class BinaryContext:
         self.rop_gadgets = ROPGadgetInfo()
 
         try:
-            result = subprocess.run(
-                ['ROPgadget', '--binary', self.binary_path],
-                capture_output=True, text=True, timeout=120
-            )
+            index = get_gadgets(self.binary_path).index()
 
-            gadgets = []
-            for line in result.stdout.split('\n'):
-                if ' : ' in line:
-                    parts = line.split(' : ', 1)
-                    if len(parts) == 2:
-                        try:
-                            addr = int(parts[0].strip(), 16)
-                            insn = parts[1].strip()
-                            gadgets.append({'address': addr, 'instructions': insn})
-                        except ValueError:
-                            continue
-
-            self.rop_gadgets.total_gadgets = len(gadgets)
-
-            # Filter by bad bytes
-            def has_bad_bytes(addr: int) -> bool:
-                addr_bytes = addr.to_bytes(8, 'little')
-                return any(b in bad_bytes for b in addr_bytes)
-
-            usable = []
-            for g in gadgets:
-                if not has_bad_bytes(g['address']):
-                    usable.append(g)
-                else:
-                    self.rop_gadgets.filtered_by_bad_bytes += 1
-
-            self.rop_gadgets.usable_gadgets = len(usable)
-            self.rop_gadgets.all_gadgets = usable
+            self.rop_gadgets.total_gadgets = len(index)
+            self.rop_gadgets.all_gadgets = [
+                {'address': addr, 'instructions': insn}
+                for addr, insn in index.query(bad_bytes=bad_bytes)
+            ]
+            self.rop_gadgets.usable_gadgets = len(self.rop_gadgets.all_gadgets)
+            self.rop_gadgets.filtered_by_bad_bytes = len(index) - self.rop_gadgets.usable_gadgets
 
             # Find essential gadgets
-            for g in usable:
-                insn = g['instructions'].lower()
-                addr = g['address']
-
-                if 'pop rdi' in insn and 'ret' in insn and not self.rop_gadgets.pop_rdi_ret:
-                    self.rop_gadgets.pop_rdi_ret = addr
-                elif 'pop rsi' in insn and 'ret' in insn and not self.rop_gadgets.pop_rsi_ret:
-                    self.rop_gadgets.pop_rsi_ret = addr
-                elif 'pop rdx' in insn and 'ret' in insn and not self.rop_gadgets.pop_rdx_ret:
-                    self.rop_gadgets.pop_rdx_ret = addr
-                elif 'pop rax' in insn and 'ret' in insn and not self.rop_gadgets.pop_rax_ret:
-                    self.rop_gadgets.pop_rax_ret = addr
-                elif insn == 'ret' and not self.rop_gadgets.ret:
-                    self.rop_gadgets.ret = addr
-                elif 'leave' in insn and 'ret' in insn and not self.rop_gadgets.leave_ret:
-                    self.rop_gadgets.leave_ret = addr
-                elif 'syscall' in insn and not self.rop_gadgets.syscall_ret:
-                    self.rop_gadgets.syscall_ret = addr
+            for name, addr in index.key_gadgets(bad_bytes=bad_bytes).items():
+                setattr(self.rop_gadgets, name, addr)
 
         except FileNotFoundError:
             logger.warning("ROPgadget not installed")
@@ -1157,55 +1010,21 @@ class BinaryContext:
         logger.info(f"ROP gadgets: {self.rop_gadgets.total_gadgets} total, "
                    f"{self.rop_gadgets.usable_gadgets} usable")
 
-    def collect_address_space(self, num_samples: int = 5):
+    def collect_address_space(self, num_samples: Optional[int] = None):
         """Sample address space to understand ASLR entropy."""
         if not self.binary_path:
             return
 
         self.address_space = AddressSpaceInfo()
-        binary_name = Path(self.binary_path).name
 
-        binary_bases = []
-        libc_bases = []
-        stack_addrs = []
-        heap_addrs = []
+        samples = sample_address_space(self.binary_path, num_samples or get_config().address_samples)
+        self.address_space.samples = samples.count
+        self.address_space.sample_method = samples.method
 
-        for _ in range(num_samples):
-            try:
-                proc = subprocess.Popen(
-                    [self.binary_path],
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
-
-                try:
-                    with open(f"/proc/{proc.pid}/maps", 'r') as f:
-                        for line in f:
-                            parts = line.split()
-                            if len(parts) < 6:
-                                continue
-
-                            addr_range = parts[0]
-                            perms = parts[1]
-                            pathname = parts[5] if len(parts) > 5 else ""
-
-                            start_addr = int(addr_range.split('-')[0], 16)
-
-                            if binary_name in pathname and 'x' in perms:
-                                binary_bases.append(start_addr)
-                            elif 'libc' in pathname and 'x' in perms:
-                                libc_bases.append(start_addr)
-                            elif '[stack]' in pathname:
-                                stack_addrs.append(start_addr)
-                            elif '[heap]' in pathname:
-                                heap_addrs.append(start_addr)
-                finally:
-                    proc.kill()
-                    proc.wait()
-
-            except Exception as e:
-                logger.debug(f"Address space sample failed: {e}")
+        binary_bases = samples.binary
+        libc_bases = samples.libc
+        stack_addrs = samples.stack
+        heap_addrs = samples.heap
 
         def analyze_samples(samples: List[int]):
             if not samples:
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Indexed queries over a binary's ROP gadgets.
+
+GadgetIndex parses each unique gadget into normalised (mnemonic, operands)
+instructions once and builds an inverted index by effect (registers popped
+or written, mnemonics, terminator, exact text). Address filtering for bad
+bytes and input charsets runs as byte-table lookups over the whole address
+array, vectorised with NumPy when it is installed.
+
+Usage:
+    index = get_gadgets("/path/to/binary").index()
+    # "set rdi then ret, no 0x0a bytes"
+    index.query(pops=["rdi"], ends_with="ret", bad_bytes=[0x0a])
+    index.key_gadgets(bad_bytes=[0x0a])["pop_rdi_ret"]
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Allowed non-NUL address bytes per input charset. NUL bytes are allowed
+# since they usually come from the zero-extended high bytes of the address.
+CHARSETS: Dict[str, FrozenSet[int]] = {
+    "printable": frozenset(range(0x20, 0x7f)),
+    "alphanumeric": frozenset(
+        list(range(0x30, 0x3a)) + list(range(0x41, 0x5b)) + list(range(0x61, 0x7b))
+    ),
+}
+
+# Mnemonics whose first operand is a destination register
+_WRITES_FIRST = frozenset({
+    "mov", "movabs", "movzx", "movsx", "movsxd", "lea", "pop", "xor", "add", "sub",
+    "adc", "sbb", "and", "or", "inc", "dec", "neg", "not", "shl", "shr", "sar",
+    "rol", "ror", "imul", "cmove", "cmovne", "bswap",
+})
+_WRITES_BOTH = frozenset({"xchg"})
+_IMPLICIT_WRITES = {"leave": ("rsp", "rbp")}
+
+_REGISTER_RE = re.compile(r"[a-z][a-z0-9]{1,4}")
+
+# Key gadget queries shared by FeasibilityAnalyzer and BinaryContext
+KEY_GADGETS: Dict[str, Dict] = {
+    "pop_rdi_ret": {"exact": "pop rdi ; ret"},
+    "pop_rsi_ret": {"pops": ("rsi",), "ends_with": "ret"},  # May include pop r15
+    "pop_rdx_ret": {"pops": ("rdx",), "ends_with": "ret"},
+    "pop_rax_ret": {"pops": ("rax",), "ends_with": "ret"},
+    "pop_rbx_ret": {"pops": ("rbx",), "ends_with": "ret"},
+    "pop_rcx_ret": {"pops": ("rcx",), "ends_with": "ret"},
+    "pop_rbp_ret": {"pops": ("rbp",), "ends_with": "ret"},
+    "pop_rsp_ret": {"pops": ("rsp",), "ends_with": "ret"},
+    "syscall_ret": {"mnemonics": ("syscall",)},
+    "leave_ret": {"exact": "leave ; ret"},
+    "call_rax": {"instructions": ("call rax",)},
+    "ret": {"exact": "ret"},
+}
+
+Instruction = Tuple[str, str]
+
+
+def parse_gadget(text: str) -> Tuple[Instruction, ...]:
+    """
+    Split gadget text into normalised (mnemonic, operands) instructions.
+
+    Example:
+        >>> parse_gadget("pop rdi ;  ret")
+        (('pop', 'rdi'), ('ret', ''))
+        >>> parse_gadget("mov rax,qword ptr [rdi] ; ret")
+        (('mov', 'rax, qword ptr [rdi]'), ('ret', ''))
+    """
+    instructions = []
+    for part in text.lower().split(";"):
+        part = " ".join(part.split())
+        if not part:
+            continue
+        mnemonic, _, operands = part.partition(" ")
+        if operands:
+            operands = ", ".join(op.strip() for op in operands.split(","))
+        instructions.append((mnemonic, operands))
+    return tuple(instructions)
+
+
+def _is_register(operand: str) -> bool:
+    return bool(_REGISTER_RE.fullmatch(operand))
+
+
+def _written_registers(mnemonic: str, operands: str) -> List[str]:
+    ops = operands.split(", ") if operands else []
+    if mnemonic in _WRITES_BOTH:
+        return [op for op in ops if _is_register(op)]
+    if mnemonic in _WRITES_FIRST and ops and _is_register(ops[0]):
+        return [ops[0]]
+    return list(_IMPLICIT_WRITES.get(mnemonic, ()))
+
+
+def _address_ok(addr: int, bad: FrozenSet[int], allowed: Optional[FrozenSet[int]]) -> bool:
+    addr_bytes = addr.to_bytes(8, "little")
+    if any(b in bad for b in addr_bytes):
+        return False
+    return allowed is None or all(b in allowed for b in addr_bytes)
+
+
+class GadgetIndex:
+    """Inverted index and vectorised address filters over a GadgetDB."""
+
+    def __init__(self, db):
+        """
+        Args:
+            db: GadgetDB to index (see gadgets.py)
+        """
+        self.db = db
+        self.parsed = [parse_gadget(text) for text in db.instructions]
+        self.normalised = [" ; ".join(f"{m} {o}".rstrip() for m, o in insns) for insns in self.parsed]
+
+        postings: Dict[Tuple[str, str], Set[int]] = defaultdict(set)
+        for insn_id, insns in enumerate(self.parsed):
+            postings[("text", self.normalised[insn_id])].add(insn_id)
+            if insns:
+                postings[("ends", insns[-1][0])].add(insn_id)
+            for mnemonic, operands in insns:
+                postings[("mnemonic", mnemonic)].add(insn_id)
+                postings[("insn", f"{mnemonic} {operands}".rstrip())].add(insn_id)
+                if mnemonic == "pop" and _is_register(operands):
+                    postings[("pop", operands)].add(insn_id)
+                for reg in _written_registers(mnemonic, operands):
+                    postings[("write", reg)].add(insn_id)
+        self._postings = dict(postings)
+
+        if np is not None:
+            self._ids = np.frombuffer(db.insn_ids, dtype=np.uint32)
+            addresses = np.frombuffer(db.addresses, dtype=np.uint64).astype("<u8", copy=False)
+            self._addresses = addresses
+            self._address_bytes = addresses.view(np.uint8).reshape(-1, 8)
+        else:
+            # Gadget positions per instruction id, so queries only visit candidates
+            self._positions: Dict[int, List[int]] = defaultdict(list)
+            for position, insn_id in enumerate(db.insn_ids):
+                self._positions[insn_id].append(position)
+        self._masks: Dict[Tuple[FrozenSet[int], Optional[str]], object] = {}
+
+    def __len__(self) -> int:
+        return len(self.db)
+
+    def __repr__(self) -> str:
+        return f"GadgetIndex(gadgets={len(self)}, keys={len(self._postings)})"
+
+    def address_mask(self, bad_bytes: Optional[Iterable[int]] = None, charset: Optional[str] = None):
+        """
+        Per-gadget usability mask for an address byte filter.
+
+        Addresses are checked as 8 little-endian bytes. Returns a NumPy bool
+        array when NumPy is available, else a list of bools.
+
+        Args:
+            bad_bytes: Bytes that may not appear anywhere in the address
+            charset: "printable" or "alphanumeric" - non-NUL bytes must be in it
+        """
+        key = (frozenset(bad_bytes or ()), charset)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = self._compute_mask(*key)
+        return mask
+
+    def _compute_mask(self, bad: FrozenSet[int], charset: Optional[str]):
+        allowed = None
+        if charset is not None:
+            allowed = CHARSETS[charset] | {0}
+
+        if np is not None:
+            mask = np.ones(len(self._addresses), dtype=bool)
+            if bad:
+                table = np.zeros(256, dtype=bool)
+                table[list(bad)] = True
+                mask &= ~table[self._address_bytes].any(axis=1)
+            if allowed is not None:
+                table = np.zeros(256, dtype=bool)
+                table[list(allowed)] = True
+                mask &= table[self._address_bytes].all(axis=1)
+            return mask
+
+        return [_address_ok(addr, bad, allowed) for addr in self.db.addresses]
+
+    def count(self, bad_bytes: Optional[Iterable[int]] = None, charset: Optional[str] = None) -> int:
+        """Number of gadgets whose address passes the filter."""
+        mask = self.address_mask(bad_bytes, charset)
+        return int(mask.sum()) if np is not None else sum(mask)
+
+    def _matching_ids(
+        self,
+        pops: Sequence[str],
+        writes: Sequence[str],
+        mnemonics: Sequence[str],
+        instructions: Sequence[str],
+        ends_with: Optional[str],
+        exact: Optional[str],
+    ) -> Optional[Set[int]]:
+        """Instruction ids matching every criterion (None = no criteria)."""
+        keys = [("pop", r.lower()) for r in pops]
+        keys += [("write", r.lower()) for r in writes]
+        keys += [("mnemonic", m.lower()) for m in mnemonics]
+        keys += [("insn", " ; ".join(f"{m} {o}".rstrip() for m, o in parse_gadget(i))) for i in instructions]
+        if ends_with:
+            keys.append(("ends", ends_with.lower()))
+        if exact is not None:
+            text = " ; ".join(f"{m} {o}".rstrip() for m, o in parse_gadget(exact))
+            keys.append(("text", text))
+        if not keys:
+            return None
+
+        # Intersect smallest posting lists first
+        lists = sorted((self._postings.get(k, set()) for k in keys), key=len)
+        ids = set(lists[0])
+        for other in lists[1:]:
+            ids &= other
+            if not ids:
+                break
+        return ids
+
+    def query(
+        self,
+        pops: Sequence[str] = (),
+        writes: Sequence[str] = (),
+        mnemonics: Sequence[str] = (),
+        instructions: Sequence[str] = (),
+        ends_with: Optional[str] = None,
+        exact: Optional[str] = None,
+        bad_bytes: Optional[Iterable[int]] = None,
+        charset: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[int, str]]:
+        """
+        Gadgets matching all criteria, in ROPgadget order.
+
+        Args:
+            pops: Registers the gadget must pop from the stack
+            writes: Registers the gadget must write (pop, mov, xchg, leave, ...)
+            mnemonics: Mnemonics that must appear
+            instructions: Whole instructions that must appear (e.g. "call rax")
+            ends_with: Mnemonic of the final instruction (e.g. "ret")
+            exact: Whole gadget text, whitespace-insensitive
+            bad_bytes: Bytes that may not appear in the address
+            charset: Address charset constraint ("printable" / "alphanumeric")
+            limit: Maximum number of results
+
+        Returns:
+            List of (address, instruction text) tuples
+
+        Example:
+            >>> # "set rdi then ret, no 0x0a bytes"
+            >>> # index.query(pops=["rdi"], ends_with="ret", bad_bytes=[0x0a])
+        """
+        ids = self._matching_ids(pops, writes, mnemonics, instructions, ends_with, exact)
+        if ids is not None and not ids:
+            return []
+        texts = self.db.instructions
+
+        if np is not None:
+            mask = self.address_mask(bad_bytes, charset)
+            if ids is not None:
+                wanted = np.zeros(len(texts), dtype=bool)
+                wanted[list(ids)] = True
+                mask = mask & wanted[self._ids]
+            positions = np.flatnonzero(mask)
+            if limit is not None:
+                positions = positions[:limit]
+            return [(int(self._addresses[p]), texts[self._ids[p]]) for p in positions]
+
+        # Without NumPy, only check the addresses of candidate gadgets
+        bad = frozenset(bad_bytes or ())
+        allowed = CHARSETS[charset] | {0} if charset is not None else None
+        cached = self._masks.get((bad, charset))
+        if ids is None:
+            positions = range(len(self.db))
+        else:
+            positions = sorted(p for insn_id in ids for p in self._positions[insn_id])
+
+        results = []
+        for p in positions:
+            if cached[p] if cached is not None else _address_ok(self.db.addresses[p], bad, allowed):
+                results.append((self.db.addresses[p], texts[self.db.insn_ids[p]]))
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def first(self, **criteria) -> Optional[int]:
+        """Address of the first gadget matching query(**criteria), or None."""
+        found = self.query(limit=1, **criteria)
+        return found[0][0] if found else None
+
+    def key_gadgets(self, bad_bytes: Optional[Iterable[int]] = None) -> Dict[str, int]:
+        """First usable address of each KEY_GADGETS entry that exists."""
+        found = {}
+        for name, criteria in KEY_GADGETS.items():
+            addr = self.first(bad_bytes=bad_bytes, **criteria)
+            if addr is not None:
+                found[name] = addr
+        return found
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Shared, persistent ROP gadget store.
+
+ROPgadget is slow on large binaries, so its output is parsed once per unique
+binary and kept in a compact columnar file keyed by the binary's full SHA-256:
+- an address array (uint64)
+- an instruction-id array (uint32) into an interned instruction table
+
+The analyzer, BinaryContext and cache.py all query this store, so within a
+process ROPgadget runs at most once per binary and across processes the
+on-disk file is reused. A per-binary lock file stops concurrent processes
+from running ROPgadget on the same binary at the same time.
+
+Usage:
+    db = get_gadgets("/path/to/binary")
+    for addr, instr in db:
+        ...
+    db.index().query(pops=["rdi"], ends_with="ret", bad_bytes=[0x0a])
+"""
+
+import hashlib
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, atomic rename still applies
+    fcntl = None
+
+from core.logging import get_logger
+
+from .config import get_config
+from .gadget_index import GadgetIndex
+
+logger = get_logger()
+
+# File layout: magic, then <count, table size, table bytes> as little-endian
+# uint64s, then the address array, the instruction-id array and the
+# newline-joined UTF-8 instruction table.
+_MAGIC = b"RGADGET1"
+_HEADER = struct.Struct("<8sQQQ")
+_FILE_SUFFIX = ".gadgets"
+
+# Bump when parsing changes so stale files are ignored
+_FORMAT_VERSION = 1
+
+
+class GadgetToolError(RuntimeError):
+    """ROPgadget ran but exited with an error."""
+
+
+class GadgetDB:
+    """
+    Gadgets of one binary in columnar form.
+
+    Iterating yields (address, instruction) tuples in ROPgadget's order.
+    """
+
+    def __init__(self, addresses: array, insn_ids: array, instructions: List[str], sha256: str = ""):
+        self.addresses = addresses
+        self.insn_ids = insn_ids
+        self.instructions = instructions
+        self.sha256 = sha256
+        self._index: Optional[GadgetIndex] = None
+
+    @classmethod
+    def parse(cls, output: str, sha256: str = "") -> "GadgetDB":
+        """Build a GadgetDB from ROPgadget text output (``0x... : insn ; insn``)."""
+        addresses = array("Q")
+        insn_ids = array("I")
+        instructions: List[str] = []
+        interned: Dict[str, int] = {}
+
+        for line in output.split("\n"):
+            addr_text, sep, instr = line.partition(" : ")
+            if not sep:
+                continue
+            try:
+                addr = int(addr_text.strip(), 16)
+            except ValueError:
+                continue
+            instr = instr.strip()
+            insn_id = interned.get(instr)
+            if insn_id is None:
+                insn_id = interned[instr] = len(instructions)
+                instructions.append(instr)
+            addresses.append(addr)
+            insn_ids.append(insn_id)
+
+        return cls(addresses, insn_ids, instructions, sha256)
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        instructions = self.instructions
+        for addr, insn_id in zip(self.addresses, self.insn_ids):
+            yield addr, instructions[insn_id]
+
+    def index(self) -> GadgetIndex:
+        """Query index over these gadgets, built on first use."""
+        if self._index is None:
+            self._index = GadgetIndex(self)
+        return self._index
+
+    def __repr__(self) -> str:
+        return f"GadgetDB(gadgets={len(self)}, unique_instructions={len(self.instructions)})"
+
+    def save(self, path: Path) -> None:
+        """Write atomically so concurrent readers never see a partial file."""
+        table = "\n".join(self.instructions).encode("utf-8")
+        addresses, insn_ids = self.addresses, self.insn_ids
+        if sys.byteorder == "big":
+            addresses, insn_ids = array("Q", addresses), array("I", insn_ids)
+            addresses.byteswap()
+            insn_ids.byteswap()
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, len(addresses), len(self.instructions), len(table)))
+                addresses.tofile(f)
+                insn_ids.tofile(f)
+                f.write(table)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, path: Path, sha256: str = "") -> Optional["GadgetDB"]:
+        """Read a file written by save(), or None if it is missing or corrupt."""
+        try:
+            with open(path, "rb") as f:
+                magic, count, table_len, table_bytes = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC:
+                    return None
+                addresses = array("Q")
+                addresses.fromfile(f, count)
+                insn_ids = array("I")
+                insn_ids.fromfile(f, count)
+                table = f.read(table_bytes)
+        except (OSError, EOFError, struct.error):
+            return None
+
+        if len(table) != table_bytes:
+            return None
+        instructions = table.decode("utf-8").split("\n") if table_len else []
+        if len(instructions) != table_len:
+            return None
+        if sys.byteorder == "big":
+            addresses.byteswap()
+            insn_ids.byteswap()
+        return cls(addresses, insn_ids, instructions, sha256)
+
+
+# In-process state: databases by content hash, and content hashes by file
+# identity so repeated lookups don't re-read the binary
+_dbs: Dict[str, GadgetDB] = {}
+_hashes: Dict[Tuple[str, int, int, int], str] = {}
+_lock = threading.Lock()
+_key_locks: Dict[str, threading.Lock] = {}
+
+
+def file_sha256(path: str) -> str:
+    """Full SHA-256 of a file, memoised on (path, size, mtime, inode)."""
+    real = os.path.realpath(path)
+    st = os.stat(real)
+    ident = (real, st.st_size, st.st_mtime_ns, st.st_ino)
+    digest = _hashes.get(ident)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(real, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        digest = _hashes[ident] = h.hexdigest()
+    return digest
+
+
+def gadget_cache_dir() -> Path:
+    """Directory holding gadget files (AnalysisConfig.cache_dir, else the temp dir)."""
+    base = get_config().cache_dir or os.path.join(tempfile.gettempdir(), "raptor_cache")
+    return Path(base) / "gadgets"
+
+
+def _run_ropgadget(binary_path: str, sha256: str) -> GadgetDB:
+    config = get_config()
+    result = subprocess.run(
+        [config.ropgadget_path or "ROPgadget", "--binary", binary_path],
+        capture_output=True, text=True, timeout=config.timeout_very_slow
+    )
+    if result.returncode != 0:
+        raise GadgetToolError(f"ROPgadget failed: {result.stderr.strip()}")
+    return GadgetDB.parse(result.stdout, sha256)
+
+
+class _FileLock:
+    """Exclusive advisory lock on a file (no-op where fcntl is unavailable)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+def get_gadgets(binary_path: str) -> GadgetDB:
+    """
+    Gadgets for a binary, running ROPgadget only if no process has before.
+
+    Lookup order: in-process store, on-disk store, ROPgadget. With caching
+    disabled in AnalysisConfig, ROPgadget always runs and nothing is kept.
+
+    Raises:
+        FileNotFoundError: ROPgadget (or the binary) is missing
+        subprocess.TimeoutExpired: ROPgadget took too long
+        GadgetToolError: ROPgadget exited with an error
+    """
+    binary_path = str(binary_path)
+    if not get_config().enable_caching:
+        return _run_ropgadget(binary_path, "")
+
+    sha256 = file_sha256(binary_path)
+    db = _dbs.get(sha256)
+    if db is not None:
+        return db
+
+    with _lock:
+        key_lock = _key_locks.setdefault(sha256, threading.Lock())
+
+    # One extraction per binary: threads wait on key_lock, processes on the lock file
+    with key_lock:
+        db = _dbs.get(sha256)
+        if db is not None:
+            return db
+
+        cache_dir = gadget_cache_dir()
+        path = cache_dir / f"{sha256}.v{_FORMAT_VERSION}{_FILE_SUFFIX}"
+        db = GadgetDB.load(path, sha256)
+        if db is None:
+            with _FileLock(cache_dir / f"{sha256}.lock"):
+                db = GadgetDB.load(path, sha256)
+                if db is None:
+                    logger.debug(f"Running ROPgadget on {binary_path}")
+                    db = _run_ropgadget(binary_path, sha256)
+                    try:
+                        db.save(path)
+                    except OSError as e:
+                        logger.debug(f"Could not persist gadgets for {binary_path}: {e}")
+        _dbs[sha256] = db
+        return db
+
+
+def clear_gadget_cache(persistent: bool = False) -> None:
+    """Drop in-process gadget databases, and the on-disk files if persistent."""
+    with _lock:
+        _dbs.clear()
+        _hashes.clear()
+    if persistent:
+        cache_dir = gadget_cache_dir()
+        if cache_dir.is_dir():
+            for entry in cache_dir.iterdir():
+                if entry.suffix in (_FILE_SUFFIX, ".lock"):
+                    try:
+                        entry.unlink()
+                    except OSError:
+                        pass
@@ -6,12 +6,19 @@ Models how exploitation primitives chain together.
 Agent uses this to find paths from initial vulnerability to code execution.
 
 Example chain: format_string_vuln -> libc_leak -> ret2libc -> code_execution
+
+Searches run on a CompiledGraph: primitives and capabilities become integer
+ids, capability sets become int bitsets, and results are memoised per
+(start, goal, blocked primitives). Graphs with the same primitive definitions
+share one CompiledGraph, so what-if sweeps over many mitigation combinations
+only search each distinct combination once.
 """
 
 import re
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
 from .constants import GlibcVersion
 from .primitives import (
@@ -33,6 +40,240 @@ class PrimitiveNode:
     missing_requirements: List[str] = field(default_factory=list)
 
 
+Edges = Tuple[Dict[str, List[str]], Dict[str, List[str]], Dict[str, List[str]]]
+
+# (name, provides, requires, requires_any, blocked_by) per primitive
+Signature = Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]], ...]
+
+
+def _build_edges(primitives: Dict[str, Primitive]) -> Edges:
+    """Build (enables, required_by, providers) adjacency lists."""
+    # What each primitive enables (forward edges)
+    enables: Dict[str, List[str]] = defaultdict(list)
+    # What each primitive requires (backward edges)
+    required_by: Dict[str, List[str]] = defaultdict(list)
+    # Map capabilities to primitives that provide them
+    providers: Dict[str, List[str]] = defaultdict(list)
+
+    # First pass: build provider map
+    for name, prim in primitives.items():
+        for provides in prim.provides:
+            providers[provides].append(name)
+
+    # Second pass: build edges
+    for name, prim in primitives.items():
+        # Forward: what this primitive's outputs enable
+        for provides in prim.provides:
+            for other_name, other in primitives.items():
+                if other_name == name:
+                    continue
+                if provides in other.requires or provides in other.requires_any:
+                    if other_name not in enables[name]:
+                        enables[name].append(other_name)
+
+        # Also add direct edges for "provides" that match primitive names
+        for provides in prim.provides:
+            if provides in primitives and provides not in enables[name]:
+                enables[name].append(provides)
+
+        # Backward: what requires this primitive
+        for req in prim.requires:
+            required_by[req].append(name)
+        for req in prim.requires_any:
+            required_by[req].append(name)
+
+    # Third pass: add edges from primitives to those that require them
+    for name, prim in primitives.items():
+        for req in prim.requires:
+            if req in primitives and name not in enables[req]:
+                enables[req].append(name)
+        for req in prim.requires_any:
+            if req in primitives and name not in enables[req]:
+                enables[req].append(name)
+
+    return enables, required_by, providers
+
+
+def _signature(primitives: Dict[str, Primitive]) -> Signature:
+    """The parts of the primitive definitions that searches depend on."""
+    return tuple(
+        (name, tuple(p.provides), tuple(p.requires), tuple(p.requires_any), tuple(p.blocked_by))
+        for name, p in primitives.items()
+    )
+
+
+def _bits(mask: int) -> Iterator[int]:
+    """Indexes of the set bits in mask."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class CompiledGraph:
+    """
+    Bitset form of the primitive graph with memoised searches.
+
+    Primitives get ids 0..n-1 and every other capability string an id after
+    them; a set of primitives/capabilities is an int with those bits set.
+    Search results only depend on which primitives are blocked, so they are
+    cached per blocked mask rather than per mitigation set.
+
+    Use compile_graph() rather than constructing this directly.
+    """
+
+    def __init__(self, signature: Signature):
+        primitives = {
+            name: Primitive(name, "", provides=list(provides), requires=list(requires),
+                            requires_any=list(requires_any), blocked_by=list(blocked_by))
+            for name, provides, requires, requires_any, blocked_by in signature
+        }
+        self.edges = _build_edges(primitives)
+        enables, _, providers = self.edges
+
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(primitives)}
+        self.tokens: List[str] = list(primitives)
+        self.count = len(primitives)
+        for prim in primitives.values():
+            for token in (*prim.provides, *prim.requires, *prim.requires_any):
+                self._id(token)
+
+        def mask(tokens) -> int:
+            return sum(1 << i for i in {self.ids[t] for t in tokens})
+
+        prims = list(primitives.values())
+        self.provides = [mask(p.provides) for p in prims]
+        self.provides_order = [tuple(self.ids[t] for t in p.provides) for p in prims]
+        self.requires = [mask(p.requires) for p in prims]
+        self.requires_any = [mask(p.requires_any) for p in prims]
+        self.blocked_by = [frozenset(p.blocked_by) for p in prims]
+        self.enables = [tuple(self.ids[n] for n in enables.get(p.name, ())) for p in prims]
+        self.enables_mask = [mask(enables.get(p.name, ())) for p in prims]
+        self.providers = [mask(providers.get(t, ())) for t in self.tokens]
+        self.any_providers = [
+            mask(n for t in p.requires_any for n in providers.get(t, ())) for p in prims
+        ]
+
+        self.blocked_mask = lru_cache(maxsize=1024)(self._blocked_mask)
+        self.available = lru_cache(maxsize=4096)(self._available)
+        self.paths = lru_cache(maxsize=4096)(self._paths)
+
+    def _id(self, token: str) -> int:
+        if token not in self.ids:
+            self.ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        return self.ids[token]
+
+    def _blocked_mask(self, mitigations: FrozenSet[str]) -> int:
+        """Primitives blocked by any of the given mitigations."""
+        return sum(1 << i for i, blockers in enumerate(self.blocked_by)
+                   if not blockers.isdisjoint(mitigations))
+
+    def _achievable(self, i: int, available: int, blocked: int) -> bool:
+        if blocked >> i & 1 or self.requires[i] & ~available:
+            return False
+        return not self.requires_any[i] or bool(available & self.requires_any[i])
+
+    def _available(self, starts: Tuple[str, ...], blocked: int) -> FrozenSet[str]:
+        """Everything reachable from starts; see get_available_primitives()."""
+        available = 0
+        queue = deque()
+        for name in starts:
+            if name in self.ids:
+                available |= 1 << self.ids[name]
+                queue.append(self.ids[name])
+
+        visited = 0
+        while queue:
+            current = queue.popleft()
+            if visited >> current & 1 or current >= self.count:
+                continue
+            visited |= 1 << current
+
+            for provided in self.provides_order[current]:
+                if available >> provided & 1:
+                    continue
+                available |= 1 << provided
+                for i in range(self.count):
+                    if not available >> i & 1 and self._achievable(i, available, blocked):
+                        available |= 1 << i
+                        queue.append(i)
+
+        return frozenset(self.tokens[i] for i in _bits(available)) | frozenset(starts)
+
+    def _paths(self, start: str, goal: str, max_depth: int,
+               blocked: int) -> Tuple[Tuple[str, ...], ...]:
+        """Step lists from start to goal, in DFS order; see find_paths_to_goal()."""
+        start_id = self.ids.get(start)
+        if start_id is None or start_id >= self.count:
+            return ()
+
+        goal_id = self.ids.get(goal, -1)
+        goal_bit = 1 << goal_id if goal_id >= 0 else 0
+
+        # A goal with requires_any can be reached as soon as one of its
+        # alternatives (and its own requirements) is in the capability set
+        goal_requires = 0
+        goal_options: List[Tuple[int, int, int]] = []
+        if 0 <= goal_id < self.count:
+            goal_requires = self.requires[goal_id]
+            for option in _bits(self.requires_any[goal_id]):
+                if option < self.count:
+                    goal_options.append((1 << option, self.requires[option], self.requires_any[option]))
+                else:
+                    goal_options.append((1 << option, 0, 0))
+
+        def goal_reachable(caps: int) -> bool:
+            if not goal_options or goal_requires & ~caps:
+                return False
+            return any(
+                caps & bit and not requires & ~caps and (not requires_any or caps & requires_any)
+                for bit, requires, requires_any in goal_options
+            )
+
+        def can_proceed(nxt: int, current: int, caps: int, visited: int) -> bool:
+            # Missing requirements must be obtainable from current's successors
+            reachable = self.enables_mask[current] & ~blocked
+            for req in _bits(self.requires[nxt] & ~caps):
+                if not (req < self.count and reachable >> req & 1) and \
+                        not self.providers[req] & reachable & ~visited:
+                    return False
+            if self.requires_any[nxt] and not caps & self.requires_any[nxt]:
+                if not self.any_providers[nxt] & reachable & ~visited:
+                    return False
+            return True
+
+        found: List[Tuple[str, ...]] = []
+
+        def dfs(current: int, path: Tuple[int, ...], visited: int, caps: int) -> None:
+            if len(path) > max_depth or blocked >> current & 1:
+                return
+            caps |= 1 << current | self.provides[current]
+
+            if current == goal_id or self.provides[current] & goal_bit:
+                found.append(tuple(self.tokens[i] for i in path))
+                return
+            if goal_reachable(caps):
+                found.append(tuple(self.tokens[i] for i in path) + (goal,))
+
+            for nxt in self.enables[current]:
+                if not visited >> nxt & 1 and can_proceed(nxt, current, caps, visited):
+                    dfs(nxt, path + (nxt,), visited | 1 << nxt, caps)
+
+        dfs(start_id, (start_id,), 1 << start_id, 0)
+        return tuple(found)
+
+
+@lru_cache(maxsize=16)
+def _compile(signature: Signature) -> CompiledGraph:
+    return CompiledGraph(signature)
+
+
+def compile_graph(primitives: Dict[str, Primitive]) -> CompiledGraph:
+    """Shared CompiledGraph for these primitive definitions."""
+    return _compile(_signature(primitives))
+
+
 class PrimitiveDependencyGraph:
     """
     Graph of exploitation primitives and their dependencies.
@@ -64,48 +305,15 @@ class PrimitiveDependencyGraph:
 
     def _build_graph(self) -> None:
         """Build adjacency lists for graph traversal."""
-        # What each primitive enables (forward edges)
-        self.enables: Dict[str, List[str]] = defaultdict(list)
-        # What each primitive requires (backward edges)
-        self.required_by: Dict[str, List[str]] = defaultdict(list)
-        # Map capabilities to primitives that provide them
-        self.providers: Dict[str, List[str]] = defaultdict(list)
-
-        # First pass: build provider map
-        for name, prim in self.primitives.items():
-            for provides in prim.provides:
-                self.providers[provides].append(name)
+        enables, required_by, providers = compile_graph(self.primitives).edges
+        self.enables: Dict[str, List[str]] = defaultdict(list, {k: list(v) for k, v in enables.items()})
+        self.required_by: Dict[str, List[str]] = defaultdict(list, {k: list(v) for k, v in required_by.items()})
+        self.providers: Dict[str, List[str]] = defaultdict(list, {k: list(v) for k, v in providers.items()})
 
-        # Second pass: build edges
-        for name, prim in self.primitives.items():
-            # Forward: what this primitive's outputs enable
-            for provides in prim.provides:
-                for other_name, other in self.primitives.items():
-                    if other_name == name:
-                        continue
-                    if provides in other.requires or provides in other.requires_any:
-                        if other_name not in self.enables[name]:
-                            self.enables[name].append(other_name)
-
-            # Also add direct edges for "provides" that match primitive names
-            for provides in prim.provides:
-                if provides in self.primitives and provides not in self.enables[name]:
-                    self.enables[name].append(provides)
-
-            # Backward: what requires this primitive
-            for req in prim.requires:
-                self.required_by[req].append(name)
-            for req in prim.requires_any:
-                self.required_by[req].append(name)
-
-        # Third pass: add edges from primitives to those that require them
-        for name, prim in self.primitives.items():
-            for req in prim.requires:
-                if req in self.primitives and name not in self.enables[req]:
-                    self.enables[req].append(name)
-            for req in prim.requires_any:
-                if req in self.primitives and name not in self.enables[req]:
-                    self.enables[req].append(name)
+    def _compiled(self) -> Tuple[CompiledGraph, int]:
+        """Compiled graph for the current primitives and its blocked-primitive mask."""
+        compiled = compile_graph(self.primitives)
+        return compiled, compiled.blocked_mask(frozenset(self.active_mitigations))
 
     def is_blocked(self, primitive_name: str) -> Tuple[bool, str]:
         """
@@ -144,30 +352,8 @@ class PrimitiveDependencyGraph:
             >>> "libc_leak" in available
             True
         """
-        available = set(starting_primitives)
-        queue = list(starting_primitives)
-        visited = set()
-
-        while queue:
-            current = queue.pop(0)
-            if current in visited:
-                continue
-            visited.add(current)
-
-            prim = self.primitives.get(current)
-            if not prim:
-                continue
-
-            # Add what this primitive provides
-            for provides in prim.provides:
-                if provides not in available:
-                    available.add(provides)
-                    for name, p in self.primitives.items():
-                        if name not in available and p.is_achievable(available, self.active_mitigations):
-                            available.add(name)
-                            queue.append(name)
-
-        return available
+        compiled, blocked = self._compiled()
+        return set(compiled.available(tuple(starting_primitives), blocked))
 
     def find_paths_to_goal(
         self,
@@ -194,137 +380,45 @@ class PrimitiveDependencyGraph:
             >>> all(p.goal == "code_execution" for p in paths)
             True
         """
-        paths = []
-        self._dfs_paths(start, goal, [start], set([start]), paths, max_depth)
+        compiled, blocked = self._compiled()
+        paths = [
+            self._build_exploit_path(list(steps), goal)
+            for steps in compiled.paths(start, goal, max_depth, blocked)
+        ]
         paths.sort(key=lambda p: p.total_reliability, reverse=True)
         return paths
 
-    def _dfs_paths(
+    def what_if_blocked(
         self,
-        current: str,
-        goal: str,
-        path: List[str],
-        visited: Set[str],
-        paths: List[ExploitPath],
-        max_depth: int,
-        accumulated_capabilities: Optional[Set[str]] = None
-    ):
-        """DFS helper for path finding."""
-        if len(path) > max_depth:
-            return
-
-        prim = self.primitives.get(current)
-        if not prim:
-            return
-
-        blocked, blocker = self.is_blocked(current)
-        if blocked:
-            return
-
-        if accumulated_capabilities is None:
-            accumulated_capabilities = set()
-
-        capabilities = accumulated_capabilities.copy()
-        capabilities.add(current)
-        for provided in prim.provides:
-            capabilities.add(provided)
-
-        # Check if goal reached
-        if current == goal or goal in prim.provides:
-            exploit_path = self._build_exploit_path(path, goal)
-            paths.append(exploit_path)
-            return
-
-        # Check if we can reach the goal with current capabilities
-        goal_prim = self.primitives.get(goal, Primitive(goal, ""))
-
-        if goal_prim.requires_any:
-            for req in goal_prim.requires_any:
-                if req in capabilities:
-                    req_prim = self.primitives.get(req)
-                    if req_prim:
-                        req_satisfied = all(r in capabilities for r in req_prim.requires)
-                        req_any_satisfied = not req_prim.requires_any or any(
-                            r in capabilities for r in req_prim.requires_any
-                        )
-                        if req_satisfied and req_any_satisfied:
-                            can_satisfy_requires = all(r in capabilities for r in goal_prim.requires)
-                            if can_satisfy_requires:
-                                final_path = path + [goal]
-                                exploit_path = self._build_exploit_path(final_path, goal)
-                                paths.append(exploit_path)
-                                break
-                    else:
-                        can_satisfy_requires = all(r in capabilities for r in goal_prim.requires)
-                        if can_satisfy_requires:
-                            final_path = path + [goal]
-                            exploit_path = self._build_exploit_path(final_path, goal)
-                            paths.append(exploit_path)
-                            break
-
-        # Continue exploring
-        for next_prim_name in self.enables.get(current, []):
-            if next_prim_name not in visited:
-                next_prim = self.primitives.get(next_prim_name)
-                if next_prim:
-                    can_proceed = self._can_proceed_to_primitive(
-                        next_prim, current, capabilities, visited
-                    )
-                    if can_proceed:
-                        visited.add(next_prim_name)
-                        self._dfs_paths(
-                            next_prim_name, goal, path + [next_prim_name],
-                            visited, paths, max_depth, capabilities
-                        )
-                        visited.remove(next_prim_name)
-
-    def _can_proceed_to_primitive(
-        self,
-        next_prim: Primitive,
-        current: str,
-        capabilities: Set[str],
-        visited: Set[str]
-    ) -> bool:
-        """Check if we can proceed to the next primitive."""
-        # Check requires (must have ALL)
-        for req in next_prim.requires:
-            if req not in capabilities:
-                can_get_req = False
-                if req in self.primitives:
-                    blocked, _ = self.is_blocked(req)
-                    if not blocked and req in self.enables.get(current, []):
-                        can_get_req = True
-
-                if not can_get_req:
-                    for pname in self.enables.get(current, []):
-                        pprim = self.primitives.get(pname)
-                        if pprim and req in pprim.provides:
-                            blocked, _ = self.is_blocked(pname)
-                            if not blocked and pname not in visited:
-                                can_get_req = True
-                                break
-
-                if not can_get_req:
-                    return False
+        mitigation: str,
+        goal: str = "code_execution"
+    ) -> Dict[str, List[ExploitPath]]:
+        """
+        Paths that adding a mitigation would block, per starting vulnerability.
 
-        # Check requires_any (must have AT LEAST ONE)
-        if next_prim.requires_any:
-            has_any = any(req in capabilities for req in next_prim.requires_any)
-            if not has_any:
-                can_acquire = False
-                for req in next_prim.requires_any:
-                    for pname, pprim in self.primitives.items():
-                        if req in pprim.provides and pname not in visited:
-                            blocked, _ = self.is_blocked(pname)
-                            if not blocked and pname in self.enables.get(current, []):
-                                can_acquire = True
-                                break
-                    if can_acquire:
-                        break
-                if not can_acquire:
-                    return False
+        Example:
+            >>> graph = PrimitiveDependencyGraph([])
+            >>> blocked = graph.what_if_blocked("glibc_n_disabled", goal="arbitrary_write")
+            >>> all("format_string_write" in p.steps for p in blocked["format_string_vuln"])
+            True
+        """
+        compiled, before = self._compiled()
+        after = compiled.blocked_mask(frozenset(self.active_mitigations | {mitigation}))
 
-        return True
+        result: Dict[str, List[ExploitPath]] = {}
+        for name, prim in self.primitives.items():
+            if prim.primitive_type != PrimitiveType.VULNERABILITY:
+                continue
+            remaining = set(compiled.paths(name, goal, 10, after))
+            lost = [
+                self._build_exploit_path(list(steps), goal)
+                for steps in compiled.paths(name, goal, 10, before)
+                if steps not in remaining
+            ]
+            if lost:
+                lost.sort(key=lambda p: p.total_reliability, reverse=True)
+                result[name] = lost
+        return result
 
     def _build_exploit_path(self, steps: List[str], goal: str) -> ExploitPath:
         """Build ExploitPath object from list of steps."""
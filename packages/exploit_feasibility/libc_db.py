@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Persistent libc fingerprint database.
+
+Every libc the analyzer looks at is indexed once into a SQLite file in the
+cache directory, keyed by SHA-256 (with its GNU build ID alongside):
+- version banner, "/bin/sh" offset and one_gadget output
+- all defined symbol offsets, indexed on (symbol, low 12 bits of offset)
+
+Repeat analyses read offsets and one_gadget results from the database
+instead of re-parsing libc and re-running one_gadget. The (symbol, low 12
+bits) index turns leak-based libc identification into one indexed lookup
+per leaked symbol: ASLR only randomises page-aligned bases, so the low 12
+bits of a leaked address equal those of the symbol's offset.
+
+Usage:
+    from packages.exploit_feasibility.libc_db import get_libc_db
+
+    db = get_libc_db()
+    record = db.lookup("/lib/x86_64-linux-gnu/libc.so.6")
+    record.symbols["system"], record.bin_sh_offset
+
+    db.scan()  # index the local libcs
+    db.identify({"puts": 0x7f3a1c680e50, "printf": 0x7f3a1c660770})
+
+    # CLI
+    python -m packages.exploit_feasibility.libc_db scan
+    python -m packages.exploit_feasibility.libc_db identify puts=0x7f3a1c680e50 printf=0x...
+"""
+
+import argparse
+import glob
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.elf import ELFError, open_elf
+from core.logging import get_logger
+
+from .config import get_config
+from .constants import Timeout
+from .gadgets import file_sha256
+
+logger = get_logger()
+
+LIBC_DB_NAME = "libc.sqlite"
+
+# Where scan() looks for libc files
+LIBC_GLOBS = (
+    "/lib/libc.so*",
+    "/lib/*/libc.so*",
+    "/lib32/libc.so*",
+    "/lib64/libc.so*",
+    "/usr/lib/libc.so*",
+    "/usr/lib/*/libc.so*",
+    "/usr/lib32/libc.so*",
+    "/usr/lib64/libc.so*",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS libcs (
+    id INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL UNIQUE,
+    build_id TEXT,
+    path TEXT NOT NULL,
+    arch TEXT,
+    version TEXT,
+    bin_sh_offset INTEGER,
+    one_gadget_output TEXT,
+    added_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_libcs_build_id ON libcs (build_id);
+CREATE TABLE IF NOT EXISTS symbols (
+    libc_id INTEGER NOT NULL REFERENCES libcs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    low12 INTEGER NOT NULL,
+    PRIMARY KEY (libc_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_symbols_fingerprint ON symbols (name, low12);
+"""
+
+# Banner printed when libc is executed; read from the file instead of running it
+_VERSION_PREFIX = "GNU C Library"
+
+
+@dataclass
+class LibcRecord:
+    """One indexed libc."""
+    sha256: str
+    path: str
+    build_id: Optional[str] = None
+    arch: str = ""
+    version: str = ""
+    bin_sh_offset: Optional[int] = None
+    # Raw one_gadget stdout; None if one_gadget has not produced output yet
+    one_gadget_output: Optional[str] = None
+    symbols: Dict[str, int] = field(default_factory=dict)
+
+
+def _read_version(elf) -> str:
+    for _, text in elf.strings(min_length=len(_VERSION_PREFIX)):
+        if text.startswith(_VERSION_PREFIX):
+            return text
+    return ""
+
+
+def _run_one_gadget(libc_path: str) -> str:
+    """
+    one_gadget stdout for libc_path.
+
+    Raises:
+        FileNotFoundError: one_gadget is not installed
+        subprocess.TimeoutExpired: one_gadget timed out
+        RuntimeError: one_gadget failed without output
+    """
+    result = subprocess.run(
+        ['one_gadget', libc_path],
+        capture_output=True, text=True, timeout=Timeout.SLOW
+    )
+    if result.returncode != 0 and not result.stdout:
+        raise RuntimeError(f"one_gadget failed: {result.stderr}")
+    return result.stdout
+
+
+class LibcDB:
+    """SQLite-backed libc fingerprint database, safe across threads and processes."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Database file (default: <cache dir>/libc.sqlite; ":memory:" for a
+                  throwaway database)
+        """
+        self.path = str(path) if path else str(libc_db_path())
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._records: Dict[str, LibcRecord] = {}
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM libcs").fetchone()[0]
+
+    def _load(self, sha256: str) -> Optional[LibcRecord]:
+        row = self._conn.execute(
+            "SELECT id, path, build_id, arch, version, bin_sh_offset, one_gadget_output "
+            "FROM libcs WHERE sha256 = ?", (sha256,)
+        ).fetchone()
+        if row is None:
+            return None
+        libc_id, path, build_id, arch, version, bin_sh, one_gadget = row
+        symbols = dict(self._conn.execute(
+            "SELECT name, offset FROM symbols WHERE libc_id = ?", (libc_id,)
+        ))
+        return LibcRecord(sha256=sha256, path=path, build_id=build_id, arch=arch or "",
+                          version=version or "", bin_sh_offset=bin_sh,
+                          one_gadget_output=one_gadget, symbols=symbols)
+
+    def get(self, libc_path: str) -> Optional[LibcRecord]:
+        """Record for this file if it has been indexed, else None."""
+        sha256 = file_sha256(libc_path)
+        with self._lock:
+            record = self._records.get(sha256)
+            if record is None:
+                record = self._load(sha256)
+                if record is not None:
+                    self._records[sha256] = record
+            return record
+
+    def add(self, libc_path: str) -> LibcRecord:
+        """
+        Index a libc file (replacing any previous entry for the same contents).
+
+        Raises:
+            OSError: File is missing or unreadable
+            ELFError: File is not an ELF file
+        """
+        libc_path = str(libc_path)
+        sha256 = file_sha256(libc_path)
+        elf = open_elf(libc_path)
+
+        record = LibcRecord(
+            sha256=sha256,
+            path=os.path.realpath(libc_path),
+            build_id=elf.build_id,
+            arch=elf.arch,
+            version=_read_version(elf),
+            bin_sh_offset=elf.find_string('/bin/sh'),
+            symbols={name: sym.value for name, sym in elf.defined_symbols.items()},
+        )
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM libcs WHERE sha256 = ?", (sha256,))
+                cur = self._conn.execute(
+                    "INSERT INTO libcs (sha256, build_id, path, arch, version, bin_sh_offset, added_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (sha256, record.build_id, record.path, record.arch, record.version,
+                     record.bin_sh_offset, time.time()),
+                )
+                self._conn.executemany(
+                    "INSERT INTO symbols VALUES (?, ?, ?, ?)",
+                    ((cur.lastrowid, name, offset, offset & 0xfff)
+                     for name, offset in record.symbols.items()),
+                )
+            self._records[sha256] = record
+        logger.debug(f"Indexed libc {libc_path} ({len(record.symbols)} symbols)")
+        return record
+
+    def lookup(self, libc_path: str) -> LibcRecord:
+        """Record for a libc file, indexing it first if needed."""
+        return self.get(libc_path) or self.add(libc_path)
+
+    def one_gadget_output(self, libc_path: str) -> str:
+        """
+        one_gadget stdout for a libc; the tool runs once per libc ever.
+
+        Failures are not stored, so a later call retries (e.g. once
+        one_gadget is installed). Raises as _run_one_gadget does.
+        """
+        record = self.lookup(libc_path)
+        if record.one_gadget_output is None:
+            output = _run_one_gadget(str(libc_path))
+            with self._lock:
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE libcs SET one_gadget_output = ? WHERE sha256 = ?",
+                        (output, record.sha256),
+                    )
+                record.one_gadget_output = output
+        return record.one_gadget_output
+
+    def scan(self, patterns=LIBC_GLOBS) -> int:
+        """Index libc files matching the glob patterns; returns how many were new."""
+        added = 0
+        seen = set()
+        for pattern in patterns:
+            for path in sorted(glob.glob(pattern)):
+                real = os.path.realpath(path)
+                if real in seen or not os.path.isfile(real):
+                    continue
+                seen.add(real)
+                try:
+                    if self.get(real) is None:
+                        self.add(real)
+                        added += 1
+                except (OSError, ELFError) as e:
+                    logger.debug(f"Skipping {path}: {e}")
+        return added
+
+    def candidates(self, symbol: str, address: int) -> List[str]:
+        """SHA-256 of every indexed libc whose symbol has address's low 12 bits."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT l.sha256 FROM symbols s JOIN libcs l ON l.id = s.libc_id "
+                "WHERE s.name = ? AND s.low12 = ?", (symbol, address & 0xfff)
+            )]
+
+    def identify(self, leaks: Dict[str, int]) -> List[LibcRecord]:
+        """
+        Indexed libcs consistent with leaked runtime addresses.
+
+        Args:
+            leaks: Symbol name -> leaked address (or offset)
+
+        Returns:
+            Matching records; when several symbols are given, their distance
+            must also equal the distance between the leaks
+        """
+        matches = None
+        for symbol, address in leaks.items():
+            found = set(self.candidates(symbol, address))
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+
+        records = []
+        for sha256 in sorted(matches or ()):
+            with self._lock:
+                record = self._records.get(sha256) or self._load(sha256)
+            if record is None:
+                continue
+            # Same libc base for every leak
+            bases = {address - record.symbols[symbol] for symbol, address in leaks.items()}
+            if len(bases) == 1:
+                records.append(record)
+        return records
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def libc_db_path() -> Path:
+    """Default database file (AnalysisConfig.cache_dir, else the temp dir)."""
+    base = get_config().cache_dir or os.path.join(tempfile.gettempdir(), "raptor_cache")
+    return Path(base) / LIBC_DB_NAME
+
+
+_dbs: Dict[str, LibcDB] = {}
+_dbs_lock = threading.Lock()
+
+
+def get_libc_db() -> LibcDB:
+    """
+    Shared database for the configured cache directory.
+
+    With caching disabled in AnalysisConfig a fresh in-memory database is
+    returned, so nothing is kept between calls.
+    """
+    if not get_config().enable_caching:
+        return LibcDB(":memory:")
+    path = str(libc_db_path())
+    with _dbs_lock:
+        db = _dbs.get(path)
+        if db is None:
+            db = _dbs[path] = LibcDB(path)
+        return db
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description='RAPTOR libc fingerprint database')
+    sub = ap.add_subparsers(dest='command', required=True)
+    scan = sub.add_parser('scan', help='Index local libc files')
+    scan.add_argument('paths', nargs='*', help='libc files or globs (default: system libcs)')
+    ident = sub.add_parser('identify', help='Find libcs matching leaked addresses')
+    ident.add_argument('leaks', nargs='+', metavar='SYMBOL=ADDRESS')
+    args = ap.parse_args(argv)
+
+    db = get_libc_db()
+    if args.command == 'scan':
+        added = db.scan(args.paths or LIBC_GLOBS)
+        print(f"Indexed {added} new libc(s); {len(db)} in {db.path}")
+        return 0
+
+    leaks = {}
+    for leak in args.leaks:
+        symbol, _, address = leak.partition('=')
+        leaks[symbol] = int(address, 0)
+    matches = db.identify(leaks)
+    for record in matches:
+        print(f"{record.path}  {record.build_id or '-'}  {record.version}")
+    if not matches:
+        print("No indexed libc matches (index more with: scan)")
+    return 0 if matches else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware stage scheduler for feasibility analysis.
+
+Each analysis step (checksec, readelf, ROPgadget, address sampling, ...) is
+a Stage that mutates a report. Stages whose dependencies are satisfied run
+concurrently in a thread pool; the expensive part of every stage is an
+external tool, so threads are enough.
+
+Every stage works on a private copy of the report and its changes are merged
+back strictly in declaration order. The final report is therefore identical
+to running the stages one after another, provided each stage declares every
+earlier stage whose fields it reads. Appending to shared lists (warnings,
+blockers, ...) needs no declaration; a stage that rewrites a shared list must
+depend on every earlier stage that touches it.
+"""
+
+import copy
+import dataclasses
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from core.logging import get_logger
+
+logger = get_logger()
+
+
+@dataclass
+class Stage:
+    """One analysis step and the stages it must run after."""
+    name: str
+    run: Callable[[Any], None]
+    depends_on: Tuple[str, ...] = ()
+
+
+def _snapshot(report: Any, skip: Sequence[str]) -> Dict[str, Any]:
+    """Field values of a report, with lists and dicts copied."""
+    snap = {}
+    for f in dataclasses.fields(report):
+        if f.name in skip:
+            continue
+        value = getattr(report, f.name)
+        if isinstance(value, list):
+            value = list(value)
+        elif isinstance(value, dict):
+            value = dict(value)
+        snap[f.name] = value
+    return snap
+
+
+def _private_copy(report: Any, snap: Dict[str, Any]) -> Any:
+    """Shallow report copy whose lists and dicts are not shared with report."""
+    scratch = copy.copy(report)
+    for name, value in snap.items():
+        if isinstance(value, (list, dict)):
+            setattr(scratch, name, copy.copy(value))
+    return scratch
+
+
+def _merge(report: Any, values: Dict[str, Any], snap: Dict[str, Any]) -> None:
+    """Apply the field values a stage left on its private copy onto report."""
+    for name, new in values.items():
+        old = snap[name]
+        if isinstance(old, list):
+            current = getattr(report, name)
+            if new[:len(old)] == old:
+                current.extend(new[len(old):])
+            else:
+                # Stage rewrote the list; keep what later-merged stages appended
+                setattr(report, name, new + current[len(old):])
+        elif isinstance(old, dict):
+            if new != old:
+                current = getattr(report, name)
+                for key in old.keys() - new.keys():
+                    current.pop(key, None)
+                for key, value in new.items():
+                    if key not in old or old[key] is not value:
+                        current[key] = value
+        elif new is not old:
+            setattr(report, name, new)
+
+
+@dataclass
+class StageEffect:
+    """Fields one stage changed, replayable onto other reports."""
+    snapshot: Dict[str, Any]
+    values: Dict[str, Any]
+
+    def apply(self, report: Any) -> None:
+        """Make the same changes to report (values are copied, not shared)."""
+        _merge(report, copy.deepcopy(self.values), self.snapshot)
+
+
+def record_stage(report: Any, stage: Stage, timings_field: str = "stage_timings") -> StageEffect:
+    """
+    Run a stage on a private copy of report and record what it changed.
+
+    Used to compute host-level facts once and replay them onto the reports
+    of many binaries. report itself is left untouched.
+    """
+    snap = _snapshot(report, (timings_field,))
+    scratch = _private_copy(report, snap)
+    stage.run(scratch)
+
+    changed = {}
+    for name, old in snap.items():
+        new = getattr(scratch, name)
+        if new != old if isinstance(old, (list, dict)) else new is not old:
+            changed[name] = new
+    return StageEffect({name: snap[name] for name in changed}, changed)
+
+
+def _timed(stage: Stage, report: Any) -> float:
+    start = time.perf_counter()
+    stage.run(report)
+    return time.perf_counter() - start
+
+
+def run_stages(
+    report: Any,
+    stages: List[Stage],
+    max_workers: int = 1,
+    timings_field: str = "stage_timings",
+) -> None:
+    """
+    Run stages against a dataclass report, concurrently where dependencies allow.
+
+    Dependencies on stages not in the list are treated as already satisfied.
+    Per-stage wall-clock seconds are recorded in report.<timings_field>.
+    An exception from a stage propagates (after earlier stages are merged),
+    as it would when running sequentially.
+
+    Args:
+        report: Dataclass instance the stages mutate
+        stages: Stages in their sequential order
+        max_workers: Concurrent stages (1 = run in order on report directly)
+        timings_field: Report field (a dict) receiving per-stage timings
+    """
+    timings = getattr(report, timings_field)
+
+    if max_workers <= 1 or len(stages) <= 1:
+        for stage in stages:
+            timings[stage.name] = _timed(stage, report)
+        return
+
+    names = {stage.name for stage in stages}
+    for i, stage in enumerate(stages):
+        earlier = {s.name for s in stages[:i]}
+        for dep in stage.depends_on:
+            if dep in names and dep not in earlier:
+                raise ValueError(f"Stage {stage.name!r} depends on later stage {dep!r}")
+
+    merged = set()
+    pending = {}  # future -> (index, scratch, snapshot)
+    finished = {}  # index -> (future, scratch, snapshot)
+    next_start = set(range(len(stages)))
+    next_merge = 0
+
+    def ready(stage: Stage) -> bool:
+        return all(dep in merged or dep not in names for dep in stage.depends_on)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="feasibility") as pool:
+        while next_merge < len(stages):
+            for i in sorted(next_start):
+                if ready(stages[i]):
+                    snap = _snapshot(report, (timings_field,))
+                    scratch = _private_copy(report, snap)
+                    future = pool.submit(_timed, stages[i], scratch)
+                    pending[future] = (i, scratch, snap)
+                    next_start.discard(i)
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, scratch, snap = pending.pop(future)
+                finished[i] = (future, scratch, snap)
+
+            # Merge in declaration order so the report matches the sequential path
+            while next_merge in finished:
+                future, scratch, snap = finished.pop(next_merge)
+                stage = stages[next_merge]
+                try:
+                    timings[stage.name] = future.result()
+                except BaseException:
+                    for other in pending:
+                        other.cancel()
+                    raise
+                _merge(report, {name: getattr(scratch, name) for name in snap}, snap)
+                merged.add(stage.name)
+                next_merge += 1
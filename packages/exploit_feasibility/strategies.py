@@ -18,6 +18,8 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from core.elf import ELFError, open_elf
+
 from .profiles import TargetContext, TargetProfile
 
 
@@ -109,15 +111,15 @@ class AnalysisStrategy(ABC):
                 'full_relro': elf.relro == 'Full',
             }
         except ImportError:
-            # Fall back to readelf
-            protections = self._checksec_via_readelf(binary_path)
+            # Fall back to parsing the ELF in-process
+            protections = self._checksec_via_elf(binary_path)
         except Exception:
-            protections = self._checksec_via_readelf(binary_path)
+            protections = self._checksec_via_elf(binary_path)
 
         return protections
 
-    def _checksec_via_readelf(self, binary_path: Path) -> Dict[str, bool]:
-        """Fallback checksec using readelf."""
+    def _checksec_via_elf(self, binary_path: Path) -> Dict[str, bool]:
+        """Fallback checksec reading the ELF headers and symbols in-process."""
         protections = {
             'canary': False,
             'nx': True,  # Assume NX enabled by default
@@ -127,38 +129,10 @@ class AnalysisStrategy(ABC):
         }
 
         try:
-            # Check for stack canary
-            result = subprocess.run(
-                ['readelf', '-s', str(binary_path)],
-                capture_output=True, text=True, timeout=10
-            )
-            if '__stack_chk_fail' in result.stdout:
-                protections['canary'] = True
-
-            # Check for PIE
-            result = subprocess.run(
-                ['readelf', '-h', str(binary_path)],
-                capture_output=True, text=True, timeout=10
-            )
-            if 'DYN' in result.stdout:
-                protections['pie'] = True
-
-            # Check for RELRO
-            result = subprocess.run(
-                ['readelf', '-l', str(binary_path)],
-                capture_output=True, text=True, timeout=10
-            )
-            if 'GNU_RELRO' in result.stdout:
-                protections['relro'] = True
-                # Check for BIND_NOW (Full RELRO)
-                result2 = subprocess.run(
-                    ['readelf', '-d', str(binary_path)],
-                    capture_output=True, text=True, timeout=10
-                )
-                if 'BIND_NOW' in result2.stdout:
-                    protections['full_relro'] = True
-
-        except (subprocess.SubprocessError, OSError):
+            checks = open_elf(str(binary_path)).checksec()
+            for key in protections:
+                protections[key] = checks[key]
+        except (ELFError, OSError):
             pass
 
         return protections
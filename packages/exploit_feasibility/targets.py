@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .mitigations import ROPGadgetInfo
+    from .gadget_index import GadgetIndex
 
 
 @dataclass
@@ -261,7 +262,8 @@ class BinarySpecificAnalysis:
 
 def analyze_gadget_quality(
     rop_info: 'ROPGadgetInfo',
-    bad_bytes: Optional[List[int]] = None
+    bad_bytes: Optional[List[int]] = None,
+    index: Optional['GadgetIndex'] = None,
 ) -> GadgetQuality:
     """
     Assess ROP gadget quality for technique viability.
@@ -271,6 +273,8 @@ def analyze_gadget_quality(
     Args:
         rop_info: ROPGadgetInfo from analyzer
         bad_bytes: Bytes that cannot appear in addresses
+        index: GadgetIndex for the binary; when given, all gadgets are searched
+               for stack pivots instead of the first 100 in rop_info
 
     Returns:
         GadgetQuality assessment
@@ -332,7 +336,18 @@ def analyze_gadget_quality(
         quality.has_stack_pivot = True
         quality.pivot_gadgets.append(f"0x{rop_info.pop_rsp_ret:x}: pop rsp ; ret")
 
-    # Then check all_gadgets for additional pivot gadgets
+    # Then look for additional pivot gadgets (anything else that writes rsp)
+    if index is not None:
+        # Every 64-bit address has NUL high bytes, so NUL is not applied here
+        # (strcpy-style truncation is handled by ExploitationConstraints)
+        pivot_bad_bytes = [b for b in bad_bytes if b != 0x00]
+        known = {rop_info.leave_ret, rop_info.pop_rsp_ret}
+        for addr, gadget in index.query(writes=['rsp'], bad_bytes=pivot_bad_bytes, limit=20):
+            if addr not in known:
+                quality.has_stack_pivot = True
+                quality.pivot_gadgets.append(f"0x{addr:x}: {gadget}")
+        return quality
+
     pivot_patterns = ['xchg', 'mov rsp', 'add rsp']
     for gadget_info in rop_info.all_gadgets[:100]:  # Check first 100
         if isinstance(gadget_info, dict):
@@ -10,6 +10,8 @@ from ..api import (
     get_exploit_constraints,
     list_primitives,
     get_primitive_requirements,
+    sweep_mitigations,
+    what_if_mitigation_blocked,
 )
 
 
@@ -335,6 +337,71 @@ class TestFindExploitPathsCaching:
         assert isinstance(result, dict)
 
 
+class TestWhatIfMitigationBlocked:
+    """Tests for what_if_mitigation_blocked."""
+
+    def test_returns_impact_summary(self):
+        """Test that the what-if analysis runs and summarises its impact."""
+        result = what_if_mitigation_blocked("glibc_n_disabled")
+        assert set(result) == {'affected_vulnerabilities', 'blocked_path_count', 'summary'}
+        assert "glibc_n_disabled" in result['summary']
+
+    def test_unknown_mitigation_blocks_nothing(self):
+        """Test that a mitigation no primitive knows about blocks no paths."""
+        result = what_if_mitigation_blocked("not_a_mitigation", vulnerability="format_string_vuln")
+        assert result['blocked_path_count'] == 0
+        assert result['affected_vulnerabilities'] == {}
+
+
+class TestSweepMitigations:
+    """Tests for sweep_mitigations."""
+
+    def test_matches_single_scenario_search(self):
+        """Test that every scenario agrees with a direct graph search."""
+        from ..graph import create_dependency_graph
+
+        sweep = sweep_mitigations(
+            mitigations=["glibc_n_disabled", "asan"],
+            vulnerabilities=["format_string_vuln", "use_after_free_vuln"],
+            goals=["arbitrary_write", "denial_of_service"],
+        )
+        assert len(sweep['path_count']) == 4
+        for scenario in range(4):
+            enabled = [m for j, m in enumerate(sweep['mitigations']) if scenario >> j & 1]
+            graph = create_dependency_graph(additional_mitigations=enabled)
+            total = 0
+            for v, vuln in enumerate(sweep['vulnerabilities']):
+                for g, goal in enumerate(sweep['goals']):
+                    paths = graph.find_paths_to_goal(vuln, goal)
+                    total += len(paths)
+                    best = max((p.total_reliability for p in paths), default=None)
+                    assert sweep['best_reliability'][scenario][v][g] == pytest.approx(best)
+            assert sweep['path_count'][scenario] == total
+
+    def test_current_scenario_and_ranking(self):
+        """Test that detected mitigations pick the current scenario."""
+        sweep = sweep_mitigations(
+            mitigations=["glibc_n_disabled", "full_relro"],
+            binary_protections={'full_relro': True, 'pie': True},
+        )
+        assert sweep['current'] == 0b10
+        assert 'pie' in sweep['fixed_mitigations']
+        changes = {r['mitigation']: r['change'] for r in sweep['ranking']}
+        assert changes == {'glibc_n_disabled': 'enable', 'full_relro': 'disable'}
+        removed = [r['paths_removed'] for r in sweep['ranking']]
+        assert removed == sorted(removed, reverse=True)
+
+    def test_parallel_matches_serial(self):
+        """Test that worker processes produce the same matrix."""
+        kwargs = dict(mitigations=["glibc_n_disabled", "glibc_no_tcache", "asan"])
+        assert sweep_mitigations(workers=2, **kwargs) == sweep_mitigations(**kwargs)
+
+    def test_too_many_mitigations(self):
+        """Test that oversized sweeps are rejected."""
+        with pytest.raises(ValueError):
+            sweep_mitigations(mitigations=[f"m{i}" for i in range(17)])
+
+
 class TestAutoProfileSelection:
     """Tests for automatic profile selection based on vulnerability type."""
 
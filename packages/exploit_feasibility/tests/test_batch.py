@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Tests for batch analysis and shared host facts."""
+
+import json
+import shutil
+
+import pytest
+
+from ..analyzer import FeasibilityAnalyzer, FeasibilityReport
+from ..batch import analyze_binaries, collect_host_facts, find_elf_binaries, main
+from ..stages import Stage, record_stage
+
+SYSTEM_BINARY = shutil.which("true")
+
+
+@pytest.fixture
+def firmware(tmp_path):
+    """A directory with two identical ELF files, a symlink and a script."""
+    (tmp_path / "bin").mkdir()
+    (tmp_path / "lib").mkdir()
+    shutil.copy(SYSTEM_BINARY, tmp_path / "bin" / "true")
+    shutil.copy(SYSTEM_BINARY, tmp_path / "lib" / "true.bak")
+    (tmp_path / "bin" / "link").symlink_to(tmp_path / "bin" / "true")
+    (tmp_path / "bin" / "run.sh").write_text("#!/bin/sh\n")
+    return tmp_path
+
+
+class TestRecordStage:
+    """Recorded stage effects replay onto other reports."""
+
+    def test_replay_matches_running_the_stage(self):
+        def stage(report):
+            report.warnings.append("shared warning")
+            report.confidence["glibc_version"] = "detected"
+            report.glibc_version = "2.99"
+
+        effect = record_stage(FeasibilityReport(), Stage("host", stage))
+        assert set(effect.values) == {"warnings", "confidence", "glibc_version"}
+
+        report = FeasibilityReport(warnings=["binary warning"])
+        effect.apply(report)
+        effect.apply(FeasibilityReport())
+        assert report.warnings == ["binary warning", "shared warning"]
+        assert report.confidence == {"glibc_version": "detected"}
+        assert report.glibc_version == "2.99"
+
+
+@pytest.mark.skipif(not SYSTEM_BINARY, reason="needs a system binary")
+class TestBatch:
+    """analyze_binaries dedupes and shares host facts."""
+
+    def test_find_elf_binaries_skips_symlinks_and_scripts(self, firmware):
+        assert find_elf_binaries(firmware) == [
+            firmware / "bin" / "true",
+            firmware / "lib" / "true.bak",
+        ]
+
+    def test_duplicates_analysed_once(self, firmware):
+        records = list(analyze_binaries(firmware, extended=False, workers=1))
+        assert [r["binary"] for r in records] == [
+            str(firmware / "bin" / "true"),
+            str(firmware / "lib" / "true.bak"),
+        ]
+        assert records[0]["sha256"] == records[1]["sha256"]
+        assert records[0]["duplicate_of"] is None
+        assert records[1]["duplicate_of"] == str(firmware / "bin" / "true")
+        assert records[1]["result"] is records[0]["result"]
+
+    def test_shared_facts_match_per_binary_analysis(self):
+        facts = collect_host_facts("format_string")
+        shared = FeasibilityAnalyzer(SYSTEM_BINARY, host_facts=facts).full_analysis("format_string")
+        alone = FeasibilityAnalyzer(SYSTEM_BINARY).full_analysis("format_string")
+
+        for name in ("verdict", "blockers", "warnings", "glibc_version", "glibc_n_disabled",
+                     "kernel_mitigations", "confidence"):
+            assert getattr(shared, name) == getattr(alone, name), name
+        assert shared.profile.glibc_version == alone.profile.glibc_version
+
+    def test_cli_writes_json_lines(self, firmware, tmp_path):
+        output = tmp_path / "results.jsonl"
+        assert main([str(firmware), "--no-extended", "--workers", "2", "-o", str(output)]) == 0
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert len(records) == 2
+        assert {r["duplicate_of"] for r in records} == {None, str(firmware / "bin" / "true")}
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Tests for gadget_index module."""
+
+from ..context import ROPGadgetInfo
+from ..gadget_index import GadgetIndex, parse_gadget
+from ..gadgets import GadgetDB
+from ..targets import analyze_gadget_quality
+
+ROPGADGET_OUTPUT = """
+0x0000000000401016 : ret
+0x000000000040100a : pop rdi ; ret
+0x000000000040113d : pop rdi ; ret
+0x000000000040113f : pop rsi ; pop r15 ; ret
+0x0000000000401150 : leave ; ret
+0x0000000000401160 : xchg rax, rsp ; ret
+0x0000000000401170 : mov rax,qword ptr [rdi] ; call rax
+0x0000000000401180 : syscall
+0x0000000000412141 : ret
+"""
+
+
+def make_index():
+    return GadgetIndex(GadgetDB.parse(ROPGADGET_OUTPUT))
+
+
+class TestParseGadget:
+    """Tests for instruction normalisation."""
+
+    def test_normalises_whitespace_and_operands(self):
+        assert parse_gadget("MOV rax,qword ptr [rdi]  ;  call rax") == (
+            ("mov", "rax, qword ptr [rdi]"),
+            ("call", "rax"),
+        )
+
+
+class TestGadgetIndex:
+    """Tests for GadgetIndex queries."""
+
+    def test_pop_then_ret_with_bad_bytes(self):
+        """'Set rdi then ret, no 0x0a bytes' skips the 0x40100a gadget."""
+        index = make_index()
+        assert index.query(pops=["rdi"], ends_with="ret") == [
+            (0x40100a, "pop rdi ; ret"),
+            (0x40113d, "pop rdi ; ret"),
+        ]
+        assert index.first(pops=["rdi"], ends_with="ret", bad_bytes=[0x0a]) == 0x40113d
+
+    def test_writes_includes_implicit_and_xchg(self):
+        index = make_index()
+        pivots = [addr for addr, _ in index.query(writes=["rsp"])]
+        assert pivots == [0x401150, 0x401160]
+
+    def test_exact_and_instruction_match(self):
+        index = make_index()
+        assert index.first(exact="leave;ret") == 0x401150
+        assert index.first(instructions=["call rax"]) == 0x401170
+        assert index.query(exact="pop rax ; ret") == []
+
+    def test_charset_counts(self):
+        """0x412141 is printable ('A', '!', 'A'), but '!' is not alphanumeric."""
+        index = make_index()
+        assert index.count() == 9
+        assert index.count(bad_bytes=[0x0a]) == 8
+        assert index.count(charset="printable") == 1
+        assert index.count(charset="alphanumeric") == 0
+
+    def test_key_gadgets(self):
+        found = make_index().key_gadgets(bad_bytes=[0x0a])
+        assert found["pop_rdi_ret"] == 0x40113d
+        assert found["pop_rsi_ret"] == 0x40113f
+        assert found["leave_ret"] == 0x401150
+        assert found["syscall_ret"] == 0x401180
+        assert found["call_rax"] == 0x401170
+        assert found["ret"] == 0x401016
+        assert "pop_rax_ret" not in found
+
+
+class TestGadgetQualityWithIndex:
+    """analyze_gadget_quality searches the whole index for pivots."""
+
+    def test_pivots_from_index(self):
+        rop_info = ROPGadgetInfo(total_gadgets=9, usable_gadgets=9, leave_ret=0x401150)
+        quality = analyze_gadget_quality(rop_info, [0x00, 0x0a], index=make_index())
+        assert quality.has_stack_pivot
+        assert quality.pivot_gadgets == [
+            "0x401150: leave ; ret",
+            "0x401160: xchg rax, rsp ; ret",
+        ]
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Tests for the persistent ROP gadget store."""
+
+import os
+import stat
+
+import pytest
+
+from ..cache import cached_rop_analysis, clear_caches
+from ..config import AnalysisConfig, reset_config, set_config
+from ..context import BinaryContext
+from ..gadgets import GadgetDB, GadgetToolError, clear_gadget_cache, get_gadgets
+
+ROPGADGET_OUTPUT = """Gadgets information
+============================================================
+0x0000000000401016 : ret
+0x000000000040113d : pop rdi ; ret
+0x000000000040113f : pop rsi ; pop r15 ; ret
+0x0000000000401150 : leave ; ret
+0x000000000040110a : ret
+
+Unique gadgets found: 5
+"""
+
+
+@pytest.fixture
+def fake_ropgadget(tmp_path):
+    """A ROPgadget stand-in that counts its runs, configured via AnalysisConfig."""
+    runs = tmp_path / "runs"
+    output = tmp_path / "output.txt"
+    output.write_text(ROPGADGET_OUTPUT)
+    script = tmp_path / "ROPgadget"
+    script.write_text(f"#!/bin/sh\necho run >> {runs}\ncat {output}\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+
+    set_config(AnalysisConfig(ropgadget_path=str(script), cache_dir=str(tmp_path / "cache")))
+    clear_caches()
+    yield script, runs
+    clear_caches()
+    reset_config()
+
+
+@pytest.fixture
+def binary(tmp_path):
+    path = tmp_path / "target"
+    path.write_bytes(b"\x7fELF" + os.urandom(64))
+    return path
+
+
+def run_count(runs):
+    return len(runs.read_text().splitlines()) if runs.exists() else 0
+
+
+class TestGadgetDB:
+    """Tests for GadgetDB parsing and serialization."""
+
+    def test_parse_interns_instructions(self):
+        db = GadgetDB.parse(ROPGADGET_OUTPUT)
+        assert len(db) == 5
+        assert len(db.instructions) == 4  # "ret" appears twice
+        assert list(db)[1] == (0x40113d, "pop rdi ; ret")
+
+    def test_save_load_roundtrip(self, tmp_path):
+        db = GadgetDB.parse(ROPGADGET_OUTPUT)
+        db.save(tmp_path / "db.gadgets")
+        loaded = GadgetDB.load(tmp_path / "db.gadgets")
+        assert list(loaded) == list(db)
+
+    def test_load_rejects_corrupt_file(self, tmp_path):
+        path = tmp_path / "db.gadgets"
+        GadgetDB.parse(ROPGADGET_OUTPUT).save(path)
+        path.write_bytes(path.read_bytes()[:-3])
+        assert GadgetDB.load(path) is None
+        assert GadgetDB.load(tmp_path / "missing.gadgets") is None
+
+
+class TestGetGadgets:
+    """Tests for the shared store lookup."""
+
+    def test_runs_once_per_binary_across_processes(self, fake_ropgadget, binary):
+        _, runs = fake_ropgadget
+        assert len(get_gadgets(str(binary))) == 5
+        get_gadgets(str(binary))
+        assert run_count(runs) == 1
+
+        # A new process starts with an empty in-process store
+        clear_gadget_cache()
+        assert len(get_gadgets(str(binary))) == 5
+        assert run_count(runs) == 1
+
+    def test_keyed_by_content(self, fake_ropgadget, binary, tmp_path):
+        _, runs = fake_ropgadget
+        copy = tmp_path / "copy"
+        copy.write_bytes(binary.read_bytes())
+        get_gadgets(str(binary))
+        get_gadgets(str(copy))
+        assert run_count(runs) == 1
+
+        binary.write_bytes(binary.read_bytes() + b"\x00")
+        get_gadgets(str(binary))
+        assert run_count(runs) == 2
+
+    def test_tool_failure(self, fake_ropgadget, binary):
+        script, _ = fake_ropgadget
+        script.write_text("#!/bin/sh\necho boom >&2\nexit 1\n")
+        with pytest.raises(GadgetToolError, match="boom"):
+            get_gadgets(str(binary))
+
+    def test_call_sites_share_one_run(self, fake_ropgadget, binary):
+        _, runs = fake_ropgadget
+        ctx = BinaryContext(str(binary))
+        ctx.collect_rop_gadgets(bad_bytes=[0x0a])
+        info = cached_rop_analysis(str(binary), "key")
+
+        assert ctx.rop_gadgets.total_gadgets == info.total_gadgets == 5
+        assert ctx.rop_gadgets.pop_rdi_ret == info.pop_rdi_ret == 0x40113d
+        assert ctx.rop_gadgets.filtered_by_bad_bytes == 1  # 0x40110a has a 0x0a byte
+        assert run_count(runs) == 1
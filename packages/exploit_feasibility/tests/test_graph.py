@@ -4,6 +4,7 @@
 import pytest
 from ..graph import (
     PrimitiveDependencyGraph,
+    compile_graph,
     create_dependency_graph,
 )
 
@@ -109,6 +110,56 @@ class TestPrimitiveDependencyGraph:
         assert "full_relro" in summary
 
 
+class TestCompiledGraph:
+    """Tests for the shared, memoised search structure."""
+
+    def test_graphs_share_compiled_form(self):
+        """Graphs with the same primitives reuse one CompiledGraph."""
+        a = PrimitiveDependencyGraph(["pie"])
+        b = PrimitiveDependencyGraph(["full_relro"])
+        assert compile_graph(a.primitives) is compile_graph(b.primitives)
+
+    def test_blocked_mask_shared_by_equivalent_mitigations(self):
+        """Mitigations that block nothing do not change the search key."""
+        graph = PrimitiveDependencyGraph()
+        compiled = compile_graph(graph.primitives)
+        assert compiled.blocked_mask(frozenset()) == compiled.blocked_mask(frozenset({"not_a_mitigation"}))
+        assert compiled.blocked_mask(frozenset({"glibc_n_disabled"})) != 0
+
+    def test_memoised_paths_are_fresh_objects(self):
+        """Repeated searches return equal but independent ExploitPaths."""
+        graph = PrimitiveDependencyGraph()
+        first = graph.find_paths_to_goal("format_string_vuln", "arbitrary_write")
+        assert first
+        first[0].steps.append("mutated")
+        second = graph.find_paths_to_goal("format_string_vuln", "arbitrary_write")
+        assert "mutated" not in second[0].steps
+
+    def test_mitigation_changes_after_construction(self):
+        """Searches follow later edits to active_mitigations and primitives."""
+        graph = PrimitiveDependencyGraph()
+        assert graph.find_paths_to_goal("format_string_vuln", "arbitrary_write")
+
+        graph.active_mitigations.add("glibc_n_disabled")
+        assert not graph.find_paths_to_goal("format_string_vuln", "arbitrary_write")
+
+        graph.primitives["format_string_write"].blocked_by = []
+        assert graph.find_paths_to_goal("format_string_vuln", "arbitrary_write")
+
+    def test_available_includes_unknown_starts(self):
+        """Unknown starting points are returned unchanged."""
+        available = PrimitiveDependencyGraph().get_available_primitives(["nonexistent"])
+        assert available == {"nonexistent"}
+
+    def test_what_if_blocked(self):
+        """Adding glibc_n_disabled blocks the %n write paths."""
+        graph = PrimitiveDependencyGraph()
+        blocked = graph.what_if_blocked("glibc_n_disabled", goal="arbitrary_write")
+        assert set(blocked) == {"format_string_vuln"}
+        assert all("format_string_write" in p.steps for p in blocked["format_string_vuln"])
+        assert graph.what_if_blocked("not_a_mitigation") == {}
+
+
 class TestCreateDependencyGraph:
     """Tests for create_dependency_graph function."""
 
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Tests for the persistent libc fingerprint database."""
+
+import glob
+import os
+import stat
+
+import pytest
+
+from core.elf import is_elf
+
+from ..cache import clear_caches, get_libc_info, get_one_gadgets
+from ..config import AnalysisConfig, reset_config, set_config
+from ..constraints import assess_libc_fingerprinting
+from ..libc_db import LIBC_GLOBS, LibcDB, get_libc_db, main
+
+SYSTEM_LIBC = next((os.path.realpath(p) for pattern in LIBC_GLOBS
+                    for p in sorted(glob.glob(pattern)) if is_elf(p)), None)
+
+ONE_GADGET_OUTPUT = """0x4c140 posix_spawn(rsp+0xc, "/bin/sh", 0, rbp, rsp+0x50, environ)
+constraints:
+  address rsp+0x60 is writable
+  rsp & 0xf == 0
+
+0xd511f execve("/bin/sh", rbp-0x40, r13)
+constraints:
+  address rbp-0x38 is writable
+"""
+
+BASE = 0x7f3a1c400000
+
+pytestmark = pytest.mark.skipif(not SYSTEM_LIBC, reason="needs a system libc")
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    set_config(AnalysisConfig(cache_dir=str(tmp_path / "cache")))
+    clear_caches()
+    yield tmp_path / "cache"
+    clear_caches()
+    reset_config()
+
+
+@pytest.fixture
+def fake_one_gadget(tmp_path, monkeypatch):
+    """A one_gadget stand-in on PATH that counts its runs."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    runs = tmp_path / "runs"
+    output = tmp_path / "output.txt"
+    output.write_text(ONE_GADGET_OUTPUT)
+    script = bin_dir / "one_gadget"
+    script.write_text(f"#!/bin/sh\necho run >> {runs}\ncat {output}\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return runs
+
+
+def leaks_for(record, *symbols, base=BASE):
+    return {symbol: base + record.symbols[symbol] for symbol in symbols}
+
+
+class TestLibcDB:
+    """Indexing, persistence and lookups."""
+
+    def test_lookup_indexes_libc(self, cache_dir):
+        record = get_libc_db().lookup(SYSTEM_LIBC)
+        assert "system" in record.symbols and "puts" in record.symbols
+        assert record.bin_sh_offset is not None
+        assert record.version.startswith("GNU C Library")
+        assert (cache_dir / "libc.sqlite").exists()
+
+    def test_persists_across_instances(self, cache_dir):
+        first = LibcDB().add(SYSTEM_LIBC)
+        reopened = LibcDB()
+        assert len(reopened) == 1
+        assert reopened.get(SYSTEM_LIBC) == first
+
+    def test_get_unindexed_is_none(self, cache_dir):
+        assert LibcDB().get(SYSTEM_LIBC) is None
+
+    def test_identify_from_leaks(self, cache_dir):
+        db = get_libc_db()
+        record = db.lookup(SYSTEM_LIBC)
+        assert db.identify(leaks_for(record, "puts", "printf")) == [record]
+
+    def test_identify_rejects_wrong_page_offset(self, cache_dir):
+        db = get_libc_db()
+        record = db.lookup(SYSTEM_LIBC)
+        assert db.identify({"puts": BASE + record.symbols["puts"] + 8}) == []
+
+    def test_identify_rejects_inconsistent_bases(self, cache_dir):
+        db = get_libc_db()
+        record = db.lookup(SYSTEM_LIBC)
+        leaks = leaks_for(record, "puts")
+        leaks.update(leaks_for(record, "printf", base=BASE + 0x1000))
+        assert db.identify(leaks) == []
+
+    def test_caching_disabled_uses_memory(self, tmp_path):
+        set_config(AnalysisConfig(cache_dir=str(tmp_path / "cache"), enable_caching=False))
+        try:
+            get_libc_db().lookup(SYSTEM_LIBC)
+            assert not (tmp_path / "cache").exists()
+        finally:
+            reset_config()
+
+
+class TestOneGadget:
+    """one_gadget output is stored per libc."""
+
+    def test_runs_once_per_libc(self, cache_dir, fake_one_gadget):
+        assert get_libc_db().one_gadget_output(SYSTEM_LIBC) == ONE_GADGET_OUTPUT
+        assert LibcDB().one_gadget_output(SYSTEM_LIBC) == ONE_GADGET_OUTPUT
+        assert len(fake_one_gadget.read_text().splitlines()) == 1
+
+    def test_missing_tool_is_not_stored(self, cache_dir, monkeypatch):
+        monkeypatch.setenv("PATH", "")
+        with pytest.raises(FileNotFoundError):
+            get_libc_db().one_gadget_output(SYSTEM_LIBC)
+        assert LibcDB().get(SYSTEM_LIBC).one_gadget_output is None
+
+    def test_cache_layer_parses_stored_output(self, cache_dir, fake_one_gadget):
+        info = get_one_gadgets(SYSTEM_LIBC)
+        assert [g.offset for g in info.gadgets] == [0x4c140, 0xd511f]
+        assert info.gadgets[1].constraints == ["address rbp-0x38 is writable"]
+
+
+def test_cached_libc_info_uses_db(cache_dir):
+    info = get_libc_info(SYSTEM_LIBC)
+    record = get_libc_db().get(SYSTEM_LIBC)
+    assert record is not None
+    assert info.system_offset == record.symbols["system"]
+    assert info.binsh_offset == record.bin_sh_offset
+
+
+def test_fingerprinting_with_leaks(cache_dir):
+    record = get_libc_db().lookup(SYSTEM_LIBC)
+    potential = assess_libc_fingerprinting(
+        ["puts", "printf"], leaks=leaks_for(record, "puts", "printf"))
+    assert len(potential.candidate_libcs) == 1
+    assert potential.candidate_libcs[0].startswith(SYSTEM_LIBC)
+    assert potential.to_dict()["candidate_libcs"] == potential.candidate_libcs
+
+
+def test_cli_identify(cache_dir, capsys):
+    assert main(["scan", SYSTEM_LIBC]) == 0
+    record = get_libc_db().get(SYSTEM_LIBC)
+    leak = hex(BASE + record.symbols["puts"])
+    assert main(["identify", f"puts={leak}"]) == 0
+    assert SYSTEM_LIBC in capsys.readouterr().out
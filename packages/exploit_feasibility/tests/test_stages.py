@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Tests for the analysis stage scheduler."""
+
+import dataclasses
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import pytest
+
+from ..analyzer import FeasibilityAnalyzer
+from ..stages import Stage, run_stages
+
+
+@dataclass
+class Report:
+    log: List[str] = field(default_factory=list)
+    values: Dict[str, int] = field(default_factory=dict)
+    total: Optional[int] = None
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+
+
+def make_stages(active=None):
+    """Stages whose sleeps make later stages finish first."""
+    lock = threading.Lock()
+
+    def step(name, delay, value):
+        def run(report):
+            if active is not None:
+                with lock:
+                    active.append(name)
+            time.sleep(delay)
+            report.log.append(f"{name} done")
+            report.values[name] = value
+        return run
+
+    def total(report):
+        report.total = sum(report.values.values())
+        report.log = [entry.upper() for entry in report.log]  # Rewrites the list
+
+    return [
+        Stage("a", step("a", 0.3, 1)),
+        Stage("b", step("b", 0.1, 2)),
+        Stage("c", step("c", 0.05, 3), depends_on=("b",)),
+        Stage("total", total, depends_on=("a", "b", "c")),
+        Stage("d", step("d", 0.0, 4)),
+    ]
+
+
+class TestRunStages:
+    """run_stages matches the sequential path."""
+
+    def test_parallel_matches_sequential(self):
+        sequential, parallel = Report(), Report()
+        run_stages(sequential, make_stages(), max_workers=1)
+        run_stages(parallel, make_stages(), max_workers=4)
+
+        assert parallel.log == sequential.log == ["A DONE", "B DONE", "C DONE", "d done"]
+        assert parallel.values == sequential.values
+        assert parallel.total == sequential.total == 6
+        assert set(parallel.stage_timings) == {"a", "b", "c", "total", "d"}
+
+    def test_independent_stages_overlap(self):
+        started = []
+        start = time.perf_counter()
+        run_stages(Report(), make_stages(started), max_workers=4)
+        # a (0.3s) overlaps b -> c; sequentially this takes over 0.45s
+        assert time.perf_counter() - start < 0.42
+        assert set(started[:2]) == {"a", "b"}
+
+    def test_stage_error_propagates(self):
+        def fail(report):
+            raise RuntimeError("tool crashed")
+
+        report = Report()
+        with pytest.raises(RuntimeError, match="tool crashed"):
+            run_stages(report, make_stages()[:2] + [Stage("fail", fail)], max_workers=4)
+        assert report.log == ["a done", "b done"]
+
+    def test_rejects_dependency_on_later_stage(self):
+        stages = [Stage("x", lambda r: None, depends_on=("y",)), Stage("y", lambda r: None)]
+        with pytest.raises(ValueError, match="later stage"):
+            run_stages(Report(), stages, max_workers=2)
+
+
+@pytest.mark.skipif(not shutil.which("ls"), reason="needs a system binary")
+class TestParallelFullAnalysis:
+    """FeasibilityAnalyzer reports match with and without concurrent stages."""
+
+    def test_extended_report_identical(self):
+        binary = shutil.which("ls")
+        reports = [
+            FeasibilityAnalyzer(binary, max_workers=workers).full_analysis(
+                "format_string", input_handler="strcpy", extended=True)
+            for workers in (1, 6)
+        ]
+
+        def fields(report):
+            # Address-space samples differ between runs under ASLR
+            return {f.name: repr(getattr(report, f.name)) for f in dataclasses.fields(report)
+                    if f.name not in ("stage_timings", "address_space")}
+
+        assert fields(reports[0]) == fields(reports[1])
+        assert set(reports[0].stage_timings) == set(reports[1].stage_timings)
+        assert "rop_gadgets" in reports[1].stage_timings
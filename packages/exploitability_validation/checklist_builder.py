@@ -19,6 +19,8 @@ from typing import List, Dict, Optional, Set
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from core.inventory import get_inventory
+
 logger = logging.getLogger(__name__)
 
 # Maximum workers for parallel file processing
@@ -442,24 +444,18 @@ def _collect_source_files(target: Path, extensions: Set[str]) -> List[Path]:
     """
     Collect all source files in a single pass.
 
-    More efficient than multiple rglob() calls.
+    Reads the shared repository inventory (core.inventory), so the tree is
+    not walked again when another stage of the run already listed it.
     """
     if target.is_file():
         return [target]
 
-    file_list = []
-
-    # Single-pass directory walk
-    for root, dirs, files in os.walk(target):
-        # Prune hidden directories early
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
-
-        for filename in files:
-            ext = Path(filename).suffix.lower()
-            if ext in extensions:
-                file_list.append(Path(root) / filename)
-
-    return file_list
+    # Hidden directories are pruned, as before
+    return [
+        target / f.path
+        for f in get_inventory(target).files(skip_hidden_dirs=True)
+        if f.ext.lower() in extensions
+    ]
 
 
 def build_checklist(
@@ -6,12 +6,16 @@ Provides fuzzing capabilities using AFL++ and other fuzzers.
 """
 
 from .afl_runner import AFLRunner
+from .afl_monitor import CampaignMonitor
 from .crash_collector import CrashCollector, Crash
-from .corpus_manager import CorpusManager
+from .corpus_manager import CorpusManager, SeedCoverage, minimal_cover
 
 __all__ = [
     'AFLRunner',
+    'CampaignMonitor',
     'CrashCollector',
     'Crash',
     'CorpusManager',
+    'SeedCoverage',
+    'minimal_cover',
 ]
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+RAPTOR AFL++ Campaign Monitor
+
+Watches every instance of an AFL++ campaign (<output>/<instance>/crashes/
+and <output>/<instance>/fuzzer_stats) and reacts as files appear instead of
+sleeping and re-listing directories:
+- New crash inputs are counted and handed to a callback as soon as AFL
+  finishes writing them, from the main instance and all secondaries
+- fuzzer_stats of every instance is re-read when rewritten and aggregated
+
+On Linux the monitor uses inotify (through libc, no extra dependency).
+Elsewhere, or if inotify is unavailable, it rescans the instances on every
+wait() instead.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from core.logging import get_logger
+
+logger = get_logger()
+
+# inotify(7)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Per-directory watch masks, as narrow as possible: AFL rewrites .cur_input
+# (and queue entries) in the instance directory constantly.
+# Output dir: new instance directories
+_OUTPUT_MASK = _IN_CREATE
+# Instance dir: fuzzer_stats, which AFL renames into place; IN_CREATE only
+# until crashes/ exists
+_INSTANCE_MASK = _IN_MOVED_TO
+_NEW_INSTANCE_MASK = _INSTANCE_MASK | _IN_CREATE
+# Crashes dir: crash inputs once fully written
+_CRASHES_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO
+
+# fuzzer_stats fields summed / maxed across instances (others: main's value)
+_SUMMED_STATS = (
+    "execs_done", "execs_per_sec", "paths_found", "paths_total", "corpus_count",
+    "corpus_found", "saved_crashes", "unique_crashes", "saved_hangs", "unique_hangs",
+)
+_MAX_STATS = ("bitmap_cvg", "stability", "run_time", "last_update")
+
+
+def parse_fuzzer_stats(stats_file: Path) -> Dict[str, str]:
+    """Parse an AFL fuzzer_stats file ("key : value" lines); {} if unreadable."""
+    stats = {}
+    try:
+        with open(stats_file) as f:
+            for line in f:
+                if ":" in line:
+                    key, value = line.strip().split(":", 1)
+                    stats[key.strip()] = value.strip()
+    except OSError:
+        pass
+    return stats
+
+
+def _number(value: str) -> Optional[float]:
+    try:
+        return float(value.rstrip("%"))
+    except ValueError:
+        return None
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if value == int(value) else f"{value:.2f}"
+
+
+class _Inotify:
+    """Minimal inotify binding: directory watches and decoded events."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: Path, mask: int) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(path))
+        return wd
+
+    def read(self, timeout: float):
+        """Events as (wd, mask, name) tuples, waiting up to timeout seconds for the first."""
+        if not select.select([self.fd], [], [], max(timeout, 0))[0]:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="surrogateescape")
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class CampaignMonitor:
+    """Crash and stats watcher for all instances of one AFL++ output directory."""
+
+    def __init__(self, output_dir: Path,
+                 on_crash: Optional[Callable[[Path], None]] = None,
+                 use_inotify: bool = True):
+        """
+        Args:
+            output_dir: AFL output directory (parent of the instance directories)
+            on_crash: Called with each new crash input path, once, as it appears
+            use_inotify: Use inotify when available (False: always rescan)
+        """
+        self.output_dir = Path(output_dir)
+        self.on_crash = on_crash
+        self.crashes: List[Path] = []
+
+        self._seen: Set[Path] = set()
+        self._instance_stats: Dict[str, Dict[str, str]] = {}
+        self._stats_mtimes: Dict[str, int] = {}
+        self._inotify: Optional[_Inotify] = None
+        self._watches: Dict[int, Path] = {}
+        self._watch_masks: Dict[Path, int] = {}
+
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.debug(f"inotify unavailable, polling instead: {e}")
+
+    def __enter__(self) -> "CampaignMonitor":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def crash_count(self) -> int:
+        """Crash inputs seen so far across all instances."""
+        return len(self.crashes)
+
+    @property
+    def event_driven(self) -> bool:
+        return self._inotify is not None
+
+    def start(self) -> None:
+        """Watch the output directory and pick up anything already there."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._watch(self.output_dir, _OUTPUT_MASK)
+        self.refresh()
+
+    def wait(self, timeout: float) -> None:
+        """
+        Handle new crashes and stats for up to timeout seconds.
+
+        Event-driven: returns as soon as a batch of changes has been handled
+        (or at timeout), so callers can check thresholds right away. Polling:
+        sleeps for timeout, then rescans.
+        """
+        if self._inotify is None:
+            time.sleep(max(timeout, 0))
+            self.refresh()
+            return
+
+        for wd, mask, name in self._inotify.read(timeout):
+            if mask & _IN_Q_OVERFLOW:
+                self.refresh()
+                continue
+            if mask & _IN_IGNORED:
+                directory = self._watches.pop(wd, None)
+                if directory is not None:
+                    self._watch_masks.pop(directory, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / name
+
+            if directory == self.output_dir:
+                if mask & _IN_ISDIR:
+                    self._scan_instance(path)
+            elif directory.name == "crashes":
+                self._found_crash(path)
+            elif name == "crashes" and mask & _IN_ISDIR:
+                self._watch_crashes(path)
+            elif name == "fuzzer_stats":
+                self._read_stats(directory)
+
+    def stats(self) -> Dict[str, str]:
+        """
+        fuzzer_stats aggregated over all instances.
+
+        Counters and rates (execs, paths, crashes) are summed, coverage and
+        stability take the best instance, and other fields are the main
+        instance's. Values are strings, as in fuzzer_stats.
+        """
+        if not self._instance_stats:
+            return {}
+        main = self._instance_stats.get("main") or next(iter(self._instance_stats.values()))
+        aggregated = dict(main)
+        for key in _SUMMED_STATS + _MAX_STATS:
+            values = [_number(stats[key]) for stats in self._instance_stats.values() if key in stats]
+            values = [value for value in values if value is not None]
+            if values:
+                total = sum(values) if key in _SUMMED_STATS else max(values)
+                aggregated[key] = _format_number(total)
+        aggregated["instances"] = str(len(self._instance_stats))
+        return aggregated
+
+    def refresh(self) -> None:
+        """Full pass over every instance (start, polling, lost events, final count)."""
+        try:
+            instances = [entry.path for entry in os.scandir(self.output_dir) if entry.is_dir()]
+        except OSError:
+            return
+        for instance in sorted(instances):
+            self._scan_instance(Path(instance))
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    # ── Internals ────────────────────────────────────────────────────────────
+
+    def _watch(self, directory: Path, mask: int) -> bool:
+        """Watch directory for mask (replacing an earlier mask); False if not watched."""
+        if self._inotify is None:
+            return False
+        if self._watch_masks.get(directory) == mask:
+            return True
+        try:
+            # Same inode, same wd: a second add_watch just replaces the mask
+            self._watches[self._inotify.add_watch(directory, mask)] = directory
+        except OSError as e:
+            logger.debug(f"Cannot watch {directory}: {e}")
+            return False
+        self._watch_masks[directory] = mask
+        return True
+
+    def _scan_instance(self, instance: Path) -> None:
+        # Watch before listing, so files created in between are not missed
+        if self._watch_masks.get(instance) != _INSTANCE_MASK:
+            self._watch(instance, _NEW_INSTANCE_MASK)
+        crashes_dir = instance / "crashes"
+        if crashes_dir.is_dir():
+            self._watch_crashes(crashes_dir)
+        self._read_stats(instance)
+
+    def _watch_crashes(self, crashes_dir: Path) -> None:
+        if self._watch(crashes_dir, _CRASHES_MASK):
+            # crashes/ was all IN_CREATE was needed for on the instance
+            self._watch(crashes_dir.parent, _INSTANCE_MASK)
+        self._scan_crashes(crashes_dir)
+
+    def _scan_crashes(self, crashes_dir: Path) -> None:
+        try:
+            names = sorted(entry.name for entry in os.scandir(crashes_dir) if entry.is_file())
+        except OSError:
+            return
+        for name in names:
+            self._found_crash(crashes_dir / name)
+
+    def _found_crash(self, path: Path) -> None:
+        if not path.name.startswith("id:") or path in self._seen:
+            return
+        self._seen.add(path)
+        self.crashes.append(path)
+        if self.on_crash is not None:
+            try:
+                self.on_crash(path)
+            except Exception as e:
+                logger.warning(f"Crash callback failed for {path}: {e}")
+
+    def _read_stats(self, instance: Path) -> None:
+        stats_file = instance / "fuzzer_stats"
+        try:
+            mtime = stats_file.stat().st_mtime_ns
+        except OSError:
+            return
+        if self._stats_mtimes.get(instance.name) == mtime:
+            return
+        stats = parse_fuzzer_stats(stats_file)
+        if stats:
+            self._stats_mtimes[instance.name] = mtime
+            self._instance_stats[instance.name] = stats
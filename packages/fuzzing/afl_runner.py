@@ -10,10 +10,12 @@ import shutil
 import subprocess
 import time
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 
 from core.logging import get_logger
 
+from .afl_monitor import CampaignMonitor, parse_fuzzer_stats
+
 logger = get_logger()
 
 
@@ -216,6 +218,7 @@ class AFLRunner:
         parallel_jobs: int = 1,
         timeout_ms: int = 1000,
         max_crashes: Optional[int] = None,
+        on_crash: Optional[Callable[[Path], None]] = None,
     ) -> Tuple[int, Path]:
         """
         Run AFL++ fuzzing campaign.
@@ -224,10 +227,12 @@ class AFLRunner:
             duration: Fuzzing duration in seconds
             parallel_jobs: Number of parallel AFL instances
             timeout_ms: Timeout per execution in milliseconds
-            max_crashes: Stop after finding N unique crashes
+            max_crashes: Stop after finding N unique crashes (in all instances)
+            on_crash: Called with each new crash input as soon as it appears
 
         Returns:
-            Tuple of (num_crashes, crashes_dir)
+            Tuple of (num_crashes across all instances, main instance crashes_dir;
+            see crash_dirs() for every instance's)
         """
         logger.info("=" * 70)
         logger.info("STARTING AFL++ FUZZING CAMPAIGN")
@@ -278,41 +283,43 @@ class AFLRunner:
             )
             processes.append((instance_name, proc))
 
-        # Monitor fuzzing
+        # Monitor fuzzing: react to new crashes and stats in every instance
         start_time = time.time()
         crashes_dir = self.output_dir / "main" / "crashes"
         last_logged_crashes = 0
         last_status_time = 0
+        monitor = CampaignMonitor(self.output_dir, on_crash=on_crash)
 
         try:
+            monitor.start()
+            logger.info(f"Monitoring {self.output_dir} "
+                        f"({'inotify' if monitor.event_driven else 'polling'})")
             while time.time() - start_time < duration:
-                time.sleep(10)  # Check every 10 seconds
+                monitor.wait(min(1.0, duration - (time.time() - start_time)))
                 current_time = time.time()
 
-                # Count unique crashes
-                if crashes_dir.exists():
-                    num_crashes = len([f for f in crashes_dir.iterdir() if f.name.startswith("id:")])
-
-                    if num_crashes > last_logged_crashes:
-                        logger.info(f"Progress: {num_crashes} unique crashes found")
-                        last_logged_crashes = num_crashes
+                # Count unique crashes across all instances
+                num_crashes = monitor.crash_count
+                if num_crashes > last_logged_crashes:
+                    logger.info(f"Progress: {num_crashes} unique crashes found")
+                    last_logged_crashes = num_crashes
 
-                    if max_crashes and num_crashes >= max_crashes:
-                        logger.info(f"✓ Reached {max_crashes} crashes, stopping early")
-                        break
+                if max_crashes and num_crashes >= max_crashes:
+                    logger.info(f"✓ Reached {max_crashes} crashes, stopping early")
+                    break
 
                 # Periodic status update (every 60 seconds)
                 if current_time - last_status_time >= 60:
                     elapsed = current_time - start_time
-                    stats = self.get_stats()
+                    stats = monitor.stats()
                     if stats:
                         execs_per_sec = stats.get('execs_per_sec', 'N/A')
                         total_execs = stats.get('execs_done', 'N/A')
-                        paths_found = stats.get('paths_found', 'N/A')
+                        paths_found = stats.get('paths_found', stats.get('corpus_count', 'N/A'))
                         stability = stats.get('stability', 'N/A')
                         bitmap_cvg = stats.get('bitmap_cvg', 'N/A')
                         
-                        logger.info(f"Status: {elapsed:.0f}s elapsed | {execs_per_sec} exec/s | {total_execs} total execs | {paths_found} paths | {stability}% stable | {bitmap_cvg}% coverage")
+                        logger.info(f"Status: {elapsed:.0f}s elapsed | {stats['instances']} instances | {execs_per_sec} exec/s | {total_execs} total execs | {paths_found} paths | {stability}% stable | {bitmap_cvg}% coverage")
                     else:
                         logger.info(f"Status: {elapsed:.0f}s elapsed (no stats available yet)")
                     
@@ -375,20 +382,20 @@ class AFLRunner:
                     logger.warning(f"Force killing {name}")
                     proc.kill()
 
-        # Count final crashes
-        total_crashes = 0
-        if crashes_dir.exists():
-            crash_files = [f for f in crashes_dir.iterdir() if f.name.startswith("id:")]
-            total_crashes = len(crash_files)
+            # Count final crashes (including any written while instances stopped)
+            monitor.refresh()
+            monitor.close()
+
+        total_crashes = monitor.crash_count
 
         elapsed = time.time() - start_time
         
         # Final status report
-        final_stats = self.get_stats()
+        final_stats = monitor.stats()
         if final_stats:
             total_execs = final_stats.get('execs_done', 'N/A')
             execs_per_sec = final_stats.get('execs_per_sec', 'N/A')
-            paths_found = final_stats.get('paths_found', 'N/A')
+            paths_found = final_stats.get('paths_found', final_stats.get('corpus_count', 'N/A'))
             stability = final_stats.get('stability', 'N/A')
             bitmap_cvg = final_stats.get('bitmap_cvg', 'N/A')
             
@@ -473,19 +480,11 @@ class AFLRunner:
 
     def get_stats(self) -> dict:
         """Get fuzzing statistics from AFL."""
-        stats_file = self.output_dir / "main" / "fuzzer_stats"
-
-        if not stats_file.exists():
-            return {}
-
-        stats = {}
-        with open(stats_file) as f:
-            for line in f:
-                if ":" in line:
-                    key, value = line.strip().split(":", 1)
-                    stats[key.strip()] = value.strip()
+        return parse_fuzzer_stats(self.output_dir / "main" / "fuzzer_stats")
 
-        return stats
+    def crash_dirs(self) -> List[Path]:
+        """crashes/ directories of every instance (main first)."""
+        return sorted(self.output_dir.glob("*/crashes"), key=lambda d: (d.parent.name != "main", d.parent.name))
 
     def run_showmap(self) -> dict:
         """Run afl-showmap to analyze coverage."""
@@ -5,14 +5,80 @@ Corpus Manager
 Manages fuzzing corpus (seed inputs).
 """
 
+import heapq
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from core.logging import get_logger
 
 logger = get_logger()
 
 
+@dataclass
+class SeedCoverage:
+    """Edge coverage of one seed, as measured by afl-showmap."""
+    path: Path
+    edges: int          # Bitset: bit i set if edge i of the coverage map was hit
+    size: int           # Seed size in bytes
+    exec_ms: float      # Wall time of the measuring run
+
+    @property
+    def edge_count(self) -> int:
+        return bin(self.edges).count('1')
+
+
+def _edge_bitset(map_file: Path) -> int:
+    """Parse afl-showmap output ("edge:count" lines) into an edge bitset."""
+    edges = [int(line.split(":", 1)[0]) for line in map_file.read_text().splitlines() if ":" in line]
+    if not edges:
+        return 0
+    bitmap = bytearray(max(edges) // 8 + 1)
+    for edge in edges:
+        bitmap[edge >> 3] |= 1 << (edge & 7)
+    return int.from_bytes(bitmap, "little")
+
+
+def minimal_cover(coverages: List[SeedCoverage]) -> List[SeedCoverage]:
+    """
+    Greedy set cover: a small subset of seeds hitting every edge any seed hits.
+
+    Repeatedly takes the seed adding the most uncovered edges; ties go to the
+    seed with the lowest exec time x size (AFL's favoured-entry cost). Gains
+    only shrink as edges get covered, so stale heap entries are re-scored
+    lazily instead of rescanning every seed per pick.
+
+    Returns:
+        The chosen seeds, in pick order
+    """
+    uncovered = 0
+    for coverage in coverages:
+        uncovered |= coverage.edges
+
+    heap = [(-c.edge_count, c.exec_ms * c.size, idx) for idx, c in enumerate(coverages) if c.edges]
+    heapq.heapify(heap)
+
+    chosen = []
+    while uncovered and heap:
+        _, cost, idx = heapq.heappop(heap)
+        edges = coverages[idx].edges
+        gain = bin(edges & uncovered).count('1')
+        if gain == 0:
+            continue
+        if heap and (-gain, cost) > heap[0][:2]:
+            heapq.heappush(heap, (-gain, cost, idx))
+            continue
+        chosen.append(coverages[idx])
+        uncovered &= ~edges
+    return chosen
+
+
 class CorpusManager:
     """Manages fuzzing corpus."""
 
@@ -55,6 +121,72 @@ class CorpusManager:
         """List all seeds in corpus."""
         return list(self.corpus_dir.rglob("*"))
 
+    def collect_coverage(
+        self,
+        binary: Path,
+        seeds: Optional[List[Path]] = None,
+        input_mode: str = "stdin",
+        timeout_ms: int = 1000,
+        qemu: bool = False,
+        workers: Optional[int] = None,
+    ) -> List[SeedCoverage]:
+        """
+        Run afl-showmap over seeds, several at once, recording edge coverage.
+
+        Seeds whose run produced no coverage map (timeout, showmap error) are
+        left out of the result.
+
+        Args:
+            binary: Target binary
+            seeds: Seeds to measure (default: every seed in the corpus)
+            input_mode: "stdin" or "file" (seed path passed as argument)
+            timeout_ms: Per-seed execution timeout
+            qemu: Run in QEMU mode (uninstrumented binary)
+            workers: Concurrent afl-showmap runs (default: CPU count)
+
+        Raises:
+            FileNotFoundError: afl-showmap is not installed
+        """
+        showmap = shutil.which("afl-showmap")
+        if not showmap:
+            raise FileNotFoundError("afl-showmap not found")
+        if seeds is None:
+            seeds = [seed for seed in self.list_seeds() if seed.is_file()]
+
+        with tempfile.TemporaryDirectory(prefix="raptor_showmap_") as tmp:
+            def measure(idx: int) -> Optional[SeedCoverage]:
+                seed = seeds[idx]
+                map_file = Path(tmp) / f"map{idx}"
+                cmd = [showmap, "-q", "-e", "-t", str(timeout_ms), "-o", str(map_file)]
+                if qemu:
+                    cmd.append("-Q")
+                cmd += ["--", str(binary)]
+                if input_mode == "file":
+                    cmd.append(str(seed))
+                start = time.monotonic()
+                try:
+                    with open(seed, "rb") as stdin:
+                        subprocess.run(
+                            cmd,
+                            stdin=stdin if input_mode != "file" else subprocess.DEVNULL,
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL,
+                            timeout=timeout_ms / 1000 + 10,
+                        )
+                    exec_ms = (time.monotonic() - start) * 1000
+                    return SeedCoverage(seed, _edge_bitset(map_file), seed.stat().st_size, exec_ms)
+                except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+                    logger.debug(f"afl-showmap failed on {seed}: {e}")
+                    return None
+
+            workers = workers or os.cpu_count() or 1
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="showmap") as pool:
+                results = list(pool.map(measure, range(len(seeds))))
+
+        coverages = [coverage for coverage in results if coverage is not None]
+        logger.info(f"Measured coverage of {len(coverages)}/{len(seeds)} seeds")
+        return coverages
+
     def get_stats(self) -> dict:
         """Get corpus statistics."""
         seeds = self.list_seeds()
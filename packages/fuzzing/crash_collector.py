@@ -2,13 +2,15 @@
 """
 RAPTOR Crash Collector
 
-Collects and deduplicates crashes from AFL output.
+Collects and deduplicates crashes from AFL output (by input hash, then stack hash).
 """
 
 import hashlib
-from dataclasses import dataclass
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Sequence, Union
 
 from core.logging import get_logger
 
@@ -24,6 +26,7 @@ class Crash:
     stack_hash: Optional[str] = None
     size: int = 0
     timestamp: Optional[float] = None
+    duplicates: List[str] = field(default_factory=list)  # IDs of crashes with the same stack hash
 
     def __repr__(self):
         return f"Crash(id={self.crash_id}, signal={self.signal}, size={self.size})"
@@ -32,10 +35,18 @@ class Crash:
 class CrashCollector:
     """Collects and deduplicates crashes from fuzzing output."""
 
-    def __init__(self, crashes_dir: Path):
-        self.crashes_dir = Path(crashes_dir)
-        if not self.crashes_dir.exists():
+    def __init__(self, crashes_dir: Union[Path, Sequence[Path]]):
+        """
+        Args:
+            crashes_dir: An AFL crashes/ directory, or several (e.g. one per
+                         instance, from AFLRunner.crash_dirs(); missing ones
+                         are skipped)
+        """
+        dirs = [Path(crashes_dir)] if isinstance(crashes_dir, (str, Path)) else [Path(d) for d in crashes_dir]
+        self.crashes_dirs = [d for d in dirs if d.exists()]
+        if not self.crashes_dirs:
             raise FileNotFoundError(f"Crashes directory not found: {crashes_dir}")
+        self.crashes_dir = self.crashes_dirs[0]
 
     def collect_crashes(self, max_crashes: Optional[int] = None) -> List[Crash]:
         """
@@ -47,12 +58,13 @@ class CrashCollector:
         Returns:
             List of Crash objects
         """
-        logger.info(f"Collecting crashes from: {self.crashes_dir}")
+        logger.info(f"Collecting crashes from: {', '.join(str(d) for d in self.crashes_dirs)}")
 
-        crash_files = sorted([
-            f for f in self.crashes_dir.iterdir()
+        crash_files = [
+            f for crashes_dir in self.crashes_dirs
+            for f in sorted(crashes_dir.iterdir())
             if f.name.startswith("id:") and f.is_file()
-        ])
+        ]
 
         if not crash_files:
             logger.warning("No crashes found!")
@@ -66,8 +78,7 @@ class CrashCollector:
         for crash_file in crash_files[:max_crashes] if max_crashes else crash_files:
             crash = self._parse_crash_file(crash_file)
 
-            # Deduplicate by input hash (simple approach)
-            # In practice, you'd want stack hash deduplication
+            # Deduplicate by input hash (see deduplicate_by_stack for stack hashes)
             input_hash = self._hash_file(crash_file)
 
             if input_hash not in seen_hashes:
@@ -80,6 +91,57 @@ class CrashCollector:
 
         return crashes
 
+    def deduplicate_by_stack(
+        self,
+        crashes: List[Crash],
+        stack_signature: Callable[[Path], str],
+        workers: Optional[int] = None,
+    ) -> List[Crash]:
+        """
+        Bucket crashes by stack hash and keep one representative per bucket.
+
+        Cheap triage before full analysis: every input is replayed through
+        stack_signature (e.g. CrashAnalyser.stack_signature), several at once
+        since each replay is its own debugger process. The smallest input of
+        each bucket is kept, with the IDs of the rest in its duplicates.
+        Crashes without a signature are all kept.
+
+        Args:
+            crashes: Crashes to triage (input-hash unique, from collect_crashes)
+            stack_signature: Input file -> stack hash ("" if unknown)
+            workers: Concurrent replays (default: CPU count)
+
+        Returns:
+            Representatives, in the order of crashes
+        """
+        if not crashes:
+            return []
+
+        workers = workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="triage") as pool:
+            signatures = list(pool.map(lambda crash: stack_signature(crash.input_file), crashes))
+
+        buckets: Dict[str, List[Crash]] = {}
+        representatives = []
+        for crash, signature in zip(crashes, signatures):
+            crash.stack_hash = signature or None
+            if signature:
+                buckets.setdefault(signature, []).append(crash)
+            else:
+                representatives.append(crash)
+
+        for members in buckets.values():
+            best = min(members, key=lambda crash: crash.size)
+            best.duplicates = [crash.crash_id for crash in members if crash is not best]
+            representatives.append(best)
+
+        order = {id(crash): idx for idx, crash in enumerate(crashes)}
+        representatives.sort(key=lambda crash: order[id(crash)])
+
+        logger.info(f"Stack triage: {len(crashes)} crashes -> {len(buckets)} stack buckets "
+                    f"(+{signatures.count('')} without a backtrace)")
+        return representatives
+
     def _parse_crash_file(self, crash_file: Path) -> Crash:
         """Parse crash metadata from filename and content."""
         # AFL crash format: id:000000,sig:06,src:000000,op:havoc,rep:16
@@ -97,6 +159,10 @@ class CrashCollector:
         size = crash_file.stat().st_size
         timestamp = crash_file.stat().st_mtime
 
+        # AFL numbers crashes per instance; qualify IDs from other instances
+        if crash_id and crash_file.parent != self.crashes_dir:
+            crash_id = f"{crash_file.parent.parent.name}_{crash_id}"
+
         return Crash(
             crash_id=crash_id or crash_file.stem,
             input_file=crash_file,
@@ -0,0 +1 @@
+"""Tests for fuzzing module."""
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Tests for the AFL++ campaign monitor."""
+
+import os
+import sys
+import time
+
+import pytest
+
+from ..afl_monitor import CampaignMonitor, parse_fuzzer_stats
+from ..crash_collector import CrashCollector
+
+MODES = [
+    pytest.param(False, id="polling"),
+    pytest.param(True, id="inotify", marks=pytest.mark.skipif(
+        not sys.platform.startswith("linux"), reason="inotify is Linux-only")),
+]
+
+
+def write_stats(instance, **stats):
+    """Write fuzzer_stats the way AFL does: to a temporary file, then rename."""
+    tmp = instance / ".fuzzer_stats_tmp"
+    tmp.write_text("".join(f"{key:<18}: {value}\n" for key, value in stats.items()))
+    os.rename(tmp, instance / "fuzzer_stats")
+
+
+def wait_for(monitor, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            pytest.fail("monitor did not see the change")
+        monitor.wait(0.05)
+
+
+@pytest.fixture(params=MODES)
+def monitor(request, tmp_path):
+    found = []
+    monitor = CampaignMonitor(tmp_path / "out", on_crash=found.append, use_inotify=request.param)
+    if request.param and not monitor.event_driven:
+        pytest.skip("inotify unavailable")
+    monitor.found = found
+    monitor.start()
+    yield monitor
+    monitor.close()
+
+
+def test_parse_fuzzer_stats(tmp_path):
+    stats_file = tmp_path / "fuzzer_stats"
+    stats_file.write_text("execs_done        : 1200\nbitmap_cvg        : 3.25%\nbanner : a:b\n")
+    assert parse_fuzzer_stats(stats_file) == {"execs_done": "1200", "bitmap_cvg": "3.25%", "banner": "a:b"}
+    assert parse_fuzzer_stats(tmp_path / "missing") == {}
+
+
+class TestCampaignMonitor:
+    """Crashes and stats across instances, by events or by rescans."""
+
+    def test_existing_crashes_at_start(self, tmp_path):
+        crashes = tmp_path / "out" / "main" / "crashes"
+        crashes.mkdir(parents=True)
+        (crashes / "id:000000,sig:11").write_bytes(b"x")
+        with CampaignMonitor(tmp_path / "out", use_inotify=False) as monitor:
+            assert monitor.crash_count == 1
+
+    def test_new_instance_and_secondary_crashes(self, monitor):
+        main = monitor.output_dir / "main"
+        (main / "crashes").mkdir(parents=True)
+        (main / "crashes" / "id:000000,sig:11").write_bytes(b"main")
+        wait_for(monitor, lambda: monitor.crash_count == 1)
+
+        # An instance started after the monitor
+        secondary = monitor.output_dir / "secondary1"
+        secondary.mkdir()
+        (secondary / "crashes").mkdir()
+        (secondary / "crashes" / "id:000000,sig:06").write_bytes(b"secondary")
+        (secondary / "crashes" / "README.txt").write_text("not a crash")
+        wait_for(monitor, lambda: monitor.crash_count == 2)
+
+        monitor.refresh()
+        assert monitor.crash_count == 2
+        assert [path.parent.parent.name for path in monitor.found] == ["main", "secondary1"]
+        assert all(path.name.startswith("id:") for path in monitor.crashes)
+
+        crashes = CrashCollector([main / "crashes", secondary / "crashes"]).collect_crashes()
+        assert [crash.crash_id for crash in crashes] == ["000000", "secondary1_000000"]
+
+    def test_stats_aggregated_across_instances(self, monitor):
+        for name in ("main", "secondary1"):
+            (monitor.output_dir / name).mkdir()
+        write_stats(monitor.output_dir / "main", execs_done=1000, execs_per_sec=100.5,
+                    bitmap_cvg="2.50%", afl_banner="main")
+        write_stats(monitor.output_dir / "secondary1", execs_done=500, execs_per_sec=50,
+                    bitmap_cvg="4.00%", afl_banner="secondary1")
+        wait_for(monitor, lambda: monitor.stats().get("instances") == "2")
+
+        stats = monitor.stats()
+        assert stats["execs_done"] == "1500"
+        assert stats["execs_per_sec"] == "150.50"
+        assert stats["bitmap_cvg"] == "4"
+        assert stats["afl_banner"] == "main"
+
+        # Rewritten stats replace the instance's earlier values
+        write_stats(monitor.output_dir / "secondary1", execs_done=900)
+        wait_for(monitor, lambda: monitor.stats()["execs_done"] == "1900")
+
+    def test_no_stats_yet(self, monitor):
+        assert monitor.stats() == {}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_cur_input_writes_are_not_watched(tmp_path):
+    """AFL rewrites .cur_input for every exec; none of that may reach the monitor."""
+    instance = tmp_path / "out" / "main"
+    (instance / "crashes").mkdir(parents=True)
+    monitor = CampaignMonitor(tmp_path / "out")
+    if not monitor.event_driven:
+        pytest.skip("inotify unavailable")
+
+    with monitor:
+        refreshes, events = [], []
+        monitor.refresh = lambda: refreshes.append(True)
+        read = monitor._inotify.read
+
+        def recording_read(timeout):
+            batch = read(timeout)
+            events.extend(batch)
+            return batch
+
+        monitor._inotify.read = recording_read
+
+        # More writes than the default inotify queue holds (16384 events)
+        cur_input = instance / ".cur_input"
+        for i in range(10000):
+            cur_input.unlink(missing_ok=True)
+            cur_input.write_bytes(b"%d" % i)
+        monitor.wait(0.1)
+        assert events == []
+        assert refreshes == []
+
+        # Still watching what matters
+        write_stats(instance, execs_done=10000)
+        (instance / "crashes" / "id:000000,sig:11").write_bytes(b"x")
+        wait_for(monitor, lambda: monitor.crash_count == 1 and monitor.stats().get("execs_done") == "10000")
+        assert refreshes == []
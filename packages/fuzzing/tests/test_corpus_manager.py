@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Tests for coverage-guided corpus minimisation."""
+
+from pathlib import Path
+
+from ..corpus_manager import SeedCoverage, _edge_bitset, minimal_cover
+
+
+def seed(name, edges, size=10, exec_ms=1.0):
+    bits = 0
+    for edge in edges:
+        bits |= 1 << edge
+    return SeedCoverage(Path(name), bits, size, exec_ms)
+
+
+def covered(coverages):
+    bits = 0
+    for coverage in coverages:
+        bits |= coverage.edges
+    return bits
+
+
+class TestEdgeBitset:
+    """afl-showmap output parsing."""
+
+    def test_parses_edges(self, tmp_path):
+        map_file = tmp_path / "map"
+        map_file.write_text("3:1\n9:4\n65535:128\n")
+        bits = _edge_bitset(map_file)
+        assert bits == (1 << 3) | (1 << 9) | (1 << 65535)
+        assert seed("s", [3, 9, 65535]).edges == bits
+
+    def test_empty_map(self, tmp_path):
+        map_file = tmp_path / "map"
+        map_file.write_text("")
+        assert _edge_bitset(map_file) == 0
+
+
+class TestMinimalCover:
+    """Greedy set cover."""
+
+    def test_covers_every_edge(self):
+        coverages = [
+            seed("a", [1, 2, 3]),
+            seed("b", [3, 4]),
+            seed("c", [1, 2]),
+            seed("d", [5]),
+            seed("e", [4, 5]),
+        ]
+        chosen = minimal_cover(coverages)
+        assert covered(chosen) == covered(coverages)
+        assert [c.path.name for c in chosen] == ["a", "e"]
+
+    def test_tie_goes_to_cheaper_seed(self):
+        coverages = [
+            seed("big", [1, 2], size=100),
+            seed("slow", [1, 2], size=10, exec_ms=50.0),
+            seed("small", [1, 2], size=10),
+        ]
+        assert [c.path.name for c in minimal_cover(coverages)] == ["small"]
+
+    def test_subsumed_seed_dropped(self):
+        coverages = [seed("sub", [1], size=1), seed("super", [1, 2, 3], size=100)]
+        assert [c.path.name for c in minimal_cover(coverages)] == ["super"]
+
+    def test_no_edges(self):
+        assert minimal_cover([seed("a", []), seed("b", [])]) == []
+        assert minimal_cover([]) == []
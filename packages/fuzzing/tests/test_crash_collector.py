@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Tests for crash collection and stack-hash triage."""
+
+import pytest
+
+from ..crash_collector import Crash, CrashCollector
+
+
+@pytest.fixture
+def collector(tmp_path):
+    crashes_dir = tmp_path / "main" / "crashes"
+    crashes_dir.mkdir(parents=True)
+    return CrashCollector(crashes_dir)
+
+
+def make_crash(tmp_path, crash_id, size):
+    input_file = tmp_path / f"id:{crash_id}"
+    input_file.write_bytes(b"A" * size)
+    return Crash(crash_id=crash_id, input_file=input_file, size=size)
+
+
+class TestDeduplicateByStack:
+    """One representative per stack hash."""
+
+    def test_buckets_keep_smallest(self, collector, tmp_path):
+        crashes = [
+            make_crash(tmp_path, "000000", 30),
+            make_crash(tmp_path, "000001", 10),
+            make_crash(tmp_path, "000002", 20),
+            make_crash(tmp_path, "000003", 5),
+        ]
+        signatures = {"000000": "aaaa", "000001": "aaaa", "000002": "aaaa", "000003": "bbbb"}
+
+        kept = collector.deduplicate_by_stack(
+            crashes, lambda path: signatures[path.name[3:]], workers=2)
+
+        assert [crash.crash_id for crash in kept] == ["000001", "000003"]
+        assert sorted(kept[0].duplicates) == ["000000", "000002"]
+        assert kept[1].duplicates == []
+        assert [crash.stack_hash for crash in kept] == ["aaaa", "bbbb"]
+
+    def test_without_signature_kept(self, collector, tmp_path):
+        crashes = [make_crash(tmp_path, f"00000{i}", 10) for i in range(3)]
+        kept = collector.deduplicate_by_stack(crashes, lambda path: "", workers=1)
+        assert kept == crashes
+        assert all(crash.stack_hash is None and not crash.duplicates for crash in kept)
+
+    def test_empty(self, collector):
+        assert collector.deduplicate_by_stack([], lambda path: "x") == []
+
+
+class TestCollectCrashes:
+    """Collection across instances."""
+
+    def test_secondary_ids_are_prefixed(self, tmp_path):
+        main = tmp_path / "main" / "crashes"
+        secondary = tmp_path / "secondary1" / "crashes"
+        for crashes_dir, data in ((main, b"one"), (secondary, b"two")):
+            crashes_dir.mkdir(parents=True)
+            (crashes_dir / "id:000000,sig:11,src:000000,op:havoc,rep:2").write_bytes(data)
+            (crashes_dir / "README.txt").write_text("not a crash")
+
+        crashes = CrashCollector([main, secondary, tmp_path / "missing"]).collect_crashes()
+
+        assert [crash.crash_id for crash in crashes] == ["000000", "secondary1_000000"]
+        assert {crash.signal for crash in crashes} == {"11"}
+
+    def test_identical_inputs_collapsed(self, collector):
+        for i in range(2):
+            (collector.crashes_dir / f"id:00000{i},sig:06").write_bytes(b"same")
+        assert len(collector.collect_crashes()) == 1
+
+    def test_missing_dirs(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            CrashCollector([tmp_path / "a", tmp_path / "b"])
@@ -15,6 +15,7 @@ import argparse
 import json
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -988,8 +989,64 @@ Balance security with usability and performance."""
         # If no code block, return content as-is
         return content.strip()
 
-    def process_findings(self, sarif_paths: List[str], max_findings: int = 10) -> Dict[str, Any]:
-        """Process findings with full LLM-powered autonomous workflow."""
+    def _process_finding(self, finding: Dict[str, Any], idx: int, total: int) -> Dict[str, Any]:
+        """
+        Run one finding through analyze -> exploit -> patch.
+
+        Returns:
+            Outcome flags for the report counters, plus the finding's result
+            dict when it was analyzed
+        """
+        logger.info("")
+        logger.info(f"{'█' * 70}")
+        logger.info(f"VULNERABILITY {idx}/{total}")
+        logger.info(f"{'█' * 70}")
+
+        vuln = VulnerabilityContext(finding, self.repo_path)
+        outcome = {
+            "analyzed": False,
+            "dataflow_validated": False,
+            "false_positive": False,
+            "exploitable": False,
+            "exploit_generated": False,
+            "patch_generated": False,
+            "result": None,
+        }
+
+        # 1. Autonomous analysis (LLM-powered)
+        if not self.analyze_vulnerability(vuln):
+            return outcome
+        outcome["analyzed"] = True
+
+        # Track dataflow validation
+        if vuln.has_dataflow and vuln.analysis and 'dataflow_validation' in vuln.analysis:
+            outcome["dataflow_validated"] = True
+            outcome["false_positive"] = bool(vuln.analysis['dataflow_validation'].get('false_positive'))
+
+        if vuln.exploitable:
+            outcome["exploitable"] = True
+
+            # 2. Generate exploit using LLM
+            outcome["exploit_generated"] = self.generate_exploit(vuln)
+
+            # 3. Generate patch using LLM (only for exploitable)
+            outcome["patch_generated"] = self.generate_patch(vuln)
+        else:
+            logger.debug(f"⊘ Skipping patch generation (not exploitable)")
+
+        outcome["result"] = vuln.to_dict()
+        return outcome
+
+    def process_findings(self, sarif_paths: List[str], max_findings: int = 10,
+                         workers: int = 1) -> Dict[str, Any]:
+        """
+        Process findings with full LLM-powered autonomous workflow.
+
+        Args:
+            sarif_paths: SARIF files to load findings from
+            max_findings: Maximum findings to process (dataflow findings first)
+            workers: Findings analysed concurrently (1 = sequential)
+        """
         start_time = time.time()
 
         # Parse findings
@@ -1021,6 +1078,39 @@ Balance security with usability and performance."""
 
         unique_findings = prioritized_findings
 
+        workers = max(1, workers)
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(unique_findings)
+
+        # Add progress counter for long operations (>15s per vuln expected)
+        with HackerProgress(total=len(unique_findings), operation="Analyzing vulnerabilities") as progress:
+            if workers == 1:
+                for idx, finding in enumerate(unique_findings, 1):
+                    rule_id = finding.get('rule_id', 'unknown')
+                    progress.update(current=idx, message=rule_id)
+                    # One bad finding must not abort the run, as with workers > 1
+                    try:
+                        outcomes[idx - 1] = self._process_finding(finding, idx, len(unique_findings))
+                    except Exception as e:
+                        logger.error(f"Vulnerability {idx} ({rule_id}) failed: {e}")
+            else:
+                # Each finding's pipeline is independent; the LLM client bounds
+                # spend and per-provider request rate across workers
+                logger.info(f"Analyzing with {workers} concurrent workers")
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    future_to_idx = {
+                        executor.submit(self._process_finding, finding, idx, len(unique_findings)): idx
+                        for idx, finding in enumerate(unique_findings, 1)
+                    }
+                    for completed, future in enumerate(as_completed(future_to_idx), 1):
+                        idx = future_to_idx[future]
+                        rule_id = unique_findings[idx - 1].get('rule_id', 'unknown')
+                        try:
+                            outcomes[idx - 1] = future.result()
+                        except Exception as e:
+                            logger.error(f"Vulnerability {idx} ({rule_id}) failed: {e}")
+                        progress.update(current=completed, message=rule_id)
+
+        # Aggregate in priority order so the report doesn't depend on completion order
         results = []
         analyzed = 0
         exploitable = 0
@@ -1028,53 +1118,24 @@ Balance security with usability and performance."""
         patches_generated = 0
         dataflow_validated = 0
         false_positives_found = 0
-        idx = 0  # Initialize idx to prevent UnboundLocalError when unique_findings is empty
-
-        # Add progress counter for long operations (>15s per vuln expected)
-        with HackerProgress(total=len(unique_findings), operation="Analyzing vulnerabilities") as progress:
-            for idx, finding in enumerate(unique_findings, 1):
-                progress.update(current=idx, message=f"{finding.get('rule_id', 'unknown')}")
-
-                logger.info("")
-                logger.info(f"{'█' * 70}")
-                logger.info(f"VULNERABILITY {idx}/{len(unique_findings)}")
-                logger.info(f"{'█' * 70}")
-
-                vuln = VulnerabilityContext(finding, self.repo_path)
-
-                # 1. Autonomous analysis (LLM-powered)
-                if self.analyze_vulnerability(vuln):
-                    analyzed += 1
-
-                    # Track dataflow validation
-                    if vuln.has_dataflow and vuln.analysis and 'dataflow_validation' in vuln.analysis:
-                        dataflow_validated += 1
-                        validation = vuln.analysis['dataflow_validation']
-                        if validation.get('false_positive'):
-                            false_positives_found += 1
-
-                    if vuln.exploitable:
-                        exploitable += 1
-
-                        # 2. Generate exploit using LLM
-                        if self.generate_exploit(vuln):
-                            exploits_generated += 1
-
-                        # 3. Generate patch using LLM (only for exploitable)
-                        if self.generate_patch(vuln):
-                            patches_generated += 1
-                    else:
-                        logger.debug(f"⊘ Skipping patch generation (not exploitable)")
-
-                    results.append(vuln.to_dict())
-
-            # Show progress
-            logger.info("")
-            logger.info(f"Progress: {idx}/{len(unique_findings)} analyzed, "
-                       f"{exploitable} exploitable, "
-                       f"{exploits_generated} exploits, "
-                       f"{patches_generated} patches, "
-                       f"{dataflow_validated} dataflow validated")
+        for outcome in outcomes:
+            if not outcome or not outcome["analyzed"]:
+                continue
+            analyzed += 1
+            dataflow_validated += outcome["dataflow_validated"]
+            false_positives_found += outcome["false_positive"]
+            exploitable += outcome["exploitable"]
+            exploits_generated += outcome["exploit_generated"]
+            patches_generated += outcome["patch_generated"]
+            results.append(outcome["result"])
+
+        # Show progress
+        logger.info("")
+        logger.info(f"Progress: {len(unique_findings)}/{len(unique_findings)} analyzed, "
+                   f"{exploitable} exploitable, "
+                   f"{exploits_generated} exploits, "
+                   f"{patches_generated} patches, "
+                   f"{dataflow_validated} dataflow validated")
 
         execution_time = time.time() - start_time
 
@@ -1133,6 +1194,8 @@ def main() -> None:
     ap.add_argument("--sarif", nargs="+", required=True, help="SARIF files")
     ap.add_argument("--out", help="Output directory")
     ap.add_argument("--max-findings", type=int, default=10, help="Max findings to process")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="Findings to analyse concurrently (bounded by LLM budget and rate limits)")
 
     args = ap.parse_args()
 
@@ -1147,7 +1210,7 @@ def main() -> None:
     agent = AutonomousSecurityAgentV2(repo_path, out_dir)
 
     # Process findings
-    report = agent.process_findings(args.sarif, args.max_findings)
+    report = agent.process_findings(args.sarif, args.max_findings, workers=args.workers)
 
     print("\n" + "=" * 70)
     print("Autonomous Security Agent Report")
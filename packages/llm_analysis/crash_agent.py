@@ -78,6 +78,7 @@ class CrashAnalysisAgent:
 **Binary:** {crash_context.binary_path.name}
 **Crash ID:** {crash_context.crash_id}
 **Signal:** {self._signal_name(crash_context.signal)}
+**Duplicate Inputs:** {crash_context.duplicate_count} other crashing inputs share this stack trace
 
 **Stack Trace:**
 ```
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache
+
+Single-file SQLite cache of LLM responses keyed by prompt hash, replacing
+the old one-JSON-file-per-key layout:
+- TTL expiry and least-recently-used eviction under a byte cap
+- Safe for concurrent threads (one locked connection) and processes
+  (SQLite WAL with a busy timeout; every write is a transaction)
+- Hit/miss/eviction counters for LLMClient.get_stats()
+
+Legacy <sha256>.json files found in the cache directory are imported
+once and removed.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from core.logging import get_logger
+
+logger = get_logger()
+
+CACHE_DB_NAME = "llm_cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    model TEXT,
+    provider TEXT,
+    tokens_used INTEGER,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+"""
+
+# Evict down to this fraction of the cap so eviction doesn't run on every write
+_EVICT_TARGET = 0.9
+
+
+class ResponseCache:
+    """SQLite-backed LLM response cache with TTL and LRU eviction."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 0, ttl_seconds: float = 0):
+        """
+        Args:
+            cache_dir: Directory holding the cache database
+            max_bytes: Evict least recently used entries above this size (0 = unbounded)
+            ttl_seconds: Entries older than this are misses (0 = never expire)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.cache_dir / CACHE_DB_NAME
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+        self._import_legacy_files()
+        self._total_bytes = self._size_on_record()
+
+    def _size_on_record(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _import_legacy_files(self) -> None:
+        """Move old per-key JSON cache files into the database."""
+        imported = 0
+        batch = []
+        parsed = []
+        try:
+            entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith(".json") and e.is_file()]
+        except OSError:
+            return
+
+        for entry in entries:
+            try:
+                with open(entry.path) as f:
+                    data = json.load(f)
+                content = data["content"]
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            created = float(data.get("timestamp") or entry.stat().st_mtime)
+            batch.append((entry.name[:-len(".json")], content, data.get("model"), data.get("provider"),
+                          data.get("tokens_used"), created, created, len(content.encode())))
+            parsed.append(entry.path)
+            if len(batch) >= 1000:
+                imported += self._insert_legacy(batch)
+                batch = []
+        imported += self._insert_legacy(batch)
+
+        # Files that could not be read are left in place
+        for path in parsed:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        if imported:
+            logger.info(f"Imported {imported} legacy LLM cache files into {self.path}")
+
+    def _insert_legacy(self, batch) -> int:
+        if not batch:
+            return 0
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+        return len(batch)
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached content for key, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            with self._conn:
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def put(self, key: str, content: str, model: str = "", provider: str = "", tokens_used: int = 0) -> None:
+        """Store a response, evicting old entries if the cache is over its cap."""
+        now = time.time()
+        size = len(content.encode())
+        with self._lock:
+            with self._conn:
+                # A replaced entry's bytes are freed
+                old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, content, model, provider, tokens_used, now, now, size),
+                )
+            self._total_bytes += size - (old[0] if old else 0)
+            if self.max_bytes and self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones down to the target size."""
+        with self._conn:
+            if self.ttl_seconds:
+                cur = self._conn.execute(
+                    "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+                )
+                self.evictions += cur.rowcount
+
+            # Other processes write too, so re-read the real size before evicting
+            total = self._size_on_record()
+            excess = total - int(self.max_bytes * _EVICT_TARGET)
+            if excess > 0:
+                freed = 0
+                victims = []
+                for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+                    if freed >= excess:
+                        break
+                    victims.append((key,))
+                    freed += size
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+                self.evictions += len(victims)
+                total -= freed
+        self._total_bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
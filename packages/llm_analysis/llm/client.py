@@ -8,13 +8,17 @@ Manages multiple LLM providers with:
 - Cost tracking and budget limits
 - Response caching
 - Task-specific model selection
+- Thread-safe accounting, asyncio API and per-provider rate limiting
 """
 
+import asyncio
 import hashlib
-import json
 import re
+import sqlite3
 import sys
+import threading
 import time
+import weakref
 from pathlib import Path
 from typing import Dict, Optional, Any, Tuple
 
@@ -22,6 +26,7 @@ from typing import Dict, Optional, Any, Tuple
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from core.logging import get_logger
+from .cache import ResponseCache
 from .config import LLMConfig, ModelConfig
 from .providers import LLMProvider, LLMResponse, create_provider
 
@@ -207,6 +212,24 @@ class RaptorLLMLogger:
             logger.debug(f"[LiteLLM] Callback error (non-fatal): {_sanitize_log_message(str(e))}")
 
 
+class _RateLimiter:
+    """Spaces requests to one provider evenly to stay under a requests-per-minute limit."""
+
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60.0 / requests_per_minute
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        """Block until this caller's slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 # Singleton instance of callback logger
 _raptor_llm_logger_instance = None
 
@@ -228,6 +251,15 @@ class LLMClient:
         self.total_cost = 0.0
         self.request_count = 0
 
+        # Concurrency: accounting lock, budget reserved by in-flight requests,
+        # per-provider rate limiters and per-event-loop async semaphores
+        self._lock = threading.RLock()
+        self._reserved_cost = 0.0
+        self._rate_limiters: Dict[str, Optional[_RateLimiter]] = {}
+        self._async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
         # HEALTH CHECK: Verify LiteLLM library is available
         try:
             import litellm
@@ -268,8 +300,16 @@ class LLMClient:
             litellm.callbacks.append(callback)
 
         # Initialize cache
+        self.cache: Optional[ResponseCache] = None
         if self.config.enable_caching:
-            self.config.cache_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                self.cache = ResponseCache(
+                    self.config.cache_dir,
+                    max_bytes=self.config.cache_max_bytes,
+                    ttl_seconds=self.config.cache_ttl_seconds,
+                )
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"LLM response cache unavailable, continuing without it: {e}")
 
         logger.info("LLM Client initialized")
         logger.info(f"Primary model: {self.config.primary_model.provider}/{self.config.primary_model.model_name}")
@@ -290,11 +330,23 @@ class LLMClient:
         """Get or create provider for model config."""
         key = f"{model_config.provider}:{model_config.model_name}"
 
-        if key not in self.providers:
-            logger.debug(f"Creating provider: {key}")
-            self.providers[key] = create_provider(model_config)
+        with self._lock:
+            if key not in self.providers:
+                logger.debug(f"Creating provider: {key}")
+                self.providers[key] = create_provider(model_config)
+
+            return self.providers[key]
 
-        return self.providers[key]
+    def _wait_for_rate_limit(self, provider: str) -> None:
+        """Block until the provider's requests-per-minute limit allows another request."""
+        provider = provider.lower()
+        with self._lock:
+            if provider not in self._rate_limiters:
+                rpm = self.config.requests_per_minute.get(provider)
+                self._rate_limiters[provider] = _RateLimiter(rpm) if rpm else None
+            limiter = self._rate_limiters[provider]
+        if limiter:
+            limiter.acquire()
 
     def _get_cache_key(self, prompt: str, system_prompt: Optional[str], model: str) -> str:
         """Generate cache key for prompt."""
@@ -303,50 +355,79 @@ class LLMClient:
 
     def _get_cached_response(self, cache_key: str) -> Optional[str]:
         """Retrieve cached response if available."""
-        if not self.config.enable_caching:
+        if not self.cache:
             return None
 
-        cache_file = self.config.cache_dir / f"{cache_key}.json"
-        if cache_file.exists():
-            try:
-                with open(cache_file) as f:
-                    data = json.load(f)
-                logger.debug(f"Cache hit: {cache_key}")
-                return data.get("content")
-            except Exception as e:
-                logger.warning(f"Cache read error: {e}")
-
-        return None
+        try:
+            content = self.cache.get(cache_key)
+        except sqlite3.Error as e:
+            logger.warning(f"Cache read error: {e}")
+            return None
+        if content is not None:
+            logger.debug(f"Cache hit: {cache_key}")
+        return content
 
     def _save_to_cache(self, cache_key: str, response: LLMResponse) -> None:
         """Save response to cache."""
-        if not self.config.enable_caching:
+        if not self.cache:
             return
 
-        cache_file = self.config.cache_dir / f"{cache_key}.json"
         try:
-            with open(cache_file, 'w') as f:
-                json.dump({
-                    "content": response.content,
-                    "model": response.model,
-                    "provider": response.provider,
-                    "tokens_used": response.tokens_used,
-                    "timestamp": time.time(),
-                }, f, indent=2)
-        except Exception as e:
+            self.cache.put(cache_key, response.content, response.model, response.provider, response.tokens_used)
+        except sqlite3.Error as e:
             logger.warning(f"Cache write error: {e}")
 
     def _check_budget(self, estimated_cost: float = 0.1) -> bool:
-        """Check if we're within budget."""
+        """Check if we're within budget, counting cost reserved by in-flight requests."""
         if not self.config.enable_cost_tracking:
             return True
 
-        if self.total_cost + estimated_cost > self.config.max_cost_per_scan:
-            logger.error(f"Budget exceeded: ${self.total_cost:.2f} + ${estimated_cost:.2f} > ${self.config.max_cost_per_scan:.2f}")
+        committed = self.total_cost + self._reserved_cost
+        if committed + estimated_cost > self.config.max_cost_per_scan:
+            logger.error(f"Budget exceeded: ${committed:.2f} + ${estimated_cost:.2f} > ${self.config.max_cost_per_scan:.2f}")
             return False
 
         return True
 
+    def _reserve_budget(self) -> float:
+        """
+        Reserve the estimated cost of one request against the budget.
+
+        Reservations keep concurrent requests from overshooting
+        max_cost_per_scan; each must be released with _release_budget().
+
+        Returns:
+            The reserved amount
+        """
+        estimate = self.config.estimated_cost_per_request if self.config.enable_cost_tracking else 0.0
+        with self._lock:
+            if not self._check_budget(estimate):
+                raise RuntimeError(
+                    f"LLM budget exceeded: ${self.total_cost:.4f} spent > ${self.config.max_cost_per_scan:.4f} limit. "
+                    f"Increase budget with: LLMConfig(max_cost_per_scan={self.config.max_cost_per_scan * 2:.1f})"
+                )
+            self._reserved_cost += estimate
+        return estimate
+
+    def _release_budget(self, reserved: float) -> None:
+        with self._lock:
+            self._reserved_cost -= reserved
+
+    def _record_request(self, cost: float) -> None:
+        with self._lock:
+            self.total_cost += cost
+            self.request_count += 1
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limit for async calls on the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
+                self._async_semaphores[loop] = semaphore
+            return semaphore
+
     def generate(self, prompt: str, system_prompt: Optional[str] = None,
                  task_type: Optional[str] = None, **kwargs) -> LLMResponse:
         """
@@ -362,15 +443,27 @@ class LLMClient:
         Returns:
             LLMResponse with generated content
 
-        Warning: Not thread-safe. Use locks if enabling concurrent access.
+        Thread-safe: cost, budget and request accounting are locked.
         """
-        # Check budget
-        if not self._check_budget():
-            raise RuntimeError(
-                f"LLM budget exceeded: ${self.total_cost:.4f} spent > ${self.config.max_cost_per_scan:.4f} limit. "
-                f"Increase budget with: LLMConfig(max_cost_per_scan={self.config.max_cost_per_scan * 2:.1f})"
-            )
+        reserved = self._reserve_budget()
+        try:
+            return self._generate(prompt, system_prompt, task_type, **kwargs)
+        finally:
+            self._release_budget(reserved)
+
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        task_type: Optional[str] = None, **kwargs) -> LLMResponse:
+        """
+        Async generate(); at most config.max_concurrent_requests run at once per event loop.
+
+        Same arguments and return value as generate().
+        """
+        async with self._async_semaphore():
+            return await asyncio.to_thread(self.generate, prompt, system_prompt, task_type, **kwargs)
 
+    def _generate(self, prompt: str, system_prompt: Optional[str] = None,
+                  task_type: Optional[str] = None, **kwargs) -> LLMResponse:
+        """generate() body, run with a budget reservation held."""
         # Get appropriate model for task (priority: explicit model_config > task_type > primary)
         model_config = kwargs.pop('model_config', None)
         if not model_config:
@@ -384,7 +477,7 @@ class LLMClient:
         cached_content = self._get_cached_response(cache_key)
         if cached_content:
             print(f"► Using cached response for {model_config.provider}/{model_config.model_name}")
-            self.request_count += 1
+            self._record_request(0.0)
             return LLMResponse(
                 content=cached_content,
                 model=model_config.model_name,
@@ -435,11 +528,11 @@ class LLMClient:
                         print(f"  ↻ Retrying... (attempt {attempt + 1}/{self.config.max_retries})")
 
                     provider = self._get_provider(model)
+                    self._wait_for_rate_limit(model.provider)
                     response = provider.generate(prompt, system_prompt, **kwargs)
 
                     # Track cost
-                    self.total_cost += response.cost
-                    self.request_count += 1
+                    self._record_request(response.cost)
 
                     # Cache response
                     self._save_to_cache(cache_key, response)
@@ -512,15 +605,31 @@ class LLMClient:
         Returns:
             Tuple of (parsed JSON object matching schema, full response content)
 
-        Warning: Not thread-safe. Use locks if enabling concurrent access.
+        Thread-safe: cost, budget and request accounting are locked.
         """
-        # Check budget
-        if not self._check_budget():
-            raise RuntimeError(
-                f"LLM budget exceeded: ${self.total_cost:.4f} spent > ${self.config.max_cost_per_scan:.4f} limit. "
-                f"Increase budget with: LLMConfig(max_cost_per_scan={self.config.max_cost_per_scan * 2:.1f})"
+        reserved = self._reserve_budget()
+        try:
+            return self._generate_structured(prompt, schema, system_prompt, task_type, **kwargs)
+        finally:
+            self._release_budget(reserved)
+
+    async def agenerate_structured(self, prompt: str, schema: Dict[str, Any],
+                                   system_prompt: Optional[str] = None,
+                                   task_type: Optional[str] = None, **kwargs) -> Tuple[Dict[str, Any], str]:
+        """
+        Async generate_structured(); shares the concurrency limit with agenerate().
+
+        Same arguments and return value as generate_structured().
+        """
+        async with self._async_semaphore():
+            return await asyncio.to_thread(
+                self.generate_structured, prompt, schema, system_prompt, task_type, **kwargs
             )
 
+    def _generate_structured(self, prompt: str, schema: Dict[str, Any],
+                             system_prompt: Optional[str] = None,
+                             task_type: Optional[str] = None, **kwargs) -> Tuple[Dict[str, Any], str]:
+        """generate_structured() body, run with a budget reservation held."""
         # Get appropriate model (priority: explicit model_config > task_type > primary)
         model_config = kwargs.pop('model_config', None)
         if not model_config:
@@ -568,20 +677,15 @@ class LLMClient:
                         print(f"  ↻ Retrying... (attempt {attempt + 1}/{self.config.max_retries})")
 
                     provider = self._get_provider(model)
-
-                    # Capture cost before call
-                    cost_before = provider.total_cost
-                    tokens_before = provider.total_tokens
+                    self._wait_for_rate_limit(model.provider)
 
                     result = provider.generate_structured(prompt, schema, system_prompt)
 
-                    # Calculate cost delta
-                    cost_delta = provider.total_cost - cost_before
-                    tokens_delta = provider.total_tokens - tokens_before
+                    # Usage of this call (per-thread, so concurrent calls don't mix)
+                    tokens_delta, cost_delta = provider.last_usage()
 
                     # Track at client level
-                    self.total_cost += cost_delta
-                    self.request_count += 1
+                    self._record_request(cost_delta)
 
                     logger.info(f"Structured generation successful: {model.provider}/{model.model_name} "
                                f"(tokens: {tokens_delta}, cost: ${cost_delta:.4f})")
@@ -632,24 +736,28 @@ class LLMClient:
 
     def get_stats(self) -> Dict[str, Any]:
         """Get usage statistics."""
-        provider_stats = {}
-        for key, provider in self.providers.items():
-            provider_stats[key] = {
-                "total_tokens": provider.total_tokens,
-                "total_cost": provider.total_cost,
+        with self._lock:
+            provider_stats = {}
+            for key, provider in self.providers.items():
+                provider_stats[key] = {
+                    "total_tokens": provider.total_tokens,
+                    "total_cost": provider.total_cost,
+                }
+
+            return {
+                "total_requests": self.request_count,
+                "total_cost": self.total_cost,
+                "budget_remaining": self.config.max_cost_per_scan - self.total_cost,
+                "budget_reserved": self._reserved_cost,
+                "providers": provider_stats,
+                "cache": self.cache.stats() if self.cache else None,
             }
 
-        return {
-            "total_requests": self.request_count,
-            "total_cost": self.total_cost,
-            "budget_remaining": self.config.max_cost_per_scan - self.total_cost,
-            "providers": provider_stats,
-        }
-
     def reset_stats(self) -> None:
         """Reset usage statistics."""
-        self.total_cost = 0.0
-        self.request_count = 0
-        for provider in self.providers.values():
-            provider.total_tokens = 0
-            provider.total_cost = 0.0
+        with self._lock:
+            self.total_cost = 0.0
+            self.request_count = 0
+            for provider in self.providers.values():
+                provider.total_tokens = 0
+                provider.total_cost = 0.0
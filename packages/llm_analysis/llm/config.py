@@ -473,8 +473,15 @@ class LLMConfig:
     retry_delay_remote: float = 5.0  # Longer delay for remote servers
     enable_caching: bool = True
     cache_dir: Path = Path("out/llm_cache")
+    cache_max_bytes: int = 512 * 1024 * 1024  # LRU eviction above this (0 = unbounded)
+    cache_ttl_seconds: float = 30 * 24 * 3600  # Responses older than this are re-requested (0 = never)
     enable_cost_tracking: bool = True
     max_cost_per_scan: float = 10.0  # USD
+    estimated_cost_per_request: float = 0.1  # USD reserved per in-flight request
+
+    # Concurrency (async API and concurrent callers of the sync API)
+    max_concurrent_requests: int = 4  # Per event loop, for agenerate/agenerate_structured
+    requests_per_minute: Dict[str, int] = field(default_factory=dict)  # provider -> limit (absent = unlimited)
 
     def to_file(self, config_path: Path) -> None:
         """Save configuration to JSON file."""
@@ -8,6 +8,7 @@ Replaces individual provider implementations with a single LiteLLMProvider.
 
 import json
 import sys
+import threading
 from abc import ABC, abstractmethod
 from inspect import isclass
 from typing import Dict, Optional, Any, Tuple, Type, Union
@@ -42,6 +43,8 @@ class LLMProvider(ABC):
         self.config = config
         self.total_tokens = 0
         self.total_cost = 0.0
+        self._usage_lock = threading.Lock()
+        self._local = threading.local()
 
     @abstractmethod
     def generate(self, prompt: str, system_prompt: Optional[str] = None,
@@ -56,11 +59,18 @@ class LLMProvider(ABC):
         pass
 
     def track_usage(self, tokens: int, cost: float) -> None:
-        """Track token usage and cost."""
-        self.total_tokens += tokens
-        self.total_cost += (cost or 0.0)  # Handle None costs from Ollama
+        """Track token usage and cost (thread-safe)."""
+        with self._usage_lock:
+            self.total_tokens += tokens
+            self.total_cost += (cost or 0.0)  # Handle None costs from Ollama
+        # Per-thread record so concurrent callers can attribute their own call
+        self._local.last_usage = (tokens, cost or 0.0)
         logger.debug(f"LLM usage: {tokens} tokens, ${(cost or 0.0):.4f} (total: {self.total_tokens} tokens, ${self.total_cost:.4f})")
 
+    def last_usage(self) -> Tuple[int, float]:
+        """(tokens, cost) of the last call tracked on the current thread."""
+        return getattr(self._local, "last_usage", (0, 0.0))
+
 
 def _dict_schema_to_pydantic(schema: Union[Dict[str, Any], Type['BaseModel']]):
     """
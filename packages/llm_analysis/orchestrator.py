@@ -70,6 +70,7 @@ class AgenticOrchestrator:
         sarif_paths: List[str],
         max_findings: int = 5,
         codeql_env: Optional[CodeQLEnv] = None,
+        workers: int = 1,
     ) -> Dict[str, Any]:
         """
         Main autonomous orchestration:
@@ -83,6 +84,7 @@ class AgenticOrchestrator:
             sarif_paths: List of SARIF files
             max_findings: Maximum findings to process (to avoid overwhelming)
             codeql_env: Optional CodeQL environment snapshot for provenance
+            workers: Findings analysed concurrently (1 = sequential)
         """
         logger.info("=" * 60)
         logger.info("STARTING AUTONOMOUS WORKFLOW ORCHESTRATION")
@@ -148,7 +150,7 @@ class AgenticOrchestrator:
             # in the agent implementation.
 
         # Process findings autonomously, passing SARIF paths and max_findings
-        results = agent.process_findings(sarif_paths, max_findings=max_findings)
+        results = agent.process_findings(sarif_paths, max_findings=max_findings, workers=workers)
 
         # Generate orchestration report from agent results
         report: Dict[str, Any] = {
@@ -218,6 +220,12 @@ Examples:
         default=10,
         help="Maximum findings to process",
     )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Findings to analyse concurrently (default: 1, sequential)",
+    )
     ap.add_argument(
         "--codeql-mode",
         choices=["disabled", "detect", "require"],
@@ -360,6 +368,7 @@ Examples:
         sarif_paths,
         args.max_findings,
         codeql_env=codeql_env,
+        workers=args.workers,
     )
 
     print("\n" + "=" * 70)
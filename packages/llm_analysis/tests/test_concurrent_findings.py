@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent finding analysis in AutonomousSecurityAgentV2.process_findings.
+"""
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directories to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from packages.llm_analysis.agent import AutonomousSecurityAgentV2
+
+
+class _StubLLM:
+    def get_stats(self):
+        return {"total_requests": 0, "total_cost": 0.0}
+
+
+@pytest.fixture
+def sarif_file(tmp_path):
+    results = [
+        {
+            "ruleId": f"rule-{i}",
+            "level": "warning",
+            "message": {"text": f"finding {i}"},
+            "locations": [{"physicalLocation": {
+                "artifactLocation": {"uri": f"src/file{i}.py"},
+                "region": {"startLine": i + 1},
+            }}],
+        }
+        for i in range(12)
+    ]
+    path = tmp_path / "scan.sarif"
+    path.write_text(json.dumps({"version": "2.1.0", "runs": [{
+        "tool": {"driver": {"name": "Semgrep"}}, "results": results,
+    }]}))
+    return path
+
+
+@pytest.fixture
+def agent(tmp_path):
+    """Agent with the LLM stages replaced by deterministic stubs."""
+    agent = AutonomousSecurityAgentV2.__new__(AutonomousSecurityAgentV2)
+    agent.repo_path = tmp_path
+    agent.out_dir = tmp_path / "out"
+    agent.out_dir.mkdir()
+    agent.llm = _StubLLM()
+
+    def analyze(vuln):
+        time.sleep(random.uniform(0, 0.02))  # Scramble completion order
+        index = int(vuln.rule_id.split("-")[1])
+        if index % 4 == 3:
+            return False
+        vuln.analysis = {"index": index}
+        vuln.exploitable = index % 2 == 0
+        return True
+
+    def fail_on_rule_4(vuln):
+        if vuln.rule_id == "rule-4":
+            raise RuntimeError("provider down")
+        return True
+
+    agent.analyze_vulnerability = analyze
+    agent.generate_exploit = fail_on_rule_4
+    agent.generate_patch = lambda vuln: True
+    return agent
+
+
+class TestConcurrentProcessFindings:
+    """process_findings(workers=N) matches the sequential report."""
+
+    def test_concurrent_matches_sequential(self, agent, sarif_file):
+        agent.generate_exploit = lambda vuln: True
+        sequential = agent.process_findings([str(sarif_file)], max_findings=12, workers=1)
+        concurrent = agent.process_findings([str(sarif_file)], max_findings=12, workers=6)
+
+        for key in ("processed", "analyzed", "exploitable", "exploits_generated", "patches_generated"):
+            assert concurrent[key] == sequential[key]
+        assert [r["rule_id"] for r in concurrent["results"]] == [r["rule_id"] for r in sequential["results"]]
+        assert sequential["analyzed"] == 9
+        assert sequential["exploitable"] == 6
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_failed_finding_does_not_stop_others(self, agent, sarif_file, workers):
+        report = agent.process_findings([str(sarif_file)], max_findings=12, workers=workers)
+        rule_ids = [r["rule_id"] for r in report["results"]]
+        assert "rule-4" not in rule_ids
+        assert report["analyzed"] == 8
+        assert report["exploits_generated"] == 5
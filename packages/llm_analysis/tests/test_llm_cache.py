@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite-backed LLM response cache.
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+# Add parent directories to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from packages.llm_analysis.llm.cache import CACHE_DB_NAME, ResponseCache
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_roundtrip_and_stats(self, tmp_path):
+        """Stored responses are returned and hits/misses are counted."""
+        cache = ResponseCache(tmp_path)
+        assert cache.get("k") is None
+        cache.put("k", "hello", "model", "openai", 12)
+        assert cache.get("k") == "hello"
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_persists_across_instances(self, tmp_path):
+        """Another instance (or process) sees committed entries."""
+        ResponseCache(tmp_path).put("k", "v")
+        assert ResponseCache(tmp_path).get("k") == "v"
+
+    def test_ttl_expiry(self, tmp_path):
+        """Entries older than the TTL are misses and are removed."""
+        cache = ResponseCache(tmp_path, ttl_seconds=0.05)
+        cache.put("k", "v")
+        time.sleep(0.1)
+        assert cache.get("k") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction_under_cap(self, tmp_path):
+        """Least recently used entries are evicted to stay under max_bytes."""
+        cache = ResponseCache(tmp_path, max_bytes=1000)
+        for i in range(5):
+            cache.put(f"k{i}", "x" * 200)
+            time.sleep(0.01)
+        cache.get("k0")  # Refresh k0 so k1 is now the oldest
+        cache.put("k5", "x" * 200)
+
+        assert cache.get("k0") is not None
+        assert cache.get("k1") is None
+        assert cache.stats()["bytes"] <= 1000
+        assert cache.stats()["evictions"] >= 1
+
+    def test_concurrent_writers(self, tmp_path):
+        """Threads sharing one cache and separate instances don't corrupt it."""
+        shared = ResponseCache(tmp_path)
+
+        def writer(cache, prefix):
+            for i in range(50):
+                cache.put(f"{prefix}{i}", f"value {prefix}{i}")
+
+        threads = [threading.Thread(target=writer, args=(shared, f"t{n}-")) for n in range(4)]
+        threads += [threading.Thread(target=writer, args=(ResponseCache(tmp_path), f"p{n}-")) for n in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert shared.stats()["entries"] == 300
+        assert shared.get("p1-49") == "value p1-49"
+
+    def test_imports_legacy_json_files(self, tmp_path):
+        """Old one-file-per-key entries are imported once and removed."""
+        (tmp_path / "abc.json").write_text(json.dumps({
+            "content": "legacy", "model": "m", "provider": "p", "tokens_used": 3, "timestamp": time.time(),
+        }))
+        cache = ResponseCache(tmp_path)
+        assert cache.get("abc") == "legacy"
+        assert not (tmp_path / "abc.json").exists()
+        assert [p.name for p in tmp_path.glob("*.json")] == []
+        assert (tmp_path / CACHE_DB_NAME).exists()
+
+    def test_unparseable_legacy_files_are_kept(self, tmp_path):
+        """Only files that were imported are removed."""
+        (tmp_path / "good.json").write_text(json.dumps({"content": "legacy"}))
+        (tmp_path / "broken.json").write_text("{not json")
+        (tmp_path / "other.json").write_text(json.dumps({"unrelated": True}))
+        cache = ResponseCache(tmp_path)
+        assert cache.get("good") == "legacy"
+        assert sorted(p.name for p in tmp_path.glob("*.json")) == ["broken.json", "other.json"]
+
+    def test_replacing_entry_does_not_grow_size(self, tmp_path):
+        """Rewriting a key counts only its latest size towards the cap."""
+        cache = ResponseCache(tmp_path, max_bytes=10000)
+        for _ in range(3):
+            cache.put("k", "x" * 300)
+        cache.put("other", "y" * 300)
+        assert cache._total_bytes == 600
+        cache.put("k", "x" * 500)
+        assert cache._total_bytes == cache.stats()["bytes"] == 800
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent use of LLMClient: async API, thread-safe accounting,
+budget reservations and per-provider rate limiting.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directories to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from packages.llm_analysis.llm import client as client_module
+from packages.llm_analysis.llm.client import LLMClient, _RateLimiter
+from packages.llm_analysis.llm.config import LLMConfig, ModelConfig
+from packages.llm_analysis.llm.providers import LLMProvider, LLMResponse
+
+
+class FakeProvider(LLMProvider):
+    """Provider that sleeps briefly and records peak concurrency."""
+
+    def __init__(self, config, delay=0.05, cost=0.01):
+        super().__init__(config)
+        self.delay = delay
+        self.cost = cost
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _call(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+
+    def generate(self, prompt, system_prompt=None, **kwargs):
+        self._call()
+        self.track_usage(10, self.cost)
+        return LLMResponse(prompt.upper(), self.config.model_name, self.config.provider,
+                           10, self.cost, "stop")
+
+    def generate_structured(self, prompt, schema, system_prompt=None):
+        self._call()
+        # Cost depends on the prompt so mixed-up attribution would show
+        self.track_usage(len(prompt), len(prompt) / 1000)
+        return {"echo": prompt}, prompt
+
+
+@pytest.fixture
+def make_client(monkeypatch, tmp_path):
+    provider_holder = {}
+
+    def fake_create_provider(model_config):
+        provider_holder["provider"] = FakeProvider(model_config)
+        return provider_holder["provider"]
+
+    monkeypatch.setattr(client_module, "create_provider", fake_create_provider)
+
+    def _make(**overrides):
+        config = LLMConfig(
+            primary_model=ModelConfig(provider="openai", model_name="fake"),
+            fallback_models=[],
+            enable_caching=False,
+            cache_dir=tmp_path / "cache",
+            retry_delay=0.0,
+        )
+        for key, value in overrides.items():
+            setattr(config, key, value)
+        client = LLMClient(config)
+        client._get_provider(config.primary_model)
+        return client, provider_holder["provider"]
+
+    return _make
+
+
+class TestAsyncGenerate:
+    """agenerate / agenerate_structured."""
+
+    def test_results_and_concurrency_limit(self, make_client):
+        """Many calls run concurrently, bounded by max_concurrent_requests."""
+        client, provider = make_client(max_concurrent_requests=3)
+
+        async def run():
+            return await asyncio.gather(*(client.agenerate(f"p{i}") for i in range(12)))
+
+        responses = asyncio.run(run())
+        assert [r.content for r in responses] == [f"P{i}" for i in range(12)]
+        assert provider.peak == 3
+        assert client.get_stats()["total_requests"] == 12
+        assert client.get_stats()["total_cost"] == pytest.approx(0.12)
+
+    def test_structured_cost_attribution(self, make_client):
+        """Concurrent structured calls each account for their own usage."""
+        client, _ = make_client(max_concurrent_requests=8)
+        prompts = ["x" * n for n in range(1, 21)]
+
+        async def run():
+            return await asyncio.gather(*(client.agenerate_structured(p, {}) for p in prompts))
+
+        results = asyncio.run(run())
+        assert [r[0]["echo"] for r in results] == prompts
+        assert client.total_cost == pytest.approx(sum(len(p) for p in prompts) / 1000)
+
+
+class TestBudget:
+    """Budget reservations under concurrency."""
+
+    def test_in_flight_requests_reserve_budget(self, make_client):
+        """Concurrent calls cannot collectively overshoot max_cost_per_scan."""
+        client, provider = make_client(max_concurrent_requests=10, max_cost_per_scan=0.35,
+                                       estimated_cost_per_request=0.1)
+
+        async def run():
+            return await asyncio.gather(*(client.agenerate(f"p{i}") for i in range(10)),
+                                        return_exceptions=True)
+
+        results = asyncio.run(run())
+        errors = [r for r in results if isinstance(r, RuntimeError)]
+        assert len(results) - len(errors) == 3
+        assert all("budget exceeded" in str(e) for e in errors)
+        assert client.get_stats()["budget_reserved"] == pytest.approx(0.0)
+
+
+class TestRateLimiting:
+    """Per-provider requests-per-minute limits."""
+
+    def test_rate_limiter_spacing(self):
+        """Acquisitions are spaced by 60/rpm seconds."""
+        limiter = _RateLimiter(requests_per_minute=1200)  # one per 50ms
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.19
+
+    def test_client_applies_provider_limit(self, make_client):
+        """Requests to a rate-limited provider are spaced even when concurrent."""
+        client, provider = make_client(max_concurrent_requests=8, requests_per_minute={"openai": 600})
+        provider.delay = 0
+
+        async def run():
+            start = time.monotonic()
+            await asyncio.gather(*(client.agenerate(f"p{i}") for i in range(5)))
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) >= 0.39
@@ -5,24 +5,19 @@
 - Produces out/recon.json with simple inventory: file counts, languages by extension
 - Produces scan-manifest.json (input_hash, timestamp, agent meta)
 """
-import argparse, json, os, shutil, subprocess, sys, tempfile, time, hashlib
+import argparse, json, os, shutil, subprocess, sys, tempfile, time
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.inventory import end_run, get_inventory, start_run
+from core.tree_hash import sha256_tree
+
 
 def get_out_dir() -> Path:
     base = os.environ.get("RAPTOR_OUT_DIR")
     return Path(base).resolve() if base else Path("out").resolve()
 
-def sha256_tree(root: Path) -> str:
-    h = hashlib.sha256()
-    for p in sorted(root.rglob("*")):
-        if p.is_file():
-            h.update(p.relative_to(root).as_posix().encode())
-            with p.open("rb") as f:
-                for chunk in iter(lambda: f.read(8192), b""):
-                    h.update(chunk)
-    return h.hexdigest()
-
 def safe_clone(url: str, dest: Path):
     env = os.environ.copy()
     env.update({
@@ -41,24 +36,13 @@ def inventory(path: Path):
     counts = {}
     langs = {}
     total_files = 0
-    for p in path.rglob("*"):
-        if p.is_file():
-            total_files += 1
-            ext = p.suffix.lower()
-            counts[ext] = counts.get(ext,0) + 1
-            # coarse language mapping
-            if ext in ['.java','.kt']:
-                langs['java'] = langs.get('java',0)+1
-            elif ext in ['.py']:
-                langs['python'] = langs.get('python',0)+1
-            elif ext in ['.go']:
-                langs['go'] = langs.get('go',0)+1
-            elif ext in ['.js','.ts']:
-                langs['javascript'] = langs.get('javascript',0)+1
-            elif ext in ['.rb']:
-                langs['ruby'] = langs.get('ruby',0)+1
-            elif ext in ['.cs']:
-                langs['csharp'] = langs.get('csharp',0)+1
+    for f in get_inventory(path):
+        total_files += 1
+        ext = f.ext.lower()
+        counts[ext] = counts.get(ext,0) + 1
+        # language mapping shared with CodeQL language detection
+        if f.language:
+            langs[f.language] = langs.get(f.language,0)+1
     return {'file_count': total_files, 'ext_counts': counts, 'language_counts': langs}
 
 def main():
@@ -80,6 +64,9 @@ def main():
         out_dir = get_out_dir()
         out_dir.mkdir(parents=True, exist_ok=True)
 
+        # One walk shared by the hash and the inventory
+        start_run(repo_path)
+
         manifest = {
             'agent': 'raptor.recon',
             'version': '1.0.0',
@@ -94,6 +81,7 @@ def main():
 
         print(json.dumps({'status':'ok','manifest':manifest,'inventory':inv}, indent=2))
     finally:
+        end_run()
         if not args.keep:
             try:
                 shutil.rmtree(tmp)
@@ -8,16 +8,25 @@ import argparse, json, os, shutil, subprocess, sys, tempfile, time
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.inventory import get_inventory
+
 
 def get_out_dir() -> Path:
     base = os.environ.get("RAPTOR_OUT_DIR")
     return Path(base).resolve() if base else Path("out").resolve()
 
+DEPENDENCY_FILES = ['pom.xml','build.gradle','package.json','requirements.txt','pyproject.toml']
+
 def find_dependency_files(root: Path):
+    by_name = {}
+    for f in get_inventory(root).build_files():
+        if f.name in DEPENDENCY_FILES:
+            by_name.setdefault(f.name, []).append(root / f.path)
     candidates = []
-    for pat in ['pom.xml','build.gradle','package.json','requirements.txt','pyproject.toml']:
-        for p in root.rglob(pat):
-            candidates.append(p)
+    for pat in DEPENDENCY_FILES:
+        candidates.extend(sorted(by_name.get(pat, [])))
     return candidates
 
 def parse_pom(p):
@@ -4,7 +4,13 @@ RAPTOR Static Analysis Package
 Scanner for security vulnerabilities using Semgrep and CodeQL.
 """
 
-# Note: Directory name is 'static-analysis' but Python imports use relative path
-from .scanner import main
+import sys
+from pathlib import Path
+
+# Note: Directory name is 'static-analysis', which is not a valid package name,
+# so scanner.py and its helper modules import each other from this directory
+sys.path.insert(0, str(Path(__file__).parent))
+
+from scanner import main  # noqa: E402
 
 __all__ = ["main"]
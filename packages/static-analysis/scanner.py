@@ -3,6 +3,8 @@
 - Accepts a repo path or Git URL
 - Supports --policy-groups (comma-separated list) to select rule categories
 - Runs Semgrep across selected local rule directories IN PARALLEL
+  (or sequentially, or batched into one Semgrep process via --mode)
+- Optionally rescans only files changed since the last run (--incremental)
 - Optionally runs CodeQL when --codeql is provided; requires codeql CLI and query packs
 - Produces SARIF outputs and optional merged SARIF with deduplication
 - Includes progress reporting and comprehensive metrics
@@ -17,15 +19,25 @@ import subprocess
 import sys
 import tempfile
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
-from typing import Callable, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import RaptorConfig
 from core.logging import get_logger
 from core.sarif.parser import generate_scan_metrics, validate_sarif
+from core.tree_hash import sha256_tree
+from semgrep_cache import (
+    SemgrepScanCache,
+    hash_rule_config,
+    load_rule_ids,
+    result_sort_key,
+    sarif_fingerprints,
+    save_rule_ids,
+)
+from semgrep_shards import ShardUnit, plan_shards, scan_tree, split_shard
 
 logger = get_logger()
 
@@ -80,23 +92,82 @@ def safe_clone(url: str, workdir: Path) -> Path:
     logger.info(f"Repository cloned successfully to {repo_dir}")
     return repo_dir
 
+def sanitize_name(name: str) -> str:
+    """Make a scan name safe for use in output file names."""
+    return name.replace("/", "_").replace(":", "_")
+
+
+def semgrep_version() -> str:
+    """Return the installed Semgrep version string ("unknown" if unavailable)."""
+    semgrep_cmd = shutil.which("semgrep") or "/opt/homebrew/bin/semgrep"
+    try:
+        rc, so, _ = run([semgrep_cmd, "--version"], timeout=60)
+        return so.strip() if rc == 0 else "unknown"
+    except Exception:
+        return "unknown"
+
+
+def build_semgrep_configs(rules_dirs: List[str]) -> List[Tuple[str, str]]:
+    """
+    Build the (name, config) list: local rules and the matching standard pack
+    for each category, followed by the baseline packs, without duplicates.
+    """
+    configs: List[Tuple[str, str]] = []
+    added_packs = set()  # Track which standard packs we've added to avoid duplicates
+
+    # Add local rules + corresponding standard packs for each specified category
+    for rd in rules_dirs:
+        rd_path = Path(rd)
+        if rd_path.exists():
+            category_name = rd_path.name
+
+            # Add local rules for this category
+            configs.append((f"category_{category_name}", str(rd_path)))
+
+            # Add corresponding standard pack if available
+            if category_name in RaptorConfig.POLICY_GROUP_TO_SEMGREP_PACK:
+                pack_name, pack_id = RaptorConfig.POLICY_GROUP_TO_SEMGREP_PACK[category_name]
+                if pack_id not in added_packs:
+                    configs.append((pack_name, pack_id))
+                    added_packs.add(pack_id)
+                    logger.debug(f"Added standard pack for {category_name}: {pack_id}")
+        else:
+            logger.warning(f"Rule directory not found: {rd_path}")
+
+    # Add baseline packs (unless already added)
+    for pack_name, pack_identifier in RaptorConfig.BASELINE_SEMGREP_PACKS:
+        if pack_identifier not in added_packs:
+            configs.append((pack_name, pack_identifier))
+            added_packs.add(pack_identifier)
+
+    return configs
+
+
 def run_single_semgrep(
     name: str,
-    config: str,
+    config: Union[str, List[str]],
     repo_path: Path,
     out_dir: Path,
     timeout: int,
-    progress_callback: Optional[Callable] = None
+    progress_callback: Optional[Callable] = None,
+    include_paths: Optional[List[str]] = None,
+    targets: Optional[List[Path]] = None,
 ) -> Tuple[str, bool]:
     """
     Run a single Semgrep scan.
 
+    A scan that exceeds ``timeout`` records "timeout" in its .exit file so
+    callers can tell it apart from other failures.
+
+    Args:
+        config: A --config value, or several to load in one Semgrep process
+        include_paths: Restrict analysis to these repo-relative paths (via
+            --include) while keeping Semgrep's normal target discovery
+        targets: Scan these files/directories instead of the whole repo_path
+
     Returns:
         Tuple of (sarif_path, success)
     """
-    def sanitize_name(name: str) -> str:
-        return name.replace("/", "_").replace(":", "_")
-
     suffix = sanitize_name(name)
     sarif = out_dir / f"semgrep_{suffix}.sarif"
     stderr_log = out_dir / f"semgrep_{suffix}.stderr.log"
@@ -110,17 +181,19 @@ def run_single_semgrep(
     # Use full path to semgrep to avoid broken venv installations
     semgrep_cmd = shutil.which("semgrep") or "/opt/homebrew/bin/semgrep"
 
-    cmd = [
-        semgrep_cmd,
-        "scan",
-        "--config", config,
+    cmd = [semgrep_cmd, "scan"]
+    for cfg in [config] if isinstance(config, str) else config:
+        cmd.extend(["--config", cfg])
+    cmd += [
         "--quiet",
         "--metrics", "off",
         "--error",
         "--sarif",
         "--timeout", str(RaptorConfig.SEMGREP_RULE_TIMEOUT),
-        str(repo_path),
     ]
+    for rel in include_paths or []:
+        cmd.extend(["--include", rel])
+    cmd += [str(t) for t in targets] if targets else [str(repo_path)]
 
     # Create clean environment without venv contamination
     clean_env = os.environ.copy()
@@ -154,6 +227,13 @@ def run_single_semgrep(
 
         return str(sarif), success
 
+    except subprocess.TimeoutExpired:
+        logger.error(f"Semgrep scan '{name}' timed out after {timeout}s")
+        sarif.write_text('{"runs": []}')
+        stderr_log.write_text(f"timed out after {timeout}s")
+        exit_file.write_text("timeout")
+        return str(sarif), False
+
     except Exception as e:
         logger.error(f"Semgrep scan '{name}' failed: {e}")
         # Write empty SARIF on error
@@ -163,12 +243,119 @@ def run_single_semgrep(
         return str(sarif), False
 
 
+def _config_keys(configs: List[Tuple[str, str]]) -> Dict[str, Tuple[str, bool]]:
+    """Cache keys for each config; the Semgrep version and rule timeout affect results too."""
+    version = semgrep_version()
+    extra_args = ["--timeout", str(RaptorConfig.SEMGREP_RULE_TIMEOUT)]
+    return {config: hash_rule_config(config, version, extra_args) for _, config in configs}
+
+
+def _verify_incremental(
+    name: str,
+    config: str,
+    repo_path: Path,
+    out_dir: Path,
+    timeout: int,
+    cache: SemgrepScanCache,
+    key: str,
+    merged: Dict[str, Any],
+) -> Optional[bool]:
+    """
+    Compare an incremental result with a cold scan of the same config.
+
+    On mismatch the cold SARIF replaces the incremental one and the cache.
+
+    Returns:
+        True/False for match/mismatch, None if the cold scan failed
+    """
+    verify_dir = out_dir / "incremental_verify"
+    verify_dir.mkdir(parents=True, exist_ok=True)
+    cold_path, cold_ok = run_single_semgrep(name, config, repo_path, verify_dir, timeout)
+    if not cold_ok:
+        return None
+
+    cold = json.loads(Path(cold_path).read_text())
+    if sarif_fingerprints(cold, cache.repo_path) == sarif_fingerprints(merged, cache.repo_path):
+        return True
+
+    logger.warning(f"Semgrep '{name}': incremental results differ from cold scan; "
+                   f"using cold results and resetting cache")
+    shutil.copyfile(cold_path, out_dir / f"semgrep_{sanitize_name(name)}.sarif")
+    cache.update(key, cold, {"cold": True})
+    return False
+
+
+def run_semgrep_cached(
+    name: str,
+    config: str,
+    repo_path: Path,
+    out_dir: Path,
+    timeout: int,
+    cache: SemgrepScanCache,
+    config_key: Tuple[str, bool],
+    progress_callback: Optional[Callable] = None,
+    verify: bool = False,
+) -> Tuple[str, bool]:
+    """
+    Run one Semgrep config incrementally against the scan cache.
+
+    Only files changed since the cached scan are analysed; cached results
+    for the remaining files are merged into the SARIF. With ``verify`` a
+    cold scan is also run and compared; on mismatch the cold result wins
+    and replaces the cache.
+
+    Returns:
+        Tuple of (sarif_path, success)
+    """
+    key, is_remote = config_key
+    plan = cache.plan(key, is_remote)
+    suffix = sanitize_name(name)
+    sarif = out_dir / f"semgrep_{suffix}.sarif"
+    report = {"mode": "cold" if plan["cold"] else "incremental", "verified": None}
+
+    if plan["cold"]:
+        report["reason"] = plan["reason"]
+        logger.info(f"Semgrep '{name}': cold scan ({plan['reason']})")
+        sarif_path, success = run_single_semgrep(name, config, repo_path, out_dir, timeout, progress_callback)
+        if success:
+            cache.update(key, json.loads(sarif.read_text()), plan)
+    else:
+        changed = plan["changed"]
+        report["changed_files"] = len(changed)
+        logger.info(f"Semgrep '{name}': incremental scan of {len(changed)} changed file(s)")
+
+        if changed:
+            sarif_path, success = run_single_semgrep(
+                name, config, repo_path, out_dir, timeout, progress_callback, include_paths=changed
+            )
+            partial = json.loads(sarif.read_text()) if success else None
+        else:
+            # Nothing changed: the cached results are the scan
+            sarif_path, success = str(sarif), True
+            partial = {"version": "2.1.0", "runs": []}
+
+        if success:
+            merged = cache.merge(plan, partial)
+            sarif.write_text(json.dumps(merged))
+            cache.update(key, merged, plan)
+
+            if verify:
+                report["verified"] = _verify_incremental(
+                    name, config, repo_path, out_dir, timeout, cache, key, merged
+                )
+
+    (out_dir / f"semgrep_{suffix}.incremental.json").write_text(json.dumps(report))
+    return sarif_path, success
+
+
 def semgrep_scan_parallel(
     repo_path: Path,
     rules_dirs: List[str],
     out_dir: Path,
     timeout: int = RaptorConfig.SEMGREP_TIMEOUT,
-    progress_callback: Optional[Callable] = None
+    progress_callback: Optional[Callable] = None,
+    cache: Optional[SemgrepScanCache] = None,
+    verify: bool = False,
 ) -> List[str]:
     """
     Run Semgrep scans in parallel for improved performance.
@@ -179,40 +366,15 @@ def semgrep_scan_parallel(
         out_dir: Output directory for results
         timeout: Timeout per scan
         progress_callback: Optional callback for progress updates
+        cache: Incremental scan cache; only changed files are rescanned
+        verify: With a cache, also run cold scans and check they match
 
     Returns:
         List of SARIF file paths
     """
     out_dir.mkdir(parents=True, exist_ok=True)
-
-    # Build config list with BOTH local rules AND standard packs for each category
-    configs: List[Tuple[str, str]] = []
-    added_packs = set()  # Track which standard packs we've added to avoid duplicates
-
-    # Add local rules + corresponding standard packs for each specified category
-    for rd in rules_dirs:
-        rd_path = Path(rd)
-        if rd_path.exists():
-            category_name = rd_path.name
-
-            # Add local rules for this category
-            configs.append((f"category_{category_name}", str(rd_path)))
-
-            # Add corresponding standard pack if available
-            if category_name in RaptorConfig.POLICY_GROUP_TO_SEMGREP_PACK:
-                pack_name, pack_id = RaptorConfig.POLICY_GROUP_TO_SEMGREP_PACK[category_name]
-                if pack_id not in added_packs:
-                    configs.append((pack_name, pack_id))
-                    added_packs.add(pack_id)
-                    logger.debug(f"Added standard pack for {category_name}: {pack_id}")
-        else:
-            logger.warning(f"Rule directory not found: {rd_path}")
-
-    # Add baseline packs (unless already added)
-    for pack_name, pack_identifier in RaptorConfig.BASELINE_SEMGREP_PACKS:
-        if pack_identifier not in added_packs:
-            configs.append((pack_name, pack_identifier))
-            added_packs.add(pack_identifier)
+    configs = build_semgrep_configs(rules_dirs)
+    config_keys = _config_keys(configs) if cache else {}
 
     logger.info(f"Starting {len(configs)} Semgrep scans in parallel (max {RaptorConfig.MAX_SEMGREP_WORKERS} workers)")
     logger.info(f"  - Local rule directories: {len([c for c in configs if c[0].startswith('category_')])}")
@@ -223,18 +385,35 @@ def semgrep_scan_parallel(
     failed_scans: List[str] = []
 
     with ThreadPoolExecutor(max_workers=RaptorConfig.MAX_SEMGREP_WORKERS) as executor:
-        future_to_config = {
-            executor.submit(
-                run_single_semgrep,
-                name,
-                config,
-                repo_path,
-                out_dir,
-                timeout,
-                progress_callback
-            ): (name, config)
-            for name, config in configs
-        }
+        if cache:
+            future_to_config = {
+                executor.submit(
+                    run_semgrep_cached,
+                    name,
+                    config,
+                    repo_path,
+                    out_dir,
+                    timeout,
+                    cache,
+                    config_keys[config],
+                    progress_callback,
+                    verify,
+                ): (name, config)
+                for name, config in configs
+            }
+        else:
+            future_to_config = {
+                executor.submit(
+                    run_single_semgrep,
+                    name,
+                    config,
+                    repo_path,
+                    out_dir,
+                    timeout,
+                    progress_callback
+                ): (name, config)
+                for name, config in configs
+            }
 
         completed = 0
         total = len(future_to_config)
@@ -264,50 +443,403 @@ def semgrep_scan_parallel(
     return sarif_paths
 
 
-def semgrep_scan_sequential(
+def semgrep_rule_ids(
+    name: str,
+    config: str,
+    config_key: Tuple[str, bool],
+    probe_dir: Path,
+    timeout: int,
+) -> Optional[List[str]]:
+    """
+    Rule ids a config expands to, used to split batched results per config.
+
+    The config is run once against an empty directory (no parsing work) and
+    the rule table is read from the SARIF driver; the answer is cached by
+    config hash.
+    """
+    key, is_remote = config_key
+    rule_ids = load_rule_ids(key, is_remote)
+    if rule_ids is not None:
+        return rule_ids
+
+    empty = probe_dir / "empty"
+    empty.mkdir(parents=True, exist_ok=True)
+    sarif_path, success = run_single_semgrep(f"rules_{name}", config, empty, probe_dir, timeout)
+    if not success:
+        logger.warning(f"Could not list rules for '{name}'; its batched results will be unattributed")
+        return None
+
+    sarif = json.loads(Path(sarif_path).read_text())
+    rule_ids = [
+        rule.get("id")
+        for run in sarif.get("runs", [])
+        for rule in run.get("tool", {}).get("driver", {}).get("rules", [])
+    ]
+    save_rule_ids(key, rule_ids)
+    return rule_ids
+
+
+def split_batched_sarif(
+    sarif_data: Dict[str, Any],
+    rule_sets: Dict[str, Optional[List[str]]],
+) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Split one multi-config SARIF into per-config documents by rule id.
+
+    A rule shared by several configs is reported under each of them, as
+    separate scans would. Results whose rule matches no config are returned
+    separately so nothing is silently dropped.
+
+    Returns:
+        Tuple of ({config: sarif_data}, unattributed_results)
+    """
+    owners: Dict[str, List[str]] = {}
+    for config, rule_ids in rule_sets.items():
+        for rule_id in rule_ids or []:
+            owners.setdefault(rule_id, []).append(config)
+
+    runs = sarif_data.get("runs") or [{}]
+    template = {k: v for k, v in runs[0].items() if k != "results"}
+    driver_rules = template.get("tool", {}).get("driver", {}).get("rules", [])
+
+    per_config_results: Dict[str, List[Dict[str, Any]]] = {config: [] for config in rule_sets}
+    unattributed: List[Dict[str, Any]] = []
+    for run in runs:
+        for result in run.get("results", []):
+            configs = owners.get(result.get("ruleId"))
+            if not configs:
+                unattributed.append(result)
+            for config in configs or []:
+                per_config_results[config].append(result)
+
+    split: Dict[str, Dict[str, Any]] = {}
+    for config, rule_ids in rule_sets.items():
+        wanted = set(rule_ids or [])
+        run = json.loads(json.dumps(template))
+        driver = run.setdefault("tool", {}).setdefault("driver", {})
+        driver["rules"] = [rule for rule in driver_rules if rule.get("id") in wanted]
+        run["results"] = per_config_results[config]
+        split[config] = {k: v for k, v in sarif_data.items() if k != "runs"}
+        split[config]["runs"] = [run]
+    return split, unattributed
+
+
+def semgrep_scan_batched(
     repo_path: Path,
     rules_dirs: List[str],
     out_dir: Path,
-    timeout: int = RaptorConfig.SEMGREP_TIMEOUT
+    timeout: int = RaptorConfig.SEMGREP_TIMEOUT,
+    progress_callback: Optional[Callable] = None,
+    cache: Optional[SemgrepScanCache] = None,
+    verify: bool = False,
 ) -> List[str]:
-    """Sequential scanning fallback for debugging."""
+    """
+    Run every config in a single Semgrep process and split the output.
+
+    The repository is walked and parsed once instead of once per config,
+    and Semgrep's startup cost is paid once. Results are split back into
+    the usual per-config SARIF files by rule id, so downstream consumers
+    see the same layout as the parallel and sequential modes.
+
+    Args:
+        timeout: Timeout per config; the batched process gets the sum
+
+    Returns:
+        List of SARIF file paths
+    """
     out_dir.mkdir(parents=True, exist_ok=True)
+    configs = build_semgrep_configs(rules_dirs)
+    config_keys = _config_keys(configs)
+    batch_dir = out_dir / "batched"
+    batch_dir.mkdir(parents=True, exist_ok=True)
+
+    # Rule ownership per config (cached; probes are cheap and run concurrently)
+    with ThreadPoolExecutor(max_workers=RaptorConfig.MAX_SEMGREP_WORKERS) as executor:
+        futures = {
+            config: executor.submit(semgrep_rule_ids, name, config, config_keys[config], batch_dir, timeout)
+            for name, config in configs
+        }
+        rule_sets = {config: future.result() for config, future in futures.items()}
+
+    # Incremental: rescan the union of changed files, or everything if any config is cold
+    plans = {config: cache.plan(*config_keys[config]) for _, config in configs} if cache else {}
+    cold = not cache or any(plan["cold"] for plan in plans.values())
+    include_paths = None
+    if not cold:
+        include_paths = sorted({rel for plan in plans.values() for rel in plan["changed"]})
+
+    logger.info(f"Starting batched Semgrep scan of {len(configs)} configs in one process"
+                + (f" ({len(include_paths)} changed files)" if include_paths is not None else ""))
+
+    if include_paths == []:
+        batched, success = {"version": "2.1.0", "runs": []}, True
+    else:
+        batched_path, success = run_single_semgrep(
+            "batched", [config for _, config in configs], repo_path, batch_dir,
+            timeout * len(configs), progress_callback, include_paths=include_paths,
+        )
+        batched = json.loads(Path(batched_path).read_text()) if success else {"runs": []}
+
+    split, unattributed = split_batched_sarif(batched, rule_sets)
+
     sarif_paths: List[str] = []
+    for name, config in configs:
+        sarif_data = split[config]
+        # A config whose rules could not be listed has no trustworthy split to cache
+        if cache and success and rule_sets[config] is not None:
+            plan = plans[config]
+            if not plan["cold"] and not cold:
+                sarif_data = cache.merge(plan, sarif_data)
+            cache.update(config_keys[config][0], sarif_data, {"cold": True} if cold else plan)
+
+        sarif = out_dir / f"semgrep_{sanitize_name(name)}.sarif"
+        sarif.write_text(json.dumps(sarif_data))
+        sarif_paths.append(str(sarif))
+
+        if cache:
+            report = {"mode": "cold" if cold else "incremental", "verified": None}
+            if verify and success and not cold and rule_sets[config] is not None:
+                report["verified"] = _verify_incremental(
+                    name, config, repo_path, out_dir, timeout, cache, config_keys[config][0], sarif_data
+                )
+            (out_dir / f"semgrep_{sanitize_name(name)}.incremental.json").write_text(json.dumps(report))
+
+    if unattributed:
+        logger.warning(f"{len(unattributed)} batched results matched no known config rule")
+        sarif = out_dir / "semgrep_batched_unattributed.sarif"
+        sarif.write_text(json.dumps({"version": "2.1.0", "runs": [{
+            "tool": {"driver": {"name": "Semgrep"}}, "results": unattributed,
+        }]}))
+        sarif_paths.append(str(sarif))
+
+    if not success:
+        logger.warning("Batched Semgrep scan failed")
+    logger.info(f"Completed batched scan ({len(sarif_paths)} SARIF files)")
+    return sarif_paths
 
-    # Build config list with BOTH local rules AND standard packs for each category
-    configs: List[Tuple[str, str]] = []
-    added_packs = set()  # Track which standard packs we've added to avoid duplicates
 
-    # Add local rules + corresponding standard packs for each specified category
-    for rd in rules_dirs:
-        rd_path = Path(rd)
-        if rd_path.exists():
-            category_name = rd_path.name
+def _run_shard(
+    name: str,
+    config: str,
+    repo_path: Path,
+    shard: List[ShardUnit],
+    shard_dir: Path,
+    timeout: int,
+) -> Tuple[str, bool, bool]:
+    """
+    Scan one shard with one config.
 
-            # Add local rules for this category
-            configs.append((f"category_{category_name}", str(rd_path)))
+    Returns:
+        Tuple of (sarif_path, success, timed_out)
+    """
+    targets = [repo_path / unit.path if unit.path else repo_path for unit in shard]
+    sarif_path, success = run_single_semgrep(name, config, repo_path, shard_dir, timeout, targets=targets)
+    exit_file = shard_dir / f"semgrep_{sanitize_name(name)}.exit"
+    timed_out = exit_file.exists() and exit_file.read_text() == "timeout"
+    return sarif_path, success, timed_out
 
-            # Add corresponding standard pack if available
-            if category_name in RaptorConfig.POLICY_GROUP_TO_SEMGREP_PACK:
-                pack_name, pack_id = RaptorConfig.POLICY_GROUP_TO_SEMGREP_PACK[category_name]
-                if pack_id not in added_packs:
-                    configs.append((pack_name, pack_id))
-                    added_packs.add(pack_id)
 
-    # Add baseline packs (unless already added)
-    for pack_name, pack_identifier in RaptorConfig.BASELINE_SEMGREP_PACKS:
-        if pack_identifier not in added_packs:
-            configs.append((pack_name, pack_identifier))
-            added_packs.add(pack_identifier)
+def semgrep_scan_sharded(
+    repo_path: Path,
+    rules_dirs: List[str],
+    out_dir: Path,
+    timeout: int = RaptorConfig.SEMGREP_TIMEOUT,
+    progress_callback: Optional[Callable] = None,
+    cache: Optional[SemgrepScanCache] = None,
+    verify: bool = False,
+    num_shards: Optional[int] = None,
+) -> List[str]:
+    """
+    Split the repository into size-balanced shards and scan config x shard.
+
+    For repositories where a single Semgrep process per config is too slow
+    or hits the timeout. Every (config, shard) pair is a job on the worker
+    pool; a shard that times out is split in two and retried, up to
+    SEMGREP_SHARD_MAX_SPLITS times. Shard results are merged back into one
+    SARIF per config with a stable result order. Configs the cache can scan
+    incrementally are not sharded.
+
+    Args:
+        timeout: Timeout per (config, shard) job
+        num_shards: Shards per config (default: SEMGREP_SHARDS, or
+            MAX_SEMGREP_WORKERS when that is 0)
+
+    Returns:
+        List of SARIF file paths
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    shard_dir = out_dir / "shards"
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    configs = build_semgrep_configs(rules_dirs)
+    config_keys = _config_keys(configs) if cache else {}
+    plans = {config: cache.plan(*config_keys[config]) for _, config in configs} if cache else {}
+    sharded = [(name, config) for name, config in configs if not cache or plans[config]["cold"]]
+
+    num_shards = num_shards or RaptorConfig.SEMGREP_SHARDS or RaptorConfig.MAX_SEMGREP_WORKERS
+    tree = scan_tree(repo_path)
+    shards = plan_shards(tree, num_shards)
+    logger.info(f"Starting sharded Semgrep scan: {len(sharded)} configs x {len(shards)} shards "
+                f"(max {RaptorConfig.MAX_SEMGREP_WORKERS} workers)")
+
+    documents: Dict[str, Dict[str, Any]] = {}
+    results: Dict[str, List[Dict[str, Any]]] = {config: [] for _, config in sharded}
+    failed: Dict[str, str] = {}
+    cached_paths: Dict[str, Tuple[str, bool]] = {}
+
+    with ThreadPoolExecutor(max_workers=RaptorConfig.MAX_SEMGREP_WORKERS) as executor:
+        pending: Dict[Any, Tuple] = {}
+
+        def submit(name: str, config: str, shard: List[ShardUnit], shard_id: str, splits: int) -> None:
+            job_name = f"{name}_shard_{shard_id}"
+            future = executor.submit(_run_shard, job_name, config, repo_path, shard, shard_dir, timeout)
+            pending[future] = (name, config, shard, shard_id, splits)
+
+        incremental = {
+            executor.submit(
+                run_semgrep_cached, name, config, repo_path, out_dir, timeout,
+                cache, config_keys[config], progress_callback, verify,
+            ): config
+            for name, config in configs
+            if cache and not plans[config]["cold"]
+        }
+        for name, config in sharded:
+            for idx, shard in enumerate(shards):
+                submit(name, config, shard, str(idx), 0)
+
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, config, shard, shard_id, splits = pending.pop(future)
+                sarif_path, success, timed_out = future.result()
+
+                if success:
+                    data = json.loads(Path(sarif_path).read_text())
+                    documents.setdefault(config, data)
+                    for run in data.get("runs", []):
+                        results[config].extend(run.get("results", []))
+                    if progress_callback:
+                        progress_callback(f"Completed {name} shard {shard_id}")
+                    continue
+
+                parts = split_shard(shard, tree) if timed_out else []
+                if parts and splits < RaptorConfig.SEMGREP_SHARD_MAX_SPLITS:
+                    logger.warning(f"Semgrep '{name}' shard {shard_id} timed out; "
+                                   f"retrying as {len(parts)} smaller shards")
+                    for idx, part in enumerate(parts):
+                        submit(name, config, part, f"{shard_id}-{idx}", splits + 1)
+                else:
+                    failed.setdefault(config, f"shard {shard_id} {'timed out' if timed_out else 'failed'}")
+
+        for future, config in incremental.items():
+            cached_paths[config] = future.result()
+
+    sarif_paths: List[str] = []
+    for name, config in configs:
+        if config in cached_paths:
+            sarif_paths.append(cached_paths[config][0])
+            continue
+
+        template = documents.get(config, {"version": "2.1.0", "runs": []})
+        runs = template.get("runs") or [{"tool": {"driver": {"name": "Semgrep"}}}]
+        run = {k: v for k, v in runs[0].items() if k != "results"}
+        run["results"] = sorted(results[config], key=result_sort_key)
+        merged = {k: v for k, v in template.items() if k != "runs"}
+        merged["runs"] = [run]
+
+        sarif = out_dir / f"semgrep_{sanitize_name(name)}.sarif"
+        sarif.write_text(json.dumps(merged))
+        sarif_paths.append(str(sarif))
+
+        if config in failed:
+            # Partial results are still written, but never cached as a complete scan
+            logger.warning(f"Semgrep '{name}': incomplete sharded scan ({failed[config]})")
+        elif cache:
+            cache.update(config_keys[config][0], merged, plans[config])
+        if cache:
+            report = {"mode": "cold", "reason": plans[config]["reason"], "verified": None, "shards": len(shards)}
+            (out_dir / f"semgrep_{sanitize_name(name)}.incremental.json").write_text(json.dumps(report))
+
+    if failed:
+        logger.warning(f"Failed scans: {', '.join(name for name, config in configs if config in failed)}")
+    logger.info(f"Completed sharded scan ({len(sarif_paths)} SARIF files, {len(failed)} incomplete)")
+    return sarif_paths
+
+
+def semgrep_scan_sequential(
+    repo_path: Path,
+    rules_dirs: List[str],
+    out_dir: Path,
+    timeout: int = RaptorConfig.SEMGREP_TIMEOUT,
+    cache: Optional[SemgrepScanCache] = None,
+    verify: bool = False,
+) -> List[str]:
+    """Sequential scanning fallback for debugging."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    sarif_paths: List[str] = []
+    configs = build_semgrep_configs(rules_dirs)
+    config_keys = _config_keys(configs) if cache else {}
 
     for idx, (name, config) in enumerate(configs, 1):
         logger.info(f"Running scan {idx}/{len(configs)}: {name}")
-        sarif_path, success = run_single_semgrep(name, config, repo_path, out_dir, timeout)
+        if cache:
+            sarif_path, success = run_semgrep_cached(
+                name, config, repo_path, out_dir, timeout, cache, config_keys[config], verify=verify
+            )
+        else:
+            sarif_path, success = run_single_semgrep(name, config, repo_path, out_dir, timeout)
         sarif_paths.append(sarif_path)
 
     return sarif_paths
 
 
+SEMGREP_MODES: Dict[str, Callable[..., List[str]]] = {
+    "parallel": semgrep_scan_parallel,
+    "sequential": semgrep_scan_sequential,
+    "batched": semgrep_scan_batched,
+    "sharded": semgrep_scan_sharded,
+}
+
+
+def benchmark_semgrep_modes(
+    repo_path: Path,
+    rules_dirs: List[str],
+    out_dir: Path,
+    modes: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the same scan in each mode (cold, no cache) and compare.
+
+    Returns:
+        Dict of mode -> {duration, findings, matches_baseline}; the first
+        mode is the baseline the others are compared against.
+    """
+    modes = modes or list(SEMGREP_MODES)
+    repo_root = Path(repo_path).resolve()
+    results: Dict[str, Any] = {}
+    baseline = None
+
+    for mode in modes:
+        mode_dir = out_dir / "benchmark" / mode
+        logger.info(f"Benchmarking Semgrep mode: {mode}")
+        start = time.time()
+        paths = SEMGREP_MODES[mode](repo_path, rules_dirs, mode_dir)
+        duration = time.time() - start
+
+        prints = sorted(
+            fp for path in paths for fp in sarif_fingerprints(json.loads(Path(path).read_text()), repo_root)
+        )
+        if baseline is None:
+            baseline = prints
+        results[mode] = {
+            "duration": round(duration, 3),
+            "findings": len(prints),
+            "matches_baseline": prints == baseline,
+        }
+        logger.info(f"  {mode}: {duration:.2f}s, {len(prints)} findings")
+
+    return results
+
+
 # This is a WIP CodeQL runner; assumes codeql CLI is installed and query packs are available
 # Expect this to change
 def run_codeql(repo_path: Path, out_dir: Path, languages):
@@ -338,30 +870,6 @@ def run_codeql(repo_path: Path, out_dir: Path, languages):
     return sarif_paths
 
 
-def sha256_tree(root: Path) -> str:
-    """Hash directory tree with size limits and consistent chunk size."""
-    import hashlib
-    h = hashlib.sha256()
-    skipped_files = []
-
-    for p in sorted(root.rglob("*")):
-        if p.is_file():
-            stat = p.stat()
-            # Skip very large files
-            if stat.st_size > RaptorConfig.MAX_FILE_SIZE_FOR_HASH:
-                skipped_files.append(str(p.relative_to(root)))
-                continue
-
-            h.update(p.relative_to(root).as_posix().encode())
-            with p.open("rb") as f:
-                for chunk in iter(lambda: f.read(RaptorConfig.HASH_CHUNK_SIZE), b""):
-                    h.update(chunk)
-
-    if skipped_files:
-        logger.debug(f"Skipped {len(skipped_files)} large files during hashing")
-
-    return h.hexdigest()
-
 def main():
     ap = argparse.ArgumentParser(description="RAPTOR Automated Code Security Agent with parallel scanning")
     ap.add_argument("--repo", required=True, help="Path or Git URL")
@@ -374,7 +882,19 @@ def main():
     ap.add_argument("--codeql", action="store_true", help="Run CodeQL stage if available")
     ap.add_argument("--keep", action="store_true", help="Keep temp working directory")
     ap.add_argument("--sequential", action="store_true", help="Disable parallel scanning (for debugging)")
+    ap.add_argument("--mode", choices=sorted(SEMGREP_MODES), default="parallel",
+                    help="Semgrep execution mode: one process per config in parallel (default), "
+                         "sequentially, all configs batched into one process, or each config "
+                         "split across size-balanced repository shards")
+    ap.add_argument("--benchmark", action="store_true",
+                    help="Run every Semgrep mode, compare durations and results (semgrep_benchmark.json)")
+    ap.add_argument("--incremental", action="store_true",
+                    help="Reuse cached Semgrep results and rescan only files changed since the last run")
+    ap.add_argument("--verify-incremental", action="store_true",
+                    help="With --incremental, also run a cold scan and check the results match")
     args = ap.parse_args()
+    if args.sequential:
+        args.mode = "sequential"
 
     start_time = time.time()
     tmp = Path(tempfile.mkdtemp(prefix="raptor_auto_"))
@@ -422,18 +942,33 @@ def main():
             "input_hash": repo_hash,
             "policy_version": args.policy_version,
             "policy_groups": groups,
-            "parallel_scanning": not args.sequential,
+            "parallel_scanning": args.mode != "sequential",
+            "semgrep_mode": args.mode,
+            "incremental": args.incremental,
         }
         (out_dir / "scan-manifest.json").write_text(json.dumps(manifest, indent=2))
 
         # Semgrep stage - Use parallel scanning by default
         logger.info("Starting Semgrep scans...")
-        if args.sequential:
+        if args.benchmark:
+            benchmark = benchmark_semgrep_modes(repo_path, rules_dirs, out_dir)
+            (out_dir / "semgrep_benchmark.json").write_text(json.dumps(benchmark, indent=2))
+
+        cache = SemgrepScanCache(repo_path) if args.incremental else None
+        if args.mode == "sequential":
             # Fallback to sequential for debugging
             logger.warning("Sequential scanning enabled (slower)")
-            semgrep_sarifs = semgrep_scan_sequential(repo_path, rules_dirs, out_dir)
-        else:
-            semgrep_sarifs = semgrep_scan_parallel(repo_path, rules_dirs, out_dir)
+        semgrep_sarifs = SEMGREP_MODES[args.mode](
+            repo_path, rules_dirs, out_dir, cache=cache, verify=args.verify_incremental
+        )
+
+        if cache:
+            # Record how each config was scanned (cold/incremental, verification outcome)
+            manifest["incremental_scans"] = {
+                p.name[len("semgrep_"):-len(".incremental.json")]: json.loads(p.read_text())
+                for p in sorted(out_dir.glob("semgrep_*.incremental.json"))
+            }
+            (out_dir / "scan-manifest.json").write_text(json.dumps(manifest, indent=2))
 
         # CodeQL stage (optional)
         codeql_sarifs = []
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Incremental Semgrep scan cache.
+
+Semgrep OSS analyses each file independently, so the results for a file
+depend only on its content and on the rules. This module keeps, per
+repository and per rule config, the content hash of every file from the
+last scan together with that file's SARIF results. A rerun then only has to
+feed changed files to Semgrep and can merge cached results for the rest.
+
+Cache layout (under RaptorConfig.SEMGREP_CACHE_DIR):
+    <repo-key>/<root-key>.sqlite   file stat cache (core.tree_hash)
+    <repo-key>/<config-key>.json   per-config scan state and results
+    rules/<config-key>.json        rule ids a config expands to
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
+
+from core.config import RaptorConfig
+from core.inventory import get_inventory
+from core.logging import get_logger
+from core.tree_hash import hash_tree_files
+
+logger = get_logger()
+
+CACHE_FORMAT_VERSION = 1
+
+# Characters Semgrep would interpret in an --include glob
+_GLOB_CHARS = set("*?[]{}")
+
+
+def _atomic_write_json(path: Path, data: Any) -> None:
+    """Write JSON via a temp file and rename so concurrent readers never see partial data."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _load_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def hash_rule_config(config: str, semgrep_version: str, extra_args: Iterable[str] = ()) -> Tuple[str, bool]:
+    """
+    Hash a Semgrep --config value together with everything that affects results.
+
+    Local rule files/directories are hashed by content. Registry configs
+    (e.g. "p/security-audit") can change upstream without notice, so they
+    are keyed by identifier and reported as remote for TTL handling.
+
+    Returns:
+        Tuple of (config_key, is_remote)
+    """
+    h = hashlib.sha256()
+    h.update(f"v{CACHE_FORMAT_VERSION}\0{semgrep_version}\0".encode())
+    for arg in extra_args:
+        h.update(f"{arg}\0".encode())
+
+    path = Path(config)
+    if path.is_dir():
+        for rule_file in sorted(p for p in path.rglob("*") if p.is_file()):
+            h.update(rule_file.relative_to(path).as_posix().encode() + b"\0")
+            h.update(rule_file.read_bytes())
+        return h.hexdigest(), False
+    if path.is_file():
+        h.update(path.read_bytes())
+        return h.hexdigest(), False
+
+    h.update(f"registry:{config}".encode())
+    return h.hexdigest(), True
+
+
+def result_relpath(result: Dict[str, Any], repo_path: Path) -> Optional[str]:
+    """Map a SARIF result's primary location to a repo-relative POSIX path."""
+    locations = result.get("locations") or [{}]
+    uri = locations[0].get("physicalLocation", {}).get("artifactLocation", {}).get("uri")
+    if not uri:
+        return None
+    if uri.startswith("file://"):
+        uri = unquote(uri[len("file://"):])
+
+    path = Path(uri)
+    if not path.is_absolute():
+        # Semgrep reports paths the way targets were given; we always pass an absolute root
+        path = Path.cwd() / path
+    try:
+        return path.resolve().relative_to(repo_path).as_posix()
+    except ValueError:
+        return None
+
+
+def result_sort_key(result: Dict[str, Any]) -> Tuple:
+    """Stable ordering for merged results: location first, then rule and message."""
+    loc = (result.get("locations") or [{}])[0].get("physicalLocation", {})
+    region = loc.get("region", {})
+    return (
+        loc.get("artifactLocation", {}).get("uri", ""),
+        region.get("startLine", 0),
+        region.get("startColumn", 0),
+        region.get("endLine", 0),
+        region.get("endColumn", 0),
+        result.get("ruleId", ""),
+        result.get("message", {}).get("text", ""),
+    )
+
+
+class SemgrepScanCache:
+    """
+    Per-repository incremental scan state.
+
+    Usage:
+        cache = SemgrepScanCache(repo_path)
+        plan = cache.plan(config_key, is_remote)      # per config
+        ... run Semgrep on plan["changed"] (or the whole repo if plan["cold"]) ...
+        cache.update(config_key, sarif_data, plan)
+    """
+
+    def __init__(
+        self,
+        repo_path: Path,
+        cache_dir: Optional[Path] = None,
+        max_changed_files: int = RaptorConfig.SEMGREP_INCREMENTAL_MAX_CHANGED_FILES,
+        max_changed_fraction: float = RaptorConfig.SEMGREP_INCREMENTAL_MAX_CHANGED_FRACTION,
+        registry_ttl: int = RaptorConfig.SEMGREP_REGISTRY_CACHE_TTL,
+    ):
+        self.repo_path = Path(repo_path).resolve()
+        repo_key = hashlib.sha256(str(self.repo_path).encode()).hexdigest()[:16]
+        self.cache_dir = Path(cache_dir or RaptorConfig.SEMGREP_CACHE_DIR) / repo_key
+        self.max_changed_files = max_changed_files
+        self.max_changed_fraction = max_changed_fraction
+        self.registry_ttl = registry_ttl
+        self._files: Optional[Dict[str, str]] = None
+        self._files_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # File state
+    # ------------------------------------------------------------------
+
+    def current_files(self) -> Dict[str, str]:
+        """
+        Content hash of every file in the repository, keyed by relative path.
+
+        The file list comes from core.inventory and the digests from
+        core.tree_hash, whose stat cache (kept in this repository's cache
+        directory) saves rereading unchanged files.
+        """
+        with self._files_lock:
+            if self._files is None:
+                self._files = self._hash_files()
+            return self._files
+
+    def _hash_files(self) -> Dict[str, str]:
+        # Semgrep does not skip every PRUNED_DIRS name (e.g. venv/), and a
+        # file missing here would have its results dropped by merge()
+        inventory = get_inventory(self.repo_path, exclude_dirs=(".git",), full=True)
+        stat_keys = [(f.path, f.stat_key) for f in inventory.files((".git",))]
+        files = hash_tree_files(self.repo_path, stat_keys, cache_dir=self.cache_dir)
+        logger.debug(f"Semgrep cache: {len(files)} files")
+        return files
+
+    # ------------------------------------------------------------------
+    # Per-config state
+    # ------------------------------------------------------------------
+
+    def _config_path(self, config_key: str) -> Path:
+        return self.cache_dir / f"{config_key}.json"
+
+    def plan(self, config_key: str, is_remote: bool = False) -> Dict[str, Any]:
+        """
+        Decide how to scan one config.
+
+        Returns:
+            Dict with:
+              cold:    True if the whole repository must be scanned
+              reason:  why a cold scan was chosen (when cold)
+              changed: sorted relative paths to rescan (when incremental)
+              state:   the cached per-config state (when incremental)
+        """
+        files = self.current_files()
+        state = _load_json(self._config_path(config_key))
+        if not isinstance(state, dict):
+            state = None
+
+        if not state or state.get("version") != CACHE_FORMAT_VERSION:
+            return {"cold": True, "reason": "no cached scan"}
+        if is_remote and time.time() - state.get("created", 0) > self.registry_ttl:
+            return {"cold": True, "reason": "registry rules expired"}
+
+        scanned = state.get("files", {})
+        changed = sorted(rel for rel, digest in files.items() if scanned.get(rel) != digest)
+
+        if len(changed) > self.max_changed_files or (
+            files and len(changed) > self.max_changed_fraction * len(files)
+        ):
+            return {"cold": True, "reason": f"{len(changed)}/{len(files)} files changed"}
+        if any(_GLOB_CHARS & set(rel) for rel in changed):
+            return {"cold": True, "reason": "changed path not expressible as --include"}
+
+        return {"cold": False, "changed": changed, "state": state}
+
+    def merge(self, plan: Dict[str, Any], sarif_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Combine a partial scan of ``plan["changed"]`` with cached results.
+
+        Fresh results for changed files replace their cached ones; results
+        for deleted files are dropped. Results are sorted for stable output.
+        """
+        files = self.current_files()
+        changed = set(plan["changed"])
+        cached = plan["state"].get("results", {})
+
+        results: List[Dict[str, Any]] = [
+            result
+            for rel, rel_results in cached.items()
+            if rel in files and rel not in changed
+            for result in rel_results
+        ]
+        for run in sarif_data.get("runs", []):
+            for result in run.get("results", []):
+                # --include globs are unanchored; keep only files we asked for
+                if result_relpath(result, self.repo_path) in changed:
+                    results.append(result)
+
+        template = plan["state"].get("run", {})
+        runs = sarif_data.get("runs") or []
+        run = dict(runs[0]) if runs else dict(template)
+        run["results"] = sorted(results, key=result_sort_key)
+        merged = dict(sarif_data)
+        merged["runs"] = [run]
+        return merged
+
+    def update(self, config_key: str, sarif_data: Dict[str, Any], plan: Dict[str, Any]) -> None:
+        """Record a complete (cold or merged) scan as the new cached state."""
+        files = self.current_files()
+        results_by_file: Dict[str, List[Dict[str, Any]]] = {}
+        run_template: Dict[str, Any] = {}
+
+        for run in sarif_data.get("runs", []):
+            run_template = {k: v for k, v in run.items() if k != "results"}
+            for result in run.get("results", []):
+                rel = result_relpath(result, self.repo_path)
+                if rel is None:
+                    # Unattributable results make per-file reuse unsafe
+                    logger.debug("Semgrep cache: result outside repository, not caching config")
+                    self.invalidate(config_key)
+                    return
+                results_by_file.setdefault(rel, []).append(result)
+
+        previous = plan.get("state") or {}
+        state = {
+            "version": CACHE_FORMAT_VERSION,
+            # Registry TTL counts from the last cold scan, not from each rerun
+            "created": time.time() if plan.get("cold") else previous.get("created", time.time()),
+            "files": files,
+            "results": results_by_file,
+            "run": run_template,
+        }
+        _atomic_write_json(self._config_path(config_key), state)
+
+    def invalidate(self, config_key: str) -> None:
+        """Forget a config so its next scan is cold."""
+        self._config_path(config_key).unlink(missing_ok=True)
+
+
+def load_rule_ids(config_key: str, is_remote: bool, cache_dir: Optional[Path] = None) -> Optional[List[str]]:
+    """Cached rule ids for a config (see save_rule_ids), or None if unknown or expired."""
+    state = _load_json(Path(cache_dir or RaptorConfig.SEMGREP_CACHE_DIR) / "rules" / f"{config_key}.json")
+    if not isinstance(state, dict):
+        return None
+    if is_remote and time.time() - state.get("created", 0) > RaptorConfig.SEMGREP_REGISTRY_CACHE_TTL:
+        return None
+    return state.get("rule_ids")
+
+
+def save_rule_ids(config_key: str, rule_ids: List[str], cache_dir: Optional[Path] = None) -> None:
+    """Remember which rule ids a config expands to, so batched scans can split results."""
+    _atomic_write_json(
+        Path(cache_dir or RaptorConfig.SEMGREP_CACHE_DIR) / "rules" / f"{config_key}.json",
+        {"created": time.time(), "rule_ids": rule_ids},
+    )
+
+
+def sarif_fingerprints(sarif_data: Dict[str, Any], repo_path: Path) -> List[Tuple]:
+    """Order-independent view of a SARIF document's results, for cold/incremental comparison."""
+    prints = []
+    for run in sarif_data.get("runs", []):
+        for result in run.get("results", []):
+            region = (result.get("locations") or [{}])[0].get("physicalLocation", {}).get("region", {})
+            prints.append((
+                result.get("ruleId", ""),
+                result_relpath(result, repo_path) or "",
+                region.get("startLine", 0),
+                region.get("startColumn", 0),
+                region.get("endLine", 0),
+                region.get("endColumn", 0),
+                result.get("message", {}).get("text", ""),
+            ))
+    return sorted(prints)
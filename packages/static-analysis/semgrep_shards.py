@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Size-balanced sharding of a repository for Semgrep.
+
+A shard is a list of units, each either a directory subtree or a single
+file, passed to Semgrep as explicit targets. Directories are kept whole
+where possible so Semgrep's own ignore handling still applies inside them;
+only directories larger than the target shard size are broken into their
+children. Shards that time out can be split further with split_shard().
+"""
+
+import heapq
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+@dataclass(frozen=True)
+class ShardUnit:
+    """A directory subtree or file, relative to the repository root ("" is the root)."""
+    path: str
+    size: int
+    is_dir: bool
+
+
+@dataclass
+class RepoTree:
+    """Directory sizes and children, enough to expand units on demand."""
+    dir_size: Dict[str, int] = field(default_factory=dict)
+    dir_files: Dict[str, List[Tuple[str, int]]] = field(default_factory=dict)
+    dir_subdirs: Dict[str, List[str]] = field(default_factory=dict)
+
+    def children(self, unit: ShardUnit) -> List[ShardUnit]:
+        """Immediate children of a directory unit that contain any bytes."""
+        units = [ShardUnit(rel, size, False) for rel, size in self.dir_files.get(unit.path, []) if size]
+        units += [
+            ShardUnit(rel, self.dir_size[rel], True)
+            for rel in self.dir_subdirs.get(unit.path, [])
+            if self.dir_size.get(rel)
+        ]
+        return units
+
+
+def scan_tree(repo_path: Path) -> RepoTree:
+    """Walk the repository once (skipping .git) and record subtree sizes."""
+    tree = RepoTree()
+    order: List[str] = []
+    stack = [""]
+
+    while stack:
+        rel_dir = stack.pop()
+        order.append(rel_dir)
+        files: List[Tuple[str, int]] = []
+        subdirs: List[str] = []
+        try:
+            with os.scandir(repo_path / rel_dir if rel_dir else repo_path) as it:
+                for entry in it:
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != ".git":
+                            subdirs.append(rel)
+                    elif entry.is_file(follow_symlinks=False):
+                        files.append((rel, entry.stat(follow_symlinks=False).st_size))
+        except OSError:
+            pass
+        tree.dir_files[rel_dir] = sorted(files)
+        tree.dir_subdirs[rel_dir] = sorted(subdirs)
+        stack.extend(subdirs)
+
+    # Parents were visited before children, so sum sizes in reverse
+    for rel_dir in reversed(order):
+        tree.dir_size[rel_dir] = (
+            sum(size for _, size in tree.dir_files[rel_dir])
+            + sum(tree.dir_size[sub] for sub in tree.dir_subdirs[rel_dir])
+        )
+    return tree
+
+
+def _expand(units: List[ShardUnit], tree: RepoTree, target_size: int) -> List[ShardUnit]:
+    """Break directory units larger than target_size into their children, recursively."""
+    result: List[ShardUnit] = []
+    pending = list(units)
+    while pending:
+        unit = pending.pop()
+        if unit.is_dir and unit.size > target_size:
+            children = tree.children(unit)
+            if children:
+                pending.extend(children)
+                continue
+        result.append(unit)
+    return result
+
+
+def _pack(units: List[ShardUnit], num_shards: int) -> List[List[ShardUnit]]:
+    """Greedy longest-processing-time packing into num_shards size-balanced shards."""
+    heap: List[Tuple[int, int]] = [(0, i) for i in range(num_shards)]
+    shards: List[List[ShardUnit]] = [[] for _ in range(num_shards)]
+    for unit in sorted(units, key=lambda u: (-u.size, u.path)):
+        size, idx = heapq.heappop(heap)
+        shards[idx].append(unit)
+        heapq.heappush(heap, (size + unit.size, idx))
+    return [sorted(shard, key=lambda u: u.path) for shard in shards if shard]
+
+
+def plan_shards(tree: RepoTree, num_shards: int) -> List[List[ShardUnit]]:
+    """Partition the whole repository into at most num_shards size-balanced shards."""
+    total = tree.dir_size.get("", 0)
+    if not total:
+        return []
+    root = ShardUnit("", total, True)
+    if num_shards <= 1:
+        return [[root]]
+    target_size = max(1, total // num_shards)
+    return _pack(_expand([root], tree, target_size), num_shards)
+
+
+def split_shard(shard: List[ShardUnit], tree: RepoTree) -> List[List[ShardUnit]]:
+    """
+    Split a shard in two for a retry, descending into directories as needed.
+
+    Returns an empty list when the shard is a single file and cannot shrink.
+    """
+    units = list(shard)
+    if len(units) == 1:
+        units = tree.children(units[0]) if units[0].is_dir else []
+        if not units:
+            return []
+    if len(units) == 1:
+        # A directory with one child: keep descending until it branches
+        return split_shard(units, tree)
+    return _pack(units, 2)
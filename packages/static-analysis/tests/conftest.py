@@ -0,0 +1,160 @@
+"""
+Shared fixtures for static analysis tests.
+
+The package directory is named static-analysis, so its modules are imported
+the way scanner.py itself does: with the directory on sys.path.
+"""
+
+import fnmatch
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import scanner  # noqa: E402
+from core.config import RaptorConfig  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def cache_dirs(tmp_path, monkeypatch):
+    """Keep Semgrep and tree hash caches out of the repository."""
+    monkeypatch.setattr(RaptorConfig, "SEMGREP_CACHE_DIR", tmp_path / "semgrep_cache")
+    monkeypatch.setattr(RaptorConfig, "TREE_HASH_CACHE_DIR", tmp_path / "tree_hash_cache")
+    return tmp_path / "semgrep_cache"
+
+
+class FakeSemgrep:
+    """
+    Stand-in for the semgrep subprocess behind scanner.run().
+
+    A config is a rule file, or a directory of them, with one
+    "<rule-id> <needle>" per line; a rule matches every line containing its
+    needle. Targets, --include globs and the SARIF layout follow Semgrep's.
+    Scans that include a file named in ``slow``, or more than ``max_files``
+    files, time out.
+    """
+
+    def __init__(self):
+        self.calls: List[Dict] = []
+        self.slow: set = set()
+        self.max_files: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _rules(config: str) -> Dict[str, str]:
+        path = Path(config)
+        rule_files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+        rules = {}
+        for rule_file in rule_files:
+            for line in rule_file.read_text().splitlines():
+                if line.strip():
+                    rule_id, needle = line.split(None, 1)
+                    rules[rule_id] = needle
+        return rules
+
+    @staticmethod
+    def _files(target: Path) -> List[Path]:
+        if target.is_file():
+            return [target]
+        found = []
+        for dirpath, dirnames, filenames in os.walk(target):
+            dirnames[:] = sorted(d for d in dirnames if d != ".git")
+            found += [Path(dirpath) / name for name in sorted(filenames)]
+        return found
+
+    def __call__(self, cmd, cwd=None, timeout=None, env=None):
+        if "--version" in cmd:
+            return 0, "1.0.0\n", ""
+
+        args = cmd[2:]
+        configs, includes, targets = [], [], []
+        i = 0
+        while i < len(args):
+            if args[i] in ("--config", "--include", "--timeout", "--metrics"):
+                if args[i] == "--config":
+                    configs.append(args[i + 1])
+                elif args[i] == "--include":
+                    includes.append(args[i + 1])
+                i += 2
+            elif args[i].startswith("--"):
+                i += 1
+            else:
+                targets.append(Path(args[i]))
+                i += 1
+
+        files = [f for target in targets for f in self._files(target)]
+        if includes:
+            files = [f for f in files if any(fnmatch.fnmatch(f.as_posix(), f"*{g}") for g in includes)]
+        with self._lock:
+            self.calls.append({"configs": configs, "includes": includes, "targets": targets, "files": files})
+        if any(f.name in self.slow for f in files) or (
+            self.max_files is not None and len(files) > self.max_files
+        ):
+            raise subprocess.TimeoutExpired(cmd, timeout)
+
+        rules: Dict[str, str] = {}
+        for config in configs:
+            rules.update(self._rules(config))
+        results = []
+        for f in files:
+            for line_no, line in enumerate(f.read_text().splitlines(), 1):
+                for rule_id, needle in rules.items():
+                    if needle in line:
+                        results.append({
+                            "ruleId": rule_id,
+                            "message": {"text": f"{rule_id} matched"},
+                            "locations": [{"physicalLocation": {
+                                "artifactLocation": {"uri": str(f)},
+                                "region": {"startLine": line_no, "startColumn": line.index(needle) + 1},
+                            }}],
+                        })
+        sarif = {
+            "version": "2.1.0",
+            "runs": [{
+                "tool": {"driver": {"name": "Semgrep", "rules": [{"id": r} for r in rules]}},
+                "results": results,
+            }],
+        }
+        return (1 if results else 0), json.dumps(sarif), ""
+
+
+@pytest.fixture
+def fake_semgrep(monkeypatch):
+    """Route every Semgrep invocation to a FakeSemgrep; no baseline registry packs."""
+    fake = FakeSemgrep()
+    monkeypatch.setattr(scanner, "run", fake)
+    monkeypatch.setattr(RaptorConfig, "BASELINE_SEMGREP_PACKS", [])
+    monkeypatch.setattr(RaptorConfig, "POLICY_GROUP_TO_SEMGREP_PACK", {})
+    return fake
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A small repository with a .git directory the scans must skip."""
+    root = tmp_path / "repo"
+    (root / "src").mkdir(parents=True)
+    (root / ".git").mkdir()
+    (root / ".git" / "config").write_text("eval(\n")
+    (root / "src" / "app.py").write_text("import os\nos.system(cmd)\n")
+    (root / "src" / "util.py").write_text("def f(x):\n    return eval(x)\n")
+    (root / "README.md").write_text("nothing to see\n")
+    return root.resolve()
+
+
+@pytest.fixture
+def rules(tmp_path):
+    """Two local rule directories; the rule "shared" is in both."""
+    base = tmp_path / "rules"
+    (base / "injection").mkdir(parents=True)
+    (base / "eval").mkdir(parents=True)
+    (base / "injection" / "rules.txt").write_text("os-system os.system\nshared import\n")
+    (base / "eval" / "rules.txt").write_text("eval-call eval(\nshared import\n")
+    return [str(base / "injection"), str(base / "eval")]
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for batched Semgrep scans: one process for all configs, split by rule id.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import scanner
+from semgrep_cache import SemgrepScanCache, sarif_fingerprints
+
+
+def _result(rule_id: str, uri: str = "/repo/a.py") -> dict:
+    return {
+        "ruleId": rule_id,
+        "message": {"text": rule_id},
+        "locations": [{"physicalLocation": {"artifactLocation": {"uri": uri}, "region": {"startLine": 1}}}],
+    }
+
+
+def _load(path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def _rule_ids(sarif: dict) -> list:
+    return sorted(rule["id"] for run in sarif["runs"] for rule in run["tool"]["driver"].get("rules", []))
+
+
+@pytest.fixture
+def all_rules(rules, tmp_path):
+    """The shared rule fixture plus a config that matches nothing."""
+    quiet = tmp_path / "rules" / "crypto"
+    quiet.mkdir()
+    (quiet / "rules.txt").write_text("weak-hash md5(\n")
+    return rules + [str(quiet)]
+
+
+class TestSplitBatchedSarif:
+
+    def test_results_attributed_by_rule_id(self):
+        batched = {"version": "2.1.0", "runs": [{
+            "tool": {"driver": {"name": "Semgrep", "rules": [{"id": "a"}, {"id": "b"}, {"id": "shared"}]}},
+            "results": [_result("a"), _result("b"), _result("shared")],
+        }]}
+        split, unattributed = scanner.split_batched_sarif(
+            batched, {"one": ["a", "shared"], "two": ["b", "shared"]}
+        )
+
+        assert unattributed == []
+        assert [r["ruleId"] for r in split["one"]["runs"][0]["results"]] == ["a", "shared"]
+        assert [r["ruleId"] for r in split["two"]["runs"][0]["results"]] == ["b", "shared"]
+        assert _rule_ids(split["one"]) == ["a", "shared"]
+        assert split["one"]["version"] == "2.1.0"
+
+    def test_unknown_rule_and_unlisted_config_are_unattributed(self):
+        batched = {"runs": [{"results": [_result("a"), _result("mystery"), _result("c")]}]}
+        split, unattributed = scanner.split_batched_sarif(batched, {"one": ["a"], "unlisted": None})
+
+        assert [r["ruleId"] for r in split["one"]["runs"][0]["results"]] == ["a"]
+        assert split["unlisted"]["runs"][0]["results"] == []
+        assert [r["ruleId"] for r in unattributed] == ["mystery", "c"]
+
+    def test_config_without_results_gets_empty_run(self):
+        split, unattributed = scanner.split_batched_sarif({"runs": []}, {"one": ["a"], "two": []})
+        assert unattributed == []
+        for config in ("one", "two"):
+            assert split[config]["runs"][0]["results"] == []
+
+
+class TestSemgrepScanBatched:
+
+    def test_matches_per_config_scans(self, repo, all_rules, fake_semgrep, tmp_path):
+        separate = scanner.semgrep_scan_sequential(repo, all_rules, tmp_path / "separate")
+        calls = len(fake_semgrep.calls)
+        batched = scanner.semgrep_scan_batched(repo, all_rules, tmp_path / "batched")
+
+        scans = [call for call in fake_semgrep.calls[calls:] if "empty" not in str(call["targets"][0])]
+        assert len(scans) == 1
+        assert scans[0]["configs"] == all_rules
+
+        assert [Path(p).name for p in batched] == [Path(p).name for p in separate]
+        for separate_path, batched_path in zip(separate, batched):
+            expected, actual = _load(separate_path), _load(batched_path)
+            assert sarif_fingerprints(actual, repo) == sarif_fingerprints(expected, repo)
+            assert _rule_ids(actual) == _rule_ids(expected)
+
+        quiet = _load(tmp_path / "batched" / "semgrep_category_crypto.sarif")
+        assert quiet["runs"][0]["results"] == []
+        assert not (tmp_path / "batched" / "semgrep_batched_unattributed.sarif").exists()
+
+    def test_unlisted_config_results_kept_separately(self, repo, rules, fake_semgrep, tmp_path, monkeypatch):
+        rule_ids = scanner.semgrep_rule_ids
+        monkeypatch.setattr(
+            scanner, "semgrep_rule_ids",
+            lambda name, config, *args: None if name == "category_eval" else rule_ids(name, config, *args),
+        )
+        cache = SemgrepScanCache(repo, tmp_path / "cache")
+        out_dir = tmp_path / "out"
+        paths = scanner.semgrep_scan_batched(repo, rules, out_dir, cache=cache)
+
+        assert Path(paths[-1]).name == "semgrep_batched_unattributed.sarif"
+        unattributed = [r["ruleId"] for r in _load(paths[-1])["runs"][0]["results"]]
+        assert unattributed == ["eval-call"]
+        assert _load(out_dir / "semgrep_category_eval.sarif")["runs"][0]["results"] == []
+        # Its rules are unknown, so nothing was cached for it
+        key = scanner._config_keys([("eval", rules[1])])[rules[1]]
+        assert cache.plan(*key)["cold"] is True
+
+    def test_incremental_rerun_matches_cold(self, repo, all_rules, fake_semgrep, tmp_path):
+        cache_dir = tmp_path / "cache"
+        scanner.semgrep_scan_batched(repo, all_rules, tmp_path / "out1", cache=SemgrepScanCache(repo, cache_dir))
+
+        (repo / "src" / "app.py").write_text("eval(os.system(x))\n")
+        calls = len(fake_semgrep.calls)
+        out_dir = tmp_path / "out2"
+        paths = scanner.semgrep_scan_batched(
+            repo, all_rules, out_dir, cache=SemgrepScanCache(repo, cache_dir), verify=True,
+        )
+
+        assert fake_semgrep.calls[calls]["includes"] == ["src/app.py"]
+        for path in paths:
+            report = json.loads(Path(path).with_suffix(".incremental.json").read_text())
+            assert report == {"mode": "incremental", "verified": True}
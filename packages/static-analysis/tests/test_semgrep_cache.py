@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental Semgrep scan cache.
+"""
+
+import json
+from pathlib import Path
+
+import scanner
+from semgrep_cache import SemgrepScanCache, hash_rule_config, sarif_fingerprints
+
+
+def _result(path: Path, rule_id: str = "rule", line: int = 1) -> dict:
+    return {
+        "ruleId": rule_id,
+        "message": {"text": rule_id},
+        "locations": [{"physicalLocation": {
+            "artifactLocation": {"uri": str(path)},
+            "region": {"startLine": line},
+        }}],
+    }
+
+
+def _sarif(*results) -> dict:
+    return {"version": "2.1.0", "runs": [{"tool": {"driver": {"name": "Semgrep"}}, "results": list(results)}]}
+
+
+def _results(sarif: dict) -> list:
+    return [r for run in sarif["runs"] for r in run["results"]]
+
+
+class TestSemgrepScanCache:
+
+    def test_first_scan_is_cold(self, repo, tmp_path):
+        cache = SemgrepScanCache(repo, cache_dir=tmp_path / "cache")
+        assert cache.plan("key") == {"cold": True, "reason": "no cached scan"}
+
+    def test_files_skip_git(self, repo, tmp_path):
+        files = SemgrepScanCache(repo, cache_dir=tmp_path / "cache").current_files()
+        assert sorted(files) == ["README.md", "src/app.py", "src/util.py"]
+
+    def test_unchanged_repo_served_from_cache(self, repo, tmp_path):
+        cache = SemgrepScanCache(repo, cache_dir=tmp_path / "cache")
+        cold = _sarif(_result(repo / "src" / "app.py", line=2))
+        cache.update("key", cold, cache.plan("key"))
+
+        plan = SemgrepScanCache(repo, cache_dir=tmp_path / "cache").plan("key")
+        assert plan["cold"] is False
+        assert plan["changed"] == []
+        merged = cache.merge(plan, {"version": "2.1.0", "runs": []})
+        assert _results(merged) == _results(cold)
+
+    def test_changed_file_rescanned_unchanged_reused(self, repo, tmp_path):
+        cache = SemgrepScanCache(repo, cache_dir=tmp_path / "cache")
+        app, util = repo / "src" / "app.py", repo / "src" / "util.py"
+        cache.update("key", _sarif(_result(app, line=2), _result(util, line=2)), cache.plan("key"))
+
+        util.write_text("def f(x):\n    return x\n")
+        cache = SemgrepScanCache(repo, cache_dir=tmp_path / "cache")
+        plan = cache.plan("key")
+        assert plan["changed"] == ["src/util.py"]
+
+        # The partial scan also reports app.py (unanchored --include); the cached result wins
+        partial = _sarif(_result(app, "other", line=1))
+        merged = cache.merge(plan, partial)
+        assert _results(merged) == [_result(app, line=2)]
+
+        cache.update("key", merged, plan)
+        assert SemgrepScanCache(repo, cache_dir=tmp_path / "cache").plan("key")["changed"] == []
+
+    def test_deleted_file_results_dropped(self, repo, tmp_path):
+        cache = SemgrepScanCache(repo, cache_dir=tmp_path / "cache")
+        util = repo / "src" / "util.py"
+        cache.update("key", _sarif(_result(repo / "src" / "app.py"), _result(util)), cache.plan("key"))
+
+        util.unlink()
+        cache = SemgrepScanCache(repo, cache_dir=tmp_path / "cache")
+        plan = cache.plan("key")
+        assert plan["changed"] == []
+        assert _results(cache.merge(plan, {"runs": []})) == [_result(repo / "src" / "app.py")]
+
+    def test_too_many_changes_go_cold(self, repo, tmp_path):
+        cache = SemgrepScanCache(repo, cache_dir=tmp_path / "cache", max_changed_fraction=0.5)
+        cache.update("key", _sarif(), cache.plan("key"))
+
+        (repo / "src" / "app.py").write_text("changed\n")
+        (repo / "src" / "util.py").write_text("changed\n")
+        plan = SemgrepScanCache(repo, cache_dir=tmp_path / "cache", max_changed_fraction=0.5).plan("key")
+        assert plan == {"cold": True, "reason": "2/3 files changed"}
+
+    def test_unattributable_result_invalidates(self, repo, tmp_path):
+        cache = SemgrepScanCache(repo, cache_dir=tmp_path / "cache")
+        cache.update("key", _sarif(_result(tmp_path / "elsewhere.py")), cache.plan("key"))
+        assert cache.plan("key")["cold"] is True
+
+    def test_registry_results_expire(self, repo, tmp_path):
+        cache = SemgrepScanCache(repo, cache_dir=tmp_path / "cache", registry_ttl=0)
+        cache.update("key", _sarif(), cache.plan("key", is_remote=True))
+        assert cache.plan("key", is_remote=True) == {"cold": True, "reason": "registry rules expired"}
+        assert cache.plan("key", is_remote=False)["cold"] is False
+
+
+class TestRuleConfigHash:
+
+    def test_rule_change_invalidates(self, repo, tmp_path):
+        rules = tmp_path / "rules.txt"
+        rules.write_text("rule eval(\n")
+        key, is_remote = hash_rule_config(str(rules), "1.0.0")
+        assert is_remote is False
+
+        cache = SemgrepScanCache(repo, cache_dir=tmp_path / "cache")
+        cache.update(key, _sarif(), cache.plan(key))
+        assert cache.plan(key)["cold"] is False
+
+        rules.write_text("rule exec(\n")
+        new_key, _ = hash_rule_config(str(rules), "1.0.0")
+        assert new_key != key
+        assert cache.plan(new_key) == {"cold": True, "reason": "no cached scan"}
+
+    def test_version_and_args_are_part_of_key(self, tmp_path):
+        rules = tmp_path / "rules"
+        rules.mkdir()
+        (rules / "a.txt").write_text("rule eval(\n")
+        key = hash_rule_config(str(rules), "1.0.0")[0]
+        assert hash_rule_config(str(rules), "1.0.1")[0] != key
+        assert hash_rule_config(str(rules), "1.0.0", ["--timeout", "5"])[0] != key
+
+        (rules / "b.txt").write_text("other exec(\n")
+        assert hash_rule_config(str(rules), "1.0.0")[0] != key
+
+    def test_registry_config_is_remote(self):
+        assert hash_rule_config("p/security-audit", "1.0.0")[1] is True
+
+
+class TestRunSemgrepCached:
+
+    def _run(self, repo, rules_dir, out_dir, cache, verify=False):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        key = scanner._config_keys([("eval", rules_dir)])[rules_dir]
+        scanner.run_semgrep_cached("eval", rules_dir, repo, out_dir, 60, cache, key, verify=verify)
+        report = json.loads((out_dir / "semgrep_eval.incremental.json").read_text())
+        return json.loads((out_dir / "semgrep_eval.sarif").read_text()), report
+
+    def test_only_changed_files_rescanned(self, repo, rules, fake_semgrep, tmp_path):
+        cache_dir = tmp_path / "cache"
+        self._run(repo, rules[1], tmp_path / "out1", SemgrepScanCache(repo, cache_dir))
+
+        (repo / "src" / "app.py").write_text("eval(x)\n")
+        sarif, report = self._run(repo, rules[1], tmp_path / "out2", SemgrepScanCache(repo, cache_dir))
+
+        assert report["mode"] == "incremental"
+        assert report["changed_files"] == 1
+        assert [f.name for f in fake_semgrep.calls[-1]["files"]] == ["app.py"]
+        # Fresh result for app.py, cached result for util.py
+        found = [(r["ruleId"], Path(r["locations"][0]["physicalLocation"]["artifactLocation"]["uri"]).name)
+                 for r in _results(sarif)]
+        assert found == [("eval-call", "app.py"), ("eval-call", "util.py")]
+
+    def test_verify_detects_mismatch(self, repo, rules, fake_semgrep, tmp_path):
+        cache_dir = tmp_path / "cache"
+        cache = SemgrepScanCache(repo, cache_dir)
+        self._run(repo, rules[1], tmp_path / "out1", cache)
+
+        # Corrupt the cached results for an unchanged file
+        key = scanner._config_keys([("eval", rules[1])])[rules[1]][0]
+        state_path = cache.cache_dir / f"{key}.json"
+        state = json.loads(state_path.read_text())
+        state["results"]["src/util.py"] = []
+        state_path.write_text(json.dumps(state))
+
+        (repo / "README.md").write_text("changed\n")
+        out_dir = tmp_path / "out2"
+        sarif, report = self._run(repo, rules[1], out_dir, SemgrepScanCache(repo, cache_dir), verify=True)
+
+        assert report["mode"] == "incremental"
+        assert report["verified"] is False
+        cold = json.loads((out_dir / "incremental_verify" / "semgrep_eval.sarif").read_text())
+        assert sarif_fingerprints(sarif, repo) == sarif_fingerprints(cold, repo)
+        assert any(r["ruleId"] == "eval-call" for r in _results(sarif))
+
+        # The cold result replaced the cache, so the next verified run matches
+        (repo / "README.md").write_text("changed again\n")
+        _, report = self._run(repo, rules[1], tmp_path / "out3", SemgrepScanCache(repo, cache_dir), verify=True)
+        assert report["verified"] is True
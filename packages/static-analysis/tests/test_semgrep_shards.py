@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for sharded Semgrep scans: shard planning, timeout splits and merging.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import scanner
+from core.config import RaptorConfig
+from semgrep_cache import SemgrepScanCache, sarif_fingerprints
+from semgrep_shards import ShardUnit, plan_shards, scan_tree, split_shard
+
+
+def _write(path: Path, size: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+
+
+def _paths(shard) -> list:
+    return [unit.path for unit in shard]
+
+
+@pytest.fixture
+def tree_root(tmp_path):
+    root = tmp_path / "tree"
+    _write(root / "a" / "one.c", 400)
+    _write(root / "a" / "two.c", 100)
+    _write(root / "b" / "three.c", 300)
+    _write(root / "c" / "four.c", 200)
+    _write(root / "big.bin", 500)
+    _write(root / ".git" / "objects" / "pack", 10000)
+    return root
+
+
+class TestPlanShards:
+
+    def test_tree_sizes_skip_git(self, tree_root):
+        tree = scan_tree(tree_root)
+        assert tree.dir_size[""] == 1500
+        assert tree.dir_size["a"] == 500
+        assert ".git" not in tree.dir_subdirs[""]
+
+    def test_shards_balanced_and_cover_repo_once(self, tree_root):
+        shards = plan_shards(scan_tree(tree_root), 2)
+        assert sorted(_paths(shard) for shard in shards) == [["a", "b"], ["big.bin", "c"]]
+        assert sorted(sum(unit.size for unit in shard) for shard in shards) == [700, 800]
+
+    def test_large_directory_broken_up(self, tree_root):
+        shards = plan_shards(scan_tree(tree_root), 4)
+        units = sorted(unit.path for shard in shards for unit in shard)
+        # a/ (500) is over the 375-byte target, so its files are packed separately
+        assert units == ["a/one.c", "a/two.c", "b", "big.bin", "c"]
+        assert len(shards) == 4
+        assert max(sum(unit.size for unit in shard) for shard in shards) == 500
+
+    def test_single_shard_and_empty_repo(self, tree_root, tmp_path):
+        assert plan_shards(scan_tree(tree_root), 1) == [[ShardUnit("", 1500, True)]]
+        (tmp_path / "empty").mkdir()
+        assert plan_shards(scan_tree(tmp_path / "empty"), 4) == []
+
+
+class TestSplitShard:
+
+    def test_split_units_in_two(self, tree_root):
+        tree = scan_tree(tree_root)
+        shard = [ShardUnit("a", 500, True), ShardUnit("b", 300, True), ShardUnit("c", 200, True)]
+        assert [_paths(part) for part in split_shard(shard, tree)] == [["a"], ["b", "c"]]
+
+    def test_single_directory_split_into_children(self, tree_root):
+        tree = scan_tree(tree_root)
+        parts = split_shard([ShardUnit("a", 500, True)], tree)
+        assert sorted(_paths(part) for part in parts) == [["a/one.c"], ["a/two.c"]]
+
+    def test_directory_chain_descended(self, tmp_path):
+        _write(tmp_path / "r" / "x" / "y" / "z" / "f1", 10)
+        _write(tmp_path / "r" / "x" / "y" / "z" / "f2", 20)
+        tree = scan_tree(tmp_path / "r")
+        parts = split_shard([ShardUnit("x", 30, True)], tree)
+        assert sorted(_paths(part) for part in parts) == [["x/y/z/f1"], ["x/y/z/f2"]]
+
+    def test_single_file_cannot_split(self, tree_root):
+        assert split_shard([ShardUnit("big.bin", 500, False)], scan_tree(tree_root)) == []
+
+
+class TestSemgrepScanSharded:
+
+    def _compare(self, repo, sharded, unsharded):
+        assert [Path(p).name for p in sharded] == [Path(p).name for p in unsharded]
+        for sharded_path, unsharded_path in zip(sharded, unsharded):
+            actual = json.loads(Path(sharded_path).read_text())
+            expected = json.loads(Path(unsharded_path).read_text())
+            assert sarif_fingerprints(actual, repo) == sarif_fingerprints(expected, repo)
+            assert actual["runs"][0]["results"], "fixture should produce results"
+
+    def test_merged_equals_unsharded(self, repo, rules, fake_semgrep, tmp_path):
+        unsharded = scanner.semgrep_scan_sequential(repo, rules, tmp_path / "unsharded")
+        calls = len(fake_semgrep.calls)
+        sharded = scanner.semgrep_scan_sharded(repo, rules, tmp_path / "sharded", num_shards=2)
+        self._compare(repo, sharded, unsharded)
+
+        # Two shards per config, every file scanned exactly once per config
+        scans = fake_semgrep.calls[calls:]
+        assert len(scans) == 2 * 2
+        for config in rules:
+            files = sorted(f.name for call in scans if call["configs"] == [config] for f in call["files"])
+            assert files == ["README.md", "app.py", "util.py"]
+
+    def test_timed_out_shards_split_until_they_fit(self, repo, rules, fake_semgrep, tmp_path):
+        unsharded = scanner.semgrep_scan_sequential(repo, rules, tmp_path / "unsharded")
+        calls = len(fake_semgrep.calls)
+        fake_semgrep.max_files = 1
+
+        sharded = scanner.semgrep_scan_sharded(repo, rules, tmp_path / "sharded", num_shards=2)
+        self._compare(repo, sharded, unsharded)
+        scans = fake_semgrep.calls[calls:]
+        # Per config: [util.py] fits, [README.md, src/app.py] times out and is retried as two
+        assert len(scans) == 2 * 4
+        assert sorted(len(call["files"]) for call in scans) == [1] * 6 + [2] * 2
+
+    def test_whole_repo_shard_split_recursively(self, repo, rules, fake_semgrep, tmp_path):
+        unsharded = scanner.semgrep_scan_sequential(repo, rules, tmp_path / "unsharded")
+        fake_semgrep.max_files = 1
+
+        # [repo] -> [README.md], [src] -> [src/app.py], [src/util.py]
+        sharded = scanner.semgrep_scan_sharded(repo, rules, tmp_path / "sharded", num_shards=1)
+        self._compare(repo, sharded, unsharded)
+
+    def test_one_file_shard_timeout_is_incomplete(self, repo, rules, fake_semgrep, tmp_path):
+        fake_semgrep.slow = {"util.py"}
+        cache = SemgrepScanCache(repo, tmp_path / "cache")
+        out_dir = tmp_path / "sharded"
+        paths = scanner.semgrep_scan_sharded(repo, rules, out_dir, cache=cache, num_shards=2)
+
+        # The other shard's results are kept, the timed-out file is missing
+        eval_sarif = json.loads((out_dir / "semgrep_category_eval.sarif").read_text())
+        assert [r["ruleId"] for r in eval_sarif["runs"][0]["results"]] == ["shared"]
+        assert len(paths) == 2
+        # An incomplete scan is never cached
+        keys = scanner._config_keys([(None, config) for config in rules])
+        assert all(cache.plan(*keys[config])["cold"] for config in rules)
+
+    def test_split_limit(self, repo, rules, fake_semgrep, tmp_path, monkeypatch):
+        monkeypatch.setattr(RaptorConfig, "SEMGREP_SHARD_MAX_SPLITS", 0)
+        fake_semgrep.max_files = 1
+        cache = SemgrepScanCache(repo, tmp_path / "cache")
+        scanner.semgrep_scan_sharded(repo, rules, tmp_path / "sharded", cache=cache, num_shards=2)
+        assert len(fake_semgrep.calls) == 2 * 2
+        keys = scanner._config_keys([(None, config) for config in rules])
+        assert all(cache.plan(*keys[config])["cold"] for config in rules)
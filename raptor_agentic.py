@@ -20,17 +20,19 @@ import subprocess
 import sys
 import time
 from pathlib import Path
+from typing import Optional
 
 # Add to path
 sys.path.insert(0, str(Path(__file__).parent))
 from core.config import RaptorConfig
+from core.inventory import inventory_run, run_env
 from core.logging import get_logger
 
 logger = get_logger()
 
 
-def run_command(cmd: list, description: str) -> tuple[int, str, str]:
-    """Run a command and return results."""
+def run_command(cmd: list, description: str, env: Optional[dict] = None) -> tuple[int, str, str]:
+    """Run a command (with env, default: inherited) and return results."""
     logger.info(f"Running: {description}")
     print(f"\n[*] {description}...")
 
@@ -39,7 +41,8 @@ def run_command(cmd: list, description: str) -> tuple[int, str, str]:
             cmd,
             capture_output=True,
             text=True,
-            timeout=1800  # 30 minutes
+            timeout=1800,  # 30 minutes
+            env=env,
         )
         return result.returncode, result.stdout, result.stderr
     except subprocess.TimeoutExpired:
@@ -50,7 +53,7 @@ def run_command(cmd: list, description: str) -> tuple[int, str, str]:
         return -1, "", str(e)
 
 
-def run_command_streaming(cmd: list, description: str) -> tuple[int, str, str]:
+def run_command_streaming(cmd: list, description: str, env: Optional[dict] = None) -> tuple[int, str, str]:
     """
     Run a command and stream output in real-time while also capturing it.
 
@@ -60,6 +63,7 @@ def run_command_streaming(cmd: list, description: str) -> tuple[int, str, str]:
     Args:
         cmd: Command and arguments as a list
         description: Human-readable description of the command
+        env: Environment of the command (default: inherited)
 
     Returns:
         Tuple of (return_code, stdout, stderr)
@@ -89,7 +93,8 @@ def run_command_streaming(cmd: list, description: str) -> tuple[int, str, str]:
             stderr=subprocess.PIPE,
             text=True,
             bufsize=1,  # Line buffered
-            universal_newlines=True
+            universal_newlines=True,
+            env=env,
         )
 
         stdout_lines = []
@@ -270,6 +275,11 @@ Examples:
 
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    # Walk the repository once; only the scanner and CodeQL subprocesses load
+    # the snapshot, through their environment
+    with inventory_run(repo_path, snapshot=out_dir / "inventory.sqlite"):
+        stage_env = run_env()
+
     logger.info("=" * 70)
     logger.info("RAPTOR AGENTIC WORKFLOW STARTED")
     logger.info("=" * 70)
@@ -348,7 +358,7 @@ Examples:
             "--policy_groups", args.policy_groups,
         ]
 
-        rc, stdout, stderr = run_command(scan_cmd, "Scanning code with Semgrep")
+        rc, stdout, stderr = run_command(scan_cmd, "Scanning code with Semgrep", env=stage_env)
 
         if rc not in (0, 1):
             print(f"❌ Semgrep scan failed: {stderr}")
@@ -405,7 +415,7 @@ Examples:
         if args.codeql_cli:
             codeql_cmd.extend(["--codeql-cli", args.codeql_cli])
 
-        rc, stdout, stderr = run_command_streaming(codeql_cmd, "Scanning code with CodeQL")
+        rc, stdout, stderr = run_command_streaming(codeql_cmd, "Scanning code with CodeQL", env=stage_env)
 
         if rc != 0:
             print(f"⚠️  CodeQL scan failed or completed with warnings")
@@ -26,6 +26,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from core.config import RaptorConfig
 from core.logging import get_logger
+from core.sarif.index import get_sarif_index
 from packages.codeql.agent import CodeQLAgent
 from packages.codeql.autonomous_analyzer import AutonomousCodeQLAnalyzer
 
@@ -157,17 +158,13 @@ def run_autonomous_workflow(args):
     for sarif_file in scan_result.sarif_files:
         logger.info(f"\nAnalyzing SARIF: {sarif_file}")
 
-        with open(sarif_file) as f:
-            sarif = json.load(f)
-
-        run = sarif["runs"][0]
-        results = run["results"]
-
-        # Analyze findings (up to max_findings)
-        findings_to_analyze = results[:args.max_findings]
+        # Analyze findings (up to max_findings), decoding only those from the index
+        findings_to_analyze = list(
+            get_sarif_index(sarif_file).iter_raw_results(limit=args.max_findings)
+        )
         logger.info(f"Analyzing {len(findings_to_analyze)} findings...")
 
-        for i, result in enumerate(findings_to_analyze, 1):
+        for i, (result, run) in enumerate(findings_to_analyze, 1):
             rule_id = result.get("ruleId", "unknown")
             logger.info(f"\n[{i}/{len(findings_to_analyze)}] {rule_id}")
 
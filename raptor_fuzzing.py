@@ -54,7 +54,7 @@ def main() -> None:
     ap.add_argument("--recompile-guide", action="store_true", help="Show guide for recompiling binary with AFL instrumentation and sanitizers")
     ap.add_argument("--use-showmap", action="store_true", help="Run afl-showmap after fuzzing for coverage analysis")
     ap.add_argument("--autonomous", action="store_true", help="Enable autonomous mode with intelligent decision-making and learning")
-    ap.add_argument("--memory-file", help="Path to memory file for learning persistence (default: ~/.raptor/fuzzing_memory.json)")
+    ap.add_argument("--memory-file", help="Path to memory database for learning persistence (default: ~/.raptor/fuzzing_memory.sqlite)")
     ap.add_argument("--goal", help="High-level goal to achieve (e.g., 'find heap overflow', 'target parser code')")
 
     args = ap.parse_args()
@@ -153,8 +153,11 @@ def main() -> None:
                 max_seeds=30
             )
 
+            # Drop seeds that add no edge coverage before AFL calibrates them
+            removed = corpus_generator.optimize_corpus(autonomous_corpus_dir, input_mode=args.input_mode)
+
             corpus_dir = autonomous_corpus_dir
-            logger.info(f"✨ Autonomous corpus generated: {num_seeds} intelligent seeds")
+            logger.info(f"✨ Autonomous corpus generated: {num_seeds - removed} intelligent seeds")
 
     # ========================================================================
     # PHASE 1: FUZZING WITH AFL++
@@ -207,16 +210,18 @@ def main() -> None:
     print("=" * 70)
 
     try:
-        # Collect crashes
-        collector = CrashCollector(crashes_dir)
-        crashes = collector.collect_crashes(max_crashes=args.max_crashes)
+        # Collect crashes, then keep one input per stack hash before the
+        # expensive per-crash debugger and LLM analysis
+        collector = CrashCollector(afl_runner.crash_dirs() or crashes_dir)
+        crash_analyser = CrashAnalyser(binary_path)
+        all_crashes = collector.collect_crashes()
+        crashes = collector.deduplicate_by_stack(all_crashes, crash_analyser.stack_signature)
         ranked_crashes = collector.rank_crashes_by_exploitability(crashes)
 
-        print(f"\nCollected {len(crashes)} unique crashes")
+        print(f"\nCollected {len(crashes)} unique crashes ({len(all_crashes)} crashing inputs)")
         print(f"   Analysing top {min(len(crashes), args.max_crashes)}")
 
         # Analyse crashes
-        crash_analyser = CrashAnalyser(binary_path)
         llm_agent = CrashAnalysisAgent(
             binary_path=binary_path,
             out_dir=out_dir / "analysis",
@@ -234,7 +239,7 @@ def main() -> None:
             dummy_state = FuzzingState(
                 start_time=time.time(),
                 current_time=time.time(),
-                total_crashes=len(crashes),
+                total_crashes=len(all_crashes),
                 unique_crashes=len(crashes),
             )
             ranked_crashes = planner.recommend_crash_priority(ranked_crashes, dummy_state)
@@ -261,6 +266,7 @@ def main() -> None:
                 input_file=crash.input_file,
                 signal=crash.signal or "unknown",
             )
+            crash_context.duplicate_count = len(crash.duplicates)
 
             # Deduplicate by stack hash
             if crash_context.stack_hash and crash_context.stack_hash in seen_stack_hashes:
@@ -436,22 +442,23 @@ def main() -> None:
         if memory:
             import hashlib
             binary_hash = hashlib.sha256(binary_path.read_bytes()).hexdigest()[:16]
-            memory.record_campaign({
-                "binary_name": binary_path.name,
-                "binary_hash": binary_hash,
-                "duration": args.duration,
-                "total_crashes": num_crashes,
-                "exploitable_crashes": exploitable,
-                "exploits_generated": exploits_generated,
-            })
-
-            # Record strategy success
-            memory.record_strategy_success(
-                strategy_name="default",
-                binary_hash=binary_hash,
-                crashes_found=num_crashes,
-                exploitable_crashes=exploitable
-            )
+            with memory.batch():
+                memory.record_campaign({
+                    "binary_name": binary_path.name,
+                    "binary_hash": binary_hash,
+                    "duration": args.duration,
+                    "total_crashes": num_crashes,
+                    "exploitable_crashes": exploitable,
+                    "exploits_generated": exploits_generated,
+                })
+
+                # Record strategy success
+                memory.record_strategy_success(
+                    strategy_name="default",
+                    binary_hash=binary_hash,
+                    crashes_found=num_crashes,
+                    exploitable_crashes=exploitable
+                )
 
             logger.info("Campaign recorded in memory for future learning")
 